@@ -95,6 +95,7 @@ Application options
   -v, --version                          Show versions
   -S, --safe                             Start Gramps in 'Safe mode'
                                           (temporarily use default settings)
+  --timing                               Report the time taken by each phase of the start
   -D, --default=[APXFE]                  Reset settings to default;
                  A - addons are cleared
                  P - Preferences to default
@@ -185,6 +186,7 @@ class ArgParser:
     -v, --version                   Show versions
     -h, --help                      Display the help
     --usage                         Display usage information
+    --timing                        Report the time taken to start
 
     If the filename (no options) is specified, the interactive session is
     launched using data from filename.  In this mode (filename, no options), the
@@ -241,6 +243,7 @@ class ArgParser:
         self.create = None
         self.quiet = False
         self.auto_accept = False
+        self.timing = False
 
         self.errors = []
         self.parse_args()
@@ -419,6 +422,9 @@ class ArgParser:
                 self.quiet = True
             elif option in ["-S", "--safe"]:
                 cleandbg += [opt_ix]
+            elif option in ["--timing"]:
+                self.timing = True
+                cleandbg += [opt_ix]
             elif option in ["-D", "--default"]:
 
                 def rmtree(path):
@@ -59,8 +59,9 @@ from gramps.gen.db.exceptions import (
     DbPythonError,
     DbConnectionError,
 )
-from gramps.gen.plug import BasePluginManager
+from gramps.gen.plug import BasePluginManager, PluginRegister
 from gramps.gen.utils.config import get_researcher
+from gramps.gen.utils.debug import STARTUP_TIMER
 from gramps.gen.recentfiles import recent_files
 from gramps.gen.filters import reload_custom_filters
 
@@ -336,6 +337,15 @@ class CLIManager:
             self._pmgr.reload_plugins()
 
 
+def plugin_cache_detail():
+    """
+    Return the number of plugin registration files read from the cache and
+    run, for the startup timing report.
+    """
+    hits, runs = PluginRegister.get_instance().cache_stats()
+    return "%d registration files cached, %d run" % (hits, runs)
+
+
 def startcli(errors, argparser):
     """
     Starts a cli session of Gramps.
@@ -368,8 +378,11 @@ def startcli(errors, argparser):
     climanager = CLIManager(dbstate, True, user)
 
     # load the plugins
+    STARTUP_TIMER.mark("command line modules")
     climanager.do_reg_plugins(dbstate, uistate=None)
+    STARTUP_TIMER.mark("plugin registration", plugin_cache_detail())
     reload_custom_filters()
+    STARTUP_TIMER.mark("custom filters")
     # handle the arguments
     from .arghandler import ArgHandler
 
@@ -379,4 +392,6 @@ def startcli(errors, argparser):
     handler.handle_args_cli()
     if handler.dbstate.is_open():
         handler.dbstate.db.close()
+    STARTUP_TIMER.mark("actions")
+    STARTUP_TIMER.report()
     sys.exit(0)
@@ -80,6 +80,11 @@ class TestArgParser(unittest.TestCase):
         ap = self.create_parser()
         assert not ap.auto_accept
 
+    def test_timing_longopt_sets_timing(self):
+        bad, ap = self.triggers_option_error("--timing")
+        assert not bad, ap.errors
+        assert ap.timing
+
     def test_exception(self):
         argument_parser = self.create_parser("-O")
 
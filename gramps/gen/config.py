@@ -195,6 +195,7 @@ register("csv.dialect", "excel")
 register("csv.delimiter", ",")
 
 register("database.backend", "sqlite")
+register("database.cache-size", 10000)
 register("database.compress-backup", True)
 register("database.backup-path", USER_HOME)
 register("database.backup-on-exit", True)
@@ -202,6 +203,10 @@ register("database.autobackup", 0)
 register("database.path", os.path.join(USER_DATA, "grampsdb"))
 register("database.host", "")
 register("database.port", "")
+register("database.export-processes", 1)
+register("database.rebuild-processes", 1)
+register("database.undo-window", 10000)
+register("database.ancestor-index", False)
 
 register(
     "export.proxy-order",
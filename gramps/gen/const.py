@@ -141,6 +141,7 @@ THUMB_DIR = os.path.join(USER_CACHE, "thumb")
 THUMB_NORMAL = os.path.join(THUMB_DIR, "normal")
 THUMB_LARGE = os.path.join(THUMB_DIR, "large")
 USER_PLUGINS = os.path.join(USER_DATA_VERSION, "plugins")
+PLUGIN_CACHE = os.path.join(USER_CACHE, "plugin-registrations.pickle")
 USER_CSS = os.path.join(USER_DATA, "css")
 # dirs checked/made for each Gramps session
 USER_DIRLIST = (
@@ -337,6 +338,7 @@ LONGOPTS = [
     "sm-config-prefix=",
     "sm-disable",
     "sync",
+    "timing",
     "remove=",
     "usage",
     "version",
@@ -30,7 +30,9 @@ from this class.
 # Python modules
 #
 # -------------------------------------------------------------------------
+import json
 import logging
+from collections import deque
 
 # -------------------------------------------------------------------------
 #
@@ -38,9 +40,11 @@ import logging
 #
 # -------------------------------------------------------------------------
 from ..const import GRAMPS_LOCALE as glocale
-from ..db.dbconst import DBLOGNAME
+from ..db.dbconst import CLASS_TO_KEY_MAP, DBLOGNAME
+from ..errors import HandleError
 from ..lib.childref import ChildRef
 from ..lib.childreftype import ChildRefType
+from ..lib.serialize import to_dict
 from .exceptions import DbTransactionCancel
 from .txn import DbTxn
 
@@ -120,6 +124,166 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def iter_reference_map(self):
+        """
+        Return an iterator over all references kept in the reference map, as
+        (class_name, handle, ref_class_name, ref_handle) tuples, where the
+        object class_name, handle refers to the object ref_class_name,
+        ref_handle.
+
+        This default implementation calls :meth:`find_backlink_handles` for
+        each primary object.  Backends can override this method to read the
+        whole map at once.
+        """
+        for ref_class_name in CLASS_TO_KEY_MAP:
+            for ref_handle in self.method("iter_%s_handles", ref_class_name)():
+                for class_name, handle in self.find_backlink_handles(ref_handle):
+                    yield (class_name, handle, ref_class_name, ref_handle)
+
+    def iter_json_by_handle(self, class_name):
+        """
+        Return an iterator over the primary objects of a class, ordered by
+        handle, as (handle, json) tuples where json is the JSON text of the
+        object.  The handles are in the order in which Python compares them.
+
+        Equal objects read from the same kind of database give equal texts,
+        so they can be compared without decoding them.
+
+        This default implementation sorts the handles, then encodes each
+        object.  Backends can override this method to read the objects in
+        order, as stored.
+        """
+        get_object = self.method("get_%s_from_handle", class_name)
+        for handle in sorted(self.method("get_%s_handles", class_name)()):
+            yield (handle, json.dumps(to_dict(get_object(handle))))
+
+    def has_ancestor_index(self):
+        """
+        Return True if the backend keeps an index of the ancestors of all
+        people, so that :meth:`get_ancestors` and :meth:`get_descendants`
+        are lookups instead of walks through the families.
+        """
+        return False
+
+    def get_ancestors(self, handle, main_family_only=False):
+        """
+        Return the ancestors of a person, and the families in which the
+        person and the ancestors are children, as a dictionary of the number
+        of generations between the person and them, by handle.  The parents
+        and the parent families are one generation away.  The person is
+        only included if it is its own ancestor.
+
+        This default implementation walks through the families.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :param main_family_only: if True, only the main parent family of
+            each person is followed.
+        :type main_family_only: bool
+        :returns: dictionary of generations by handle.
+        :rtype: dict
+        """
+        ancestors = {}
+        done = {handle}
+        queue = deque([(handle, 0)])
+        while queue:
+            person_handle, generation = queue.popleft()
+            person = self._get_linked_person(person_handle)
+            if person is None:
+                continue
+            family_handles = person.get_parent_family_handle_list()
+            if main_family_only:
+                family_handles = family_handles[:1]
+            for family_handle in family_handles:
+                family = self._get_linked_family(family_handle)
+                if family is None:
+                    continue
+                ancestors.setdefault(family_handle, generation + 1)
+                for parent_handle in (
+                    family.get_father_handle(),
+                    family.get_mother_handle(),
+                ):
+                    if parent_handle and self._get_linked_person(parent_handle):
+                        ancestors.setdefault(parent_handle, generation + 1)
+                        if parent_handle not in done:
+                            done.add(parent_handle)
+                            queue.append((parent_handle, generation + 1))
+        return ancestors
+
+    def get_descendants(self, handle):
+        """
+        Return the descendants of a person, or of the children of a family,
+        as a dictionary of the number of generations between them, by
+        handle.  The children are one generation away.  The person is only
+        included if it is its own descendant.
+
+        This default implementation walks through the families.
+
+        :param handle: handle of the person or family.
+        :type handle: str
+        :returns: dictionary of generations by handle.
+        :rtype: dict
+        """
+        descendants = {}
+        done = {handle}
+        if self._get_linked_family(handle):
+            queue = deque([(None, 0, [handle])])
+        else:
+            queue = deque([(handle, 0, None)])
+        while queue:
+            person_handle, generation, family_handles = queue.popleft()
+            if family_handles is None:
+                person = self._get_linked_person(person_handle)
+                if person is None:
+                    continue
+                family_handles = person.get_family_handle_list()
+            for family_handle in family_handles:
+                family = self._get_linked_family(family_handle)
+                if family is None:
+                    continue
+                for child_ref in family.get_child_ref_list():
+                    if not self._get_linked_person(child_ref.ref):
+                        continue
+                    descendants.setdefault(child_ref.ref, generation + 1)
+                    if child_ref.ref not in done:
+                        done.add(child_ref.ref)
+                        queue.append((child_ref.ref, generation + 1, None))
+        return descendants
+
+    def may_have_common_ancestor(self, handle1, handle2):
+        """
+        Return False if two people certainly have no common ancestor or
+        ancestral family, and neither is an ancestor of the other.
+
+        This default implementation always returns True.  Backends with an
+        ancestor index answer from it.
+
+        :param handle1: handle of the first person.
+        :type handle1: str
+        :param handle2: handle of the second person.
+        :type handle2: str
+        :rtype: bool
+        """
+        return True
+
+    def _get_linked_person(self, handle):
+        """
+        Return a person, or None if it is not in the database.
+        """
+        try:
+            return self.get_person_from_handle(handle)
+        except HandleError:
+            return None
+
+    def _get_linked_family(self, handle):
+        """
+        Return a family, or None if it is not in the database.
+        """
+        try:
+            return self.get_family_from_handle(handle)
+        except HandleError:
+            return None
+
     def find_initial_person(self):
         """
         Returns first person in the database
@@ -1437,6 +1601,107 @@ class DbReadBase:
         """
         return False
 
+    def select_handles(self, class_name, condition, values):
+        """
+        Return a list of the handles of the primary objects of the given
+        class that satisfy an SQL condition on their table, or None if the
+        database does not support SQL conditions.
+
+        This is used by filters to narrow down the objects before the rules
+        are applied.  Backends that can evaluate such conditions override
+        this method.
+
+        :param class_name: name of the primary object class.
+        :type class_name: str
+        :param condition: SQL condition with ? placeholders.
+        :type condition: str
+        :param values: values of the placeholders.
+        :type values: list
+        :returns: list of handles or None.
+        :rtype: list
+        """
+        return None
+
+    def get_sort_keys(self, class_name, name, version, sort_func):
+        """
+        Return a sorted list of (sort key, handle) tuples, one for each
+        primary object of the given class.
+
+        The sort key of an object is sort_func(data), where data is the raw
+        data of the object.  Backends that can store the sort keys override
+        this method: they keep the keys under the given name, and update
+        them with sort_func when objects are committed, until
+        :meth:`release_sort_keys` is called.  The keys are computed again
+        when the version changes.  So sort_func must only depend on the
+        object, and on settings that are part of the version.
+
+        :param class_name: name of the primary object class.
+        :type class_name: str
+        :param name: name under which the sort keys are kept.
+        :type name: str
+        :param version: changes when sort_func returns other keys.
+        :type version: str
+        :param sort_func: function returning the sort key of raw data.
+        :type sort_func: callable
+        :returns: list of (sort key, handle) tuples.
+        :rtype: list
+        """
+        with self.method("get_%s_cursor", class_name)() as cursor:
+            sort_keys = [(sort_func(data), handle) for handle, data in cursor]
+        sort_keys.sort()
+        return sort_keys
+
+    def prepare_sort_keys(self, class_name, name, version, sort_func):
+        """
+        Store the sort keys of the primary objects of the given class under
+        the given name, if the backend can store them.  See
+        :meth:`get_sort_keys`.
+
+        Return True if the keys are stored, so that
+        :meth:`get_sort_key_values` and :meth:`get_sort_key_handles` read
+        them without going through all the objects.  The default
+        implementation returns False.
+
+        :returns: True if the sort keys are stored.
+        :rtype: bool
+        """
+        return False
+
+    def get_sort_key_values(self, class_name, name, version, sort_func):
+        """
+        Return the sorted list of the distinct sort keys of the primary
+        objects of the given class.  See :meth:`get_sort_keys`.
+
+        :returns: list of sort keys.
+        :rtype: list
+        """
+        sort_keys = DbReadBase.get_sort_keys(self, class_name, name, version, sort_func)
+        return sorted({sort_key for sort_key, handle in sort_keys})
+
+    def get_sort_key_handles(self, class_name, name, version, sort_func, sort_key):
+        """
+        Return the handles of the primary objects of the given class whose
+        sort key is sort_key.  See :meth:`get_sort_keys`.
+
+        :param sort_key: the sort key of the objects.
+        :type sort_key: str
+        :returns: list of handles.
+        :rtype: list
+        """
+        sort_keys = DbReadBase.get_sort_keys(self, class_name, name, version, sort_func)
+        return [handle for key, handle in sort_keys if key == sort_key]
+
+    def release_sort_keys(self, name, sort_func):
+        """
+        Stop updating the sort keys kept under the given name with
+        sort_func.  They are dropped when an object of their class changes.
+
+        :param name: name under which the sort keys are kept.
+        :type name: str
+        :param sort_func: function given to :meth:`get_sort_keys`.
+        :type sort_func: callable
+        """
+
     def method(self, fmt, *args):
         """
         Convenience function to return database methods.
@@ -1580,6 +1845,30 @@ class DbWriteBase(DbReadBase):
         """
         raise NotImplementedError
 
+    def bulk_load_begin(self, count=None):
+        """
+        Prepare the database for loading a large number of objects in a batch
+        transaction.  Backends may suspend the maintenance of secondary
+        indexes until :meth:`bulk_load_end` is called.  Must be called
+        outside of a transaction.
+
+        The default implementation does nothing.
+
+        :param count: approximate number of objects to load, or None if it
+                      is unknown.  Backends may ignore the request when the
+                      load is small compared with the database.
+        :type count: int
+        """
+
+    def bulk_load_end(self, callback=None):
+        """
+        Finish a bulk load started with :meth:`bulk_load_begin`, rebuilding
+        anything that was not maintained during the load.  Must be called
+        outside of a transaction.
+
+        The default implementation does nothing.
+        """
+
     def commit_citation(self, citation, transaction, change_time=None):
         """
         Commit the specified Event to the database, storing the changes as
@@ -35,7 +35,9 @@ import os
 import pickle
 import random
 import re
+import sqlite3
 import time
+from itertools import islice
 from pathlib import Path
 
 # ------------------------------------------------------------------------
@@ -43,6 +45,7 @@ from pathlib import Path
 # Gramps modules
 #
 # ------------------------------------------------------------------------
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 from ..errors import HandleError
 from ..lib import (
@@ -64,6 +67,7 @@ from ..lib.researcher import Researcher
 from ..updatecallback import UpdateCallback
 from ..utils.callback import Callback
 from ..utils.id import create_id
+from ..utils.lru import LRU
 from . import (
     CITATION_KEY,
     DBLOGNAME,
@@ -119,50 +123,124 @@ SIGBASE = (
 class DbGenericUndo(DbUndo):
     """
     Generic undo/redo handler
+
+    The most recent records are kept in memory.  When there are more than
+    the number given by the "database.undo-window" preference, the oldest
+    ones are moved to an SQLite database in the undo log file of the
+    database, or in a temporary file, and are read back when they are needed.
     """
 
     def __init__(self, grampsdb, path):
         super().__init__(grampsdb)
-        self.undodb = []
+        self.path = path
+        self.window = config.get("database.undo-window")
+        self.undodb = {}
+        self.count = 0
+        self.storage = None
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the backing storage.  The storage is created when the first
+        records are moved out of memory.
         """
+        self.undodb = {}
+        self.count = 0
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close and remove the backing storage.
+        """
+        self.undodb = {}
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
+            if self.path:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+    def _open_storage(self):
+        """
+        Create the backing storage, replacing the one left behind by a
+        session that was not closed.  An empty path gives a temporary file
+        which is removed when it is closed.
+        """
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+        self.storage = sqlite3.connect(self.path or "")
+        self.storage.execute("PRAGMA journal_mode = OFF")
+        self.storage.execute("PRAGMA synchronous = OFF")
+        self.storage.execute(
+            "CREATE TABLE undo (recno INTEGER PRIMARY KEY, data BLOB NOT NULL)"
+        )
+
+    def _spill(self):
         """
+        Move the oldest records to the backing storage, keeping half of the
+        window in memory.
+        """
+        if self.storage is None:
+            self._open_storage()
+        recnos = list(islice(self.undodb, len(self.undodb) - self.window // 2))
+        self.storage.executemany(
+            "INSERT INTO undo (recno, data) VALUES (?, ?)",
+            [(recno, self.undodb.pop(recno)) for recno in recnos],
+        )
+        self.storage.commit()
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new entry on the end, and return its index.
         """
-        self.undodb.append(value)
+        recno = self.count
+        self.undodb[recno] = value
+        self.count += 1
+        if self.window > 0 and len(self.undodb) > self.window:
+            self._spill()
+        return recno
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
+        Returns an entry by index number.
         """
-        return self.undodb[index]
+        if index < 0:
+            index += self.count
+        try:
+            return self.undodb[index]
+        except KeyError:
+            pass
+        if self.storage is not None:
+            row = self.storage.execute(
+                "SELECT data FROM undo WHERE recno = ?", [index]
+            ).fetchone()
+            if row:
+                return row[0]
+        raise IndexError(index)
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
-        """
-        self.undodb[index] = value
+        Set an entry to a value.
+        """
+        if index < 0:
+            index += self.count
+        if index in self.undodb:
+            self.undodb[index] = value
+        elif (
+            self.storage is not None
+            and self.storage.execute(
+                "UPDATE undo SET data = ? WHERE recno = ?", [value, index]
+            ).rowcount
+        ):
+            self.storage.commit()
+        else:
+            raise IndexError(index)
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries.
         """
-        return len(self.undodb)
+        return self.count
 
     def _redo(self, update_history):
         """
@@ -181,9 +259,7 @@ class DbGenericUndo(DbUndo):
         try:
             self.db._txn_begin()
             for record_id in subitems:
-                (key, trans_type, handle, _, new_data) = pickle.loads(
-                    self.undodb[record_id]
-                )
+                (key, trans_type, handle, _, new_data) = pickle.loads(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(new_data, handle)
@@ -230,9 +306,7 @@ class DbGenericUndo(DbUndo):
         try:
             self.db._txn_begin()
             for record_id in subitems:
-                (key, trans_type, handle, old_data, x) = pickle.loads(
-                    self.undodb[record_id]
-                )
+                (key, trans_type, handle, old_data, x) = pickle.loads(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(old_data, handle)
@@ -614,6 +688,10 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.surname_list = []
         self.genderStats = GenderStats()  # can pass in loaded stats as dict
         self.owner = Researcher()
+        # Cache of raw data keyed on (obj_key, handle):
+        self._data_cache = LRU(config.get("database.cache-size"))
+        self._cache_hits = 0
+        self._cache_misses = 0
         if directory:
             self.load(directory)
 
@@ -855,6 +933,9 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
+        self._clear_cache()
         self.db_is_open = False
         self._directory = None
 
@@ -1385,12 +1466,74 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             raise HandleError("Handle is None")
         if not handle:
             raise HandleError("Handle is empty")
-        data = self._get_raw_data(obj_key, handle)
+        data = self._get_cached_raw_data(obj_key, handle)
         if data:
             return self.serializer.data_to_object(obj_class, data)
 
         raise HandleError(f"Handle {handle} not found")
 
+    ################################################################
+    #
+    # Object cache methods
+    #
+    ################################################################
+
+    def _get_cached_raw_data(self, obj_key, handle):
+        """
+        Return raw data from the cache, reading it from the database on a
+        miss.
+
+        Only JSON data is cached, since it is never modified when converted
+        into an object.
+        """
+        key = (obj_key, handle)
+        if key in self._data_cache:
+            self._cache_hits += 1
+            data = self._data_cache[key]
+            # Move the entry to the most recently used position
+            self._data_cache[key] = data
+            return data
+        self._cache_misses += 1
+        data = self._get_raw_data(obj_key, handle)
+        if data and self.serializer is JSONSerializer:
+            self._data_cache[key] = data
+        return data
+
+    def _invalidate_cache(self, obj_key, handle):
+        """
+        Remove an object from the cache.  Must be called whenever the stored
+        data of an object is changed or removed.
+        """
+        key = (obj_key, handle)
+        if key in self._data_cache:
+            del self._data_cache[key]
+
+    def _clear_cache(self):
+        """
+        Remove all objects from the cache.
+        """
+        self._data_cache.clear()
+
+    def set_cache_size(self, size):
+        """
+        Set the maximum number of objects held in the cache.  A size of 0 or
+        1 disables the cache.
+        """
+        self._data_cache.clear()
+        self._data_cache = LRU(size)
+
+    def get_cache_statistics(self):
+        """
+        Return a dictionary with the number of cache hits and misses, and the
+        current and maximum number of cached objects.
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._data_cache.data),
+            "max_size": self._data_cache.count,
+        }
+
     def get_event_from_handle(self, handle):
         return self._get_from_handle(EVENT_KEY, Event, handle)
 
@@ -2739,3 +2882,4 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             self.serializer = BlobSerializer
         elif serializer_name == "json":
             self.serializer = JSONSerializer
+        self._clear_cache()
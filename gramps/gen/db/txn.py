@@ -192,7 +192,10 @@ class DbTxn(defaultdict):
         data is the tuple returned by the object's serialize method.
         """
         self.last = self.commitdb.append(
-            pickle.dumps((obj_type, trans_type, handle, old_data, new_data), 1)
+            pickle.dumps(
+                (obj_type, trans_type, handle, old_data, new_data),
+                pickle.HIGHEST_PROTOCOL,
+            )
         )
         if self.last is None:
             self.last = len(self.commitdb) - 1
@@ -101,6 +101,9 @@ _F_RAWFN = 4  # name format raw function
 
 PAT_AS_SURN = False
 
+# Number of formatted names kept by a NameDisplay
+_CACHE_SIZE = 50000
+
 
 # -------------------------------------------------------------------------
 #
@@ -338,6 +341,62 @@ def cleanup_name(namestring):
     return result
 
 
+def _name_key(name):
+    """
+    Return a key of the parts of a :class:`~.name.Name` used by the name
+    formats, under which its formatted strings are cached.
+    """
+    return (
+        name.first_name,
+        tuple(
+            [
+                (
+                    surn.surname,
+                    surn.prefix,
+                    surn.primary,
+                    surn.origintype.value,
+                    surn.origintype.string,
+                    surn.connector,
+                )
+                for surn in name.surname_list
+            ]
+        ),
+        name.suffix,
+        name.title,
+        name.call,
+        name.nick,
+        name.famnick,
+    )
+
+
+def _raw_name_key(raw_data):
+    """
+    Return a key of the parts of raw name data used by the name formats,
+    under which its formatted strings are cached.
+    """
+    return (
+        raw_data["first_name"],
+        tuple(
+            [
+                (
+                    surn["surname"],
+                    surn["prefix"],
+                    surn["primary"],
+                    surn["origintype"]["value"],
+                    surn["origintype"]["string"],
+                    surn["connector"],
+                )
+                for surn in raw_data["surname_list"]
+            ]
+        ),
+        raw_data["suffix"],
+        raw_data["title"],
+        raw_data["call"],
+        raw_data["nick"],
+        raw_data["famnick"],
+    )
+
+
 def __format_raw_surname(raw_surn_data):
     """
     Return a formatted string representing one surname part.
@@ -410,6 +469,9 @@ class NameDisplay:
         self.LNFN_STR = "%s" + COMMAGLYPH + " %s %s"
 
         self.name_formats = {}
+        # The formatted names, by format number and name key
+        self._cache = {}
+        self._raw_cache = {}
 
         if WITH_GRAMPS_CONFIG:
             self.default_format = config.get("preferences.name-format")
@@ -432,6 +494,7 @@ class NameDisplay:
         """How to handle single patronymic as surname is changed"""
         global PAT_AS_SURN
         PAT_AS_SURN = config.get("preferences.patronimic-surname")
+        self.clear_cache()
 
     def get_pat_as_surn(self):
         global PAT_AS_SURN
@@ -463,10 +526,50 @@ class NameDisplay:
         result = raw_data["first_name"]
         return " ".join(result.split())
 
+    def clear_cache(self):
+        """
+        Forget the formatted names.  Called when the name formats change.
+        """
+        self._cache.clear()
+        self._raw_cache.clear()
+
+    def _format_name(self, num, name):
+        """
+        Return a :class:`~.name.Name` formatted with format num, from the
+        cache if it was already formatted.
+        """
+        key = (num, _name_key(name))
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        result = self.name_formats[num][_F_FN](name)
+        if len(self._cache) >= _CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
+
+    def _format_raw_name(self, num, raw_data):
+        """
+        Return raw name data formatted with format num, from the cache if it
+        was already formatted.
+        """
+        key = (num, _raw_name_key(raw_data))
+        try:
+            return self._raw_cache[key]
+        except KeyError:
+            pass
+        result = self.name_formats[num][_F_RAWFN](raw_data)
+        if len(self._raw_cache) >= _CACHE_SIZE:
+            self._raw_cache.clear()
+        self._raw_cache[key] = result
+        return result
+
     def clear_custom_formats(self):
         self.name_formats = {
             num: value for num, value in self.name_formats.items() if num >= 0
         }
+        self.clear_cache()
 
     def set_name_format(self, formats):
         raw_func_dict = {
@@ -479,6 +582,7 @@ class NameDisplay:
             func = self._format_fn(fmt_str)
             func_raw = raw_func_dict.get(num, self._format_raw_fn(fmt_str))
             self.name_formats[num] = (name, fmt_str, act, func, func_raw)
+        self.clear_cache()
         self.set_default_format(self.get_default_format())
 
     def add_name_format(self, name, fmt_str):
@@ -501,6 +605,7 @@ class NameDisplay:
             del self.name_formats[num]
         except:
             pass
+        self.clear_cache()
 
     def set_default_format(self, num):
         if num not in self.name_formats:
@@ -519,6 +624,7 @@ class NameDisplay:
             self.name_formats[num][_F_FN],
             self.name_formats[num][_F_RAWFN],
         )
+        self.clear_cache()
 
     def get_default_format(self):
         return self.default_format
@@ -534,6 +640,7 @@ class NameDisplay:
             )
         except:
             pass
+        self.clear_cache()
 
     def get_name_format(self, also_default=False, only_custom=False, only_active=True):
         """
@@ -976,7 +1083,7 @@ class NameDisplay:
         :rtype: str
         """
         num = self._is_format_valid(name.sort_as)
-        return self.name_formats[num][_F_FN](name)
+        return self._format_name(num, name)
 
     def truncate(self, full_name, max_length=15, elipsis="..."):
         name_out = ""
@@ -1002,7 +1109,7 @@ class NameDisplay:
         :rtype: str
         """
         num = self._is_format_valid(raw_data["sort_as"])
-        return self.name_formats[num][_F_RAWFN](raw_data)
+        return self._format_raw_name(num, raw_data)
 
     def display(self, person):
         """
@@ -1036,7 +1143,7 @@ class NameDisplay:
         @rtype: str
         """
         name = person.get_primary_name()
-        return self.name_formats[num][_F_FN](name)
+        return self._format_name(num, name)
 
     def display_formal(self, person):
         """
@@ -1069,7 +1176,7 @@ class NameDisplay:
             return ""
 
         num = self._is_format_valid(name.display_as)
-        return self.name_formats[num][_F_FN](name)
+        return self._format_name(num, name)
 
     def raw_display_name(self, raw_data):
         """
@@ -1082,7 +1189,32 @@ class NameDisplay:
         :rtype: str
         """
         num = self._is_format_valid(raw_data["display_as"])
-        return self.name_formats[num][_F_RAWFN](raw_data)
+        return self._format_raw_name(num, raw_data)
+
+    def display_many(self, raw_names, sort=False):
+        """
+        Return the text strings representing many :class:`~.name.Name`
+        instances, in the order of raw_names.  This gives the same strings
+        as calling :meth:`raw_display_name`, or :meth:`raw_sorted_name` if
+        sort is True, for each name, with less overhead.
+
+        :param raw_names: raw unserialized data of the names to display.
+        :type raw_names: iterable
+        :param sort: if True, use the format for sorting the names.
+        :type sort: bool
+        :returns: Returns the string representations of the names
+        :rtype: list
+        """
+        field = "sort_as" if sort else "display_as"
+        # The format of each number is only checked once
+        formats = {}
+        result = []
+        for raw_data in raw_names:
+            num = raw_data[field]
+            if num not in formats:
+                formats[num] = self._is_format_valid(num)
+            result.append(self._format_raw_name(formats[num], raw_data))
+        return result
 
     def display_given(self, person):
         return self.format_str(person.get_primary_name(), "%f")
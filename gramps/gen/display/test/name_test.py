@@ -21,7 +21,8 @@
 import unittest
 
 from gramps.gen.display.name import NameDisplay
-from gramps.gen.lib import Name
+from gramps.gen.lib import Name, Surname
+from gramps.gen.lib.serialize import to_dict
 
 
 class NameTest(unittest.TestCase):
@@ -281,6 +282,44 @@ class NameTest(unittest.TestCase):
     def test_display_no_name(self):
         self.assertEqual("", self.name_display.display_name(None))
 
+    def test_display_name_after_format_change(self):
+        name = Name()
+        name.set_first_name("William")
+        name.set_display_as(self.add_custom_name_format("%f."))
+        self.assertEqual("William.", self.name_display.display_name(name))
+
+        self.name_display.edit_name_format(name.display_as, "%f!", "%f!")
+        self.assertEqual("William!", self.name_display.display_name(name))
+        name.set_first_name("Will")
+        self.assertEqual("Will!", self.name_display.display_name(name))
+
+    def test_display_many(self):
+        names = []
+        for first_name, surname, display_as in [
+            ("William", "Smith", 0),
+            ("Mary", "Jones", 2),
+            ("John", "", 4),
+            ("William", "Smith", 2),
+        ]:
+            name = Name()
+            name.set_first_name(first_name)
+            name.set_display_as(display_as)
+            name.set_sort_as(display_as)
+            name_surname = Surname()
+            name_surname.set_surname(surname)
+            name.set_primary_surname(0)
+            name.add_surname(name_surname)
+            names.append(to_dict(name))
+
+        self.assertEqual(
+            ["Smith, William", "Mary Jones", "John", "William Smith"],
+            self.name_display.display_many(names),
+        )
+        self.assertEqual(
+            [self.name_display.raw_sorted_name(name) for name in names],
+            self.name_display.display_many(names, sort=True),
+        )
+
     def add_custom_name_format(self, name_format):
         return self.name_display.add_name_format(name_format, name_format)
 
@@ -24,6 +24,14 @@
 Package providing filtering framework for Gramps.
 """
 
+# ------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# ------------------------------------------------------------------------
+import logging
+import time
+
 # ------------------------------------------------------------------------
 #
 # Gramps imports
@@ -40,10 +48,32 @@ from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
 from ..lib.serialize import from_dict
+from ..proxy.proxybase import ProxyDbBase
 from ..const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 
+LOG = logging.getLogger(".filter")
+
+# The largest list of handles that the SQL query of a filter is limited to.
+# Longer lists are matched against the result of the query on the table.
+MAX_SQL_HANDLES = 500
+
+
+def _timed(rule, apply):
+    """
+    Return a function which calls apply and adds the time spent and the
+    result to the statistics of the rule.
+    """
+
+    def timed_apply(db, obj):
+        start = time.perf_counter()
+        result = apply(db, obj)
+        rule.add_statistics(result, time.perf_counter() - start)
+        return result
+
+    return timed_apply
+
 
 # -------------------------------------------------------------------------
 #
@@ -54,6 +84,10 @@ class GenericFilter:
     """Filter class that consists of several rules."""
 
     logical_functions = ["or", "and", "xor", "one"]
+    # The result of these does not depend on the order of the rules, and
+    # the cheapest and most decisive rules are applied first.  All rules
+    # are applied for "xor", so the order does not matter.
+    planned_functions = ["or", "and", "one"]
 
     def __init__(self, source=None):
         if source:
@@ -63,6 +97,7 @@ class GenericFilter:
             self.comment = source.comment
             self.logical_op = source.logical_op
             self.invert = source.invert
+            self.timing = source.timing
         else:
             self.need_param = 0
             self.flist = []
@@ -70,6 +105,7 @@ class GenericFilter:
             self.comment = ""
             self.logical_op = "and"
             self.invert = False
+            self.timing = False
 
     def match(self, handle, db):
         """
@@ -100,6 +136,27 @@ class GenericFilter:
     def get_invert(self):
         return self.invert
 
+    def set_timing(self, val):
+        """
+        Set whether the time spent in each rule is measured.  Timing is also
+        enabled when debugging of the ".filter" logger is enabled.
+        """
+        self.timing = bool(val)
+
+    def get_timing(self):
+        return self.timing or LOG.isEnabledFor(logging.DEBUG)
+
+    def get_statistics(self):
+        """
+        Return a list of tuples of the rules, the number of times they were
+        applied, the number of matches and the seconds spent in them.
+        """
+        return [(rule,) + rule.get_statistics() for rule in self.flist]
+
+    def reset_statistics(self):
+        for rule in self.flist:
+            rule.reset_statistics()
+
     def get_name(self, ulocale=glocale):
         return self.name
 
@@ -136,20 +193,77 @@ class GenericFilter:
     def find_from_handle(self, db, handle):
         return db.get_person_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_person_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_people()
 
+    def can_apply_to_data(self, db):
+        """
+        Return True if all rules can be applied to the raw data of the
+        objects, so that no objects need to be created.
+
+        Proxy databases return their raw data in another format.
+        """
+        return not isinstance(db, ProxyDbBase) and all(
+            rule.can_apply_to_data() for rule in self.flist
+        )
+
+    def get_planned_rules(self):
+        """
+        Return the rules in the order in which they are applied.
+
+        For "and" the rules which are cheap and match few objects come first,
+        for "or" and "one" those which are cheap and match many objects.  The
+        measured time and matches are used if all rules have been timed,
+        otherwise the cost and selectivity declared by the rules.
+        """
+        if self.logical_op not in self.planned_functions or len(self.flist) < 2:
+            return self.flist
+        measured = all(rule.nrcalls for rule in self.flist)
+
+        def rank(rule):
+            if measured:
+                cost = rule.elapsed / rule.nrcalls
+                selectivity = rule.nrmatches / rule.nrcalls
+            else:
+                cost = rule.cost
+                selectivity = rule.selectivity
+            selectivity = min(max(selectivity, 0.01), 0.99)
+            if self.logical_op == "and":
+                return cost / (1 - selectivity)
+            return cost / selectivity
+
+        return sorted(self.flist, key=rank)
+
+    def get_apply_funcs(self, use_data):
+        """
+        Return the methods used to apply the rules to the objects or to their
+        raw data, in the planned order.
+        """
+        rules = self.get_planned_rules()
+        if use_data:
+            funcs = [rule.apply_to_data for rule in rules]
+        else:
+            funcs = [rule.apply for rule in rules]
+        if self.get_timing():
+            return [_timed(rule, func) for rule, func in zip(rules, funcs)]
+        return funcs
+
     def check_func(self, db, id_list, task, user=None, tupleind=None, tree=False):
         final_list = []
+        use_data = self.can_apply_to_data(db)
+        apply_funcs = self.get_apply_funcs(use_data)
         if user:
             user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
         if id_list is None:
             with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
                 for handle, data in cursor:
-                    person = from_dict(data)
+                    obj = data if use_data else from_dict(data)
                     if user:
                         user.step_progress()
-                    if task(db, person) != self.invert:
+                    if task(db, obj, apply_funcs) != self.invert:
                         final_list.append(handle)
         else:
             for data in id_list:
@@ -157,10 +271,13 @@ class GenericFilter:
                     handle = data
                 else:
                     handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+                if use_data:
+                    obj = self.find_data_from_handle(db, handle)
+                else:
+                    obj = self.find_from_handle(db, handle)
                 if user:
                     user.step_progress()
-                if task(db, person) != self.invert:
+                if task(db, obj, apply_funcs) != self.invert:
                     final_list.append(data)
         if user:
             user.end_progress()
@@ -168,16 +285,17 @@ class GenericFilter:
 
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
         final_list = []
-        flist = self.flist
+        use_data = self.can_apply_to_data(db)
+        apply_funcs = self.get_apply_funcs(use_data)
         if user:
             user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
         if id_list is None:
             with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
                 for handle, data in cursor:
-                    person = from_dict(data)
+                    obj = data if use_data else from_dict(data)
                     if user:
                         user.step_progress()
-                    val = all(rule.apply(db, person) for rule in flist)
+                    val = all(apply(db, obj) for apply in apply_funcs)
                     if val != self.invert:
                         final_list.append(handle)
         else:
@@ -186,10 +304,13 @@ class GenericFilter:
                     handle = data
                 else:
                     handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+                if use_data:
+                    obj = self.find_data_from_handle(db, handle)
+                else:
+                    obj = self.find_from_handle(db, handle)
                 if user:
                     user.step_progress()
-                val = all(rule.apply(db, person) for rule in flist if person)
+                val = all(apply(db, obj) for apply in apply_funcs if obj)
                 if val != self.invert:
                     final_list.append(data)
         if user:
@@ -205,23 +326,23 @@ class GenericFilter:
     def check_xor(self, db, id_list, user=None, tupleind=None, tree=False):
         return self.check_func(db, id_list, self.xor_test, user, tupleind, tree=False)
 
-    def xor_test(self, db, person):
+    def xor_test(self, db, obj, apply_funcs):
         test = False
-        for rule in self.flist:
-            test = test ^ rule.apply(db, person)
+        for apply in apply_funcs:
+            test = test ^ apply(db, obj)
         return test
 
-    def one_test(self, db, person):
+    def one_test(self, db, obj, apply_funcs):
         found_one = False
-        for rule in self.flist:
-            if rule.apply(db, person):
+        for apply in apply_funcs:
+            if apply(db, obj):
                 if found_one:
                     return False  # There can be only one!
                 found_one = True
         return found_one
 
-    def or_test(self, db, person):
-        return any(rule.apply(db, person) for rule in self.flist)
+    def or_test(self, db, obj, apply_funcs):
+        return any(apply(db, obj) for apply in apply_funcs)
 
     def get_check_func(self):
         try:
@@ -233,6 +354,46 @@ class GenericFilter:
     def check(self, db, handle):
         return self.get_check_func()(db, [handle])
 
+    def select_handles(self, db, handles=None):
+        """
+        Query the database for the objects that may match the filter, using
+        the rules that can be expressed in SQL.
+
+        If handles is given, and is not longer than MAX_SQL_HANDLES, only
+        the objects with these handles are queried.
+
+        Returns a tuple of the list of handles, or None if the database
+        cannot be queried, and a flag that is True if all rules were used,
+        so that the handles are exactly the matches of the filter.
+        """
+        if self.invert or self.logical_op not in ("and", "or"):
+            return None, False
+        conditions = []
+        values = []
+        for rule in self.flist:
+            sql = rule.get_sql()
+            if sql is None:
+                if self.logical_op == "or":
+                    return None, False
+                continue
+            conditions.append("(%s)" % sql[0])
+            values.extend(sql[1])
+        if not conditions:
+            return None, False
+        operator = " %s " % self.logical_op.upper()
+        condition = operator.join(conditions)
+        if handles is not None and len(handles) <= MAX_SQL_HANDLES:
+            if not handles:
+                return [], len(conditions) == len(self.flist)
+            condition = "handle IN (%s) AND (%s)" % (
+                ", ".join("?" * len(handles)),
+                condition,
+            )
+            values = list(handles) + values
+        class_name = self.make_obj().__class__.__name__
+        handles = db.select_handles(class_name, condition, values)
+        return handles, len(conditions) == len(self.flist)
+
     def apply(self, db, id_list=None, tupleind=None, user=None, tree=False):
         """
         Apply the filter using db.
@@ -253,9 +414,43 @@ class GenericFilter:
         m = self.get_check_func()
         for rule in self.flist:
             rule.requestprepare(db, user)
-        res = m(db, id_list, user, tupleind, tree)
+        # The tree cursor defines the order of the results
+        if tree:
+            handles, complete = None, False
+        elif id_list is None:
+            handles, complete = self.select_handles(db)
+        else:
+            # id_list may be an iterator, and is read again below
+            id_list = list(id_list)
+            handles, complete = self.select_handles(
+                db,
+                [data if tupleind is None else data[tupleind] for data in id_list],
+            )
+        if handles is None:
+            res = m(db, id_list, user, tupleind, tree)
+        else:
+            # Narrow down the objects that the rules are applied to
+            if id_list is None:
+                id_list = handles
+            else:
+                handles = set(handles)
+                id_list = [
+                    data
+                    for data in id_list
+                    if (data if tupleind is None else data[tupleind]) in handles
+                ]
+            res = id_list if complete else m(db, id_list, user, tupleind, tree)
         for rule in self.flist:
             rule.requestreset()
+        if LOG.isEnabledFor(logging.DEBUG):
+            for rule, calls, matches, elapsed in self.get_statistics():
+                LOG.debug(
+                    "%s: %d calls, %d matches, %.3f seconds",
+                    rule.__class__.__name__,
+                    calls,
+                    matches,
+                    elapsed,
+                )
         return res
 
 
@@ -272,6 +467,9 @@ class GenericFamilyFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_family_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_family_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_families()
 
@@ -289,6 +487,9 @@ class GenericEventFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_event_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_event_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_events()
 
@@ -306,6 +507,9 @@ class GenericSourceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_source_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_source_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_sources()
 
@@ -326,6 +530,9 @@ class GenericCitationFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_citation_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_citation_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_citations()
 
@@ -346,6 +553,9 @@ class GenericPlaceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_place_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_place_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_places()
 
@@ -363,6 +573,9 @@ class GenericMediaFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_media_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_media_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_media()
 
@@ -380,6 +593,9 @@ class GenericRepoFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_repository_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_repository_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_repositories()
 
@@ -397,6 +613,9 @@ class GenericNoteFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_note_from_handle(handle)
 
+    def find_data_from_handle(self, db, handle):
+        return db.get_raw_note_data(handle)
+
     def get_number(self, db):
         return db.get_number_of_notes()
 
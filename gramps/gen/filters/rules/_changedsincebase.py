@@ -102,7 +102,12 @@ class ChangedSinceBase(Rule):
             self.before = self.time_str_to_sec(self.list[1])
 
     def apply(self, db, obj):
-        obj_time = obj.get_change_time()
+        return self.match_time(obj.get_change_time())
+
+    def apply_to_data(self, db, data):
+        return self.match_time(data["change"])
+
+    def match_time(self, obj_time):
         if self.since:
             if obj_time < self.since:
                 return False
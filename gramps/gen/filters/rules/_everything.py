@@ -46,9 +46,13 @@ class Everything(Rule):
     name = "Every object"
     category = _("General filters")
     description = "Matches every object in the database"
+    selectivity = 1
 
     def is_empty(self):
         return True
 
     def apply(self, db, obj):
         return True
+
+    def apply_to_data(self, db, data):
+        return True
@@ -48,6 +48,7 @@ class HasGrampsId(Rule):
     name = "Object with <Id>"
     description = "Matches objects with a specified Gramps ID"
     category = _("General filters")
+    selectivity = 0.01
 
     def apply(self, db, obj):
         """
@@ -55,3 +56,15 @@ class HasGrampsId(Rule):
         return true if the rule passes, false otherwise.
         """
         return obj.gramps_id == self.list[0]
+
+    def apply_to_data(self, db, data):
+        return data["gramps_id"] == self.list[0]
+
+    def get_sql(self):
+        """
+        Select the object with the Gramps ID.
+        """
+        # Subclasses may apply the rule to another object
+        if type(self).apply is not HasGrampsId.apply:
+            return None
+        return "gramps_id = ?", [self.list[0]]
@@ -70,7 +70,12 @@ class HasNoteBase(Rule):
         self.userSelectedCount = int(self.list[0])
 
     def apply(self, db, obj):
-        count = len(obj.get_note_list())
+        return self.match_count(len(obj.get_note_list()))
+
+    def apply_to_data(self, db, data):
+        return self.match_count(len(data["note_list"]))
+
+    def match_count(self, count):
         if self.count_type == 0:  # "less than"
             return count < self.userSelectedCount
         elif self.count_type == 2:  # "greater than"
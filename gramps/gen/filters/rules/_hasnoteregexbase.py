@@ -50,6 +50,7 @@ class HasNoteRegexBase(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    cost = 10
 
     def apply(self, db, person):
         for handle in person.get_note_list():
@@ -45,6 +45,7 @@ class HasNoteSubstrBase(Rule):
     name = "Objects having notes containing <substring>"
     description = "Matches objects whose notes contain text matching a " "substring"
     category = _("General filters")
+    cost = 10
 
     def apply(self, db, person):
         notelist = person.get_note_list()
@@ -45,6 +45,7 @@ class HasReferenceCountBase(Rule):
     name = "Objects with a reference count of <count>"
     description = "Matches objects with a certain reference count"
     category = _("General filters")
+    cost = 10
 
     def prepare(self, db, user):
         # things we want to do just once, not for every handle
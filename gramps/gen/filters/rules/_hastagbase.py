@@ -52,6 +52,7 @@ class HasTagBase(Rule):
     name = "Objects with the <tag>"
     description = "Matches objects with the given tag"
     category = _("General filters")
+    selectivity = 0.1
 
     def prepare(self, db, user):
         """
@@ -69,3 +70,22 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.get_tag_list()
+
+    def apply_to_data(self, db, data):
+        if self.tag_handle is None:
+            return False
+        return self.tag_handle in data["tag_list"]
+
+    def get_sql(self):
+        """
+        Select the objects with the tag from the reference map.
+        """
+        # Subclasses may apply the rule to another object
+        if type(self).apply is not HasTagBase.apply:
+            return None
+        if self.tag_handle is None:
+            return "0", []
+        return (
+            "handle IN (SELECT obj_handle FROM reference WHERE ref_handle = ?)",
+            [self.tag_handle],
+        )
@@ -45,6 +45,7 @@ class HasTextMatchingSubstringOf(Rule):
     name = "Objects with records containing <substring>"
     description = "Matches objects whose records contain text " "matching a substring"
     category = _("General filters")
+    cost = 100
 
     # FIXME: This needs to be written for an arbitrary object
     # if possible
@@ -42,6 +42,10 @@ class IsPrivate(Rule):
     name = "Objects marked private"
     description = "Matches objects that are indicated as private"
     category = _("General filters")
+    selectivity = 0.1
 
     def apply(self, db, obj):
         return obj.get_privacy()
+
+    def apply_to_data(self, db, data):
+        return data["private"]
@@ -42,3 +42,6 @@ class IsPublic(Rule):
 
     def apply(self, db, obj):
         return not obj.get_privacy()
+
+    def apply_to_data(self, db, data):
+        return not data["private"]
@@ -59,8 +59,15 @@ class MatchesFilterBase(Rule):
     name = "Objects matching the <filter>"
     description = "Matches objects matched by the specified filter name"
     category = _("General filters")
+    # the other filter may contain any rule
+    cost = 100
+
+    def __init__(self, arg, use_regex=False, use_case=False):
+        Rule.__init__(self, arg, use_regex, use_case)
+        self.filter_cache = {}
 
     def prepare(self, db, user):
+        self.filter_cache = {}
         if gramps.gen.filters.CustomFilters:
             filters = gramps.gen.filters.CustomFilters.get_filters_dict(self.namespace)
             if self.list[0] in filters:
@@ -78,6 +85,7 @@ class MatchesFilterBase(Rule):
             )
 
     def reset(self):
+        self.filter_cache = {}
         if gramps.gen.filters.CustomFilters:
             filters = gramps.gen.filters.CustomFilters.get_filters_dict(self.namespace)
             if self.list[0] in filters:
@@ -86,13 +94,34 @@ class MatchesFilterBase(Rule):
                     rule.requestreset()
 
     def apply(self, db, obj):
+        return self.match_handle(db, obj.handle)
+
+    def apply_to_data(self, db, data):
+        return self.match_handle(db, data["handle"])
+
+    def match_handle(self, db, handle):
+        """
+        Return True if the object with the given handle matches the filter.
+        """
         if gramps.gen.filters.CustomFilters:
             filters = gramps.gen.filters.CustomFilters.get_filters_dict(self.namespace)
             if self.list[0] in filters:
-                filt = filters[self.list[0]]
-                return filt.check(db, obj.handle)
+                return self.check_filter(db, filters[self.list[0]], handle)
         return False
 
+    def check_filter(self, db, filt, handle):
+        """
+        Return True if the object with the given handle matches filt.
+
+        The result is remembered until the rule is reset, as the same objects
+        are often checked many times while the filter is applied.
+        """
+        try:
+            return self.filter_cache[handle]
+        except KeyError:
+            result = self.filter_cache[handle] = bool(filt.check(db, handle))
+            return result
+
     def find_filter(self):
         """
         Return the selected filter or None.
@@ -55,6 +55,22 @@ class RegExpIdBase(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    selectivity = 0.1
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def apply_to_data(self, db, data):
+        return self.match_substring(0, data["gramps_id"])
+
+    def get_sql(self):
+        """
+        Select the objects with a matching Gramps ID.
+        """
+        # Subclasses may apply the rule to another object
+        if type(self).apply is not RegExpIdBase.apply or not self.list[0]:
+            return None
+        match = self.get_sql_match(0, "gramps_id")
+        if match is None:
+            return None
+        return match[0], [match[1]]
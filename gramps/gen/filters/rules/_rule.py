@@ -58,6 +58,12 @@ class Rule:
     category = _("Miscellaneous filters")
     description = _("No description")
     allow_regex = False
+    # Relative cost of applying the rule to one object: 1 if only the object
+    # itself is examined, about 10 if other objects are loaded and about 100
+    # if other filters are applied.
+    cost = 1
+    # Expected fraction of the objects matched by the rule.
+    selectivity = 0.5
 
     def __init__(self, arg, use_regex=False, use_case=False):
         self.list = []
@@ -67,6 +73,7 @@ class Rule:
         self.use_regex = use_regex
         self.use_case = use_case
         self.nrprepare = 0
+        self.reset_statistics()
 
     def is_empty(self):
         return False
@@ -129,6 +136,26 @@ class Rule:
         """remove no longer needed memory"""
         pass
 
+    def reset_statistics(self):
+        """Clear the measured number of calls, matches and time."""
+        self.nrcalls = 0
+        self.nrmatches = 0
+        self.elapsed = 0.0
+
+    def add_statistics(self, result, elapsed):
+        """Record one application of the rule, which took elapsed seconds."""
+        self.nrcalls += 1
+        if result:
+            self.nrmatches += 1
+        self.elapsed += elapsed
+
+    def get_statistics(self):
+        """
+        Return the measured number of calls, matches and seconds spent in
+        the rule since the statistics were reset.
+        """
+        return self.nrcalls, self.nrmatches, self.elapsed
+
     def set_list(self, arg):
         """Store the values of this rule."""
         assert isinstance(arg, list) or arg is None, "Argument is not a list"
@@ -154,6 +181,58 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def apply_to_data(self, dummy_db, dummy_data):
+        """
+        Apply the rule to the raw data of some database entry, a dict as
+        returned by to_dict.  May be overwritten, together with apply, to
+        avoid creating the object.
+        """
+        return True
+
+    def can_apply_to_data(self):
+        """
+        Return True if apply_to_data gives the same result as apply.  This is
+        the case if both methods are defined by the same class, so that a
+        subclass overriding apply alone falls back to the objects.
+        """
+        if "apply" in vars(self):
+            return False
+        for cls in type(self).__mro__:
+            if "apply" in vars(cls) or "apply_to_data" in vars(cls):
+                return "apply" in vars(cls) and "apply_to_data" in vars(cls)
+        return False
+
+    def get_sql(self):
+        """
+        Return a tuple of an SQL condition on the table of the filtered
+        objects and a list of its values, which selects exactly the objects
+        matched by the rule.  Return None if the rule cannot be expressed
+        in SQL.  Called after the rule has been prepared.
+        """
+        return None
+
+    def get_sql_match(self, param_index, column):
+        """
+        Return a tuple of an SQL condition which is true when the value of
+        column matches the filter element indicated by param_index, as
+        match_substring does, and the value of its placeholder.  Return None
+        if there is no such condition.
+
+        Regular expressions use the REGEXP operator.  Substrings use the
+        match_substring function of the database, which compares the upper
+        case strings like the rule does, so that "Weiss" matches "Weiß".
+        """
+        if not self.use_regex:
+            return "match_substring(?, %s)" % column, self.list[param_index]
+        pattern = self.list[param_index]
+        if not self.use_case:
+            pattern = "(?i)" + pattern
+        try:
+            re.compile(pattern)
+        except re.error:
+            return None
+        return "%s REGEXP ?" % column, pattern
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = (
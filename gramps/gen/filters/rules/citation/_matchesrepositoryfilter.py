@@ -72,6 +72,6 @@ class MatchesRepositoryFilter(MatchesFilterBase):
         repolist = [x.ref for x in source.get_reporef_list()]
         for repohandle in repolist:
             # check if repo in repository filter
-            if self.MRF_filt.check(db, repohandle):
+            if self.check_filter(db, self.MRF_filt, repohandle):
                 return True
         return False
@@ -76,7 +76,7 @@ class MatchesPersonFilter(MatchesFilterBase):
             for classname, handle in db.find_backlink_handles(
                 event.get_handle(), ["Person"]
             ):
-                if filt.check(db, handle):
+                if self.check_filter(db, filt, handle):
                     return True
             if self.MPF_famevents:
                 # also include if family event of the person
@@ -84,9 +84,13 @@ class MatchesPersonFilter(MatchesFilterBase):
                     event.get_handle(), ["Family"]
                 ):
                     family = db.get_family_from_handle(handle)
-                    if family.father_handle and filt.check(db, family.father_handle):
+                    if family.father_handle and self.check_filter(
+                        db, filt, family.father_handle
+                    ):
                         return True
-                    if family.mother_handle and filt.check(db, family.mother_handle):
+                    if family.mother_handle and self.check_filter(
+                        db, filt, family.mother_handle
+                    ):
                         return True
 
         return False
@@ -62,6 +62,6 @@ class MatchesPlaceFilter(MatchesFilterBase):
         filt = self.find_filter()
         if filt:
             handle = event.get_place_handle()
-            if handle and filt.check(db, handle):
+            if handle and self.check_filter(db, filt, handle):
                 return True
         return False
@@ -54,3 +54,6 @@ class Disconnected(Rule):
         return not (
             person.get_parent_family_handle_list() or person.get_family_handle_list()
         )
+
+    def apply_to_data(self, db, data):
+        return not (data["parent_family_list"] or data["family_list"])
@@ -64,7 +64,12 @@ class HasAddress(Rule):
         self.userSelectedCount = int(self.list[0])
 
     def apply(self, db, person):
-        count = len(person.get_address_list())
+        return self.match_count(len(person.get_address_list()))
+
+    def apply_to_data(self, db, data):
+        return self.match_count(len(data["address_list"]))
+
+    def match_count(self, count):
         if self.count_type == 0:  # "less than"
             return count < self.userSelectedCount
         elif self.count_type == 2:  # "greater than"
@@ -53,3 +53,6 @@ class HasAlternateName(Rule):
             return True
         else:
             return False
+
+    def apply_to_data(self, db, data):
+        return bool(data["alternate_names"])
@@ -58,8 +58,18 @@ class HasCommonAncestorWith(Rule):
         # ancestor list once.
         # Start with filling the cache for root person (gramps_id in self.list[0])
         self.ancestor_cache = {}
+        self.matches = None
         root_person = db.get_person_from_gramps_id(self.list[0])
-        if root_person:
+        if root_person and db.has_ancestor_index():
+            # The people with a common ancestor are the descendants of the
+            # ancestors of the root person, read from the index
+            ancestors = set(db.get_ancestors(root_person.handle))
+            ancestors.add(root_person.handle)
+            self.matches = set(ancestors)
+            for handle in ancestors:
+                self.matches.update(db.get_descendants(handle))
+            self.with_people = [root_person.handle]
+        elif root_person:
             self.add_ancs(db, root_person)
             self.with_people = [root_person.handle]
         else:
@@ -95,6 +105,7 @@ class HasCommonAncestorWith(Rule):
 
     def reset(self):
         self.ancestor_cache = {}
+        self.matches = None
 
     def has_common_ancestor(self, other):
         for handle in self.with_people:
@@ -107,6 +118,8 @@ class HasCommonAncestorWith(Rule):
         return False
 
     def apply(self, db, person):
+        if self.matches is not None:
+            return person.handle in self.matches
         if person and person.handle not in self.ancestor_cache:
             self.add_ancs(db, person)
 
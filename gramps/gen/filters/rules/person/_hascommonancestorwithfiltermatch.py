@@ -64,6 +64,7 @@ class HasCommonAncestorWithFilterMatch(HasCommonAncestorWith):
         # ancestor list once.
         # Start with filling the cache for root person (gramps_id in self.list[0])
         self.ancestor_cache = {}
+        self.matches = None
         self.with_people = []
         self.filt = MatchesFilter(self.list)
         self.filt.requestprepare(db, user)
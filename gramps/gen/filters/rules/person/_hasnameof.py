@@ -35,6 +35,7 @@ _ = glocale.translation.sgettext
 # -------------------------------------------------------------------------
 from .. import Rule
 from ....lib.nameorigintype import NameOriginType
+from ....lib.serialize import from_dict
 
 
 # -------------------------------------------------------------------------
@@ -69,6 +70,40 @@ class HasNameOf(Rule):
                 return True
         return False
 
+    def apply_to_data(self, db, data):
+        # Only the names are created
+        for name in [data["primary_name"]] + data["alternate_names"]:
+            if self.match_name(from_dict(name)):
+                return True
+        return False
+
+    def get_sql(self):
+        """
+        Only a search on single surnames is expressed in SQL.  It matches the
+        surnames of the primary and alternate names.
+        """
+        # Subclasses may apply the rule to another object
+        if type(self).apply is not HasNameOf.apply:
+            return None
+        if not self.list[7] or any(
+            value for index, value in enumerate(self.list) if index != 7
+        ):
+            return None
+        match = self.get_sql_match(7, "json_extract(value, '$.surname')")
+        alt_match = self.get_sql_match(7, "json_extract(surname.value, '$.surname')")
+        if match is None:
+            return None
+        return (
+            "EXISTS (SELECT 1 "
+            "FROM json_each(json_data, '$.primary_name.surname_list') "
+            "WHERE %s) "
+            "OR EXISTS (SELECT 1 "
+            "FROM json_each(json_data, '$.alternate_names') AS name, "
+            "json_each(name.value, '$.surname_list') AS surname "
+            "WHERE %s)" % (match[0], alt_match[0]),
+            [match[1], alt_match[1]],
+        )
+
     def match_name(self, name):
         if self.list[0] and not self.match_substring(0, name.get_first_name()):
             return False
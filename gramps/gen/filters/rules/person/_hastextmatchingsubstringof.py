@@ -51,6 +51,7 @@ class HasTextMatchingSubstringOf(Rule):
     description = _("Matches people whose records contain text " "matching a substring")
     category = _("General filters")
     allow_regex = True
+    cost = 100
 
     def prepare(self, db, user):
         self.db = db
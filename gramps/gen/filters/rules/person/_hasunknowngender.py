@@ -47,6 +47,10 @@ class HasUnknownGender(Rule):
     name = _("People with unknown gender")
     category = _("General filters")
     description = _("Matches all people with unknown gender")
+    selectivity = 0.05
 
     def apply(self, db, person):
         return person.gender == Person.UNKNOWN
+
+    def apply_to_data(self, db, data):
+        return data["gender"] == Person.UNKNOWN
@@ -58,7 +58,14 @@ class IsAncestorOf(Rule):
             first = 1
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_ancestor_list(db, root_person, first)
+            if root_person and db.has_ancestor_index():
+                self.map.update(
+                    db.get_ancestors(root_person.handle, main_family_only=True)
+                )
+                if not first:
+                    self.map.add(root_person.handle)
+            else:
+                self.init_ancestor_list(db, root_person, first)
         except:
             pass
 
@@ -47,9 +47,13 @@ class IsBookmarked(Rule):
     name = _("Bookmarked people")
     category = _("General filters")
     description = _("Matches the people on the bookmark list")
+    selectivity = 0.01
 
     def prepare(self, db, user):
         self.bookmarks = db.get_bookmarks().get()
 
     def apply(self, db, person):
         return person.handle in self.bookmarks
+
+    def apply_to_data(self, db, data):
+        return data["handle"] in self.bookmarks
@@ -46,6 +46,7 @@ class IsDefaultPerson(Rule):
     name = _("Home Person")
     category = _("General filters")
     description = _("Matches the Home Person")
+    selectivity = 0.01
 
     def prepare(self, db, user):
         p = db.get_default_person()
@@ -58,7 +58,12 @@ class IsDescendantOf(Rule):
             first = True
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person, first)
+            if root_person and db.has_ancestor_index():
+                self.map.update(db.get_descendants(root_person.handle))
+                if not first:
+                    self.map.add(root_person.handle)
+            else:
+                self.init_list(root_person, first)
         except:
             pass
 
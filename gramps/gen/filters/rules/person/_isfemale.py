@@ -50,3 +50,6 @@ class IsFemale(Rule):
 
     def apply(self, db, person):
         return person.gender == Person.FEMALE
+
+    def apply_to_data(self, db, data):
+        return data["gender"] == Person.FEMALE
@@ -58,7 +58,17 @@ class IsLessThanNthGenerationAncestorOf(Rule):
         person = db.get_person_from_gramps_id(self.list[0])
         if person:
             root_handle = person.get_handle()
-            if root_handle:
+            if root_handle and db.has_ancestor_index():
+                # The root is generation 1
+                self.map.add(root_handle)
+                self.map.update(
+                    handle
+                    for handle, gen in db.get_ancestors(
+                        root_handle, main_family_only=True
+                    ).items()
+                    if gen < int(self.list[1])
+                )
+            elif root_handle:
                 self.init_ancestor_list(root_handle)
 
     def init_ancestor_list(self, root_handle):
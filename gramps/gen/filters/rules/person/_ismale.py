@@ -50,3 +50,6 @@ class IsMale(Rule):
 
     def apply(self, db, person):
         return person.gender == Person.MALE
+
+    def apply_to_data(self, db, data):
+        return data["gender"] == Person.MALE
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import probably_alive, alive_ranges
 from .. import Rule
 from ....datehandler import parser
 
@@ -47,12 +47,14 @@ class ProbablyAlive(Rule):
     name = _("People probably alive")
     description = _("Matches people without indications of death that are not too old")
     category = _("General filters")
+    cost = 10
 
     def prepare(self, db, user):
         try:
             self.current_date = parser.parse(str(self.list[0]))
         except:
             self.current_date = None
+        self.ranges = alive_ranges(db)
 
     def apply(self, db, person):
-        return probably_alive(person, db, self.current_date)
+        return probably_alive(person, db, self.current_date, ranges=self.ranges)
@@ -64,6 +64,6 @@ class MatchesEventFilter(MatchesFilterBase):
             for classname, handle in db.find_backlink_handles(
                 event.get_handle(), ["Event"]
             ):
-                if filt.check(db, handle):
+                if self.check_filter(db, filt, handle):
                     return True
         return False
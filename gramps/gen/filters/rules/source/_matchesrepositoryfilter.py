@@ -64,6 +64,6 @@ class MatchesRepositoryFilter(MatchesFilterBase):
         repolist = [x.ref for x in object.get_reporef_list()]
         for repohandle in repolist:
             # check if repo in repository filter
-            if self.MRF_filt.check(db, repohandle):
+            if self.check_filter(db, self.MRF_filt, repohandle):
                 return True
         return False
@@ -29,13 +29,16 @@ import inspect
 from ....filters import reload_custom_filters
 
 reload_custom_filters()
+from ....db import DbTxn
 from ....db.utils import import_as_dict
+from ....lib import Person, Surname
 from ....filters import GenericFilter, CustomFilters
 from ....const import DATA_DIR
 from ....user import User
 from ....utils.unittest import localize_date
 
 from ..person import (
+    ChangedSince,
     Disconnected,
     Everyone,
     FamilyWithIncompleteEvent,
@@ -55,9 +58,11 @@ from ..person import (
     HasNameOriginType,
     HasNameType,
     HasNickname,
+    HasNote,
     HasRelationship,
     HasSoundexName,
     HasSourceOf,
+    HasTag,
     HasTextMatchingRegexpOf,
     HasUnknownGender,
     HaveAltFamilies,
@@ -85,6 +90,7 @@ from ..person import (
     IsSiblingOfFilterMatch,
     IsSpouseOfFilterMatch,
     IsWitness,
+    MatchesFilter,
     MissingParent,
     MultipleMarriages,
     NeverMarried,
@@ -94,6 +100,7 @@ from ..person import (
     PeoplePublic,
     PersonWithIncompleteEvent,
     ProbablyAlive,
+    RegExpIdOf,
     RegExpName,
     RelationshipPathBetweenBookmarks,
 )
@@ -1270,6 +1277,154 @@ class BaseTest(unittest.TestCase):
         )
         self.assertEqual(self.filter_with_rule(rule), set(["GNUJQCL9MD64AM56OH"]))
 
+    def test_hasnameof_case(self):
+        """
+        Test that the SQL condition of HasNameOf compares the surnames in
+        upper case like the rule, where "Weiß" is "WEISS".
+        """
+        person = Person()
+        surname = Surname()
+        surname.set_surname("Weiß")
+        person.get_primary_name().add_surname(surname)
+        with DbTxn("Add person", self.db) as trans:
+            handle = self.db.add_person(person, trans)
+        try:
+            for value in ("Weiss", "weiß", "WEISS"):
+                rule = HasNameOf(["", "", "", "", "", "", "", value, "", "", ""])
+                self.assertTrue(rule.apply(self.db, person))
+                self.assertIn(handle, self.filter_with_rule(rule))
+            rule = HasNameOf(["", "", "", "", "", "", "", "Weis", "", "", ""])
+            self.assertIn(handle, self.filter_with_rule(rule))
+            rule = HasNameOf(["", "", "", "", "", "", "", "Weißs", "", "", ""])
+            self.assertNotIn(handle, self.filter_with_rule(rule))
+        finally:
+            self.db.undo()
+
+    def test_select_handles(self):
+        """
+        Test that the rules expressed in SQL match the same people.
+        """
+        rules = [
+            HasIdOf(["I0044"]),
+            RegExpIdOf(["i004"]),
+            RegExpIdOf(["^I00[0-4]"], use_regex=True),
+            HasTag(["ToDo"]),
+            HasTag(["NoSuchTag"]),
+            HasNameOf(["", "", "", "", "", "", "", "garner", "", "", ""]),
+        ]
+        for rule in rules:
+            filter_ = GenericFilter()
+            filter_.add_rule(rule)
+            rule.requestprepare(self.db, None)
+            handles, complete = filter_.select_handles(self.db)
+            expected = filter_.check_and(self.db, None)
+            some_handles = sorted(self.db.get_person_handles())[::10]
+            selected, dummy = filter_.select_handles(self.db, some_handles)
+            rule.requestreset()
+            self.assertTrue(complete)
+            self.assertEqual(set(handles), set(expected))
+            self.assertEqual(set(selected), set(expected) & set(some_handles))
+            self.assertEqual(
+                set(filter_.apply(self.db, iter(some_handles))),
+                set(expected) & set(some_handles),
+            )
+
+    def test_apply_to_data(self):
+        """
+        Test that the rules give the same results on the raw data.
+        """
+        rules = [
+            ChangedSince(["2010-01-01", ""]),
+            Disconnected([]),
+            HasAddress(["0", "greater than"]),
+            HasAlternateName([]),
+            HasIdOf(["I0044"]),
+            HasNameOf(["", "", "", "", "", "", "", "garner", "", "", ""]),
+            HasNote(["0", "greater than"]),
+            HasTag(["ToDo"]),
+            HasUnknownGender([]),
+            HavePhotos(["0", "greater than"]),
+            IsBookmarked([]),
+            IsFemale([]),
+            IsMale([]),
+            PeoplePrivate([]),
+            PeoplePublic([]),
+            RegExpIdOf(["I00"]),
+        ]
+        for rule in rules:
+            self.assertTrue(rule.can_apply_to_data())
+            rule.requestprepare(self.db, None)
+            for person in self.db.iter_people():
+                data = self.db.get_raw_person_data(person.handle)
+                self.assertEqual(
+                    rule.apply_to_data(self.db, data), rule.apply(self.db, person)
+                )
+            rule.requestreset()
+
+        rule = IsDefaultPerson([])
+        rule.requestprepare(self.db, None)
+        self.assertFalse(rule.can_apply_to_data())
+        rule.requestreset()
+
+    def test_planned_rules(self):
+        """
+        Test that the rules are applied in the order of their cost without
+        changing the results.
+        """
+        birth = HasBirth(["", "", ""])
+        male = IsMale([])
+        person = HasIdOf(["I0044"])
+        expected = {}
+        for rule in (birth, male, person):
+            expected[rule] = self.filter_with_rule(rule)
+        filter_ = GenericFilter()
+        filter_.set_rules([birth, male, person])
+        filter_.set_logical_op("and")
+        self.assertEqual(filter_.get_planned_rules(), [person, male, birth])
+        self.assertEqual(
+            set(filter_.apply(self.db)),
+            expected[birth] & expected[male] & expected[person],
+        )
+        filter_.set_logical_op("or")
+        self.assertEqual(filter_.get_planned_rules(), [male, birth, person])
+        self.assertEqual(
+            set(filter_.apply(self.db)),
+            expected[birth] | expected[male] | expected[person],
+        )
+        filter_.set_logical_op("xor")
+        self.assertEqual(filter_.get_planned_rules(), [birth, male, person])
+
+    def test_rule_timing(self):
+        """
+        Test the statistics of the rules and the memoized sub-filter.
+        """
+        unknown = HasUnknownGender([])
+        male = IsMale([])
+        filter_ = GenericFilter()
+        filter_.set_rules([male, unknown])
+        filter_.set_timing(True)
+        filter_.reset_statistics()
+        res = filter_.apply(self.db)
+        stats = dict((rule, stats) for rule, *stats in filter_.get_statistics())
+        self.assertEqual(stats[unknown][0], self.db.get_number_of_people())
+        self.assertEqual(stats[male][0], stats[unknown][1])
+        self.assertEqual(stats[male][1], len(res))
+
+        base = GenericFilter()
+        base.add_rule(HasIdOf(["I0044"]))
+        base.set_name("Timed")
+        base.set_timing(True)
+        CustomFilters.get_filters_dict("Person")["Timed"] = base
+        rule = MatchesFilter(["Timed"])
+        rule.requestprepare(self.db, None)
+        base.reset_statistics()
+        handle = self.db.get_person_from_gramps_id("I0044").handle
+        obj = self.db.get_person_from_handle(handle)
+        self.assertTrue(rule.apply(self.db, obj))
+        self.assertTrue(rule.apply(self.db, obj))
+        rule.requestreset()
+        self.assertEqual(base.get_statistics()[0][1:3], (1, 1))
+
 
 if __name__ == "__main__":
     unittest.main()
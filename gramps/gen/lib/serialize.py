@@ -54,6 +54,48 @@ def __default(obj):
     return obj.get_object_state()
 
 
+# Types which JSON stores unchanged.
+__SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def __to_struct(value):
+    """
+    Walk an object hierarchy producing the same struct as a JSON round trip.
+    """
+    value_type = type(value)
+    if value_type in __SCALAR_TYPES:
+        return value
+    if value_type is list or value_type is tuple:
+        return [__to_struct(item) for item in value]
+    if value_type is dict:
+        return {key: __to_struct(item) for key, item in value.items()}
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    return __to_struct(value.get_object_state())
+
+
+def __from_struct(value):
+    """
+    Walk a struct building objects bottom-up, as the JSON object hook does.
+
+    New containers are always created, so the struct passed in is never
+    modified.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        obj_dict = {key: __from_struct(item) for key, item in value.items()}
+        if "_class" in obj_dict:
+            return __object_hook(obj_dict)
+        return obj_dict
+    if value_type is list or value_type is tuple:
+        return [__from_struct(item) for item in value]
+    return value
+
+
 def to_json(obj):
     """
     Encode a Gramps object in JSON format.
@@ -87,7 +129,7 @@ def to_dict(obj):
     :returns: A dictionary.
     :rtype: dict
     """
-    return json.loads(to_json(obj))
+    return __to_struct(obj)
 
 
 def from_dict(dict):
@@ -99,7 +141,7 @@ def from_dict(dict):
     :returns: A Gramps object.
     :rtype: object
     """
-    return from_json(json.dumps(dict))
+    return __from_struct(dict)
 
 
 class BlobSerializer:
@@ -214,7 +256,7 @@ class JSONSerializer:
         elif type_name == "Researcher":
             value = to_dict(value)
         elif type_name not in ("int", "str", "list"):
-            value = json.loads(to_json(value))
+            value = to_dict(value)
         data = {
             "type": type_name,
             "value": value,
@@ -20,6 +20,8 @@
 
 """ Unittest for to_json, from_json """
 
+import copy
+import json
 import os
 import unittest
 
@@ -38,7 +40,7 @@ from .. import (
     Source,
     Tag,
 )
-from ..serialize import from_json, to_json
+from ..serialize import from_dict, from_json, to_dict, to_json
 
 TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
 EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
@@ -50,6 +52,16 @@ class BaseCheck:
         obj = from_json(data)
         self.assertEqual(self.object.serialize(), obj.serialize())
 
+    def test_to_dict(self):
+        self.assertEqual(to_dict(self.object), json.loads(to_json(self.object)))
+
+    def test_from_dict(self):
+        data = to_dict(self.object)
+        original = copy.deepcopy(data)
+        obj = from_dict(data)
+        self.assertEqual(data, original)
+        self.assertEqual(to_json(obj), to_json(self.object))
+
 
 class PersonCheck(unittest.TestCase, BaseCheck):
     def setUp(self):
@@ -127,11 +139,14 @@ def generate_case(obj):
 
     name = "test_serialize_%s_%s" % (obj.__class__.__name__, obj.handle)
     setattr(DatabaseCheck, name, test)
-    ####
-    # def test2(self):
-    #    self.assertEqual(obj.serialize(), from_dict(struct).serialize())
-    # name = "test_create_%s_%s" % (obj.__class__.__name__, obj.handle)
-    # setattr(DatabaseCheck, name, test2)
+
+    def test2(self):
+        struct = to_dict(obj)
+        self.assertEqual(struct, json.loads(data))
+        self.assertEqual(to_json(from_dict(struct)), data)
+
+    name = "test_create_%s_%s" % (obj.__class__.__name__, obj.handle)
+    setattr(DatabaseCheck, name, test2)
 
 
 db = import_as_dict(EXAMPLE, User())
@@ -25,7 +25,7 @@ This package implements an object difference engine.
 import json
 
 from ..db.utils import import_as_dict
-from ..lib.serialize import to_dict, from_dict
+from ..lib.serialize import from_dict
 from ..const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -88,6 +88,72 @@ def diff_items(path, json1, json2):
         return True
 
 
+# The classes of the primary objects, in the order they are compared
+PRIMARY_CLASSES = [
+    "Person",
+    "Family",
+    "Source",
+    "Citation",
+    "Event",
+    "Media",
+    "Place",
+    "Repository",
+    "Note",
+    "Tag",
+]
+
+
+def diff_table(class_name, items1, items2):
+    """
+    Merge two iterators over (handle, json) tuples ordered by handle, and
+    yield the differences as (class_name, obj1, obj2) tuples.  obj1 is None
+    for an object which is only in the second iterator, and obj2 is None for
+    an object which is only in the first one.
+
+    The JSON texts are compared first.  They include the change time, so
+    objects which were not changed are skipped without decoding them.  The
+    others are decoded and compared with :func:`diff_items`.
+    """
+    item1 = next(items1, None)
+    item2 = next(items2, None)
+    while item1 is not None or item2 is not None:
+        if item2 is None or (item1 is not None and item1[0] < item2[0]):
+            yield class_name, from_dict(json.loads(item1[1])), None
+            item1 = next(items1, None)
+        elif item1 is None or item2[0] < item1[0]:
+            yield class_name, None, from_dict(json.loads(item2[1]))
+            item2 = next(items2, None)
+        else:
+            if item1[1] != item2[1]:
+                data1 = json.loads(item1[1])
+                data2 = json.loads(item2[1])
+                if diff_items(class_name, data1, data2):
+                    yield class_name, from_dict(data1), from_dict(data2)
+            item1 = next(items1, None)
+            item2 = next(items2, None)
+
+
+def iter_diffs(db1, db2, step=None):
+    """
+    Compare two databases, and yield the differences as (class_name, obj1,
+    obj2) tuples.  obj1 is None for an object which is only in db2, and obj2
+    is None for an object which is only in db1.
+
+    The objects of each class are read from both databases at once, in the
+    order of their handles, so only the differences are kept in memory.
+
+    :param step: called before each class is compared
+    """
+    for class_name in PRIMARY_CLASSES:
+        if step:
+            step()
+        yield from diff_table(
+            class_name,
+            db1.iter_json_by_handle(class_name),
+            db2.iter_json_by_handle(class_name),
+        )
+
+
 def diff_dbs(db1, db2, user):
     """
     1. new objects => mark for insert
@@ -97,60 +163,24 @@ def diff_dbs(db1, db2, user):
        deletion
     4. updated objects => do a diff on differences, mark origin
        values as new data
+
+    Return the lists of the differences, of the objects missing from db1 and
+    of the objects missing from db2.  See :func:`iter_diffs` to read them one
+    by one.
     """
     missing_from_old = []
     missing_from_new = []
     diffs = []
-    with user.progress(_("Family Tree Differences"), _("Searching..."), 10) as step:
-        for item in [
-            "Person",
-            "Family",
-            "Source",
-            "Citation",
-            "Event",
-            "Media",
-            "Place",
-            "Repository",
-            "Note",
-            "Tag",
-        ]:
-            step()
-
-            handles_func1 = db1.method("get_%s_handles", item)
-            handles_func2 = db2.method("get_%s_handles", item)
-            handle_func1 = db1.method("get_%s_from_handle", item)
-            handle_func2 = db2.method("get_%s_from_handle", item)
-
-            handles1 = sorted([handle for handle in handles_func1()])
-            handles2 = sorted([handle for handle in handles_func2()])
-            p1 = 0
-            p2 = 0
-            while p1 < len(handles1) and p2 < len(handles2):
-                if handles1[p1] == handles2[p2]:  # in both
-                    item1 = handle_func1(handles1[p1])
-                    item2 = handle_func2(handles2[p2])
-                    diff = diff_items(item, to_dict(item1), to_dict(item2))
-                    if diff:
-                        diffs += [(item, item1, item2)]
-                    # else same!
-                    p1 += 1
-                    p2 += 1
-                elif handles1[p1] < handles2[p2]:  # p1 is mssing in p2
-                    item1 = handle_func1(handles1[p1])
-                    missing_from_new += [(item, item1)]
-                    p1 += 1
-                elif handles1[p1] > handles2[p2]:  # p2 is mssing in p1
-                    item2 = handle_func2(handles2[p2])
-                    missing_from_old += [(item, item2)]
-                    p2 += 1
-            while p1 < len(handles1):
-                item1 = handle_func1(handles1[p1])
-                missing_from_new += [(item, item1)]
-                p1 += 1
-            while p2 < len(handles2):
-                item2 = handle_func2(handles2[p2])
-                missing_from_old += [(item, item2)]
-                p2 += 1
+    with user.progress(
+        _("Family Tree Differences"), _("Searching..."), len(PRIMARY_CLASSES)
+    ) as step:
+        for item, item1, item2 in iter_diffs(db1, db2, step):
+            if item1 is None:
+                missing_from_old.append((item, item2))
+            elif item2 is None:
+                missing_from_new.append((item, item1))
+            else:
+                diffs.append((item, item1, item2))
     return diffs, missing_from_old, missing_from_new
 
 
@@ -0,0 +1,124 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the comparison of two databases
+"""
+import json
+import os
+import unittest
+from unittest import mock
+
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.base import DbReadBase
+from ...db.utils import import_as_dict
+from ...lib import Note
+from ...lib.serialize import JSONSerializer
+from ...user import User
+from ..diff import diff_dbs, iter_diffs
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class DiffTest(unittest.TestCase):
+    """
+    Compare the example database with a changed copy.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db1 = import_as_dict(EXAMPLE, User())
+        cls.db2 = import_as_dict(EXAMPLE, User())
+
+    def test_json_by_handle(self):
+        """
+        Test that the objects read in order are those of the default
+        implementation.
+        """
+        for class_name in ("Person", "Media", "Tag"):
+            items = list(self.db1.iter_json_by_handle(class_name))
+            expected = list(DbReadBase.iter_json_by_handle(self.db1, class_name))
+            self.assertEqual(
+                [item[0] for item in items], [item[0] for item in expected]
+            )
+            self.assertEqual(
+                [json.loads(item[1]) for item in items],
+                [json.loads(item[1]) for item in expected],
+            )
+
+    def test_json_as_stored(self):
+        """
+        Test that the JSON data of the objects is not decoded and encoded
+        again.
+        """
+        with mock.patch.object(
+            JSONSerializer, "string_to_data", wraps=JSONSerializer.string_to_data
+        ) as string_to_data:
+            items = list(self.db1.iter_json_by_handle("Person"))
+        string_to_data.assert_not_called()
+        self.assertEqual(len(items), self.db1.get_number_of_people())
+
+    def test_same(self):
+        self.assertEqual(list(iter_diffs(self.db1, self.db1)), [])
+
+    def test_changes(self):
+        person = next(self.db2.iter_people())
+        event = next(self.db2.iter_events())
+        note = Note()
+        note.set("New note")
+        with DbTxn("Change example", self.db2) as trans:
+            person.get_primary_name().set_first_name("Changed")
+            self.db2.commit_person(person, trans)
+            # Only the change time differs
+            self.db2.commit_event(event, trans, change_time=1)
+            self.db2.add_note(note, trans)
+            self.db2.remove_tag(next(self.db2.iter_tag_handles()), trans)
+        try:
+            diffs = [
+                (class_name, obj1 and obj1.handle, obj2 and obj2.handle)
+                for class_name, obj1, obj2 in iter_diffs(self.db1, self.db2)
+            ]
+            tag_handle = next(
+                handle
+                for handle in self.db1.iter_tag_handles()
+                if not self.db2.has_tag_handle(handle)
+            )
+            self.assertEqual(
+                sorted(diffs),
+                [
+                    ("Note", None, note.handle),
+                    ("Person", person.handle, person.handle),
+                    ("Tag", tag_handle, None),
+                ],
+            )
+            diffs, missing_from_old, missing_from_new = diff_dbs(
+                self.db1, self.db2, User()
+            )
+            self.assertEqual(diffs[0][2].get_primary_name().get_first_name(), "Changed")
+            self.assertEqual(missing_from_old[0][1].get(), "New note")
+            self.assertEqual(missing_from_new[0][1].handle, tag_handle)
+        finally:
+            self.db2.undo()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,9 +42,10 @@ import traceback
 #
 # -------------------------------------------------------------------------
 from ...version import VERSION as GRAMPSVERSION, VERSION_TUPLE
-from ..const import IMAGE_DIR
+from ..const import IMAGE_DIR, PLUGIN_CACHE
 from ..const import GRAMPS_LOCALE as glocale
 from ..utils.requirements import Requirements
+from ._regcache import RegistrationCache, file_key, is_cacheable
 
 _ = glocale.translation.gettext
 
@@ -1326,6 +1327,7 @@ class PluginRegister:
         self.__plugindata = []
         self.__id_to_pdata = {}
         self.__req = Requirements()
+        self.__cache = RegistrationCache(PLUGIN_CACHE)
 
     def add_plugindata(self, plugindata):
         """This is used to add an entry to the registration list.  The way it
@@ -1353,58 +1355,20 @@ class PluginRegister:
                 continue
             lenpd = len(self.__plugindata)
             full_filename = os.path.join(directory, filename)
-            try:
-                with open(full_filename, "r", encoding="utf-8") as file_descriptor:
-                    stream = file_descriptor.read()
-            except Exception as msg:
-                print(
-                    _("ERROR: Failed reading plugin registration %(filename)s")
-                    % {"filename": filename}
-                )
-                print(msg)
-                continue
-            if os.path.exists(os.path.join(os.path.dirname(full_filename), "locale")):
-                try:
-                    local_gettext = glocale.get_addon_translator(full_filename).gettext
-                except ValueError:
-                    print(
-                        _(
-                            "WARNING: Plugin %(plugin_name)s has no translation"
-                            " for any of your configured languages, using US"
-                            " English instead"
-                        )
-                        % {"plugin_name": filename.split(".")[0]}
-                    )
-                    local_gettext = glocale.translation.gettext
+            has_locale = os.path.exists(
+                os.path.join(os.path.dirname(full_filename), "locale")
+            )
+            key = file_key(full_filename, has_locale)
+            plugins = self.__cache.get(full_filename, key)
+            if plugins is not None:
+                self.__plugindata.extend(plugins)
+                lenpd = self.__index_plugins(lenpd)
             else:
-                local_gettext = glocale.translation.gettext
-            try:
-                exec(
-                    compile(stream, filename, "exec"),
-                    make_environment(_=local_gettext),
-                    {"uistate": uistate},
+                lenpd = self.__exec_file(
+                    full_filename, filename, has_locale, key, lenpd, uistate
                 )
-                for pdata in self.__plugindata[lenpd:]:
-                    if pdata.id in self.__id_to_pdata:
-                        # reloading
-                        old = self.__id_to_pdata[pdata.id]
-                        self.__plugindata.remove(old)
-                        lenpd -= 1
-                    self.__id_to_pdata[pdata.id] = pdata
-            except ValueError as msg:
-                print(
-                    _("ERROR: Failed reading plugin registration %(filename)s")
-                    % {"filename": filename}
-                )
-                print(msg)
-                self.__plugindata = self.__plugindata[:lenpd]
-            except:
-                print(
-                    _("ERROR: Failed reading plugin registration %(filename)s")
-                    % {"filename": filename}
-                )
-                print("".join(traceback.format_exception(*sys.exc_info())))
-                self.__plugindata = self.__plugindata[:lenpd]
+                if lenpd is None:
+                    continue
             # check if:
             #  1. plugin exists, if not remove, otherwise set module name
             #  2. plugin not stable, if stable_only=True, remove
@@ -1481,6 +1445,94 @@ class PluginRegister:
                 del self.__id_to_pdata[self.__plugindata[ind].id]
                 del self.__plugindata[ind]
 
+    def __index_plugins(self, lenpd):
+        """
+        Index the plugins added after the first lenpd ones by id, replacing
+        those registered before with the same id.  Return the new number of
+        plugins before the added ones.
+        """
+        for pdata in self.__plugindata[lenpd:]:
+            if pdata.id in self.__id_to_pdata:
+                # reloading
+                old = self.__id_to_pdata[pdata.id]
+                self.__plugindata.remove(old)
+                lenpd -= 1
+            self.__id_to_pdata[pdata.id] = pdata
+        return lenpd
+
+    def __exec_file(self, full_filename, filename, has_locale, key, lenpd, uistate):
+        """
+        Run a gpr.py file to register its plugins, and store them in the
+        cache if they only depend on the file.  Return the new number of
+        plugins before the added ones, or None if the file cannot be read.
+        """
+        try:
+            with open(full_filename, "r", encoding="utf-8") as file_descriptor:
+                stream = file_descriptor.read()
+        except Exception as msg:
+            print(
+                _("ERROR: Failed reading plugin registration %(filename)s")
+                % {"filename": filename}
+            )
+            print(msg)
+            return None
+        if has_locale:
+            try:
+                local_gettext = glocale.get_addon_translator(full_filename).gettext
+            except ValueError:
+                print(
+                    _(
+                        "WARNING: Plugin %(plugin_name)s has no translation"
+                        " for any of your configured languages, using US"
+                        " English instead"
+                    )
+                    % {"plugin_name": filename.split(".")[0]}
+                )
+                local_gettext = glocale.translation.gettext
+        else:
+            local_gettext = glocale.translation.gettext
+        try:
+            exec(
+                compile(stream, filename, "exec"),
+                make_environment(_=local_gettext),
+                {"uistate": uistate},
+            )
+            plugins = self.__plugindata[lenpd:]
+            lenpd = self.__index_plugins(lenpd)
+        except ValueError as msg:
+            print(
+                _("ERROR: Failed reading plugin registration %(filename)s")
+                % {"filename": filename}
+            )
+            print(msg)
+            self.__plugindata = self.__plugindata[:lenpd]
+            return lenpd
+        except:
+            print(
+                _("ERROR: Failed reading plugin registration %(filename)s")
+                % {"filename": filename}
+            )
+            print("".join(traceback.format_exception(*sys.exc_info())))
+            self.__plugindata = self.__plugindata[:lenpd]
+            return lenpd
+        if not is_cacheable(stream):
+            key = None
+        self.__cache.put(full_filename, key, plugins)
+        return lenpd
+
+    def save_cache(self):
+        """
+        Write the cache of the registrations, if it changed.
+        """
+        self.__cache.save()
+
+    def cache_stats(self):
+        """
+        Return the number of registration files read from the cache and
+        the number of files run, since the start.
+        """
+        return self.__cache.hits, self.__cache.misses
+
     def get_plugin(self, plugin_id):
         """
         Return the :class:`PluginData` for the plugin with id
@@ -0,0 +1,196 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+A cache of the plugin registrations read from the gpr.py files.
+
+The :class:`PluginData` registered by a gpr.py file are stored with the
+modification time and size of the file, the Gramps version and the
+languages of the user interface.  When none of these changed, the next
+session uses them instead of compiling and running the file again.
+
+Registration files which import other modules or look at the user interface
+state may register different plugins from one session to the next, so they
+are always run.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import os
+import pickle
+import re
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...version import VERSION as GRAMPSVERSION
+from ..const import GRAMPS_LOCALE as glocale
+
+LOG = logging.getLogger("._manager")
+
+# Change when the format of the cache changes
+CACHE_VERSION = 1
+
+# Imports which do not change the plugins registered by a file
+_SAFE_IMPORTS = (
+    "from gramps.gen.const import GRAMPS_LOCALE as glocale",
+    "from gramps.gen.plug._pluginreg import ",
+)
+_IMPORT = re.compile(r"^\s*(import|from)\s.*$", re.MULTILINE)
+
+
+def is_cacheable(stream):
+    """
+    Return True if the registrations of a gpr.py file only depend on the
+    file itself, so that they can be cached.
+
+    :param stream: the source of the file
+    """
+    if "uistate" in stream:
+        return False
+    for match in _IMPORT.finditer(stream):
+        if not match.group(0).strip().startswith(_SAFE_IMPORTS):
+            return False
+    return True
+
+
+def file_key(full_filename, has_locale):
+    """
+    Return the key of the registrations of a gpr.py file in the cache, or
+    None if the file cannot be read.
+    """
+    try:
+        stat = os.stat(full_filename)
+    except OSError:
+        return None
+    return (
+        stat.st_mtime_ns,
+        stat.st_size,
+        has_locale,
+        GRAMPSVERSION,
+        tuple(glocale.language),
+        __debug__,
+    )
+
+
+class RegistrationCache:
+    """
+    The registrations of the gpr.py files, by file name.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: the file in which the cache is stored
+        """
+        self.path = path
+        self.entries = None
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def __load(self):
+        """
+        Read the cache file, if it was not read yet.
+        """
+        if self.entries is not None:
+            return
+        self.entries = {}
+        try:
+            with open(self.path, "rb") as cache_file:
+                data = pickle.load(cache_file)
+        except FileNotFoundError:
+            return
+        except Exception as err:
+            # A damaged cache is rebuilt
+            LOG.warning("Ignoring the plugin cache %s: %s", self.path, err)
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.entries = data["entries"]
+
+    def get(self, full_filename, key):
+        """
+        Return the :class:`PluginData` registered by a file, or None if they
+        are not in the cache.
+        """
+        self.__load()
+        entry = self.entries.get(full_filename)
+        if key is None or entry is None or entry[0] != key:
+            self.misses += 1
+            return None
+        try:
+            plugins = pickle.loads(entry[1])
+        except Exception as err:
+            LOG.warning("Ignoring the plugin cache of %s: %s", full_filename, err)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return plugins
+
+    def put(self, full_filename, key, plugins):
+        """
+        Store the :class:`PluginData` registered by a file, or forget them
+        if key is None.
+        """
+        self.__load()
+        if key is None:
+            if self.entries.pop(full_filename, None) is not None:
+                self.dirty = True
+            return
+        try:
+            data = pickle.dumps(plugins, pickle.HIGHEST_PROTOCOL)
+        except Exception as err:
+            LOG.debug("Plugins of %s cannot be cached: %s", full_filename, err)
+            self.entries.pop(full_filename, None)
+        else:
+            self.entries[full_filename] = (key, data)
+        self.dirty = True
+
+    def save(self):
+        """
+        Write the cache file, if it changed.  The files which no longer
+        exist are dropped.
+        """
+        if not self.dirty:
+            return
+        self.dirty = False
+        entries = {
+            filename: entry
+            for filename, entry in self.entries.items()
+            if os.path.exists(filename)
+        }
+        tmp_path = "%s.%d" % (self.path, os.getpid())
+        try:
+            with open(tmp_path, "wb") as cache_file:
+                pickle.dump(
+                    {"version": CACHE_VERSION, "entries": entries},
+                    cache_file,
+                    pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as err:
+            LOG.debug("Cannot write the plugin cache %s: %s", self.path, err)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,117 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the cache of plugin registrations
+"""
+import os
+import tempfile
+import unittest
+
+from ...const import PLUGINS_DIR
+from .._pluginreg import PluginData, TOOL, TOOL_MODE_CLI
+from .._regcache import RegistrationCache, file_key, is_cacheable
+
+
+def read_gpr(name):
+    """
+    Return the source of a registration file of the plugins of Gramps.
+    """
+    with open(os.path.join(PLUGINS_DIR, name), encoding="utf-8") as gpr:
+        return gpr.read()
+
+
+class RegistrationCacheTest(unittest.TestCase):
+    """
+    Test the cache of plugin registrations.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.pickle")
+        self.gpr = os.path.join(self.tmpdir.name, "test.gpr.py")
+        with open(self.gpr, "w", encoding="utf-8") as gpr:
+            gpr.write("register(TOOL, id='test')\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_plugin(self):
+        """
+        Return a registered plugin.
+        """
+        plugin = PluginData()
+        plugin.ptype = TOOL
+        plugin.id = "test"
+        plugin.name = "Test"
+        plugin.tool_modes = [TOOL_MODE_CLI]
+        return plugin
+
+    def test_cacheable(self):
+        self.assertTrue(is_cacheable(read_gpr("cite/cite.gpr.py")))
+        self.assertTrue(is_cacheable(read_gpr("tool/tools.gpr.py")))
+        # These look for optional modules and may show a dialog
+        self.assertFalse(is_cacheable(read_gpr("view/geography.gpr.py")))
+        self.assertFalse(is_cacheable(read_gpr("gramplet/gramplet.gpr.py")))
+
+    def test_round_trip(self):
+        key = file_key(self.gpr, False)
+        cache = RegistrationCache(self.path)
+        self.assertIsNone(cache.get(self.gpr, key))
+        cache.put(self.gpr, key, [self.make_plugin()])
+        cache.save()
+
+        cache = RegistrationCache(self.path)
+        plugins = cache.get(self.gpr, key)
+        self.assertEqual(len(plugins), 1)
+        self.assertEqual(plugins[0].id, "test")
+        self.assertEqual(plugins[0].name, "Test")
+        self.assertEqual(plugins[0].tool_modes, [TOOL_MODE_CLI])
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        # Another translation is another key
+        self.assertIsNone(cache.get(self.gpr, file_key(self.gpr, True)))
+
+    def test_changed_file(self):
+        cache = RegistrationCache(self.path)
+        cache.put(self.gpr, file_key(self.gpr, False), [self.make_plugin()])
+        cache.save()
+        with open(self.gpr, "a", encoding="utf-8") as gpr:
+            gpr.write("register(TOOL, id='other')\n")
+        cache = RegistrationCache(self.path)
+        self.assertIsNone(cache.get(self.gpr, file_key(self.gpr, False)))
+
+    def test_removed_file(self):
+        cache = RegistrationCache(self.path)
+        cache.put(self.gpr, file_key(self.gpr, False), [self.make_plugin()])
+        os.remove(self.gpr)
+        cache.save()
+        cache = RegistrationCache(self.path)
+        cache.get(self.gpr, None)
+        self.assertEqual(cache.entries, {})
+
+    def test_damaged_cache(self):
+        with open(self.path, "wb") as cache_file:
+            cache_file.write(b"not a pickle")
+        cache = RegistrationCache(self.path)
+        self.assertIsNone(cache.get(self.gpr, file_key(self.gpr, False)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,7 +45,7 @@ from ..lib import (
     Note,
     Tag,
 )
-from ..utils.alive import probably_alive
+from ..utils.alive import probably_alive, alive_ranges
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -259,7 +259,11 @@ class LivingProxyDb(ProxyDbBase):
         person_handle = person.get_handle()
         unfil_person = self.get_unfiltered_person(person_handle)
         return probably_alive(
-            unfil_person, self.db, self.current_date, self.years_after_death
+            unfil_person,
+            self.db,
+            self.current_date,
+            self.years_after_death,
+            ranges=alive_ranges(self.db),
         )
 
     def __remove_living_from_family(self, family):
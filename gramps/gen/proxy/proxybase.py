@@ -988,3 +988,10 @@ class ProxyDbBase(DbReadBase):
         Return the database ID.
         """
         return self.basedb.get_dbid()
+
+    def may_have_common_ancestor(self, handle1, handle2):
+        """
+        The people of a proxy, and their links, are a part of those of the
+        real database, so the real database answers.
+        """
+        return self.db.may_have_common_ancestor(handle1, handle2)
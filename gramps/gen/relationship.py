@@ -1379,6 +1379,12 @@ class RelationshipCalculator:
         second_map = {}
         rank = 9999999
 
+        if not db.may_have_common_ancestor(orig_person.handle, other_person.handle):
+            # The ancestor index of the database tells there is no relation
+            if not self.__all_dist:
+                return (-1, None, "", [], "", []), self.__msg
+            return [(-1, None, "", [], "", [])], self.__msg
+
         try:
             if (
                 self.storemap
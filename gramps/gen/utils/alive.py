@@ -31,6 +31,7 @@ privacy in reports and exports.
 #
 # -------------------------------------------------------------------------
 import logging
+from weakref import WeakKeyDictionary
 
 LOG = logging.getLogger(".gen.utils.alive")
 
@@ -103,6 +104,21 @@ class ProbablyAlive:
         if person is None:
             return (None, None, "", None)
         self.pset = set()
+        result = self._own_range(person) or self._siblings_range(person)
+        if not result and not is_spouse:  # if you are not in recursion, let's recurse:
+            result = self._spouses_range(person)
+        if not result:
+            result = self._relatives_range(person)
+
+        # If we can't find any reason to believe that they are dead we
+        # must assume they are alive.
+
+        return result or (None, None, "", None)
+
+    def _own_range(self, person):
+        """
+        Return the range from the events of the person, or None.
+        """
         birth_ref = person.get_birth_ref()
         death_ref = person.get_death_ref()
         death_date = None
@@ -159,7 +175,13 @@ class ProbablyAlive:
 
         if death_date and birth_date:
             return (birth_date, death_date, explain, person)  # direct self evidence
+        return None
 
+    def _siblings_range(self, person):
+        """
+        Return the range from the events of the siblings of the person, or
+        None.
+        """
         # Neither birth nor death events are available. Try looking
         # at siblings. If a sibling was born more than X years past,
         # or more than Z future, then probably this person is
@@ -171,194 +193,276 @@ class ProbablyAlive:
             family = self.db.get_family_from_handle(family_handle)
             if family is None:
                 continue
-            for child_ref in family.get_child_ref_list():
-                child_handle = child_ref.ref
-                child = self.db.get_person_from_handle(child_handle)
-                if child is None:
-                    continue
-                # Go through once looking for direct evidence:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death date"),
-                                    child,
-                                )
-                # Go through again looking for fallback:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth-related date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death-related date"),
-                                    child,
-                                )
-
-        if not is_spouse:  # if you are not in recursion, let's recurse:
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if family:
-                    mother_handle = family.get_mother_handle()
-                    father_handle = family.get_father_handle()
-                    if mother_handle == person.handle and father_handle:
-                        father = self.db.get_person_from_handle(father_handle)
-                        date1, date2, explain, other = self.probably_alive_range(
-                            father, is_spouse=True
-                        )
-                        if date1 and date1.get_year() != 0:
+            result = self._children_range(family)
+            if result:
+                return result
+        return None
+
+    def _children_range(self, family):
+        """
+        Return the range from the events of the first child of a family
+        which has a birth or death date, or None.
+        """
+        for child_ref in family.get_child_ref_list():
+            child_handle = child_ref.ref
+            child = self.db.get_person_from_handle(child_handle)
+            if child is None:
+                continue
+            # Go through once looking for direct evidence:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
                             return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
                                 Date().copy_ymd(
-                                    date1.get_year() - self.AVG_GENERATION_GAP
-                                ),
-                                Date().copy_ymd(
-                                    date1.get_year()
-                                    - self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("a spouse's birth-related date, ") + explain,
-                                other,
+                                _("sibling birth date"),
+                                child,
                             )
-                        elif date2 and date2.get_year() != 0:
+                elif ev and ev.type.is_death():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
                             return (
                                 Date().copy_ymd(
-                                    date2.get_year()
-                                    + self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     - self.MAX_AGE_PROB_ALIVE
                                 ),
                                 Date().copy_ymd(
-                                    date2.get_year() + self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("a spouse's death-related date, ") + explain,
-                                other,
+                                _("sibling death date"),
+                                child,
                             )
-                    elif father_handle == person.handle and mother_handle:
-                        mother = self.db.get_person_from_handle(mother_handle)
-                        date1, date2, explain, other = self.probably_alive_range(
-                            mother, is_spouse=True
-                        )
-                        if date1 and date1.get_year() != 0:
+            # Go through again looking for fallback:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
                             return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
                                 Date().copy_ymd(
-                                    date1.get_year() - self.AVG_GENERATION_GAP
-                                ),
-                                Date().copy_ymd(
-                                    date1.get_year()
-                                    - self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("a spouse's birth-related date, ") + explain,
-                                other,
+                                _("sibling birth-related date"),
+                                child,
                             )
-                        elif date2 and date2.get_year() != 0:
+                elif ev and ev.type.is_death_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
                             return (
                                 Date().copy_ymd(
-                                    date2.get_year()
-                                    + self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     - self.MAX_AGE_PROB_ALIVE
                                 ),
                                 Date().copy_ymd(
-                                    date2.get_year() + self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("a spouse's death-related date, ") + explain,
-                                other,
+                                _("sibling death-related date"),
+                                child,
                             )
-                    # Let's check the family events and see if we find something
-                    for ref in family.get_event_ref_list():
-                        if ref:
-                            event = self.db.get_event_from_handle(ref.ref)
-                            if event:
-                                date = event.get_date_object()
-                                year = date.get_year()
-                                if year != 0:
-                                    other = None
-                                    if person.handle == mother_handle and father_handle:
-                                        other = self.db.get_person_from_handle(
-                                            father_handle
-                                        )
-                                    elif (
-                                        person.handle == father_handle and mother_handle
-                                    ):
-                                        other = self.db.get_person_from_handle(
-                                            mother_handle
-                                        )
-                                    return (
-                                        Date().copy_ymd(year - self.AVG_GENERATION_GAP),
-                                        Date().copy_ymd(
-                                            year
-                                            - self.AVG_GENERATION_GAP
-                                            + self.MAX_AGE_PROB_ALIVE
-                                        ),
-                                        _("event with spouse"),
-                                        other,
+        return None
+
+    def _spouse_range(self, spouse):
+        """
+        Return the range of a spouse, without looking at their own spouses.
+        """
+        return self.probably_alive_range(spouse, is_spouse=True)
+
+    def _spouses_range(self, person):
+        """
+        Return the range from the spouses of the person and the events of
+        their families, or None.
+        """
+        for family_handle in person.get_family_handle_list():
+            family = self.db.get_family_from_handle(family_handle)
+            if family:
+                mother_handle = family.get_mother_handle()
+                father_handle = family.get_father_handle()
+                if mother_handle == person.handle and father_handle:
+                    father = self.db.get_person_from_handle(father_handle)
+                    date1, date2, explain, other = self._spouse_range(father)
+                    if date1 and date1.get_year() != 0:
+                        return (
+                            Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
+                            Date().copy_ymd(
+                                date1.get_year()
+                                - self.AVG_GENERATION_GAP
+                                + self.MAX_AGE_PROB_ALIVE
+                            ),
+                            _("a spouse's birth-related date, ") + explain,
+                            other,
+                        )
+                    elif date2 and date2.get_year() != 0:
+                        return (
+                            Date().copy_ymd(
+                                date2.get_year()
+                                + self.AVG_GENERATION_GAP
+                                - self.MAX_AGE_PROB_ALIVE
+                            ),
+                            Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
+                            _("a spouse's death-related date, ") + explain,
+                            other,
+                        )
+                elif father_handle == person.handle and mother_handle:
+                    mother = self.db.get_person_from_handle(mother_handle)
+                    date1, date2, explain, other = self._spouse_range(mother)
+                    if date1 and date1.get_year() != 0:
+                        return (
+                            Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
+                            Date().copy_ymd(
+                                date1.get_year()
+                                - self.AVG_GENERATION_GAP
+                                + self.MAX_AGE_PROB_ALIVE
+                            ),
+                            _("a spouse's birth-related date, ") + explain,
+                            other,
+                        )
+                    elif date2 and date2.get_year() != 0:
+                        return (
+                            Date().copy_ymd(
+                                date2.get_year()
+                                + self.AVG_GENERATION_GAP
+                                - self.MAX_AGE_PROB_ALIVE
+                            ),
+                            Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
+                            _("a spouse's death-related date, ") + explain,
+                            other,
+                        )
+                # Let's check the family events and see if we find something
+                for ref in family.get_event_ref_list():
+                    if ref:
+                        event = self.db.get_event_from_handle(ref.ref)
+                        if event:
+                            date = event.get_date_object()
+                            year = date.get_year()
+                            if year != 0:
+                                other = None
+                                if person.handle == mother_handle and father_handle:
+                                    other = self.db.get_person_from_handle(
+                                        father_handle
                                     )
+                                elif person.handle == father_handle and mother_handle:
+                                    other = self.db.get_person_from_handle(
+                                        mother_handle
+                                    )
+                                return (
+                                    Date().copy_ymd(year - self.AVG_GENERATION_GAP),
+                                    Date().copy_ymd(
+                                        year
+                                        - self.AVG_GENERATION_GAP
+                                        + self.MAX_AGE_PROB_ALIVE
+                                    ),
+                                    _("event with spouse"),
+                                    other,
+                                )
+        return None
+
+    def _child_range(self, child, years):
+        """
+        Return the range from the birth or death of a descendant, who is
+        born years after the person, or None.
+        """
+        child_birth_ref = child.get_birth_ref()
+        if child_birth_ref:
+            child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
+            dobj = child_birth.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                d = Date(dobj)
+                val = d.get_start_date()
+                val = d.get_year() - years
+                d.set_year(val)
+                return (
+                    d,
+                    d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                    _("descendant birth date"),
+                    child,
+                )
+        child_death_ref = child.get_death_ref()
+        if child_death_ref:
+            child_death = self.db.get_event_from_handle(child_death_ref.ref)
+            dobj = child_death.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                return (
+                    dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
+                    dobj.copy_offset_ymd(
+                        -self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE
+                    ),
+                    _("descendant death date"),
+                    child,
+                )
+        return None
+
+    def _child_fallback_range(self, child, years):
+        """
+        Return the range from the birth-related or death-related events of a
+        descendant, who is born years after the person, or None.
+        """
+        for ev_ref in child.get_primary_event_ref_list():
+            ev = self.db.get_event_from_handle(ev_ref.ref)
+            if ev and ev.type.is_birth_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    d = Date(dobj)
+                    val = d.get_start_date()
+                    val = d.get_year() - years
+                    d.set_year(val)
+                    return (
+                        d,
+                        d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                        _("descendant birth-related date"),
+                        child,
+                    )
 
+            elif ev and ev.type.is_death_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    return (
+                        dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
+                        dobj.copy_offset_ymd(
+                            -self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE
+                        ),
+                        _("descendant death-related date"),
+                        child,
+                    )
+        return None
+
+    def _relatives_range(self, person):
+        """
+        Return the range from the descendants and the ancestors of the
+        person, or None.
+        """
         # Try looking for descendants that were born more than a lifespan
         # ago.
 
@@ -374,68 +478,18 @@ class ProbablyAlive:
                 for child_ref in family.get_child_ref_list():
                     child_handle = child_ref.ref
                     child = self.db.get_person_from_handle(child_handle)
-                    child_birth_ref = child.get_birth_ref()
-                    if child_birth_ref:
-                        child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
-                        dobj = child_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            d = Date(dobj)
-                            val = d.get_start_date()
-                            val = d.get_year() - years
-                            d.set_year(val)
-                            return (
-                                d,
-                                d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                _("descendant birth date"),
-                                child,
-                            )
-                    child_death_ref = child.get_death_ref()
-                    if child_death_ref:
-                        child_death = self.db.get_event_from_handle(child_death_ref.ref)
-                        dobj = child_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (
-                                dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                dobj.copy_offset_ymd(
-                                    -self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE
-                                ),
-                                _("descendant death date"),
-                                child,
-                            )
+                    result = self._child_range(child, years)
+                    if result:
+                        return result
                     date1, date2, explain, other = descendants_too_old(
                         child, years + self.AVG_GENERATION_GAP
                     )
                     if date1 and date2:
                         return date1, date2, explain, other
                     # Check fallback data:
-                    for ev_ref in child.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                d = Date(dobj)
-                                val = d.get_start_date()
-                                val = d.get_year() - years
-                                d.set_year(val)
-                                return (
-                                    d,
-                                    d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant birth-related date"),
-                                    child,
-                                )
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (
-                                    dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                    dobj.copy_offset_ymd(
-                                        -self.AVG_GENERATION_GAP
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("descendant death-related date"),
-                                    child,
-                                )
+                    result = self._child_fallback_range(child, years)
+                    if result:
+                        return result
 
             return (None, None, "", None)
 
@@ -628,11 +682,119 @@ class ProbablyAlive:
             )
         if date1 and date2:
             return (date1, date2, explain, other)
+        return None
 
-        # If we can't find any reason to believe that they are dead we
-        # must assume they are alive.
 
-        return (None, None, "", None)
+# -------------------------------------------------------------------------
+#
+# AliveRanges class
+#
+# -------------------------------------------------------------------------
+class AliveRanges(ProbablyAlive):
+    """
+    Computes the ranges of probably_alive_range for all the people of a
+    database in one pass.
+
+    The range from the children of a family, the range of a spouse and the
+    descendant found for a person are computed once, and used again for all
+    the people they are related to.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_sib_age_diff=None,
+        max_age_prob_alive=None,
+        avg_generation_gap=None,
+    ):
+        ProbablyAlive.__init__(
+            self, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
+        )
+        self.__children = {}
+        self.__spouses = {}
+        self.__descendants = {}
+
+    def compute(self):
+        """
+        Return a dictionary of the ranges of all the people, by handle.  The
+        related person of each range is replaced by its handle.
+        """
+        ranges = {}
+        for person in self.db.iter_people():
+            birth, death, explain, other = self.probably_alive_range(person)
+            if other is not None:
+                other = other.handle
+            ranges[person.handle] = (birth, death, explain, other)
+        self.__children.clear()
+        self.__spouses.clear()
+        self.__descendants.clear()
+        return ranges
+
+    def _children_range(self, family):
+        if family.handle not in self.__children:
+            self.__children[family.handle] = ProbablyAlive._children_range(self, family)
+        return self.__children[family.handle]
+
+    def _spouse_range(self, spouse):
+        if spouse is None:
+            return (None, None, "", None)
+        if spouse.handle not in self.__spouses:
+            self.__spouses[spouse.handle] = ProbablyAlive._spouse_range(self, spouse)
+        return self.__spouses[spouse.handle]
+
+    def _relatives_range(self, person):
+        # Only the descendants give a range: descendants_too_old adds the
+        # person to the people seen, and ancestors_too_old stops at them.
+        found = self.__find_descendant(person)
+        if found is None:
+            return None
+        handle, fallback, years = found
+        child = self.db.get_person_from_handle(handle)
+        years += self.AVG_GENERATION_GAP
+        if fallback:
+            return self._child_fallback_range(child, years)
+        return self._child_range(child, years)
+
+    def __find_descendant(self, person):
+        """
+        Return the descendant whose events give the range of a person, in the
+        order of descendants_too_old, as (handle, fallback, years), or None.
+        Fallback is True if the range is from birth-related or death-related
+        events, and years is the gap between the children of the person and
+        the descendant.
+        """
+        if person.handle in self.__descendants:
+            return self.__descendants[person.handle]
+        # A loop in the descendants gives nothing, as in descendants_too_old
+        self.__descendants[person.handle] = None
+        found = None
+        for family_handle in person.get_family_handle_list():
+            family = self.db.get_family_from_handle(family_handle)
+            if family:
+                found = self.__find_child_descendant(family)
+                if found:
+                    break
+        self.__descendants[person.handle] = found
+        return found
+
+    def __find_child_descendant(self, family):
+        """
+        Return the descendant whose events give the range of a parent of a
+        family, or None.  See __find_descendant.
+        """
+        for child_ref in family.get_child_ref_list():
+            child = self.db.get_person_from_handle(child_ref.ref)
+            if child is None:
+                continue
+            if self._child_range(child, 0):
+                return (child.handle, False, 0)
+            found = self.__find_descendant(child)
+            if found:
+                handle, fallback, years = found
+                return (handle, fallback, years + self.AVG_GENERATION_GAP)
+            if self._child_fallback_range(child, 0):
+                return (child.handle, True, 0)
+        return None
 
 
 # -------------------------------------------------------------------------
@@ -649,6 +811,7 @@ def probably_alive(
     max_age_prob_alive=None,
     avg_generation_gap=None,
     return_range=False,
+    ranges=None,
 ):
     """
     Return true if the person may be alive on current_date.
@@ -663,12 +826,19 @@ def probably_alive(
     :param max_sib_age_diff: maximum sibling age difference, in years
     :param max_age_prob_alive: maximum age of a person, in years
     :param avg_generation_gap: average generation gap, in years
+    :param ranges: the ranges of all people, as returned by alive_ranges
+                   with the same parameters
     """
-    # First, get the real database to use all people
-    # for determining alive status:
-    birth, death, explain, relative = probably_alive_range(
-        person, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
-    )
+    if ranges is not None and person.handle in ranges:
+        birth, death, explain, relative = ranges[person.handle]
+        if relative is not None and return_range:
+            relative = _get_basedb(db).get_person_from_handle(relative)
+    else:
+        # First, get the real database to use all people
+        # for determining alive status:
+        birth, death, explain, relative = probably_alive_range(
+            person, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
+        )
     if current_date is None:
         current_date = Today()
     LOG.debug(
@@ -702,14 +872,73 @@ def probably_alive_range(
     """
     # First, find the real database to use all people
     # for determining alive status:
+    basedb = _get_basedb(db)
+    # Now, we create a wrapper for doing work:
+    pb = ProbablyAlive(basedb, max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
+    return pb.probably_alive_range(person)
+
+
+class _AliveRangesCache:
+    """
+    The ranges of all people of a database, for each set of parameters.
+    They are forgotten when people, families or events are changed.
+    """
+
+    def __init__(self, db):
+        self.ranges = {}
+        for obj_type in ("person", "family", "event"):
+            for action in ("add", "update", "delete", "rebuild"):
+                db.connect("%s-%s" % (obj_type, action), self.clear)
+
+    def clear(self, *args):
+        """
+        Forget the ranges.
+        """
+        self.ranges.clear()
+
+
+# The cache of the ranges of each database
+_ALIVE_RANGES = WeakKeyDictionary()
+
+
+def alive_ranges(
+    db, max_sib_age_diff=None, max_age_prob_alive=None, avg_generation_gap=None
+):
+    """
+    Return a dictionary of the estimated birth and death dates of all people,
+    by handle, as (birth_date, death_date, explain_text, related_handle).
+
+    The dictionary is computed in one pass over the database, and kept until
+    people, families or events of the database are changed.  Use it with
+    probably_alive when most people are looked at.
+    """
+    basedb = _get_basedb(db)
+    params = (
+        _MAX_SIB_AGE_DIFF if max_sib_age_diff is None else max_sib_age_diff,
+        _MAX_AGE_PROB_ALIVE if max_age_prob_alive is None else max_age_prob_alive,
+        _AVG_GENERATION_GAP if avg_generation_gap is None else avg_generation_gap,
+    )
+    if not hasattr(basedb, "connect"):
+        # Changes cannot be followed
+        return AliveRanges(basedb, *params).compute()
+    cache = _ALIVE_RANGES.get(basedb)
+    if cache is None:
+        cache = _ALIVE_RANGES[basedb] = _AliveRangesCache(basedb)
+    if params not in cache.ranges:
+        cache.ranges[params] = AliveRanges(basedb, *params).compute()
+    return cache.ranges[params]
+
+
+def _get_basedb(db):
+    """
+    Return the real database behind proxies.
+    """
     from ..proxy.proxybase import ProxyDbBase
 
     basedb = db
     while isinstance(basedb, ProxyDbBase):
         basedb = basedb.db
-    # Now, we create a wrapper for doing work:
-    pb = ProbablyAlive(basedb, max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
-    return pb.probably_alive_range(person)
+    return basedb
 
 
 def update_constants():
@@ -26,6 +26,7 @@ Debugging utilities
 import cProfile
 import pstats
 import sys
+from time import perf_counter
 
 
 # -------------------------------------------------------------------------
@@ -91,3 +92,46 @@ def format_exception(tb_type=None, tb_value=None, tb=None):
                 line = "  %s = %s\n" % (key, "<ERROR PRINTING VALUE>")
             retval.append(line)
     return retval
+
+
+class PhaseTimer:
+    """
+    Measure the time taken by the phases of a run, such as the start of
+    Gramps, and print a report of them.
+
+    Each call to :meth:`mark` ends a phase, which started at the previous
+    call, or when the timer was created.
+    """
+
+    def __init__(self):
+        self.start = self.last = perf_counter()
+        self.phases = []
+        self.enabled = False
+
+    def mark(self, name, detail=""):
+        """
+        End the current phase.
+
+        :param name: the name of the phase which ends
+        :param detail: more information about the phase
+        """
+        now = perf_counter()
+        self.phases.append((name, now - self.last, detail))
+        self.last = now
+
+    def report(self, file=None):
+        """
+        Print the time taken by each phase, if the timer is enabled.
+        """
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        print("Startup timing:", file=file)
+        for name, seconds, detail in self.phases:
+            line = "  %-28s %8.3f s  %s" % (name, seconds, detail)
+            print(line.rstrip(), file=file)
+        print("  %-28s %8.3f s" % ("total", self.last - self.start), file=file)
+
+
+# The phases of the start of Gramps, reported with the --timing option
+STARTUP_TIMER = PhaseTimer()
@@ -0,0 +1,88 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the ranges of probably_alive computed for all people
+"""
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import Date, Event, EventRef, EventType
+from ...user import User
+from ..alive import alive_ranges, probably_alive, probably_alive_range
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class AliveRangesTest(unittest.TestCase):
+    """
+    Test that the ranges of all people match those of each person.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_ranges(self):
+        ranges = alive_ranges(self.db)
+        self.assertEqual(len(ranges), self.db.get_number_of_people())
+        for person in self.db.iter_people():
+            birth, death, explain, other = probably_alive_range(person, self.db)
+            expected = (
+                str(birth),
+                str(death),
+                explain,
+                other.handle if other else None,
+            )
+            birth, death, explain, other = ranges[person.handle]
+            self.assertEqual((str(birth), str(death), explain, other), expected)
+            self.assertEqual(
+                probably_alive(person, self.db, ranges=ranges),
+                probably_alive(person, self.db),
+            )
+
+    def test_cache(self):
+        ranges = alive_ranges(self.db)
+        self.assertIs(alive_ranges(self.db), ranges)
+        person = next(
+            person
+            for person in self.db.iter_people()
+            if probably_alive(person, self.db, ranges=ranges)
+        )
+        with DbTxn("Add death", self.db) as trans:
+            event = Event()
+            event.set_type(EventType.DEATH)
+            event.set_date_object(Date(1900))
+            self.db.add_event(event, trans)
+            event_ref = EventRef()
+            event_ref.set_reference_handle(event.handle)
+            person.add_event_ref(event_ref)
+            person.set_death_ref(event_ref)
+            self.db.commit_person(person, trans)
+        ranges = alive_ranges(self.db)
+        self.assertFalse(probably_alive(person, self.db, ranges=ranges))
+
+
+if __name__ == "__main__":
+    unittest.main()
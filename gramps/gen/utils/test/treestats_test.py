@@ -0,0 +1,136 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the statistics about people shared by the gramplets
+"""
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import Date, Person
+from ...user import User
+from ..treestats import AGE, FATHER_AGE, MOTHER_AGE, PersonStatistics
+from ..treestats import person_statistics
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+def build(stats):
+    """
+    Build statistics and return a summary of them.
+    """
+    for _ in stats.build():
+        pass
+    return (
+        {surname: count for surname, (count, _) in stats.get_surnames().items()},
+        dict(stats.unique_surnames),
+        dict(stats.given_names),
+        dict(stats.genders),
+        stats.with_media,
+        stats.total_media,
+        stats.incomplete_names,
+        stats.disconnected,
+        stats.missing_birth,
+        [
+            {
+                value: sorted(handles)
+                for value, handles in stats.get_histogram(name)[1].items()
+            }
+            for name in (AGE, MOTHER_AGE, FATHER_AGE)
+        ],
+    )
+
+
+class PersonStatisticsTest(unittest.TestCase):
+    """
+    Test that the statistics follow the changes of the database.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_build(self):
+        stats = person_statistics(self.db)
+        self.assertIs(person_statistics(self.db), stats)
+        build(stats)
+        self.assertEqual(stats.get_number_of_people(), self.db.get_number_of_people())
+        surnames = stats.get_surnames()
+        count, handle = surnames["Garner"]
+        self.assertEqual(
+            count,
+            sum(
+                any(
+                    name.get_group_name() == "Garner"
+                    for name in [person.get_primary_name()]
+                    + person.get_alternate_names()
+                )
+                for person in self.db.iter_people()
+            ),
+        )
+        person = self.db.get_person_from_handle(handle)
+        self.assertIn(
+            "Garner",
+            [
+                name.get_group_name()
+                for name in [person.get_primary_name()] + person.get_alternate_names()
+            ],
+        )
+        self.assertEqual(sum(stats.genders.values()), self.db.get_number_of_people())
+
+    def test_changes(self):
+        stats = person_statistics(self.db)
+        build(stats)
+        # Change the birth of a mother
+        family = next(
+            family
+            for family in self.db.iter_families()
+            if family.get_mother_handle()
+            and family.get_father_handle()
+            and family.get_child_ref_list()
+            and self.db.get_person_from_handle(
+                family.get_mother_handle()
+            ).get_birth_ref()
+        )
+        mother = self.db.get_person_from_handle(family.get_mother_handle())
+        event = self.db.get_event_from_handle(mother.get_birth_ref().ref)
+        date = Date()
+        date.set_yr_mon_day(1700, 1, 1)
+        event.set_date_object(date)
+        with DbTxn("Change birth", self.db) as trans:
+            self.db.commit_event(event, trans)
+        # Change the gender of a person
+        person = self.db.get_person_from_handle(family.get_child_ref_list()[0].ref)
+        person.set_gender(Person.OTHER)
+        with DbTxn("Change gender", self.db) as trans:
+            self.db.commit_person(person, trans)
+        # Remove a father
+        with DbTxn("Remove person", self.db) as trans:
+            self.db.remove_person(family.get_father_handle(), trans)
+        self.assertTrue(stats.built)
+        self.assertEqual(build(stats), build(PersonStatistics(self.db)))
+
+
+if __name__ == "__main__":
+    unittest.main()
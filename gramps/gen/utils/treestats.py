@@ -0,0 +1,435 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics about the people of a database, shared by the gramplets.
+
+The statistics are built in one pass over the people when they are first
+needed.  They are then kept up to date from the signals of the database:
+only the people which were changed, and their children, are read again.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+from collections import Counter, defaultdict
+from weakref import WeakKeyDictionary, ref
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..datehandler import get_date
+from ..lib import ChildRefType
+from .callback import Callback
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+_YIELD_INTERVAL = 350
+
+# The histograms of ages
+AGE = "age"
+MOTHER_AGE = "mother-age"
+FATHER_AGE = "father-age"
+
+
+# -------------------------------------------------------------------------
+#
+# PersonRecord
+#
+# -------------------------------------------------------------------------
+class PersonRecord:
+    """
+    What the statistics count about a person.
+    """
+
+    __slots__ = (
+        "group_names",
+        "surnames",
+        "given_names",
+        "gender",
+        "media",
+        "incomplete_names",
+        "disconnected",
+        "missing_birth",
+        "birth",
+        "death",
+        "mother",
+        "father",
+    )
+
+    def __init__(self, db, person):
+        names = [person.get_primary_name()] + person.get_alternate_names()
+        self.group_names = {name.get_group_name().strip() for name in names}
+        self.surnames = {
+            name.get_surname().strip()
+            for name in names
+            if name.get_surname().strip() != ""
+        }
+        self.given_names = []
+        for givenname in {name.get_first_name().strip() for name in names}:
+            nbsp = givenname.split("\u00A0")
+            if len(nbsp) > 1:  # there was an NBSP, a non-breaking space
+                self.given_names.append(nbsp[0] + "\u00A0" + nbsp[1].split()[0])
+                givenname = " ".join(nbsp[1].split()[1:])
+            self.given_names.extend(givenname.split())
+
+        self.gender = person.get_gender()
+        self.media = len(person.get_media_list())
+        self.incomplete_names = 0
+        for name in names:
+            if name.get_first_name().strip() == "":
+                self.incomplete_names += 1
+            elif name.get_surname_list():
+                for surname in name.get_surname_list():
+                    if surname.get_surname().strip() == "":
+                        self.incomplete_names += 1
+            else:
+                self.incomplete_names += 1
+        self.disconnected = not (
+            person.get_main_parents_family_handle() or person.get_family_handle_list()
+        )
+
+        self.missing_birth = True
+        self.birth = self.death = None
+        birth_ref = person.get_birth_ref()
+        if birth_ref:
+            event = db.get_event_from_handle(birth_ref.ref)
+            self.missing_birth = not get_date(event)
+            self.birth = _get_valid_date(event)
+        death_ref = person.get_death_ref()
+        if death_ref:
+            self.death = _get_valid_date(db.get_event_from_handle(death_ref.ref))
+
+        self.mother = self.father = None
+        for family_handle in person.get_parent_family_handle_list():
+            if not db.has_family_handle(family_handle):
+                continue
+            family = db.get_family_from_handle(family_handle)
+            for child_ref in family.get_child_ref_list():
+                if child_ref.ref == person.handle:
+                    if child_ref.get_mother_relation() == ChildRefType.BIRTH:
+                        self.mother = family.get_mother_handle()
+                    if child_ref.get_father_relation() == ChildRefType.BIRTH:
+                        self.father = family.get_father_handle()
+                    break
+
+
+def _add(counter, key, count):
+    """
+    Add to a counter, dropping the keys which are no longer counted.
+    """
+    counter[key] += count
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def _get_valid_date(event):
+    """
+    Return the date of an event, or None if it is not valid.
+    """
+    date = event.get_date_object()
+    if date.is_valid():
+        return date
+    return None
+
+
+# -------------------------------------------------------------------------
+#
+# PersonStatistics
+#
+# -------------------------------------------------------------------------
+class PersonStatistics(Callback):
+    """
+    Counts and histograms about all people of a database.
+
+    Call :meth:`build` before reading them.  The statistics-changed signal
+    is emitted when they change.
+    """
+
+    __signals__ = {"statistics-changed": None}
+
+    def __init__(self, db):
+        Callback.__init__(self)
+        self.db_ref = ref(db)
+        self.built = False
+        self.__builder = None
+        self.__clear()
+        for obj_type in ("person", "family", "event"):
+            db.connect("%s-rebuild" % obj_type, self.__rebuild)
+        db.connect("person-add", self.__people_changed)
+        db.connect("person-update", self.__people_changed)
+        db.connect("person-delete", self.__people_changed)
+        db.connect("family-add", self.__families_changed)
+        db.connect("family-update", self.__families_changed)
+        db.connect("family-delete", self.__families_changed)
+        db.connect("event-update", self.__events_changed)
+
+    def __clear(self):
+        """
+        Forget all statistics.
+        """
+        self.people = {}
+        self.children = defaultdict(set)
+        self.ages = {}
+        self.surnames = defaultdict(set)
+        self.unique_surnames = Counter()
+        self.given_names = Counter()
+        self.genders = Counter()
+        self.with_media = 0
+        self.total_media = 0
+        self.incomplete_names = 0
+        self.disconnected = 0
+        self.missing_birth = 0
+        self.histograms = {
+            AGE: defaultdict(Counter),
+            MOTHER_AGE: defaultdict(Counter),
+            FATHER_AGE: defaultdict(Counter),
+        }
+
+    def build(self):
+        """
+        Build the statistics, if they are not built yet.  This is a
+        generator, which yields True from time to time so that the user
+        interface stays responsive.
+        """
+        while not self.built:
+            if self.__builder is None:
+                self.__builder = self.__build()
+            try:
+                next(self.__builder)
+            except StopIteration:
+                self.__builder = None
+                self.built = True
+            else:
+                yield True
+
+    def __build(self):
+        """
+        Read all people, then count them.
+        """
+        db = self.db_ref()
+        self.__clear()
+        for cnt, person in enumerate(db.iter_people(), 1):
+            self.__read_person(db, person.handle, person)
+            if not cnt % _YIELD_INTERVAL:
+                yield True
+        for cnt, handle in enumerate(self.people, 1):
+            self.__add_ages(handle)
+            if not cnt % _YIELD_INTERVAL:
+                yield True
+
+    def __rebuild(self, *args):
+        """
+        Forget the statistics, which are built again when next needed.
+        """
+        self.built = False
+        self.__builder = None
+        self.__clear()
+        self.emit("statistics-changed")
+
+    def __update(self, handles):
+        """
+        Read some people again.  The ages of their children at their birth
+        are counted again.
+        """
+        db = self.db_ref()
+        affected = set(handles)
+        for handle in handles:
+            affected.update(self.children.get(handle, ()))
+        for handle in affected:
+            self.__remove_ages(handle)
+        for handle in handles:
+            if db.has_person_handle(handle):
+                self.__read_person(db, handle, db.get_person_from_handle(handle))
+            else:
+                self.__read_person(db, handle, None)
+        for handle in affected:
+            self.__add_ages(handle)
+        self.emit("statistics-changed")
+
+    def __is_built(self):
+        """
+        Return True if the statistics are built, and must follow the changes.
+        A build in progress is started again.
+        """
+        if not self.built and self.__builder is not None:
+            # The people changed while they were read
+            self.__rebuild()
+        return self.built
+
+    def __people_changed(self, handles):
+        if self.__is_built():
+            self.__update(handles)
+
+    def __families_changed(self, handles):
+        if not self.__is_built():
+            return
+        db = self.db_ref()
+        children = set()
+        for handle in handles:
+            if db.has_family_handle(handle):
+                family = db.get_family_from_handle(handle)
+                children.update(ref.ref for ref in family.get_child_ref_list())
+        self.__update([handle for handle in children if handle in self.people])
+
+    def __events_changed(self, handles):
+        if not self.__is_built():
+            return
+        db = self.db_ref()
+        people = set()
+        for handle in handles:
+            people.update(
+                person_handle
+                for _, person_handle in db.find_backlink_handles(handle, ["Person"])
+            )
+        if people:
+            self.__update(people)
+
+    def __read_person(self, db, handle, person):
+        """
+        Replace the counts of a person by those of its current data.
+        """
+        record = self.people.pop(handle, None)
+        if record is not None:
+            self.__count(handle, record, -1)
+        if person is not None:
+            record = PersonRecord(db, person)
+            self.people[handle] = record
+            self.__count(handle, record, 1)
+
+    def __count(self, handle, record, sign):
+        """
+        Add or remove the counts of a person.
+        """
+        for surname in record.group_names:
+            if sign > 0:
+                self.surnames[surname].add(handle)
+            else:
+                self.surnames[surname].discard(handle)
+                if not self.surnames[surname]:
+                    del self.surnames[surname]
+        for surname in record.surnames:
+            _add(self.unique_surnames, surname, sign)
+        for givenname in record.given_names:
+            _add(self.given_names, givenname, sign)
+        self.genders[record.gender] += sign
+        self.with_media += sign * bool(record.media)
+        self.total_media += sign * record.media
+        self.incomplete_names += sign * record.incomplete_names
+        self.disconnected += sign * record.disconnected
+        self.missing_birth += sign * record.missing_birth
+        for parent in (record.mother, record.father):
+            if parent:
+                if sign > 0:
+                    self.children[parent].add(handle)
+                else:
+                    self.children[parent].discard(handle)
+                    if not self.children[parent]:
+                        del self.children[parent]
+
+    def __add_ages(self, handle):
+        """
+        Add a person to the histograms of ages.
+        """
+        record = self.people.get(handle)
+        if record is None or record.birth is None:
+            return
+        ages = []
+        if record.death is not None:
+            age = (record.death - record.birth).tuple()[0]
+            if age >= 0:
+                ages.append((AGE, age, handle))
+        for name, parent in ((MOTHER_AGE, record.mother), (FATHER_AGE, record.father)):
+            parent_record = self.people.get(parent)
+            if parent_record is not None and parent_record.birth is not None:
+                diff = (record.birth - parent_record.birth).tuple()[0]
+                if diff >= 0:
+                    ages.append((name, diff, parent))
+        for name, value, age_handle in ages:
+            _add(self.histograms[name][value], age_handle, 1)
+        self.ages[handle] = ages
+
+    def __remove_ages(self, handle):
+        """
+        Remove a person from the histograms of ages.
+        """
+        for name, value, age_handle in self.ages.pop(handle, ()):
+            handles = self.histograms[name][value]
+            _add(handles, age_handle, -1)
+            if not handles:
+                del self.histograms[name][value]
+
+    def get_number_of_people(self):
+        """
+        Return the number of people.
+        """
+        return len(self.people)
+
+    def get_surnames(self):
+        """
+        Return the number of people with each surname, and one of them, as a
+        dictionary of (count, handle) by surname.
+        """
+        return {
+            surname: (len(handles), next(iter(handles)))
+            for surname, handles in self.surnames.items()
+        }
+
+    def get_histogram(self, name):
+        """
+        Return a histogram of ages, as a dictionary of counts by age and a
+        dictionary of the lists of people by age.
+
+        :param name: AGE, MOTHER_AGE or FATHER_AGE
+        """
+        data = {}
+        handles = {}
+        for value, counter in self.histograms[name].items():
+            data[value] = sum(counter.values())
+            handles[value] = list(counter.elements())
+        return data, handles
+
+    def get_gender_count(self, gender):
+        """
+        Return the number of people of a gender.
+        """
+        return self.genders[gender]
+
+
+# The statistics of each database
+_PERSON_STATISTICS = WeakKeyDictionary()
+
+
+def person_statistics(db):
+    """
+    Return the :class:`PersonStatistics` of a database, which are shared by
+    all their users.
+    """
+    stats = _PERSON_STATISTICS.get(db)
+    if stats is None:
+        stats = _PERSON_STATISTICS[db] = PersonStatistics(db)
+    return stats
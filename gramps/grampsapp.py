@@ -51,6 +51,7 @@ if "-S" in sys.argv or "--safe" in sys.argv:
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from .gen.utils.debug import STARTUP_TIMER
 from .gen.const import APP_GRAMPS, USER_DIRLIST, USER_DATA, ORIG_HOME_DIR
 from .gen.constfunc import mac
 from .version import VERSION_TUPLE
@@ -633,6 +634,8 @@ def run():
 
     argv_copy = sys.argv[:]
     argpars = ArgParser(argv_copy)
+    STARTUP_TIMER.enabled = argpars.timing
+    STARTUP_TIMER.mark("initialization")
 
     # if in safe mode we should point the db dir back to the original dir.
     # It is ok to import config here, 'Defaults' command had its chance...
@@ -42,6 +42,7 @@ from gramps.gen.config import config
 from gramps.gen.const import DATA_DIR, IMAGE_DIR, GTK_GETTEXT_DOMAIN
 from gramps.gen.constfunc import has_display, lin
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.utils.debug import STARTUP_TIMER
 
 _ = glocale.translation.gettext
 
@@ -563,6 +564,7 @@ class Gramps:
         from gramps.gen.dbstate import DbState
         from .viewmanager import ViewManager
         from gramps.cli.arghandler import ArgHandler
+        from gramps.cli.grampscli import plugin_cache_detail
         from .tipofday import TipOfDay
         import gettext
 
@@ -572,6 +574,7 @@ class Gramps:
 
         dbstate = DbState()
         self._vm = ViewManager(app, dbstate, config.get("interface.view-categories"))
+        STARTUP_TIMER.mark("main window")
 
         if lin() and glocale.lang != "C" and not gettext.find(GTK_GETTEXT_DOMAIN):
             _display_gtk_gettext_message(parent=self._vm.window)
@@ -579,10 +582,12 @@ class Gramps:
         _display_translator_message(parent=self._vm.window)
 
         self._vm.init_interface()
+        STARTUP_TIMER.mark("plugin registration", plugin_cache_detail())
 
         # act based on the given arguments
         arg_h = ArgHandler(dbstate, argparser, self._vm, self.argerrorfunc, gui=True)
         arg_h.handle_args_gui()
+        STARTUP_TIMER.mark("arguments")
         if arg_h.open or arg_h.imp_db_path:
             # if we opened or imported something, only show the interface
             self._vm.post_init_interface(show_manager=False)
@@ -602,6 +607,9 @@ class Gramps:
             # open without fam tree loaded
             self._vm.post_init_interface()
 
+        STARTUP_TIMER.mark("interface")
+        STARTUP_TIMER.report()
+
         if config.get("behavior.use-tips"):
             TipOfDay(self._vm.uistate)
 
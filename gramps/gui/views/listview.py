@@ -796,6 +796,8 @@ class ListView(NavigationView):
                 self.model.reverse_order()
                 self.list.set_model(self.model)
         else:
+            self.list.set_model(None)
+            self.model.destroy()
             self.model = self.make_model(
                 self.dbstate.db,
                 self.uistate,
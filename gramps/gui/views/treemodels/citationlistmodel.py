@@ -59,6 +59,9 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
     Flat citation model.  (Original code in CitationBaseModel).
     """
 
+    stored_sort_class = "Citation"
+    stored_sort_columns = (0, 1, 3, 4, 6)
+
     def __init__(
         self,
         db,
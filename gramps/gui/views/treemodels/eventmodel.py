@@ -59,6 +59,9 @@ INVALID_DATE_FORMAT = config.get("preferences.invalid-date-format")
 #
 # -------------------------------------------------------------------------
 class EventModel(FlatBaseModel):
+    stored_sort_class = "Event"
+    stored_sort_columns = (0, 1, 2, 5, 7)
+
     def __init__(
         self,
         db,
@@ -58,6 +58,9 @@ invalid_date_format = config.get("preferences.invalid-date-format")
 #
 # -------------------------------------------------------------------------
 class FamilyModel(FlatBaseModel):
+    stored_sort_class = "Family"
+    stored_sort_columns = (0, 3, 5, 7)
+
     def __init__(
         self,
         db,
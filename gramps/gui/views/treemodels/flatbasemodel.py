@@ -72,6 +72,8 @@ from gi.repository import Gtk
 # -------------------------------------------------------------------------
 from gramps.gen.filters import SearchFilter, ExactSearchFilter
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.display.name import displayer as name_displayer
+from gramps.version import VERSION
 from .basemodel import BaseModel
 from ...user import User
 from gramps.gen.proxy.cache import CacheProxyDb
@@ -261,6 +263,26 @@ class FlatNodeMap:
 
         return Gtk.TreePath((self.real_path(index),))
 
+    def get_next_handles(self, handle, count):
+        """
+        Return the handles of at most count rows, in the order of the
+        treeview, starting with the row of the passed handle.
+
+        :param handle: the key of the object of the first row
+        :type handle: an object handle
+        :param count: the largest number of handles
+        :type count: int
+        :Returns: the list of handles, empty if handle does not link to a path
+        """
+        index = self._hndl2index.get(handle)
+        if index is None:
+            return []
+        path = self.real_path(index)
+        return [
+            self._index2hndl[self.real_index(next_path)][1]
+            for next_path in range(path, min(path + count, len(self._index2hndl)))
+        ]
+
     def get_sortkey(self, handle):
         """
         Return the sortkey used for the passed handle.
@@ -449,6 +471,12 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             so as to have localized sort
     """
 
+    # The primary object class of the model, and the model columns whose sort
+    # keys only depend on the object.  The database may store the sort keys
+    # of these columns, so that they are not computed each time.
+    stored_sort_class = None
+    stored_sort_columns = ()
+
     def __init__(
         self,
         db,
@@ -484,6 +512,9 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # get the function that maps data to sort_keys
         self.sort_func = lambda x: glocale.sort_key(self.smap[col](x))
         self.sort_col = scol
+        self.sort_model_col = col
+        # the database keeping the sort keys with self.__stored_sort_func
+        self.__sort_key_db = None
         self.skip = skip
         self._in_build = False
 
@@ -501,6 +532,11 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Unset all elements that prevent garbage collection
         """
+        if self.__sort_key_db is not None:
+            self.__sort_key_db.release_sort_keys(
+                self.__sort_key_name(), self.__stored_sort_func
+            )
+            self.__sort_key_db = None
         BaseModel.destroy(self)
         self.db = None
         self.sort_func = None
@@ -573,6 +609,18 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         be shown.
         This list is sorted ascending, via localized string sort.
         """
+        if self.__stores_sort_keys():
+            if self.__sort_key_db is not None:
+                self.__sort_key_db.release_sort_keys(
+                    self.__sort_key_name(), self.__stored_sort_func
+                )
+            self.__sort_key_db = self.db
+            return self.db.get_sort_keys(
+                self.stored_sort_class,
+                self.__sort_key_name(),
+                self.sort_key_version(),
+                self.__stored_sort_func,
+            )
         # use cursor as a context manager
         with self.gen_cursor() as cursor:
             # loop over database and store the sort field, and the handle
@@ -580,6 +628,45 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             srt_keys.sort()
             return srt_keys
 
+    def sort_key_version(self):
+        """
+        Return the version of the sort keys of the sort column.  It changes
+        with the settings the sort keys depend on, so that the database
+        computes the stored sort keys again.
+        """
+        return "%s %s %s %r %s" % (
+            VERSION,
+            glocale.get_collation(),
+            glocale.language[0],
+            name_displayer.get_name_format(also_default=True, only_active=False),
+            name_displayer.get_default_format(),
+        )
+
+    def __stores_sort_keys(self):
+        """
+        Return True if the database may store the sort keys of the sort
+        column.
+        """
+        return (
+            self.stored_sort_class is not None
+            and self.sort_model_col in self.stored_sort_columns
+        )
+
+    def __sort_key_name(self):
+        """
+        Return the name of the stored sort keys of the sort column.
+        """
+        return "%s:%d" % (self.__class__.__name__, self.sort_model_col)
+
+    def __stored_sort_func(self, data):
+        """
+        Return the sort key of the data of an object, when the database
+        updates the stored sort keys.  The cached values of the object may
+        be out of date.
+        """
+        self.clear_cache(data["handle"])
+        return self.sort_func(data)
+
     def _rebuild_search(self, ignore=None):
         """function called when view must be build, given a search text
         in the top search bar
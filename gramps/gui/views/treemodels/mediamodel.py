@@ -56,6 +56,9 @@ from .flatbasemodel import FlatBaseModel
 #
 # -------------------------------------------------------------------------
 class MediaModel(FlatBaseModel):
+    stored_sort_class = "Media"
+    stored_sort_columns = (0, 1, 2, 3, 4, 5, 7)
+
     def __init__(
         self,
         db,
@@ -55,6 +55,9 @@ from gramps.gen.lib import Note, NoteType, StyledText
 class NoteModel(FlatBaseModel):
     """ """
 
+    stored_sort_class = "Note"
+    stored_sort_columns = (0, 1, 2, 3, 5)
+
     def __init__(
         self,
         db,
@@ -80,6 +80,9 @@ from gramps.gen.config import config
 invalid_date_format = config.get("preferences.invalid-date-format")
 no_surname = config.get("preferences.no-surname-text")
 
+# The number of rows of the person list whose names are formatted together
+NAME_BATCH_SIZE = 100
+
 
 # -------------------------------------------------------------------------
 #
@@ -561,6 +564,9 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
     Listed people model.
     """
 
+    stored_sort_class = "Person"
+    stored_sort_columns = (0, 1, 2, 12, 14)
+
     def __init__(
         self,
         db,
@@ -590,12 +596,41 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
         PeopleBaseModel.destroy(self)
         FlatBaseModel.destroy(self)
 
+    def column_name(self, data):
+        """
+        Return the name of a person.  The names of the rows shown after it,
+        which the view asks for next, are formatted in the same batch.
+        """
+        handle = data["handle"]
+        cached, name = self.get_cached_value(handle, "NAME")
+        if cached:
+            return name
+        if self._in_build or self.lru_data.count <= 1:
+            # The names could not be kept
+            return name_displayer.raw_display_name(data["primary_name"])
+        # Do not push the rows out of the cache
+        count = min(NAME_BATCH_SIZE, self.lru_data.count // 2)
+        batch = [data]
+        for next_handle in self.node_map.get_next_handles(handle, count)[1:]:
+            if not self.get_cached_value(next_handle, "NAME")[0]:
+                next_data = self.map(next_handle)
+                if next_data:
+                    batch.append(next_data)
+        names = name_displayer.display_many(
+            next_data["primary_name"] for next_data in batch
+        )
+        for next_data, next_name in zip(batch, names):
+            self.set_cached_value(next_data["handle"], "NAME", next_name)
+        return names[0]
+
 
 class PersonTreeModel(PeopleBaseModel, TreeBaseModel):
     """
     Hierarchical people model.
     """
 
+    group_class = "Person"
+
     def __init__(
         self,
         db,
@@ -639,6 +674,22 @@ class PersonTreeModel(PeopleBaseModel, TreeBaseModel):
     def column_header(self, node):
         return node.name if node.name else no_surname
 
+    def group_key(self, data):
+        """
+        Return the group name of a person.
+        """
+        return name_displayer.name_grouping_data(self.db, data["primary_name"])
+
+    def group_key_version(self):
+        """
+        The group names also depend on the grouping of the surnames.
+        """
+        groups = [
+            (name, self.db.get_name_group_mapping(name))
+            for name in self.db.get_name_group_keys()
+        ]
+        return "%s %r" % (TreeBaseModel.group_key_version(self), groups)
+
     def add_row(self, handle, data):
         """
         Add nodes to the node map for a single person.
@@ -276,6 +276,9 @@ class PlaceListModel(PlaceBaseModel, FlatBaseModel):
     Flat place model.  (Original code in PlaceBaseModel).
     """
 
+    stored_sort_class = "Place"
+    stored_sort_columns = (0, 1, 3, 4, 5, 6, 7, 9)
+
     def __init__(
         self,
         db,
@@ -309,6 +312,8 @@ class PlaceTreeModel(PlaceBaseModel, TreeBaseModel):
     Hierarchical place model.
     """
 
+    group_class = "Place"
+
     def __init__(
         self,
         db,
@@ -374,6 +379,14 @@ class PlaceTreeModel(PlaceBaseModel, TreeBaseModel):
 
         self.add_node(parent, handle, sort_key, handle, add_parent=False)
 
+    def group_key(self, data):
+        """
+        Return the handle of the place enclosing a place, or an empty string.
+        """
+        if len(data["placeref_list"]) > 0:
+            return data["placeref_list"][0]["ref"]
+        return ""
+
     def column_header(self, data):
         # should not get here!
         return "????"
@@ -53,6 +53,9 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class RepositoryModel(FlatBaseModel):
+    stored_sort_class = "Repository"
+    stored_sort_columns = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 14)
+
     def __init__(
         self,
         db,
@@ -51,6 +51,9 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class SourceModel(FlatBaseModel):
+    stored_sort_class = "Source"
+    stored_sort_columns = (0, 1, 2, 3, 4, 5, 7)
+
     def __init__(
         self,
         db,
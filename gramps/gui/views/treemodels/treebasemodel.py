@@ -57,6 +57,7 @@ import gramps.gui.widgets.progressdialog as progressdlg
 from ...user import User
 from bisect import bisect_right
 from gramps.gen.filters import SearchFilter, ExactSearchFilter
+from gramps.version import VERSION
 from .basemodel import BaseModel
 from gramps.gen.proxy.cache import CacheProxyDb
 
@@ -290,8 +291,23 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
     has_secondary  :  If True, the model contains two Gramps object types.
                       The suffix '2' is appended to variables relating to the
                       secondary object type.
+
+    Lazy mode:
+    When nothing is filtered, models which define group_key only create the
+    top level nodes when they are built.  The children of a node are added
+    when the view first asks for them, usually when the node is expanded.
+    group_key(data) returns the ref of the node under which an object is
+    shown, which is a group name, or the handle of the parent object if
+    group_can_have_handle (an empty string for top level objects).  The
+    database stores these keys, so the nodes can be found without reading
+    all objects.
     """
 
+    # The primary object class of the model, and the function giving the
+    # group of its objects, for the lazy mode
+    group_class = None
+    group_key = None
+
     def __init__(
         self,
         db,
@@ -360,6 +376,13 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         self.__total = 0
         self.__displayed = 0
+        self.__lazy = False
+        # refs of the nodes whose children are not added yet, in lazy mode
+        self.__unloaded = set()
+        # handles of the objects which have children, in lazy mode
+        self.__parents = set()
+        # the database keeping the group keys with self.__group_key_func
+        self.__group_key_db = None
 
         self.set_search(search)
         if self.has_secondary:
@@ -375,6 +398,11 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Unset all elements that prevent garbage collection
         """
+        if self.__group_key_db is not None:
+            self.__group_key_db.release_sort_keys(
+                self.__group_key_name(), self.__group_key_func
+            )
+            self.__group_key_db = None
         BaseModel.destroy(self)
         self.db = None
         self.sort_func = None
@@ -420,12 +448,17 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Return the number of rows displayed.
         """
+        if self.__lazy:
+            # nothing is filtered, and most rows are not added yet
+            return self.number_items()
         return self.__displayed
 
     def total(self):
         """
         Return the total number of rows without a filter or search condition.
         """
+        if self.__lazy:
+            return self.number_items()
         return self.__total
 
     def color_column(self):
@@ -441,6 +474,9 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.clear_cache()
         self.tree.clear()
         self.handle2node.clear()
+        self.__lazy = False
+        self.__unloaded.clear()
+        self.__parents.clear()
         self.stamp += 1
         self.nodemap.clear()
         # start with creating the new iters
@@ -544,6 +580,9 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         self.__total = 0
         self.__displayed = 0
+        if self.__is_lazy(dfilter, skip):
+            self.__build_lazy()
+            return
 
         items = self.number_items()
         _LOG.debug("rebuild search primary")
@@ -587,6 +626,9 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         self.__total = 0
         self.__displayed = 0
+        if self.__is_lazy(dfilter, skip):
+            self.__build_lazy()
+            return
 
         if not self.has_secondary:
             # The tree only has primary data
@@ -641,6 +683,129 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         status_ppl.end()
 
+    def __is_lazy(self, dfilter, skip):
+        """
+        Return True if the model can be built in lazy mode.  The group keys
+        must be stored by the database, otherwise reading the objects of a
+        group goes through all the objects, and the model is built at once.
+        """
+        return (
+            self.group_key is not None
+            and not self.has_secondary
+            and dfilter is None
+            and not skip
+            and self.__prepare_group_keys()
+        )
+
+    def __prepare_group_keys(self):
+        """
+        Store the group keys of the objects in the database, and return
+        True if it keeps them.
+        """
+        self.__group_key_db = self.db
+        return self.db.prepare_sort_keys(
+            self.group_class,
+            self.__group_key_name(),
+            self.group_key_version(),
+            self.__group_key_func,
+        )
+
+    def __build_lazy(self):
+        """
+        Build the top level of the data map.  The other nodes are added when
+        they are needed.
+        """
+        self.__lazy = True
+        if self.group_can_have_handle:
+            self.__parents = set(self.__get_group_keys())
+            self.__load_children(None)
+        else:
+            for group in self.__get_group_keys():
+                self.add_node(None, group, group, None, add_parent=False)
+                self.__unloaded.add(group)
+
+    def __load_children(self, ref):
+        """
+        Add the children of a node in lazy mode.  The view has not seen them
+        yet, so no signals are emitted.
+        """
+        self.__unloaded.discard(ref)
+        in_build = self._in_build
+        self._in_build = True
+        try:
+            for handle in self.__get_group_handles("" if ref is None else ref):
+                data = self.map(handle)
+                if data:
+                    self.add_row(handle, data)
+                    if handle in self.__parents:
+                        self.__unloaded.add(handle)
+        finally:
+            self._in_build = in_build
+
+    def __find_node(self, handle):
+        """
+        Add the node of an object in lazy mode, with the nodes above it, and
+        return it.  Return None if the object is not in the model.
+        """
+        data = self.map(handle)
+        if not data:
+            return None
+        ref = self.group_key(data)
+        if self.group_can_have_handle:
+            if not ref:
+                # all top level objects are in the model
+                return None
+            if ref not in self.tree and self.__find_node(ref) is None:
+                return None
+        if ref in self.__unloaded:
+            self.__load_children(ref)
+        return self.handle2node.get(handle)
+
+    def __get_group_keys(self):
+        """
+        Return the distinct group keys of the objects.
+        """
+        self.__group_key_db = self.db
+        return self.db.get_sort_key_values(
+            self.group_class,
+            self.__group_key_name(),
+            self.group_key_version(),
+            self.__group_key_func,
+        )
+
+    def __get_group_handles(self, ref):
+        """
+        Return the handles of the objects shown under the node ref.
+        """
+        self.__group_key_db = self.db
+        return self.db.get_sort_key_handles(
+            self.group_class,
+            self.__group_key_name(),
+            self.group_key_version(),
+            self.__group_key_func,
+            ref,
+        )
+
+    def group_key_version(self):
+        """
+        Return the version of the group keys.  It changes with the settings
+        the group keys depend on, so that the database computes the stored
+        keys again.
+        """
+        return VERSION
+
+    def __group_key_name(self):
+        """
+        Return the name of the stored group keys.
+        """
+        return "%s:group" % self.__class__.__name__
+
+    def __group_key_func(self, data):
+        """
+        Return the group key of the data of an object.
+        """
+        return self.group_key(data)
+
     def add_node(
         self, parent, child, sortkey, handle, add_parent=True, secondary=False
     ):
@@ -855,6 +1020,9 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         assert isinstance(handle, str)
         self.clear_cache(handle)
         if self._get_node(handle) is None:
+            if self.__lazy:
+                # in lazy mode, the object may now belong to a new group
+                self.add_row_by_handle(handle)
             return  # row not currently displayed
 
         self.dont_change_active = True
@@ -893,7 +1061,10 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Get the node for a handle.
         """
-        return self.handle2node.get(handle)
+        node = self.handle2node.get(handle)
+        if node is None and handle and self.__unloaded:
+            node = self.__find_node(handle)
+        return node
 
     def get_iter_from_handle(self, handle):
         """
@@ -1096,6 +1267,8 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             nodeid = id(self.tree[None])
         else:
             nodeparent = self.get_node_from_iter(iterparent)
+            if nodeparent.ref in self.__unloaded:
+                self.__load_children(nodeparent.ref)
             if nodeparent.children:
                 nodeid = nodeparent.children[-1 if self.__reverse else 0][1]
             else:
@@ -1107,7 +1280,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         Find if the given node has any children.
         """
         node = self.get_node_from_iter(iter)
-        return True if node.children else False
+        return True if node.children or node.ref in self.__unloaded else False
 
     def do_iter_n_children(self, iter):
         """
@@ -1117,6 +1290,8 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             node = self.tree[None]
         else:
             node = self.get_node_from_iter(iter)
+            if node.ref in self.__unloaded:
+                self.__load_children(node.ref)
         return len(node.children)
 
     def do_iter_nth_child(self, iterparent, index):
@@ -1127,6 +1302,8 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             node = self.tree[None]
         else:
             node = self.get_node_from_iter(iterparent)
+            if node.ref in self.__unloaded:
+                self.__load_children(node.ref)
         if node.children:
             if len(node.children) > index:
                 _index = (-index - 1) if self.__reverse else index
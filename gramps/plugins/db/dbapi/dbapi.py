@@ -31,7 +31,10 @@ Database API interface
 import logging
 import json
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 # ------------------------------------------------------------------------
@@ -40,9 +43,20 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from gramps.gen.db.dbconst import (
+    CLASS_TO_KEY_MAP,
     DBLOGNAME,
     KEY_TO_CLASS_MAP,
     KEY_TO_NAME_MAP,
+    PERSON_KEY,
+    FAMILY_KEY,
+    EVENT_KEY,
+    PLACE_KEY,
+    SOURCE_KEY,
+    CITATION_KEY,
+    MEDIA_KEY,
+    REPOSITORY_KEY,
+    NOTE_KEY,
+    TAG_KEY,
     REFERENCE_KEY,
     TXNADD,
     TXNDEL,
@@ -61,13 +75,185 @@ from gramps.gen.lib import (
     Source,
     Tag,
 )
-from gramps.gen.lib.serialize import from_dict, to_dict
+from gramps.gen.lib.serialize import JSONSerializer, from_dict, to_dict
+from gramps.gen.lib.styledtexttagtype import StyledTextTagType
 from gramps.gen.lib.genderstats import GenderStats
 from gramps.gen.updatecallback import UpdateCallback
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+PRIMARY_KEYS = (
+    PERSON_KEY,
+    FAMILY_KEY,
+    EVENT_KEY,
+    PLACE_KEY,
+    SOURCE_KEY,
+    CITATION_KEY,
+    MEDIA_KEY,
+    REPOSITORY_KEY,
+    NOTE_KEY,
+    TAG_KEY,
+)
+
+# Classes of the primary objects referred to by the reference objects
+REF_CLASS_MAP = {
+    "ChildRef": "Person",
+    "EventRef": "Event",
+    "MediaRef": "Media",
+    "PersonRef": "Person",
+    "PlaceRef": "Place",
+    "RepoRef": "Repository",
+}
+
+# Version of the rows of the ancestor table, stored in the metadata
+ANCESTOR_INDEX_VERSION = 1
+
+
+# -------------------------------------------------------------------------
+#
+# Reference extraction
+#
+# -------------------------------------------------------------------------
+def get_referenced_handles(data):
+    """
+    Return a set of (classname, handle) tuples for all primary objects
+    referenced by the JSON data of a primary object, whether directly or
+    through child objects.
+
+    This gives the same result as get_referenced_handles_recursively()
+    without creating the object.
+    """
+    references = set()
+    to_do = [data]
+    while to_do:
+        struct = to_do.pop()
+        class_name = struct["_class"]
+        for handle in struct.get("note_list", ()):
+            references.add(("Note", handle))
+        for handle in struct.get("citation_list", ()):
+            references.add(("Citation", handle))
+        for handle in struct.get("tag_list", ()):
+            references.add(("Tag", handle))
+
+        if class_name in REF_CLASS_MAP:
+            if struct["ref"] or class_name == "PlaceRef":
+                references.add((REF_CLASS_MAP[class_name], struct["ref"]))
+        elif class_name == "Person":
+            for handle in struct["family_list"] + struct["parent_family_list"]:
+                references.add(("Family", handle))
+        elif class_name == "Family":
+            for key in ("father_handle", "mother_handle"):
+                if struct[key]:
+                    references.add(("Person", struct[key]))
+        elif class_name == "Citation":
+            if struct["source_handle"]:
+                references.add(("Source", struct["source_handle"]))
+        elif class_name in ("Event", "LdsOrd"):
+            if struct["place"]:
+                references.add(("Place", struct["place"]))
+            if struct.get("famc"):
+                references.add(("Family", struct["famc"]))
+        elif class_name == "StyledTextTag":
+            value = struct["value"]
+            if (
+                struct["name"]["value"] == StyledTextTagType.LINK
+                and isinstance(value, str)
+                and value.startswith("gramps://")
+            ):
+                obj_class, prop, handle = value[9:].split("/", 2)
+                if prop == "handle":
+                    references.add((obj_class, handle))
+
+        for value in struct.values():
+            if isinstance(value, dict):
+                to_do.append(value)
+            elif isinstance(value, list) and value and isinstance(value[0], dict):
+                to_do.extend(value)
+    return references
+
+
+def get_reference_rows(obj_class, rows):
+    """
+    Given a list of (handle, json_data) rows for primary objects of the
+    given class, return the corresponding rows of the reference table.
+
+    This is a module level function so that it can be run in a pool of
+    processes.
+    """
+    reference_rows = []
+    for handle, string in rows:
+        for ref_class, ref_handle in get_referenced_handles(json.loads(string)):
+            reference_rows.append((handle, obj_class, ref_handle, ref_class))
+    return reference_rows
+
+
+# -------------------------------------------------------------------------
+#
+# Ancestor index
+#
+# -------------------------------------------------------------------------
+def _get_ancestor_links(obj_key, data):
+    """
+    Return the links of a person or a family which the ancestor table
+    depends on, or None if the object is not in the database.
+
+    :param data: the raw data of the person or family, or None.
+    """
+    if data is None:
+        return None
+    if obj_key == PERSON_KEY:
+        return tuple(data["parent_family_list"]), tuple(data["family_list"])
+    return (
+        data["father_handle"],
+        data["mother_handle"],
+        tuple(child_ref["ref"] for child_ref in data["child_ref_list"]),
+    )
+
+
+def _find_ancestors(handle, get_parent_families, get_family_parents):
+    """
+    Return the ancestors of a person, and the families in which the person
+    and the ancestors are children, as a dictionary of (generation,
+    main_generation) by handle.  The main generation is None for those which
+    are not reached through the main parent families only.
+
+    :param get_parent_families: returns the parent family handles of a
+        person, or None if the person is not in the database.
+    :param get_family_parents: returns the (father, mother) handles of a
+        family, or None if the family is not in the database.
+    """
+    ancestors = {}
+    for main_family_only in (False, True):
+        done = {handle}
+        queue = deque([(handle, 0)])
+        while queue:
+            person_handle, generation = queue.popleft()
+            family_handles = get_parent_families(person_handle) or []
+            if main_family_only:
+                family_handles = family_handles[:1]
+            for family_handle in family_handles:
+                parents = get_family_parents(family_handle)
+                if parents is None:
+                    continue
+                for ancestor in (family_handle,) + tuple(parents):
+                    if ancestor != family_handle and (
+                        not ancestor or get_parent_families(ancestor) is None
+                    ):
+                        continue
+                    if main_family_only:
+                        if ancestors[ancestor][1] is None:
+                            ancestors[ancestor] = (
+                                ancestors[ancestor][0],
+                                generation + 1,
+                            )
+                    elif ancestor not in ancestors:
+                        ancestors[ancestor] = (generation + 1, None)
+                    if ancestor != family_handle and ancestor not in done:
+                        done.add(ancestor)
+                        queue.append((ancestor, generation + 1))
+    return ancestors
+
 
 # -------------------------------------------------------------------------
 #
@@ -79,6 +265,39 @@ class DBAPI(DbGeneric):
     Database backends class for DB-API 2.0 databases
     """
 
+    # Secondary indexes as (name, table, column)
+    INDEXES = (
+        ("person_gramps_id", "person", "gramps_id"),
+        ("person_surname", "person", "surname"),
+        ("person_given_name", "person", "given_name"),
+        ("source_title", "source", "title"),
+        ("source_gramps_id", "source", "gramps_id"),
+        ("citation_page", "citation", "page"),
+        ("citation_gramps_id", "citation", "gramps_id"),
+        ("media_desc", "media", "desc"),
+        ("media_gramps_id", "media", "gramps_id"),
+        ("place_title", "place", "title"),
+        ("place_enclosed_by", "place", "enclosed_by"),
+        ("place_gramps_id", "place", "gramps_id"),
+        ("tag_name", "tag", "name"),
+        ("reference_ref_handle", "reference", "ref_handle"),
+        ("family_gramps_id", "family", "gramps_id"),
+        ("event_gramps_id", "event", "gramps_id"),
+        ("repository_gramps_id", "repository", "gramps_id"),
+        ("note_gramps_id", "note", "gramps_id"),
+        ("reference_obj_handle", "reference", "obj_handle"),
+    )
+
+    def __init__(self, directory=None):
+        self._bulk_load = False
+        # Stored sort keys as {name: [class name, version]}, read when needed
+        self._sort_versions = None
+        # Functions computing the stored sort keys, by name
+        self._sort_funcs = {}
+        # Whether the ancestor table is built, read when needed
+        self._ancestor_index = None
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
@@ -225,30 +444,74 @@ class DBAPI(DbGeneric):
         self._create_secondary_columns()
 
         ## Indices:
-        self.dbapi.execute("CREATE INDEX person_gramps_id ON person(gramps_id)")
-        self.dbapi.execute("CREATE INDEX person_surname ON person(surname)")
-        self.dbapi.execute("CREATE INDEX person_given_name ON person(given_name)")
-        self.dbapi.execute("CREATE INDEX source_title ON source(title)")
-        self.dbapi.execute("CREATE INDEX source_gramps_id ON source(gramps_id)")
-        self.dbapi.execute("CREATE INDEX citation_page ON citation(page)")
-        self.dbapi.execute("CREATE INDEX citation_gramps_id ON citation(gramps_id)")
-        self.dbapi.execute("CREATE INDEX media_desc ON media(desc)")
-        self.dbapi.execute("CREATE INDEX media_gramps_id ON media(gramps_id)")
-        self.dbapi.execute("CREATE INDEX place_title ON place(title)")
-        self.dbapi.execute("CREATE INDEX place_enclosed_by ON place(enclosed_by)")
-        self.dbapi.execute("CREATE INDEX place_gramps_id ON place(gramps_id)")
-        self.dbapi.execute("CREATE INDEX tag_name ON tag(name)")
-        self.dbapi.execute("CREATE INDEX reference_ref_handle ON reference(ref_handle)")
-        self.dbapi.execute("CREATE INDEX family_gramps_id ON family(gramps_id)")
-        self.dbapi.execute("CREATE INDEX event_gramps_id ON event(gramps_id)")
-        self.dbapi.execute("CREATE INDEX repository_gramps_id ON repository(gramps_id)")
-        self.dbapi.execute("CREATE INDEX note_gramps_id ON note(gramps_id)")
-        self.dbapi.execute("CREATE INDEX reference_obj_handle ON reference(obj_handle)")
+        self._create_indexes()
 
         self.dbapi.commit()
 
+    def _create_indexes(self):
+        """
+        Create any missing secondary indexes.
+        """
+        for name, table, column in self.INDEXES:
+            self.dbapi.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table}({column})"
+            )
+
+    def _bulk_load_indexes(self):
+        """
+        Return the names of the indexes which are kept during a bulk load.
+        Importers look objects up by Gramps ID, so these indexes are needed.
+        """
+        return [name for name, _, column in self.INDEXES if column == "gramps_id"]
+
+    def bulk_load_begin(self, count=None):
+        """
+        Prepare the database for loading a large number of objects.
+
+        The secondary indexes which are not needed for lookups are dropped and
+        the reference table is no longer maintained.  Both are rebuilt in a
+        single pass by :meth:`bulk_load_end`.  Must be called outside of a
+        transaction.
+
+        As the whole database is indexed again, the mode is not used when
+        the number of objects to load is known to be smaller than the number
+        of objects in the database.
+        """
+        if self.readonly or self._bulk_load:
+            return
+        if count is not None and count < self.get_total():
+            return
+        _LOG.debug("    DBAPI %s bulk load begin", hex(id(self)))
+        self._bulk_load = True
+        keep = self._bulk_load_indexes()
+        self.dbapi.begin()
+        if self._has_ancestor_table():
+            # Built again when next needed
+            self._drop_ancestor_index()
+        for name, _, _ in self.INDEXES:
+            if name not in keep:
+                self.dbapi.execute(f"DROP INDEX IF EXISTS {name}")
+        self.dbapi.commit()
+
+    def bulk_load_end(self, callback=None):
+        """
+        Leave bulk load mode, rebuilding the secondary indexes and the
+        reference map.  Must be called outside of a transaction.
+        """
+        if not self._bulk_load:
+            return
+        _LOG.debug("    DBAPI %s bulk load end", hex(id(self)))
+        self._bulk_load = False
+        self.dbapi.begin()
+        self._create_indexes()
+        self.dbapi.commit()
+        self.reindex_reference_map(callback)
+
     def _close(self):
         self.dbapi.close()
+        self._sort_versions = None
+        self._sort_funcs = {}
+        self._ancestor_index = None
 
     def _txn_begin(self):
         """
@@ -356,6 +619,11 @@ class DBAPI(DbGeneric):
         Executed after a batch operation abort.
         """
         self.dbapi.rollback()
+        # Objects read during the transaction may no longer exist
+        self._clear_cache()
+        # Read the stored sort keys again, as changes were rolled back
+        self._sort_versions = None
+        self._ancestor_index = None
         self.transaction = None
         transaction.clear()
         transaction.first = None
@@ -663,25 +931,23 @@ class DBAPI(DbGeneric):
         Commit the specified object to the database, storing the changes as
         part of the transaction.
         """
-        old_data = None
         obj.change = int(change_time or time.time())
         table = KEY_TO_NAME_MAP[obj_key]
 
-        if self._has_handle(obj_key, obj.handle):
-            old_data = self._get_raw_data(obj_key, obj.handle)
-            # update the object:
-            self.dbapi.execute(
-                f"UPDATE {table} SET {self.serializer.data_field} = ? WHERE handle = ?",
-                [self.serializer.object_to_string(obj), obj.handle],
-            )
-        else:
-            # Insert the object:
-            self.dbapi.execute(
-                f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
-                [obj.handle, self.serializer.object_to_string(obj)],
-            )
-        self._update_secondary_values(obj)
-        self._update_backlinks(obj, trans)
+        # The old data also tells us whether the object already exists
+        old_data = self._get_cached_raw_data(obj_key, obj.handle)
+        self._invalidate_cache(obj_key, obj.handle)
+
+        fields, values = self._get_secondary_values(obj)
+        self._upsert(
+            table, obj.handle, self.serializer.object_to_string(obj), fields, values
+        )
+        if not self._bulk_load:
+            self._update_backlinks(obj, trans, old_data is None)
+        if self._has_sort_keys(obj_key):
+            self._update_sort_keys(obj_key, obj.handle, to_dict(obj))
+        if obj_key in (PERSON_KEY, FAMILY_KEY) and self._has_ancestor_table():
+            self._update_ancestor_index(obj_key, obj.handle, old_data, to_dict(obj))
         if not trans.batch:
             if old_data:
                 trans.add(obj_key, TXNUPD, obj.handle, old_data, to_dict(obj))
@@ -690,6 +956,21 @@ class DBAPI(DbGeneric):
 
         return old_data
 
+    def _upsert(self, table, handle, string, fields=(), values=()):
+        """
+        Insert or update the serialized data and secondary columns of an
+        object with a single statement.
+        Does not commit.
+        """
+        columns = [self.serializer.data_field] + list(fields)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+        self.dbapi.execute(
+            f"INSERT INTO {table} (handle, {', '.join(columns)}) "
+            f"VALUES ({', '.join(['?'] * (len(columns) + 1))}) "
+            f"ON CONFLICT(handle) DO UPDATE SET {updates}",
+            [handle, string] + self._sql_cast_list(values),
+        )
+
     def _commit_raw(self, data, obj_key):
         """
         Commit a serialized primary object to the database, storing the
@@ -697,22 +978,28 @@ class DBAPI(DbGeneric):
         """
         table = KEY_TO_NAME_MAP[obj_key]
         handle = data["handle"]
-
-        if self._has_handle(obj_key, handle):
-            # update the object:
-            self.dbapi.execute(
-                f"UPDATE {table} SET {self.serializer.data_field} = ? WHERE handle = ?",
-                [self.serializer.data_to_string(data), handle],
-            )
+        if obj_key in (PERSON_KEY, FAMILY_KEY) and self._has_ancestor_table():
+            old_data = self._get_cached_raw_data(obj_key, handle)
+        self._invalidate_cache(obj_key, handle)
+        self._upsert(table, handle, self.serializer.data_to_string(data))
+        if self._has_sort_keys(obj_key):
+            self._update_sort_keys(obj_key, handle, data)
+        if obj_key in (PERSON_KEY, FAMILY_KEY) and self._has_ancestor_table():
+            self._update_ancestor_index(obj_key, handle, old_data, data)
+
+    def _update_backlinks(self, obj, transaction, is_new=False):
+        """
+        Bring the reference rows of an object into line with the handles it
+        currently references.  Only the rows that changed are written.
+
+        A new object has no reference rows, so the existing ones need not be
+        looked up.
+        """
+        obj_class = obj.__class__.__name__
+        current_references = set(obj.get_referenced_handles_recursively())
+        if is_new:
+            existing_references = set()
         else:
-            # Insert the object:
-            self.dbapi.execute(
-                f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
-                [handle, self.serializer.data_to_string(data)],
-            )
-
-    def _update_backlinks(self, obj, transaction):
-        if not transaction.batch:
             # Find existing references
             self.dbapi.execute(
                 "SELECT ref_class, ref_handle FROM reference WHERE obj_handle = ?",
@@ -720,71 +1007,61 @@ class DBAPI(DbGeneric):
             )
             existing_references = set(self.dbapi.fetchall())
 
-            # Once we have the list of rows that already have a reference
-            # we need to compare it with the list of objects that are
-            # still references from the primary object.
-            current_references = set(obj.get_referenced_handles_recursively())
-            no_longer_required_references = existing_references.difference(
-                current_references
-            )
-            new_references = current_references.difference(existing_references)
+        # Once we have the list of rows that already have a reference
+        # we need to compare it with the list of objects that are
+        # still references from the primary object.
+        no_longer_required_references = existing_references.difference(
+            current_references
+        )
+        new_references = current_references.difference(existing_references)
 
-            # Delete the existing references
-            self.dbapi.execute(
-                "DELETE FROM reference WHERE obj_handle = ?", [obj.handle]
+        if no_longer_required_references:
+            self.dbapi.executemany(
+                "DELETE FROM reference WHERE obj_handle = ? AND ref_handle = ?",
+                [
+                    [obj.handle, ref_handle]
+                    for _, ref_handle in no_longer_required_references
+                ],
+            )
+        if new_references:
+            self.dbapi.executemany(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES(?, ?, ?, ?)",
+                [
+                    [obj.handle, obj_class, ref_handle, ref_class_name]
+                    for ref_class_name, ref_handle in new_references
+                ],
             )
 
-            # Now, add the current ones
-            for ref_class_name, ref_handle in current_references:
-                self.dbapi.execute(
-                    "INSERT INTO reference "
-                    "(obj_handle, obj_class, ref_handle, ref_class) "
-                    "VALUES(?, ?, ?, ?)",
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
-                )
-
+        if not transaction.batch:
             # Add new references to the transaction
             for ref_class_name, ref_handle in new_references:
                 key = (obj.handle, ref_handle)
-                data = (obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
+                data = (obj.handle, obj_class, ref_handle, ref_class_name)
                 transaction.add(REFERENCE_KEY, TXNADD, key, None, data)
 
             # Add old references to the transaction
             for ref_class_name, ref_handle in no_longer_required_references:
                 key = (obj.handle, ref_handle)
-                old_data = (
-                    obj.handle,
-                    obj.__class__.__name__,
-                    ref_handle,
-                    ref_class_name,
-                )
+                old_data = (obj.handle, obj_class, ref_handle, ref_class_name)
                 transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
-        else:  # batch mode
-            current_references = set(obj.get_referenced_handles_recursively())
-
-            # Delete the existing references
-            self.dbapi.execute(
-                "DELETE FROM reference WHERE obj_handle = ?", [obj.handle]
-            )
-
-            # Now, add the current ones
-            for ref_class_name, ref_handle in current_references:
-                self.dbapi.execute(
-                    "INSERT INTO reference "
-                    "(obj_handle, obj_class, ref_handle, ref_class) "
-                    "VALUES(?, ?, ?, ?)",
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
-                )
 
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
             return
         if self._has_handle(obj_key, handle):
             data = self._get_raw_data(obj_key, handle)
+            self._invalidate_cache(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
-            self._remove_backlinks(obj_class, handle, transaction)
+            if not self._bulk_load:
+                self._remove_backlinks(obj_class, handle, transaction)
             table = KEY_TO_NAME_MAP[obj_key]
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            if self._has_sort_keys(obj_key):
+                self._update_sort_keys(obj_key, handle, None)
+            if obj_key in (PERSON_KEY, FAMILY_KEY) and self._has_ancestor_table():
+                self._update_ancestor_index(obj_key, handle, data, None)
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -833,6 +1110,43 @@ class DBAPI(DbGeneric):
             if (include_classes is None) or (row[0] in include_classes):
                 yield (row[0], row[1])
 
+    def iter_reference_map(self):
+        """
+        Return an iterator over all references kept in the reference map, as
+        (class_name, handle, ref_class_name, ref_handle) tuples.
+        """
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(
+                "SELECT obj_class, obj_handle, ref_class, ref_handle FROM reference"
+            )
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield tuple(row)
+                rows = cursor.fetchmany()
+
+    def iter_json_by_handle(self, class_name):
+        """
+        Return an iterator over the primary objects of a class, ordered by
+        handle, as (handle, json) tuples where json is the JSON text of the
+        object.  The JSON data is read as stored, in the order of the primary
+        key.
+        """
+        table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[class_name]]
+        json_data = self.serializer is JSONSerializer
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(
+                f"SELECT handle, {self.serializer.data_field} FROM {table} "
+                "ORDER BY handle"
+            )
+            rows = cursor.fetchmany()
+            while rows:
+                for handle, string in rows:
+                    if not json_data:
+                        string = json.dumps(self.serializer.string_to_data(string))
+                    yield (handle, string)
+                rows = cursor.fetchmany()
+
     def find_initial_person(self):
         """
         Returns first person in the database
@@ -888,62 +1202,94 @@ class DBAPI(DbGeneric):
                 to_do.append(row[0])
                 yield (row[0], self.serializer.string_to_data(row[1]))
 
+    def _iter_raw_chunks(self, obj_key):
+        """
+        Return an iterator over chunks of (handle, serialized data) rows of
+        a primary table, read with a single cursor.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(f"SELECT handle, {self.serializer.data_field} FROM {table}")
+            rows = cursor.fetchmany()
+            while rows:
+                yield rows
+                rows = cursor.fetchmany()
+
+    def _get_reference_rows(self, obj_class, rows):
+        """
+        Return the reference table rows for a chunk of serialized primary
+        objects of the given class.
+        """
+        if self.serializer is JSONSerializer:
+            return get_reference_rows(obj_class, rows)
+        class_func = self._get_table_func(obj_class)["class_func"]
+        reference_rows = []
+        for handle, string in rows:
+            obj = self.serializer.string_to_object(class_func, string)
+            for ref_class, ref_handle in set(obj.get_referenced_handles_recursively()):
+                reference_rows.append((handle, obj_class, ref_handle, ref_class))
+        return reference_rows
+
+    def _iter_reference_rows(self, obj_key, pool=None, processes=1):
+        """
+        Return an iterator over (number of objects, reference rows) tuples
+        for the chunks of a primary table.  If a pool of processes is given,
+        the references are found in parallel while the table is being read.
+        """
+        obj_class = KEY_TO_CLASS_MAP[obj_key]
+        if pool is None:
+            for rows in self._iter_raw_chunks(obj_key):
+                yield len(rows), self._get_reference_rows(obj_class, rows)
+            return
+
+        pending = deque()
+        for rows in self._iter_raw_chunks(obj_key):
+            future = pool.submit(get_reference_rows, obj_class, rows)
+            pending.append((len(rows), future))
+            # Limit the number of chunks held in memory
+            if len(pending) > 2 * processes:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+
     def reindex_reference_map(self, callback):
         """
         Reindex all primary records in the database.
+
+        Each table is read with a single cursor and the reference rows are
+        written in batches.  The references are found directly from the
+        JSON data, optionally using a pool of processes, as set by the
+        database.rebuild-processes config setting.
         """
+        UpdateCallback.__init__(self, callback)
+        self.set_total(self.get_total())
+        processes = config.get("database.rebuild-processes")
+        if processes > 1 and self.serializer is JSONSerializer:
+            pool = ProcessPoolExecutor(processes)
+        else:
+            pool = None
+
         self._txn_begin()
         self.dbapi.execute("DELETE FROM reference")
-        total = 0
-        for tbl in (
-            "people",
-            "families",
-            "events",
-            "places",
-            "sources",
-            "citations",
-            "media",
-            "repositories",
-            "notes",
-            "tags",
-        ):
-            total += self.method("get_number_of_%s", tbl)()
-        UpdateCallback.__init__(self, callback)
-        self.set_total(total)
-        primary_table = (
-            (self.get_person_cursor, Person),
-            (self.get_family_cursor, Family),
-            (self.get_event_cursor, Event),
-            (self.get_place_cursor, Place),
-            (self.get_source_cursor, Source),
-            (self.get_citation_cursor, Citation),
-            (self.get_media_cursor, Media),
-            (self.get_repository_cursor, Repository),
-            (self.get_note_cursor, Note),
-            (self.get_tag_cursor, Tag),
-        )
-        # Now we use the functions and classes defined above
-        # to loop through each of the primary object tables.
-        for cursor_func, class_func in primary_table:
-            logging.info("Rebuilding %s reference map", class_func.__name__)
-            with cursor_func() as cursor:
-                for _, val in cursor:
-                    obj = self.serializer.data_to_object(class_func, val)
-                    references = set(obj.get_referenced_handles_recursively())
-                    # handle addition of new references
-                    for ref_class_name, ref_handle in references:
-                        self.dbapi.execute(
+        done = 0
+        try:
+            for obj_key in PRIMARY_KEYS:
+                logging.info("Rebuilding %s reference map", KEY_TO_CLASS_MAP[obj_key])
+                for count, rows in self._iter_reference_rows(obj_key, pool, processes):
+                    if rows:
+                        self.dbapi.executemany(
                             "INSERT INTO reference "
                             "(obj_handle, obj_class, ref_handle, ref_class) "
                             "VALUES (?, ?, ?, ?)",
-                            [
-                                obj.handle,
-                                obj.__class__.__name__,
-                                ref_handle,
-                                ref_class_name,
-                            ],
+                            rows,
                         )
-                    self.update()
+                    done += count
+                    self.update(done)
+        finally:
+            if pool is not None:
+                pool.shutdown()
         self._txn_commit()
 
     def rebuild_secondary(self, callback=None):
@@ -953,41 +1299,31 @@ class DBAPI(DbGeneric):
         if self.readonly:
             return
 
-        total = 0
-        for tbl in (
-            "people",
-            "families",
-            "events",
-            "places",
-            "sources",
-            "citations",
-            "media",
-            "repositories",
-            "notes",
-            "tags",
-        ):
-            total += self.method("get_number_of_%s", tbl)()
         UpdateCallback.__init__(self, callback)
-        self.set_total(total)
+        self.set_total(self.get_total())
 
         # First, expand blob to individual fields:
         self._txn_begin()
-        for obj_type in (
-            "Person",
-            "Family",
-            "Event",
-            "Place",
-            "Repository",
-            "Source",
-            "Citation",
-            "Media",
-            "Note",
-            "Tag",
-        ):
-            for handle in self.method("get_%s_handles", obj_type)():
-                obj = self.method("get_%s_from_handle", obj_type)(handle)
-                self._update_secondary_values(obj)
-                self.update()
+        done = 0
+        for obj_key in PRIMARY_KEYS:
+            obj_class = KEY_TO_CLASS_MAP[obj_key]
+            class_func = self._get_table_func(obj_class)["class_func"]
+            fields = None
+            for rows in self._iter_raw_chunks(obj_key):
+                params = []
+                for _, string in rows:
+                    obj = self.serializer.string_to_object(class_func, string)
+                    fields, values = self._get_secondary_values(obj)
+                    params.append(self._sql_cast_list(values) + [obj.handle])
+                if fields:
+                    sets = ", ".join(f"{field} = ?" for field in fields)
+                    self.dbapi.executemany(
+                        f"UPDATE {KEY_TO_NAME_MAP[obj_key]} SET {sets} "
+                        "WHERE handle = ?",
+                        params,
+                    )
+                done += len(rows)
+                self.update(done)
         self._txn_commit()
 
         # Next, rebuild stats:
@@ -1078,21 +1414,438 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        if obj_key in (PERSON_KEY, FAMILY_KEY) and self._has_ancestor_table():
+            old_data = self._get_cached_raw_data(obj_key, handle)
+        self._invalidate_cache(obj_key, handle)
         if data is None:
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
         else:
-            if self._has_handle(obj_key, handle):
+            obj = from_dict(data)
+            fields, values = self._get_secondary_values(obj)
+            self._upsert(
+                table, handle, self.serializer.data_to_string(data), fields, values
+            )
+        if self._has_sort_keys(obj_key):
+            self._update_sort_keys(obj_key, handle, data)
+        if obj_key in (PERSON_KEY, FAMILY_KEY) and self._has_ancestor_table():
+            self._update_ancestor_index(obj_key, handle, old_data, data)
+
+    def get_sort_keys(self, class_name, name, version, sort_func):
+        """
+        Return a sorted list of (sort key, handle) tuples, one for each
+        primary object of the given class.
+
+        The sort keys are stored in the sort_key table, and read in order
+        from its index.  They are only computed when the version changed,
+        and then kept up to date with sort_func when objects are committed.
+        """
+        stored, sort_keys = self._prepare_sort_keys(
+            class_name, name, version, sort_func
+        )
+        if sort_keys is not None:
+            return sort_keys
+        if not stored:
+            return super().get_sort_keys(class_name, name, version, sort_func)
+        self.dbapi.execute(
+            "SELECT sort_key, handle FROM sort_key WHERE name = ? "
+            "ORDER BY sort_key, handle",
+            [name],
+        )
+        return [tuple(row) for row in self.dbapi.fetchall()]
+
+    def prepare_sort_keys(self, class_name, name, version, sort_func):
+        """
+        Store the sort keys under the given name, unless the database is
+        read-only, in a bulk load or a transaction, and return True if they
+        are stored.
+        """
+        stored, dummy = self._prepare_sort_keys(class_name, name, version, sort_func)
+        return stored
+
+    def get_sort_key_values(self, class_name, name, version, sort_func):
+        """
+        Return the sorted list of the distinct sort keys of the primary
+        objects of the given class, read from the index of the stored keys.
+        """
+        stored, sort_keys = self._prepare_sort_keys(
+            class_name, name, version, sort_func
+        )
+        if not stored:
+            return super().get_sort_key_values(class_name, name, version, sort_func)
+        self.dbapi.execute(
+            "SELECT DISTINCT sort_key FROM sort_key WHERE name = ? "
+            "ORDER BY sort_key",
+            [name],
+        )
+        return [row[0] for row in self.dbapi.fetchall()]
+
+    def get_sort_key_handles(self, class_name, name, version, sort_func, sort_key):
+        """
+        Return the handles of the primary objects of the given class whose
+        sort key is sort_key, read from the index of the stored keys.
+        """
+        stored, sort_keys = self._prepare_sort_keys(
+            class_name, name, version, sort_func
+        )
+        if not stored:
+            return super().get_sort_key_handles(
+                class_name, name, version, sort_func, sort_key
+            )
+        self.dbapi.execute(
+            "SELECT handle FROM sort_key WHERE name = ? AND sort_key = ? "
+            "ORDER BY handle",
+            [name, sort_key],
+        )
+        return [row[0] for row in self.dbapi.fetchall()]
+
+    def _prepare_sort_keys(self, class_name, name, version, sort_func):
+        """
+        Keep the sort keys stored under the given name up to date with
+        sort_func, computing and storing them if their version changed.
+
+        Return a (stored, sort_keys) tuple.  stored is False if the keys
+        cannot be stored, and sort_keys is the sorted list of the keys if
+        they were computed.
+        """
+        if self.readonly or self._bulk_load or self.transaction is not None:
+            return False, None
+        funcs = self._sort_funcs.setdefault(name, [])
+        if sort_func not in funcs:
+            funcs.append(sort_func)
+        if self._get_sort_versions().get(name) == [class_name, version]:
+            return True, None
+
+        obj_key = CLASS_TO_KEY_MAP[class_name]
+        sort_keys = [
+            (sort_func(data), handle) for handle, data in self._iter_raw_data(obj_key)
+        ]
+        sort_keys.sort()
+        self._txn_begin()
+        try:
+            self._create_sort_key_table()
+            self.dbapi.execute("DELETE FROM sort_key WHERE name = ?", [name])
+            self.dbapi.executemany(
+                "INSERT INTO sort_key (name, handle, sort_key) VALUES (?, ?, ?)",
+                [[name, handle, sort_key] for sort_key, handle in sort_keys],
+            )
+        except UnicodeEncodeError:
+            # Keys which cannot be stored are only kept in memory
+            self._txn_abort()
+            self.release_sort_keys(name, sort_func)
+            return False, sort_keys
+        self._sort_versions[name] = [class_name, version]
+        self._set_metadata("sort_keys", self._sort_versions, use_txn=False)
+        self._txn_commit()
+        return True, sort_keys
+
+    def release_sort_keys(self, name, sort_func):
+        """
+        Stop updating the sort keys stored under the given name with
+        sort_func.
+        """
+        funcs = self._sort_funcs.get(name, [])
+        if sort_func in funcs:
+            funcs.remove(sort_func)
+            if not funcs:
+                del self._sort_funcs[name]
+
+    def _create_sort_key_table(self):
+        """
+        Create the table of the stored sort keys, if it does not exist.
+        Does not commit.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE IF NOT EXISTS sort_key "
+            "("
+            "name VARCHAR(50), "
+            "handle VARCHAR(50), "
+            "sort_key TEXT, "
+            "PRIMARY KEY (name, handle)"
+            ")"
+        )
+        self.dbapi.execute(
+            "CREATE INDEX IF NOT EXISTS sort_key_order "
+            "ON sort_key(name, sort_key, handle)"
+        )
+
+    def _get_sort_versions(self):
+        """
+        Return the stored sort keys as {name: [class name, version]}.
+        """
+        if self._sort_versions is None:
+            self._sort_versions = self._get_metadata("sort_keys", {})
+        return self._sort_versions
+
+    def _has_sort_keys(self, obj_key):
+        """
+        Return True if sort keys of objects of the given type are stored.
+        """
+        class_name = KEY_TO_CLASS_MAP[obj_key]
+        return any(
+            version[0] == class_name for version in self._get_sort_versions().values()
+        )
+
+    def _update_sort_keys(self, obj_key, handle, data):
+        """
+        Bring the stored sort keys of an object into line with its data, or
+        remove them if data is None.  The sort keys which no function keeps
+        up to date any more are dropped.
+        Does not commit.
+        """
+        class_name = KEY_TO_CLASS_MAP[obj_key]
+        versions = self._get_sort_versions()
+        dropped = []
+        for name, version in versions.items():
+            if version[0] != class_name:
+                continue
+            if data is None:
                 self.dbapi.execute(
-                    f"UPDATE {table} SET {self.serializer.data_field} = ? WHERE handle = ?",
-                    [self.serializer.data_to_string(data), handle],
+                    "DELETE FROM sort_key WHERE name = ? AND handle = ?",
+                    [name, handle],
                 )
-            else:
-                self.dbapi.execute(
-                    f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
-                    [handle, self.serializer.data_to_string(data)],
+                continue
+            if name in self._sort_funcs and not self._bulk_load:
+                try:
+                    self.dbapi.execute(
+                        "INSERT INTO sort_key (name, handle, sort_key) "
+                        "VALUES (?, ?, ?) "
+                        "ON CONFLICT(name, handle) "
+                        "DO UPDATE SET sort_key = excluded.sort_key",
+                        [name, handle, self._sort_funcs[name][0](data)],
+                    )
+                    continue
+                except UnicodeEncodeError:
+                    pass
+            dropped.append(name)
+        if dropped:
+            for name in dropped:
+                del versions[name]
+                self.dbapi.execute("DELETE FROM sort_key WHERE name = ?", [name])
+            self._set_metadata("sort_keys", versions, use_txn=False)
+
+    def has_ancestor_index(self):
+        """
+        Return True if the ancestors of all people are kept in the ancestor
+        table.  The table is built the first time it is needed, when the
+        database.ancestor-index preference is set.
+        """
+        if not config.get("database.ancestor-index"):
+            return False
+        if self._has_ancestor_table():
+            return True
+        if self.readonly or self._bulk_load or self.transaction is not None:
+            return False
+        self._build_ancestor_index()
+        return True
+
+    def get_ancestors(self, handle, main_family_only=False):
+        """
+        Return the ancestors of a person, and the families in which the
+        person and the ancestors are children, as a dictionary of the number
+        of generations between the person and them, by handle.
+
+        They are read from the ancestor table, if it is kept.
+        """
+        if not self.has_ancestor_index():
+            return super().get_ancestors(handle, main_family_only)
+        if main_family_only:
+            self.dbapi.execute(
+                "SELECT ancestor, main_generation FROM ancestor "
+                "WHERE handle = ? AND main_generation IS NOT NULL",
+                [handle],
+            )
+        else:
+            self.dbapi.execute(
+                "SELECT ancestor, generation FROM ancestor WHERE handle = ?",
+                [handle],
+            )
+        return dict(self.dbapi.fetchall())
+
+    def get_descendants(self, handle):
+        """
+        Return the descendants of a person, or of the children of a family,
+        as a dictionary of the number of generations between them, by
+        handle.
+
+        They are read from the ancestor table, if it is kept.
+        """
+        if not self.has_ancestor_index():
+            return super().get_descendants(handle)
+        self.dbapi.execute(
+            "SELECT handle, generation FROM ancestor WHERE ancestor = ?", [handle]
+        )
+        return dict(self.dbapi.fetchall())
+
+    def may_have_common_ancestor(self, handle1, handle2):
+        """
+        Return False if two people certainly have no common ancestor or
+        ancestral family, and neither is an ancestor of the other.
+        """
+        if not self.has_ancestor_index():
+            return True
+        self.dbapi.execute(
+            "SELECT 1 FROM ancestor AS first JOIN ancestor AS second "
+            "ON first.ancestor = second.ancestor "
+            "WHERE first.handle = ? AND second.handle = ? LIMIT 1",
+            [handle1, handle2],
+        )
+        if self.dbapi.fetchone() is not None:
+            return True
+        self.dbapi.execute(
+            "SELECT 1 FROM ancestor WHERE handle = ? AND ancestor = ? "
+            "OR handle = ? AND ancestor = ?",
+            [handle1, handle2, handle2, handle1],
+        )
+        return handle1 == handle2 or self.dbapi.fetchone() is not None
+
+    def _has_ancestor_table(self):
+        """
+        Return True if the ancestor table is built.  It is then kept up to
+        date when people and families change.
+        """
+        if self._ancestor_index is None:
+            self._ancestor_index = (
+                self._get_metadata("ancestor_index", 0) == ANCESTOR_INDEX_VERSION
+            )
+        return self._ancestor_index
+
+    def _create_ancestor_table(self):
+        """
+        Create the ancestor table, if it does not exist.
+        Does not commit.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE IF NOT EXISTS ancestor "
+            "("
+            "handle VARCHAR(50), "
+            "ancestor VARCHAR(50), "
+            "generation INTEGER, "
+            "main_generation INTEGER, "
+            "PRIMARY KEY (handle, ancestor)"
+            ")"
+        )
+        self.dbapi.execute(
+            "CREATE INDEX IF NOT EXISTS ancestor_ancestor ON ancestor(ancestor)"
+        )
+
+    def _build_ancestor_index(self):
+        """
+        Compute the ancestors of all people and store them in the ancestor
+        table.
+        """
+        parent_families = {
+            handle: data["parent_family_list"]
+            for handle, data in self._iter_raw_data(PERSON_KEY)
+        }
+        family_parents = {
+            handle: (data["father_handle"], data["mother_handle"])
+            for handle, data in self._iter_raw_data(FAMILY_KEY)
+        }
+        self._txn_begin()
+        self._create_ancestor_table()
+        self.dbapi.execute("DELETE FROM ancestor")
+        for handle in parent_families:
+            self._insert_ancestors(
+                handle,
+                _find_ancestors(handle, parent_families.get, family_parents.get),
+            )
+        self._ancestor_index = True
+        self._set_metadata("ancestor_index", ANCESTOR_INDEX_VERSION, use_txn=False)
+        self._txn_commit()
+
+    def _drop_ancestor_index(self):
+        """
+        Stop keeping the ancestor table.
+        Does not commit.
+        """
+        self.dbapi.execute("DELETE FROM ancestor")
+        self._ancestor_index = False
+        self._set_metadata("ancestor_index", 0, use_txn=False)
+
+    def _insert_ancestors(self, handle, ancestors):
+        """
+        Store the ancestors of a person, given as a dictionary of
+        (generation, main_generation) by handle.
+        Does not commit.
+        """
+        self.dbapi.executemany(
+            "INSERT INTO ancestor (handle, ancestor, generation, main_generation) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                [handle, ancestor, generation, main_generation]
+                for ancestor, (generation, main_generation) in ancestors.items()
+            ],
+        )
+
+    def _update_ancestor_index(self, obj_key, handle, old_data, new_data):
+        """
+        Bring the ancestor table into line with a changed, added or removed
+        person or family.  The ancestors of the person or the children of
+        the family, and those of their descendants, are computed again,
+        unless the links between people and families did not change.
+        Does not commit.
+
+        :param old_data: the raw data of the object before the change, or
+            None if it was added.
+        :param new_data: the raw data of the object after the change, or
+            None if it was removed.
+        """
+        if self._bulk_load or not config.get("database.ancestor-index"):
+            self._drop_ancestor_index()
+            return
+        if _get_ancestor_links(obj_key, old_data) == _get_ancestor_links(
+            obj_key, new_data
+        ):
+            return
+        if obj_key == FAMILY_KEY:
+            family_handles = [handle]
+            roots = set()
+        else:
+            # The children of a person who was just added, or added back by
+            # an undo, do not have the person in the table yet
+            data = self._get_raw_data(PERSON_KEY, handle)
+            family_handles = data["family_list"] if data is not None else []
+            roots = {handle}
+        for family_handle in family_handles:
+            data = self._get_raw_data(FAMILY_KEY, family_handle)
+            if data is not None:
+                roots.update(child_ref["ref"] for child_ref in data["child_ref_list"])
+        # The handle is in the table as an ancestor of the people it used to
+        # be linked to, and the roots as the ancestors of their descendants
+        affected = set(roots)
+        for ancestor in roots | {handle}:
+            self.dbapi.execute(
+                "SELECT handle FROM ancestor WHERE ancestor = ?", [ancestor]
+            )
+            affected.update(row[0] for row in self.dbapi.fetchall())
+
+        people = {}
+        families = {}
+
+        def get_parent_families(person_handle):
+            if person_handle not in people:
+                data = self._get_raw_data(PERSON_KEY, person_handle)
+                people[person_handle] = data and data["parent_family_list"]
+            return people[person_handle]
+
+        def get_family_parents(family_handle):
+            if family_handle not in families:
+                data = self._get_raw_data(FAMILY_KEY, family_handle)
+                families[family_handle] = data and (
+                    data["father_handle"],
+                    data["mother_handle"],
+                )
+            return families[family_handle]
+
+        for person_handle in affected:
+            self.dbapi.execute("DELETE FROM ancestor WHERE handle = ?", [person_handle])
+            if get_parent_families(person_handle) is not None:
+                self._insert_ancestors(
+                    person_handle,
+                    _find_ancestors(
+                        person_handle, get_parent_families, get_family_parents
+                    ),
                 )
-            obj = from_dict(data)
-            self._update_secondary_values(obj)
 
     def get_surname_list(self):
         """
@@ -1144,36 +1897,39 @@ class DBAPI(DbGeneric):
                         f"ALTER TABLE {table_name} ADD COLUMN {field} {sql_type}"
                     )
 
-    def _update_secondary_values(self, obj):
+    def _get_secondary_values(self, obj):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Given a primary object return the names and values of its secondary
+        columns, including the derived ones.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append(f"{field} = ?")
-            values.append(getattr(obj, field))
+        fields = [
+            field[0] for field in obj.get_secondary_fields() if field[0] != "handle"
+        ]
+        values = [getattr(obj, field) for field in fields]
 
         # Derived fields
         if table == "Person":
             given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
+            fields += ["given_name", "surname"]
+            values += [given_name, surname]
         if table == "Place":
-            handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
-            values.append(handle)
+            fields.append("enclosed_by")
+            values.append(self._get_place_data(obj))
+        return fields, values
 
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        fields, values = self._get_secondary_values(obj)
         if len(values) > 0:
-            table_name = table.lower()
+            table_name = obj.__class__.__name__.lower()
+            sets = ", ".join(f"{field} = ?" for field in fields)
             self.dbapi.execute(
-                f'UPDATE {table_name} SET {", ".join(sets)} where handle = ?',
+                f"UPDATE {table_name} SET {sets} where handle = ?",
                 self._sql_cast_list(values) + [obj.handle],
             )
 
@@ -40,12 +40,20 @@ import sqlite3
 # -------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.db.dbconst import ARRAYSIZE
+from gramps.gen.lib.serialize import JSONSerializer
 from gramps.plugins.db.dbapi.dbapi import DBAPI
 
 _ = glocale.translation.gettext
 
 sqlite3.paramstyle = "qmark"
 
+# Settings used while bulk loading, as (pragma, value)
+BULK_LOAD_PRAGMAS = (
+    ("journal_mode", "MEMORY"),
+    ("synchronous", "OFF"),
+    ("cache_size", "-262144"),
+)
+
 
 # -------------------------------------------------------------------------
 #
@@ -78,6 +86,52 @@ class SQLite(DBAPI):
             path_to_db = os.path.join(directory, "sqlite.db")
         self.dbapi = Connection(path_to_db)
 
+    def bulk_load_begin(self, count=None):
+        """
+        Prepare the database for loading a large number of objects.
+
+        In addition to suspending index maintenance, the journal is kept in
+        memory, writes are not synced to disk, and a larger page cache is used
+        until the load ends.
+        """
+        if self._bulk_load:
+            return
+        super().bulk_load_begin(count)
+        if not self._bulk_load:
+            return
+        self.__pragmas = {}
+        for pragma, value in BULK_LOAD_PRAGMAS:
+            self.dbapi.execute(f"PRAGMA {pragma}")
+            self.__pragmas[pragma] = self.dbapi.fetchone()[0]
+            self.dbapi.execute(f"PRAGMA {pragma} = {value}")
+            self.dbapi.fetchall()
+
+    def bulk_load_end(self, callback=None):
+        """
+        Rebuild the indexes and the reference map, and restore the settings
+        changed for the bulk load.
+        """
+        if not self._bulk_load:
+            return
+        super().bulk_load_end(callback)
+        for pragma, value in self.__pragmas.items():
+            self.dbapi.execute(f"PRAGMA {pragma} = {value}")
+            self.dbapi.fetchall()
+
+    def select_handles(self, class_name, condition, values):
+        """
+        Return a list of the handles of the primary objects of the given
+        class that satisfy an SQL condition on their table.
+
+        The condition may use the JSON functions of SQLite on the json_data
+        column, the REGEXP operator and the match_substring function.
+        """
+        if self.serializer is not JSONSerializer:
+            return None
+        table = class_name.lower()
+        self.dbapi.execute(f"SELECT handle FROM {table} WHERE {condition}", values)
+        return [row[0] for row in self.dbapi.fetchall()]
+
 
 # -------------------------------------------------------------------------
 #
@@ -107,6 +161,7 @@ class Connection:
         self.__connection = sqlite3.connect(*args, **kwargs)
         self.__cursor = self.__connection.cursor()
         self.__connection.create_function("regexp", 2, regexp)
+        self.__connection.create_function("match_substring", 2, match_substring)
         self.__collations = []
         self.__tmap = str.maketrans("-.@=;", "_____")
         self.check_collation(glocale)
@@ -139,6 +194,18 @@ class Connection:
         self.log.debug(args)
         self.__cursor.execute(*args, **kwargs)
 
+    def executemany(self, *args, **kwargs):
+        """
+        Executes an SQL statement once for each set of parameters.
+
+        :param args: arguments to be passed to the sqlite3 executemany statement
+        :type args: list
+        :param kwargs: arguments to be passed to the sqlite3 executemany statement
+        :type kwargs: list
+        """
+        self.log.debug(args[:1])
+        self.__cursor.executemany(*args, **kwargs)
+
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
@@ -277,3 +344,22 @@ def regexp(expr, value):
     :rtype: bool
     """
     return re.search(expr, value, re.MULTILINE) is not None
+
+
+def match_substring(substring, value):
+    """
+    A user defined function that can be called from within an SQL statement.
+
+    It compares the strings in upper case, like the substring search of the
+    filter rules, so that "Weiss" is found in "Weiß".
+
+    :param substring: string to look for.
+    :type substring: str
+    :param value: the string to search.
+    :type value: str
+    :returns: True if the substring exists within the value, false otherwise.
+    :rtype: bool
+    """
+    if value is None:
+        return False
+    return str(value).upper().find(substring.upper()) != -1
@@ -24,15 +24,20 @@
 #
 # -------------------------------------------------------------------------
 import unittest
+from unittest import mock
 
 # -------------------------------------------------------------------------
 #
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from gramps.gen.config import config
 from gramps.gen.db import DbTxn
+from gramps.gen.db.base import DbReadBase
 from gramps.gen.db.utils import make_database
+from gramps.gen.errors import HandleError
 from gramps.gen.lib import (
+    ChildRef,
     Person,
     Family,
     Event,
@@ -44,8 +49,13 @@ from gramps.gen.lib import (
     Note,
     Tag,
     Researcher,
+    StyledText,
+    StyledTextTag,
+    StyledTextTagType,
     Surname,
 )
+from gramps.gen.lib.serialize import to_dict
+from gramps.plugins.db.dbapi.dbapi import _find_ancestors, get_referenced_handles
 
 
 # -------------------------------------------------------------------------
@@ -899,5 +909,498 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved["Mary"], (1, 3, 1))
 
 
+# -------------------------------------------------------------------------
+#
+# DbChangeTest class
+#
+# -------------------------------------------------------------------------
+class DbChangeTest(unittest.TestCase):
+    """
+    Tests of changes to some sample people.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def setUp(self):
+        with DbTxn("Add test objects", self.db) as trans:
+            for first_name in ("John", "Mary"):
+                for surname in ("Allen", "Baker", "Clark", "Davis", "Evans"):
+                    person = Person()
+                    name = person.primary_name
+                    name.first_name = first_name
+                    surname1 = Surname()
+                    surname1.surname = surname
+                    name.set_surname_list([surname1])
+                    self.db.add_person(person, trans)
+
+    def tearDown(self):
+        with DbTxn("Remove test objects", self.db) as trans:
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    ################################################################
+    #
+    # Test object cache
+    #
+    ################################################################
+
+    def test_cache_statistics(self):
+        handle = self.db.get_person_handles()[0]
+        before = self.db.get_cache_statistics()
+        self.db.get_person_from_handle(handle)
+        self.db.get_person_from_handle(handle)
+        after = self.db.get_cache_statistics()
+        self.assertGreaterEqual(after["hits"], before["hits"] + 1)
+        self.assertLessEqual(after["size"], after["max_size"])
+
+    def test_cache_commit(self):
+        handle = self.db.get_person_handles()[0]
+        person = self.db.get_person_from_handle(handle)
+        person.primary_name.first_name = "Peter"
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(person, trans)
+        person = self.db.get_person_from_handle(handle)
+        self.assertEqual(person.primary_name.first_name, "Peter")
+
+    def test_cache_undo(self):
+        handle = self.db.get_person_handles()[0]
+        person = self.db.get_person_from_handle(handle)
+        first_name = person.primary_name.first_name
+        person.primary_name.first_name = "Peter"
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.db.get_person_from_handle(handle)
+        self.db.undo()
+        person = self.db.get_person_from_handle(handle)
+        self.assertEqual(person.primary_name.first_name, first_name)
+        self.db.redo()
+        person = self.db.get_person_from_handle(handle)
+        self.assertEqual(person.primary_name.first_name, "Peter")
+
+    ################################################################
+    #
+    # Test undo history
+    #
+    ################################################################
+
+    def test_undo_storage(self):
+        undodb = self.db.get_undodb()
+        window = undodb.window
+        undodb.window = 4
+        try:
+            handles = self.db.get_person_handles()
+            first_names = []
+            for handle in handles:
+                person = self.db.get_person_from_handle(handle)
+                first_names.append(person.primary_name.first_name)
+                person.primary_name.first_name = "Peter"
+                with DbTxn("Edit person", self.db) as trans:
+                    self.db.commit_person(person, trans)
+            self.assertLessEqual(len(undodb.undodb), 4)
+            self.assertIsNotNone(undodb.storage)
+            for handle in handles:
+                self.db.undo()
+            for handle, first_name in zip(handles, first_names):
+                person = self.db.get_person_from_handle(handle)
+                self.assertEqual(person.primary_name.first_name, first_name)
+            for handle in handles:
+                self.db.redo()
+            for handle in handles:
+                person = self.db.get_person_from_handle(handle)
+                self.assertEqual(person.primary_name.first_name, "Peter")
+        finally:
+            undodb.window = window
+
+    ################################################################
+    #
+    # Test reference map updates
+    #
+    ################################################################
+
+    def test_backlinks(self):
+        father, mother = self.db.get_person_handles()[:2]
+        family = Family()
+        family.set_father_handle(father)
+        with DbTxn("Add family", self.db) as trans:
+            self.db.add_family(family, trans)
+        backlinks = list(self.db.find_backlink_handles(father))
+        self.assertEqual(backlinks, [("Family", family.handle)])
+
+        family.set_father_handle(None)
+        family.set_mother_handle(mother)
+        with DbTxn("Edit family", self.db) as trans:
+            self.db.commit_family(family, trans)
+        self.assertEqual(list(self.db.find_backlink_handles(father)), [])
+        backlinks = list(self.db.find_backlink_handles(mother))
+        self.assertEqual(backlinks, [("Family", family.handle)])
+
+        self.db.undo()
+        backlinks = list(self.db.find_backlink_handles(father))
+        self.assertEqual(backlinks, [("Family", family.handle)])
+        self.assertEqual(list(self.db.find_backlink_handles(mother)), [])
+
+        with DbTxn("Remove family", self.db) as trans:
+            self.db.remove_family(family.handle, trans)
+
+    def test_bulk_load(self):
+        father = self.db.get_person_handles()[0]
+        self.db.bulk_load_begin()
+        family = Family()
+        family.set_father_handle(father)
+        with DbTxn("Bulk load", self.db, batch=True) as trans:
+            self.db.add_family(family, trans)
+        self.db.bulk_load_end()
+        backlinks = list(self.db.find_backlink_handles(father))
+        self.assertEqual(backlinks, [("Family", family.handle)])
+        self.db.dbapi.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        indexes = [row[0] for row in self.db.dbapi.fetchall()]
+        for name, _, _ in self.db.INDEXES:
+            self.assertIn(name, indexes)
+
+        with DbTxn("Remove family", self.db) as trans:
+            self.db.remove_family(family.handle, trans)
+
+    def test_small_bulk_load(self):
+        # Smaller than the database, so the indexes are kept
+        self.db.bulk_load_begin(1)
+        self.assertFalse(self.db._bulk_load)
+        self.db.bulk_load_end()
+        self.db.bulk_load_begin(self.db.get_total())
+        self.assertTrue(self.db._bulk_load)
+        self.db.bulk_load_end()
+        self.assertFalse(self.db._bulk_load)
+
+    ################################################################
+    #
+    # Test rebuilding
+    #
+    ################################################################
+
+    def __get_references(self):
+        self.db.dbapi.execute(
+            "SELECT obj_handle, obj_class, ref_handle, ref_class FROM reference"
+        )
+        return sorted(self.db.dbapi.fetchall())
+
+    def test_reindex_reference_map(self):
+        father, mother, child = self.db.get_person_handles()[:3]
+        tag = Tag()
+        tag.set_name("Reindex")
+        note = Note()
+        link = StyledTextTag(
+            StyledTextTagType.LINK, "gramps://Person/handle/" + child, [(0, 4)]
+        )
+        note.set_styledtext(StyledText("Link", [link]))
+        family = Family()
+        family.set_father_handle(father)
+        family.set_mother_handle(mother)
+        childref = ChildRef()
+        childref.set_reference_handle(child)
+        family.add_child_ref(childref)
+        with DbTxn("Add family", self.db) as trans:
+            family.add_tag(self.db.add_tag(tag, trans))
+            note.add_tag(tag.handle)
+            family.add_note(self.db.add_note(note, trans))
+            self.db.add_family(family, trans)
+
+        for obj in (note, family):
+            self.assertEqual(
+                get_referenced_handles(to_dict(obj)),
+                set(obj.get_referenced_handles_recursively()),
+            )
+        references = self.__get_references()
+        self.assertIn((note.handle, "Note", child, "Person"), references)
+        self.db.reindex_reference_map(None)
+        self.assertEqual(self.__get_references(), references)
+
+        with DbTxn("Remove family", self.db) as trans:
+            self.db.remove_family(family.handle, trans)
+            self.db.remove_note(note.handle, trans)
+            self.db.remove_tag(tag.handle, trans)
+
+    def test_rebuild_secondary(self):
+        self.db.dbapi.execute("SELECT handle, surname FROM person")
+        surnames = sorted(self.db.dbapi.fetchall())
+        self.db.dbapi.begin()
+        self.db.dbapi.execute("UPDATE person SET surname = ''")
+        self.db.dbapi.commit()
+        self.db.rebuild_secondary(None)
+        self.db.dbapi.execute("SELECT handle, surname FROM person")
+        self.assertEqual(sorted(self.db.dbapi.fetchall()), surnames)
+
+    def test_cache_remove(self):
+        handle = self.db.get_person_handles()[0]
+        self.db.get_person_from_handle(handle)
+        with DbTxn("Remove person", self.db) as trans:
+            self.db.remove_person(handle, trans)
+        self.assertRaises(HandleError, self.db.get_person_from_handle, handle)
+
+
+# -------------------------------------------------------------------------
+#
+# DbSortKeyTest class
+#
+# -------------------------------------------------------------------------
+class DbSortKeyTest(unittest.TestCase):
+    """
+    Tests of the stored sort keys.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.calls = 0
+        with DbTxn("Add test people", self.db) as trans:
+            for gramps_id in ("I3", "I1", "I2"):
+                person = Person()
+                person.set_gramps_id(gramps_id)
+                self.db.add_person(person, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def sort_func(self, data):
+        self.calls += 1
+        return data["gramps_id"]
+
+    def get_sort_keys(self, version="1"):
+        sort_keys = self.db.get_sort_keys("Person", "id", version, self.sort_func)
+        return [
+            (key, self.db.get_raw_person_data(handle)["gramps_id"])
+            for key, handle in sort_keys
+        ]
+
+    def get_versions(self):
+        return self.db._get_metadata("sort_keys", {})
+
+    def test_stored(self):
+        expected = [("I1", "I1"), ("I2", "I2"), ("I3", "I3")]
+        self.assertEqual(self.get_sort_keys(), expected)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.get_sort_keys(), expected)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.get_versions(), {"id": ["Person", "1"]})
+
+    def test_version(self):
+        self.get_sort_keys()
+        self.get_sort_keys("2")
+        self.assertEqual(self.calls, 6)
+        self.assertEqual(self.get_versions(), {"id": ["Person", "2"]})
+
+    def test_commit(self):
+        self.get_sort_keys()
+        person = self.db.get_person_from_gramps_id("I1")
+        with DbTxn("Edit person", self.db) as trans:
+            person.set_gramps_id("I4")
+            self.db.commit_person(person, trans)
+            self.db.remove_person(self.db.get_person_from_gramps_id("I2").handle, trans)
+        self.assertEqual(self.get_sort_keys(), [("I3", "I3"), ("I4", "I4")])
+        self.assertEqual(self.calls, 4)
+        self.db.undo()
+        self.assertEqual(
+            self.get_sort_keys(), [("I1", "I1"), ("I2", "I2"), ("I3", "I3")]
+        )
+
+    def test_groups(self):
+        group_func = lambda data: data["gramps_id"][:1]
+        self.assertEqual(
+            self.db.get_sort_key_values("Person", "group", "1", group_func), ["I"]
+        )
+        handles = self.db.get_sort_key_handles("Person", "group", "1", group_func, "I")
+        self.assertEqual(sorted(handles), sorted(self.db.get_person_handles()))
+        self.assertEqual(
+            self.db.get_sort_key_handles("Person", "group", "1", group_func, "J"), []
+        )
+
+    def test_prepare(self):
+        with DbTxn("Edit person", self.db):
+            self.assertFalse(
+                self.db.prepare_sort_keys("Person", "id", "1", self.sort_func)
+            )
+        self.assertEqual(self.get_versions(), {})
+        self.assertTrue(self.db.prepare_sort_keys("Person", "id", "1", self.sort_func))
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.get_versions(), {"id": ["Person", "1"]})
+        self.assertEqual(
+            self.get_sort_keys(), [("I1", "I1"), ("I2", "I2"), ("I3", "I3")]
+        )
+        self.assertEqual(self.calls, 3)
+
+    def test_release(self):
+        self.get_sort_keys()
+        self.db.release_sort_keys("id", self.sort_func)
+        person = self.db.get_person_from_gramps_id("I1")
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.get_versions(), {})
+        self.calls = 0
+        self.get_sort_keys()
+        self.assertEqual(self.calls, 3)
+
+
+# -------------------------------------------------------------------------
+#
+# DbAncestorTest class
+#
+# -------------------------------------------------------------------------
+class DbAncestorTest(unittest.TestCase):
+    """
+    Tests of the ancestor index.
+    """
+
+    def setUp(self):
+        self.index_config = config.get("database.ancestor-index")
+        config.set("database.ancestor-index", True)
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.people = {}
+        self.families = {}
+        with DbTxn("Add test people", self.db) as trans:
+            for gramps_id in ("G1", "G2", "P1", "S1", "C1", "C2", "A1"):
+                person = Person()
+                person.set_gramps_id(gramps_id)
+                self.people[gramps_id] = self.db.add_person(person, trans)
+            # The parents of P1, the children of P1 and S1, and an adoptive
+            # family of C1
+            self.add_family("F0", "G1", "G2", ["P1"], trans)
+            self.add_family("F1", "P1", "S1", ["C1", "C2"], trans)
+            self.add_family("F2", "A1", None, ["C1"], trans)
+
+    def tearDown(self):
+        self.db.close()
+        config.set("database.ancestor-index", self.index_config)
+
+    def add_family(self, gramps_id, father, mother, children, trans):
+        family = Family()
+        family.set_gramps_id(gramps_id)
+        family.set_father_handle(father and self.people[father])
+        family.set_mother_handle(mother and self.people[mother])
+        for child in children:
+            child_ref = ChildRef()
+            child_ref.set_reference_handle(self.people[child])
+            family.add_child_ref(child_ref)
+        handle = self.families[gramps_id] = self.db.add_family(family, trans)
+        for parent in (father, mother):
+            if parent:
+                person = self.db.get_person_from_handle(self.people[parent])
+                person.add_family_handle(handle)
+                self.db.commit_person(person, trans)
+        for child in children:
+            person = self.db.get_person_from_handle(self.people[child])
+            person.add_parent_family_handle(handle)
+            self.db.commit_person(person, trans)
+
+    def check_index(self):
+        """
+        Check that the index gives the same results as the walks through
+        the families.
+        """
+        self.assertTrue(self.db.has_ancestor_index())
+        for handle in self.db.get_person_handles():
+            for main_family_only in (False, True):
+                self.assertEqual(
+                    self.db.get_ancestors(handle, main_family_only),
+                    DbReadBase.get_ancestors(self.db, handle, main_family_only),
+                )
+            self.assertEqual(
+                self.db.get_descendants(handle),
+                DbReadBase.get_descendants(self.db, handle),
+            )
+        for handle in self.db.get_family_handles():
+            self.assertEqual(
+                self.db.get_descendants(handle),
+                DbReadBase.get_descendants(self.db, handle),
+            )
+
+    def test_build(self):
+        self.check_index()
+        people, families = self.people, self.families
+        self.assertEqual(
+            self.db.get_ancestors(people["C1"]),
+            {
+                families["F1"]: 1,
+                people["P1"]: 1,
+                people["S1"]: 1,
+                families["F2"]: 1,
+                people["A1"]: 1,
+                families["F0"]: 2,
+                people["G1"]: 2,
+                people["G2"]: 2,
+            },
+        )
+        self.assertEqual(
+            self.db.get_ancestors(people["C1"], main_family_only=True),
+            {
+                families["F1"]: 1,
+                people["P1"]: 1,
+                people["S1"]: 1,
+                families["F0"]: 2,
+                people["G1"]: 2,
+                people["G2"]: 2,
+            },
+        )
+        self.assertTrue(self.db.may_have_common_ancestor(people["C1"], people["C2"]))
+        self.assertTrue(self.db.may_have_common_ancestor(people["G1"], people["C2"]))
+        self.assertTrue(self.db.may_have_common_ancestor(people["A1"], people["A1"]))
+        self.assertFalse(self.db.may_have_common_ancestor(people["S1"], people["A1"]))
+        self.assertFalse(self.db.may_have_common_ancestor(people["G1"], people["G2"]))
+
+    def test_commit(self):
+        self.check_index()
+        with DbTxn("Edit families", self.db) as trans:
+            # A1 becomes the father of S1, G1 is removed and S1 leaves F1
+            self.add_family("F3", "A1", None, ["S1"], trans)
+            self.db.remove_person(self.people["G1"], trans)
+            family = self.db.get_family_from_handle(self.families["F1"])
+            family.set_mother_handle(None)
+            self.db.commit_family(family, trans)
+            person = self.db.get_person_from_handle(self.people["S1"])
+            person.remove_family_handle(self.families["F1"])
+            self.db.commit_person(person, trans)
+        self.check_index()
+        self.assertNotIn(self.people["G1"], self.db.get_ancestors(self.people["C2"]))
+        self.assertNotIn(self.people["A1"], self.db.get_ancestors(self.people["C2"]))
+        self.db.undo()
+        self.check_index()
+        self.assertIn(self.people["G1"], self.db.get_ancestors(self.people["C2"]))
+
+    def test_unchanged_links(self):
+        self.check_index()
+        person = self.db.get_person_from_handle(self.people["C1"])
+        family = self.db.get_family_from_handle(self.families["F1"])
+        with mock.patch(
+            "gramps.plugins.db.dbapi.dbapi._find_ancestors", wraps=_find_ancestors
+        ) as find_ancestors:
+            with DbTxn("Edit names", self.db) as trans:
+                person.get_primary_name().set_first_name("Changed")
+                self.db.commit_person(person, trans)
+                self.db.commit_family(family, trans)
+            self.assertEqual(find_ancestors.call_count, 0)
+            self.db.undo()
+            self.assertEqual(find_ancestors.call_count, 0)
+            with DbTxn("Edit parent families", self.db) as trans:
+                person.set_main_parent_family_handle(self.families["F2"])
+                self.db.commit_person(person, trans)
+            self.assertGreater(find_ancestors.call_count, 0)
+        self.check_index()
+
+    def test_disabled(self):
+        config.set("database.ancestor-index", False)
+        self.assertFalse(self.db.has_ancestor_index())
+        self.assertTrue(
+            self.db.may_have_common_ancestor(self.people["S1"], self.people["A1"])
+        )
+        config.set("database.ancestor-index", True)
+        self.assertTrue(self.db.has_ancestor_index())
+        config.set("database.ancestor-index", False)
+        person = self.db.get_person_from_handle(self.people["C1"])
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.db._get_metadata("ancestor_index", 0), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -34,6 +34,8 @@
 # -------------------------------------------------------------------------
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 # -------------------------------------------------------------------------
 #
@@ -68,6 +70,14 @@ from gramps.gen.utils.file import media_path_full
 from gramps.gen.utils.place import conv_lat_lon
 from gramps.gen.utils.location import get_main_location
 from gramps.gen.display.place import displayer as _pd
+from gramps.plugins.lib.libexportpool import (
+    get_database_path,
+    get_processes,
+    init_gedcom_worker,
+    iter_chunks,
+    render_gedcom,
+    render_in_order,
+)
 
 # -------------------------------------------------------------------------
 #
@@ -257,6 +267,8 @@ class GedcomWriter(UpdateCallback):
         self.dirname = None
         self.gedcom_file = None
         self.progress_cnt = 0
+        self.pool = None
+        self.processes = 1
         self.setup(option_box)
 
     def setup(self, option_box):
@@ -272,9 +284,30 @@ class GedcomWriter(UpdateCallback):
     def write_gedcom_file(self, filename):
         """
         Write the actual GEDCOM file to the specified filename.
+
+        If the "database.export-processes" preference is more than one, and
+        the database can be opened by other processes, the individuals and
+        families are written in a pool of worker processes.
         """
 
         self.dirname = os.path.dirname(filename)
+        self.processes = get_processes()
+        path = get_database_path(self.dbase)
+        if self.processes > 1 and path:
+            with ProcessPoolExecutor(
+                self.processes,
+                initializer=init_gedcom_worker,
+                initargs=(path, self.dirname),
+            ) as self.pool:
+                ret = self._write_gedcom_file(filename)
+            self.pool = None
+            return ret
+        return self._write_gedcom_file(filename)
+
+    def _write_gedcom_file(self, filename):
+        """
+        Write the GEDCOM records to the specified filename.
+        """
         with open(filename, "w", encoding="utf-8") as self.gedcom_file:
             person_len = self.dbase.get_number_of_people()
             family_len = self.dbase.get_number_of_families()
@@ -446,9 +479,33 @@ class GedcomWriter(UpdateCallback):
                 sorted_list.append(data)
         sorted_list.sort()
 
-        for data in sorted_list:
-            self.update()
-            self._person(self.dbase.get_person_from_handle(data[1]))
+        self._write_records(
+            [data[1] for data in sorted_list],
+            self.dbase.get_person_from_handle,
+            self.dbase.get_raw_person_data,
+            self._person,
+        )
+
+    def _write_records(self, handles, get_object, get_raw_data, write_func):
+        """
+        Write the records of the primary objects with the given handles, in
+        that order.
+
+        With a pool of worker processes, the records are written from the
+        raw data of the objects by the workers, a chunk at a time.
+        """
+        if self.pool is None:
+            for handle in handles:
+                self.update()
+                write_func(get_object(handle))
+            return
+
+        render = partial(render_gedcom, write_func.__name__)
+        chunks = iter_chunks(map(get_raw_data, handles))
+        for count, text in render_in_order(self.pool, self.processes, render, chunks):
+            self.gedcom_file.write(text)
+            for dummy in range(count):
+                self.update()
 
     def _person(self, person):
         """
@@ -883,9 +940,12 @@ class GedcomWriter(UpdateCallback):
 
         # loop through the sorted list, pulling of the handle. This list
         # has already been sorted by GRAMPS_ID
-        for family_handle in [hndl[1] for hndl in sorted_list]:
-            self.update()
-            self._family(self.dbase.get_family_from_handle(family_handle))
+        self._write_records(
+            [hndl[1] for hndl in sorted_list],
+            self.dbase.get_family_from_handle,
+            self.dbase.get_raw_family_data,
+            self._family,
+        )
 
     def _family(self, family):
         """
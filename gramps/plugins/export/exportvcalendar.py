@@ -108,8 +108,12 @@ class CalendarWriter:
                 f_hndls = self.db.get_family_handles()
                 f_hndls.sort()
                 self.total = len(p_hndls) + len(f_hndls)
-                for key in p_hndls:
-                    self.write_person(key)
+                # The names of all people are formatted in one batch
+                names = name_displayer.display_many(
+                    self.db.get_raw_person_data(key)["primary_name"] for key in p_hndls
+                )
+                for key, name in zip(p_hndls, names):
+                    self.write_person(key, name)
                     self.update()
 
                 for key in f_hndls:
@@ -137,7 +141,7 @@ class CalendarWriter:
                     text = "%s - %s" % (family_name(family, self.db), _("Marriage"))
                     self.write_vevent(text, event)
 
-    def write_person(self, person_handle):
+    def write_person(self, person_handle, name):
         person = self.db.get_person_from_handle(person_handle)
         if person:
             birth_ref = person.get_birth_ref()
@@ -145,18 +149,14 @@ class CalendarWriter:
                 birth = self.db.get_event_from_handle(birth_ref.ref)
                 if birth:
                     # feature requests 2356, 1657: avoid genitive form
-                    self.write_vevent(
-                        "%s - %s" % (name_displayer.display(person), _("Birth")), birth
-                    )
+                    self.write_vevent("%s - %s" % (name, _("Birth")), birth)
 
             death_ref = person.get_death_ref()
             if death_ref:
                 death = self.db.get_event_from_handle(death_ref.ref)
                 if death:
                     # feature requests 2356, 1657: avoid genitive form
-                    self.write_vevent(
-                        "%s - %s" % (name_displayer.display(person), _("Death")), death
-                    )
+                    self.write_vevent("%s - %s" % (name, _("Death")), death)
 
     def format_single_date(self, subdate, thisyear, cal):
         retval = ""
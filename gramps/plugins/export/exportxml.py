@@ -39,6 +39,8 @@ import time
 import shutil
 import os
 import codecs
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from xml.sax.saxutils import escape
 
 # ------------------------------------------------------------------------
@@ -66,6 +68,14 @@ from gramps.version import VERSION
 from gramps.gen.constfunc import win
 from gramps.gui.plug.export import WriterOptionBox, WriterOptionBoxWithCompression
 import gramps.plugins.lib.libgrampsxml as libgrampsxml
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.plugins.lib.libexportpool import (
+    get_processes,
+    init_xml_worker,
+    iter_chunks,
+    render_in_order,
+    render_xml,
+)
 
 # -------------------------------------------------------------------------
 #
@@ -128,6 +138,8 @@ class GrampsXmlWriter(UpdateCallback):
         self.db = db
         self.strip_photos = strip_photos
         self.version = version
+        self.pool = None
+        self.processes = 1
 
         self.status = None
 
@@ -223,6 +235,24 @@ class GrampsXmlWriter(UpdateCallback):
         return 1
 
     def write_xml_data(self):
+        """
+        Write the database, rendering the primary objects in a pool of
+        worker processes if the "database.export-processes" preference is
+        more than one.  Proxy databases are always written in this process.
+        """
+        self.processes = get_processes()
+        if self.processes > 1 and not isinstance(self.db, ProxyDbBase):
+            with ProcessPoolExecutor(
+                self.processes,
+                initializer=init_xml_worker,
+                initargs=(self.strip_photos, self.version),
+            ) as self.pool:
+                self._write_xml_data()
+            self.pool = None
+        else:
+            self._write_xml_data()
+
+    def _write_xml_data(self):
         date = time.localtime(time.time())
         owner = self.db.get_researcher()
 
@@ -302,11 +332,12 @@ class GrampsXmlWriter(UpdateCallback):
         # Write primary objects
         if event_len > 0:
             self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_event_handles()),
+                self.db.get_event_from_handle,
+                self.db.get_raw_event_data,
+                self.write_event,
+            )
             self.g.write("  </events>\n")
 
         if person_len > 0:
@@ -316,75 +347,82 @@ class GrampsXmlWriter(UpdateCallback):
                 self.g.write(' home="_%s"' % person.handle)
             self.g.write(">\n")
 
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
-                if person:
-                    self.write_person(person, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_person_handles()),
+                self.db.get_person_from_handle,
+                self.db.get_raw_person_data,
+                self.write_person,
+            )
             self.g.write("  </people>\n")
 
         if family_len > 0:
             self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.iter_family_handles()),
+                self.db.get_family_from_handle,
+                self.db.get_raw_family_data,
+                self.write_family,
+            )
             self.g.write("  </families>\n")
 
         if citation_len > 0:
             self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_citation_handles()),
+                self.db.get_citation_from_handle,
+                self.db.get_raw_citation_data,
+                self.write_citation,
+            )
             self.g.write("  </citations>\n")
 
         if source_len > 0:
             self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_source_handles()),
+                self.db.get_source_from_handle,
+                self.db.get_raw_source_data,
+                self.write_source,
+            )
             self.g.write("  </sources>\n")
 
         if place_len > 0:
             self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_place_handles()),
+                self.db.get_place_from_handle,
+                self.db.get_raw_place_data,
+                self.write_place_obj,
+            )
             self.g.write("  </places>\n")
 
         if obj_len > 0:
             self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_media_handles()),
+                self.db.get_media_from_handle,
+                self.db.get_raw_media_data,
+                self.write_object,
+            )
             self.g.write("  </objects>\n")
 
         if repo_len > 0:
             self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_repository_handles()),
+                self.db.get_repository_from_handle,
+                self.db.get_raw_repository_data,
+                self.write_repository,
+            )
             self.g.write("  </repositories>\n")
 
         if note_len > 0:
             self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
-                self.update()
+            self.write_objects(
+                sorted(self.db.get_note_handles()),
+                self.db.get_note_from_handle,
+                self.db.get_raw_note_data,
+                self.write_note,
+            )
             self.g.write("  </notes>\n")
 
         # Data is written, now write bookmarks.
@@ -396,6 +434,28 @@ class GrampsXmlWriter(UpdateCallback):
     #        self.status.end()
     #        self.status = None
 
+    def write_objects(self, handles, get_object, get_raw_data, write_func):
+        """
+        Write the primary objects with the given handles, in that order.
+
+        With a pool of worker processes, the objects are written from their
+        raw data by the workers, a chunk at a time.
+        """
+        if self.pool is None:
+            for handle in handles:
+                obj = get_object(handle)
+                if obj:
+                    write_func(obj, 2)
+                self.update()
+            return
+
+        render = partial(render_xml, write_func.__name__)
+        chunks = iter_chunks(data for data in map(get_raw_data, handles) if data)
+        for count, text in render_in_order(self.pool, self.processes, render, chunks):
+            self.g.write(text)
+            for dummy in range(count):
+                self.update()
+
     def write_metadata(self):
         """Method to write out metadata of the database"""
         mediapath = self.db.get_mediapath()
@@ -0,0 +1,70 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for export to Gramps XML
+"""
+import os
+import tempfile
+import unittest
+
+from ....gen.config import config
+from ....gen.const import DATA_DIR
+from ....gen.db.utils import import_as_dict
+from ....gen.user import User
+from ..exportxml import XmlWriter
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class ExportXmlTest(unittest.TestCase):
+    """
+    Test the Gramps XML writer.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def tearDown(self):
+        config.set("database.export-processes", 1)
+
+    def write(self, processes):
+        """
+        Return the uncompressed XML written with a number of processes.
+        """
+        config.set("database.export-processes", processes)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "export.gramps")
+            writer = XmlWriter(self.db, User(), 0, compress=0)
+            self.assertTrue(writer.write(filename))
+            with open(filename, "rb") as xml_file:
+                return xml_file.read()
+
+    def test_processes(self):
+        """
+        Test that writing in worker processes gives the same file.
+        """
+        self.assertEqual(self.write(2), self.write(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,20 +30,12 @@ import os
 # ------------------------------------------------------------------------
 from gramps.gen.plug import Gramplet
 from gramps.gen.utils.file import media_path_full
-from gramps.gen.datehandler import get_date
 from gramps.gen.lib import Person
+from gramps.gen.utils.treestats import person_statistics
 from gramps.gen.const import COLON, GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.sgettext
 
-# ------------------------------------------------------------------------
-#
-# Constants
-#
-# ------------------------------------------------------------------------
-
-_YIELD_INTERVAL = 200
-
 # ------------------------------------------------------------------------
 #
 # StatsGramplet class
@@ -61,28 +53,24 @@ class StatsGramplet(Gramplet):
         self.set_tooltip(_("Double-click item to see matches"))
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "family-add", self.update)
-        self.connect(self.dbstate.db, "family-delete", self.update)
-        self.connect(self.dbstate.db, "person-rebuild", self.update)
-        self.connect(self.dbstate.db, "family-rebuild", self.update)
+        stats = person_statistics(self.dbstate.db)
+        self.connect(stats, "statistics-changed", self.update)
 
     def main(self):
         self.set_text(_("Processing..."))
         database = self.dbstate.db
-        personList = database.iter_people()
-
-        with_media = 0
-        total_media = 0
-        incomp_names = 0
-        disconnected = 0
-        missing_bday = 0
-        males = 0
-        females = 0
-        others = 0
-        unknowns = 0
+        stats = person_statistics(database)
+        yield from stats.build()
+
+        with_media = stats.with_media
+        total_media = stats.total_media
+        incomp_names = stats.incomplete_names
+        disconnected = stats.disconnected
+        missing_bday = stats.missing_birth
+        males = stats.get_gender_count(Person.MALE)
+        females = stats.get_gender_count(Person.FEMALE)
+        others = stats.get_gender_count(Person.OTHER)
+        unknowns = stats.get_gender_count(Person.UNKNOWN)
         bytes_cnt = 0
         notfound = []
 
@@ -100,47 +88,6 @@ class StatsGramplet(Gramplet):
             except OSError:
                 notfound.append(media.get_path())
 
-        for cnt, person in enumerate(personList):
-            length = len(person.get_media_list())
-            if length > 0:
-                with_media += 1
-                total_media += length
-
-            for name in [person.get_primary_name()] + person.get_alternate_names():
-                if name.get_first_name().strip() == "":
-                    incomp_names += 1
-                else:
-                    if name.get_surname_list():
-                        for surname in name.get_surname_list():
-                            if surname.get_surname().strip() == "":
-                                incomp_names += 1
-                    else:
-                        incomp_names += 1
-
-            if (
-                not person.get_main_parents_family_handle()
-                and not person.get_family_handle_list()
-            ):
-                disconnected += 1
-
-            birth_ref = person.get_birth_ref()
-            if birth_ref:
-                birth = database.get_event_from_handle(birth_ref.ref)
-                if not get_date(birth):
-                    missing_bday += 1
-            else:
-                missing_bday += 1
-
-            if person.get_gender() == Person.FEMALE:
-                females += 1
-            elif person.get_gender() == Person.MALE:
-                males += 1
-            elif person.get_gender() == Person.OTHER:
-                others += 1
-            else:
-                unknowns += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
         self.clear_text()
         self.append_text(_("Individuals") + "\n")
         self.append_text("----------------------------\n")
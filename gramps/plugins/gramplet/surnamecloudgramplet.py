@@ -31,17 +31,10 @@ from collections import defaultdict
 from gramps.gen.plug import Gramplet
 from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.utils.treestats import person_statistics
 
 _ = glocale.translation.sgettext
 
-# ------------------------------------------------------------------------
-#
-# Constants
-#
-# ------------------------------------------------------------------------
-
-_YIELD_INTERVAL = 350
-
 
 # ------------------------------------------------------------------------
 #
@@ -73,11 +66,8 @@ class SurnameCloudGramplet(Gramplet):
         self.set_text(_("No Family Tree loaded."))
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
-        self.connect(self.dbstate.db, "person-rebuild", self.update)
-        self.connect(self.dbstate.db, "family-rebuild", self.update)
+        stats = person_statistics(self.dbstate.db)
+        self.connect(stats, "statistics-changed", self.update)
 
     def on_load(self):
         if len(self.gui.data) == 3:
@@ -95,37 +85,15 @@ class SurnameCloudGramplet(Gramplet):
     def main(self):
         self.set_text(_("Processing...") + "\n")
         yield True
-        surnames = defaultdict(int)
+        stats = person_statistics(self.dbstate.db)
+        yield from stats.build()
         representative_handle = {}
 
-        cnt = 0
-        namelist = []
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set([name.get_group_name().strip() for name in allnames])
-            for surname in allnames:
-                surnames[surname] += 1
-                representative_handle[surname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
-            # Count unique surnames
-            for name in [person.get_primary_name()] + person.get_alternate_names():
-                if (
-                    not name.get_surname().strip() in namelist
-                    and not name.get_surname().strip() == ""
-                ):
-                    namelist.append(name.get_surname().strip())
-
-        total_people = cnt
+        total_people = stats.get_number_of_people()
         surname_sort = []
-        total = cnt = 0
-        for surname in surnames:
-            surname_sort.append((surnames[surname], surname))
-            total += surnames[surname]
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
+        for surname, (count, handle) in stats.get_surnames().items():
+            surname_sort.append((count, surname))
+            representative_handle[surname] = handle
 
         surname_sort.sort(reverse=True)
         cloud_names = []
@@ -181,7 +149,8 @@ class SurnameCloudGramplet(Gramplet):
                 self.append_text(" ")
                 showing += 1
         self.append_text(
-            ("\n\n" + _("Total unique surnames") + ": %d\n") % len(namelist)
+            ("\n\n" + _("Total unique surnames") + ": %d\n")
+            % len(stats.unique_surnames)
         )
         self.append_text((_("Total surnames showing") + ": %d\n") % showing)
         self.append_text((_("Total people") + ": %d") % total_people, "begin")
@@ -16,13 +16,6 @@
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
-# ------------------------------------------------------------------------
-#
-# Python modules
-#
-# ------------------------------------------------------------------------
-from collections import defaultdict
-
 # ------------------------------------------------------------------------
 #
 # Gramps modules
@@ -31,16 +24,10 @@ from collections import defaultdict
 from gramps.gen.plug import Gramplet
 from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.utils.treestats import person_statistics
 
 _ = glocale.translation.sgettext
 
-# ------------------------------------------------------------------------
-#
-# Constants
-#
-# ------------------------------------------------------------------------
-_YIELD_INTERVAL = 350
-
 
 # ------------------------------------------------------------------------
 #
@@ -54,11 +41,8 @@ class TopSurnamesGramplet(Gramplet):
         self.set_text(_("No Family Tree loaded."))
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
-        self.connect(self.dbstate.db, "person-rebuild", self.update)
-        self.connect(self.dbstate.db, "family-rebuild", self.update)
+        stats = person_statistics(self.dbstate.db)
+        self.connect(stats, "statistics-changed", self.update)
         self.set_text(_("No Family Tree loaded."))
 
     def on_load(self):
@@ -70,33 +54,20 @@ class TopSurnamesGramplet(Gramplet):
 
     def main(self):
         self.set_text(_("Processing...") + "\n")
-        surnames = defaultdict(int)
+        stats = person_statistics(self.dbstate.db)
+        yield from stats.build()
+        surnames = stats.get_surnames()
         representative_handle = {}
 
-        cnt = 0
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set([name.get_group_name().strip() for name in allnames])
-            for surname in allnames:
-                surnames[surname] += 1
-                representative_handle[surname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
-
-        total_people = cnt
+        total_people = stats.get_number_of_people()
         surname_sort = []
         total = 0
+        for surname, (count, handle) in surnames.items():
+            surname_sort.append((count, surname))
+            representative_handle[surname] = handle
+            total += count
 
-        cnt = 0
-        for surname in surnames:
-            surname_sort.append((surnames[surname], surname))
-            total += surnames[surname]
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
-
-        total_surnames = cnt
+        total_surnames = len(surnames)
         surname_sort.sort(reverse=True)
         line = 0
         ### All done!
@@ -136,7 +136,14 @@ try:
 except:
     GZIP_OK = False
 
-PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+# size of the blocks of the file that are fed to the parser
+PARSE_BLOCK_SIZE = 1 << 16
+
+# approximate size of an object in a file, plain and gzipped, used to
+# estimate the number of objects imported from the size of the file
+XML_OBJECT_SIZE = 260
+GZIP_OBJECT_SIZE = 40
+
 
 CHILD_REL_MAP = {
     "Birth": ChildRefType(ChildRefType.BIRTH),
@@ -168,8 +175,7 @@ def importData(database, filename, user):
     database.smap = {}
     database.pmap = {}
     database.fmap = {}
-    line_cnt = 1
-    person_cnt = 0
+    file_size = 0
 
     with ImportOpenFileContextManager(filename, user) as xml_file:
         if xml_file is None:
@@ -194,15 +200,13 @@ def importData(database, filename, user):
             )
 
         if filename != "-":
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
+            file_size = os.path.getsize(filename)
 
         read_only = database.readonly
         database.readonly = False
 
         try:
-            info = parser.parse(xml_file, line_cnt, person_cnt)
+            info = parser.parse(xml_file, file_size)
         except GrampsImportError as err:  # version error
             user.notify_error(*err.messages())
             return
@@ -409,61 +413,6 @@ class ImportInfo:
         return txt
 
 
-class LineParser:
-    def __init__(self, filename):
-        self.count = 0
-        self.person_count = 0
-
-        if GZIP_OK:
-            use_gzip = 1
-            try:
-                with gzip.open(filename, "r") as f:
-                    f.read(1)
-            except IOError as msg:
-                use_gzip = 0
-            except ValueError as msg:
-                use_gzip = 1
-        else:
-            use_gzip = 0
-
-        try:
-            if use_gzip:
-                import io
-
-                # Bug 6255. TextIOWrapper is required for python3 to
-                #           present file contents as text, otherwise they
-                #           are read as binary. However due to a missing
-                #           method (read1) in early python3 versions this
-                #           try block will fail.
-                #           Gramps will still import XML files using python
-                #           versions < 3.3.0 but the file progress meter
-                #           will not work properly, going immediately to
-                #           100%.
-                #           It should work correctly from version 3.3.
-                ofile = io.TextIOWrapper(
-                    gzip.open(filename, "rb"), encoding="utf8", errors="replace"
-                )
-            else:
-                ofile = open(filename, "r", encoding="utf8", errors="replace")
-
-            for line in ofile:
-                self.count += 1
-                if PERSON_RE.match(line):
-                    self.person_count += 1
-        except:
-            self.count = 0
-            self.person_count = 0
-        finally:
-            # Ensure the file handle is always closed
-            ofile.close()
-
-    def get_count(self):
-        return self.count
-
-    def get_person_count(self):
-        return self.person_count
-
-
 # -------------------------------------------------------------------------
 #
 # ImportOpenFileContextManager
@@ -1044,14 +993,39 @@ class GrampsParser(UpdateCallback):
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
-    def parse(self, ifile, linecount=1, personcount=0):
+    def parse(self, ifile, file_size=0):
         """
         Parse the xml file
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
+        :param file_size: the size of the file on disk, compressed or not, used
+                          to report progress and to decide whether to load
+                          the objects in bulk; 0 if it is unknown
+        """
+        # a gzip file reads the compressed file underneath
+        if getattr(ifile, "fileobj", None):
+            count = file_size // GZIP_OBJECT_SIZE
+        else:
+            count = file_size // XML_OBJECT_SIZE
+        self.db.bulk_load_begin(count)
+        try:
+            self.__parse(ifile, file_size)
+        finally:
+            self.db.bulk_load_end()
+        self.db.enable_signals()
+        self.db.request_rebuild()
+        return self.info
+
+    def __parse(self, ifile, file_size):
+        """
+        Parse the xml file in a single batch transaction.
+
+        The file is read once, in blocks that are fed to the parser. Progress
+        is measured by the position in the file on disk, which for a gzipped
+        file is the position in the compressed data.
         """
         with DbTxn(_("Gramps XML import"), self.db, batch=True) as self.trans:
-            self.set_total(linecount)
+            self.set_total(file_size)
 
             self.db.disable_signals()
 
@@ -1062,7 +1036,17 @@ class GrampsParser(UpdateCallback):
             self.p.StartElementHandler = self.startElement
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
-            self.p.ParseFile(ifile)
+            self.p.buffer_text = True
+            # the compressed file underneath a gzip file
+            rawfile = getattr(ifile, "fileobj", None) or ifile
+            while True:
+                data = ifile.read(PARSE_BLOCK_SIZE)
+                if not data:
+                    break
+                self.p.Parse(data, False)
+                if file_size:
+                    self.update(rawfile.tell())
+            self.p.Parse(b"", True)
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1106,9 +1090,6 @@ class GrampsParser(UpdateCallback):
             del self.func_list
             del self.p
             del self.update
-        self.db.enable_signals()
-        self.db.request_rebuild()
-        return self.info
 
     def start_database(self, attrs):
         """
@@ -1292,7 +1273,6 @@ class GrampsParser(UpdateCallback):
         # Gramps LEGACY: title in the placeobj tag
         self.placeobj.title = attrs.get("title", "")
         self.locations = 0
-        self.update(self.p.CurrentLineNumber)
         if self.default_tag:
             self.placeobj.add_tag(self.default_tag.handle)
         return self.placeobj
@@ -1403,7 +1383,6 @@ class GrampsParser(UpdateCallback):
             self.info.add("new-object", EVENT_KEY, self.event)
         else:
             # This is new event, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.event = Event()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -1626,7 +1605,6 @@ class GrampsParser(UpdateCallback):
         Add a person to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.person = Person()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -1762,7 +1740,6 @@ class GrampsParser(UpdateCallback):
         Add a family object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.family = Family()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2050,7 +2027,6 @@ class GrampsParser(UpdateCallback):
         self.in_note = 0
         if "handle" in attrs:
             # This is new note, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.note = Note()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -2255,7 +2231,6 @@ class GrampsParser(UpdateCallback):
         Add a citation object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.citation = Citation()
         orig_handle = attrs["handle"].replace("_", "")
         is_merge_candidate = self.replace_import_handle and self.db.has_citation_handle(
@@ -2314,7 +2289,6 @@ class GrampsParser(UpdateCallback):
         Add a source object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.source = Source()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2474,7 +2448,7 @@ class GrampsParser(UpdateCallback):
         pass
 
     def stop_database(self, *tag):
-        self.update(self.p.CurrentLineNumber)
+        pass
 
     def stop_media(self, *tag):
         self.db.commit_media(self.object, self.trans, self.object.get_change_time())
@@ -0,0 +1,566 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Find people that are possibly the same person.
+
+The people are grouped in blocks by gender and by a key of their surnames,
+as only people in the same block can match.  Within a block, the candidates
+of a person are looked up by the years of birth and death, as two regular
+dates in different years never match.  The data needed to compare two
+people is collected once, so that the blocks can be compared without the
+database, optionally in several processes.
+"""
+
+# ------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# ------------------------------------------------------------------------
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from heapq import merge
+
+# ------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# ------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.lib import Date, Person
+from gramps.gen.soundex import soundex, compare
+
+_ = glocale.translation.sgettext
+
+# Number of people compared in one task of a worker process
+CHUNK_SIZE = 1000
+
+
+def is_initial(name):
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == ".":
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return " ".join([surn.get_surname() for surn in name.get_surname_list()])
+
+
+def get_date_key(date):
+    """
+    Return the year used to look up the candidates with the date, or None if
+    the date can match a date in any year.
+    """
+    if date.get_modifier() == Date.MOD_TEXTONLY:
+        return None
+    if date.is_empty() or date.is_compound():
+        return None
+    return date.get_year()
+
+
+# ------------------------------------------------------------------------
+#
+# PersonFeatures
+#
+# ------------------------------------------------------------------------
+class PersonFeatures:
+    """
+    The data of a person that is compared with other people.
+    """
+
+    __slots__ = (
+        "handle",
+        "gender",
+        "name",
+        "birth",
+        "birth_place",
+        "birth_key",
+        "death",
+        "death_place",
+        "death_key",
+        "parents",
+        "families",
+    )
+
+    def __init__(self, db, person):
+        self.handle = person.get_handle()
+        self.gender = person.get_gender()
+        self.name = person.get_primary_name()
+        self.birth, self.birth_place = self.__get_event(db, person.get_birth_ref())
+        self.death, self.death_place = self.__get_event(db, person.get_death_ref())
+        self.birth_key = get_date_key(self.birth)
+        self.death_key = get_date_key(self.death)
+        self.parents = person.get_main_parents_family_handle()
+        self.families = person.get_family_handle_list()
+
+    @staticmethod
+    def __get_event(db, event_ref):
+        if event_ref:
+            event = db.get_event_from_handle(event_ref.ref)
+            return event.get_date_object(), event.get_place_handle()
+        return Date(), ""
+
+
+# ------------------------------------------------------------------------
+#
+# DuplicateScorer
+#
+# ------------------------------------------------------------------------
+class DuplicateScorer:
+    """
+    Compute the chance that two people are the same person from their
+    features, the names of all people, the fathers and mothers of all
+    families and the titles of the places.
+    """
+
+    def __init__(self, use_soundex, names, families, place_titles):
+        self.use_soundex = use_soundex
+        self.names = names
+        self.families = families
+        self.place_titles = place_titles
+
+    def gen_key(self, val):
+        if self.use_soundex:
+            try:
+                return soundex(val)
+            except UnicodeEncodeError:
+                return val
+        else:
+            return val
+
+    def compare_people(self, p1, p2):
+        """
+        Return the chance that the two people are the same, or -1 if they
+        cannot be.  Whether one is an ancestor of the other is not checked.
+        """
+        chance = self.name_match(p1.name, p2.name)
+        if chance == -1:
+            return -1
+
+        value = self.date_match(p1.birth, p2.birth)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.date_match(p1.death, p2.death)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(p1.birth_place, p2.birth_place)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(p1.death_place, p2.death_place)
+        if value == -1:
+            return -1
+        chance += value
+
+        if p1.parents and p2.parents:
+            dad1_id, mom1_id = self.families[p1.parents]
+            dad2_id, mom2_id = self.families[p2.parents]
+            dad1 = self.names.get(dad1_id) if dad1_id else None
+            dad2 = self.names.get(dad2_id) if dad2_id else None
+
+            value = self.name_match(dad1, dad2)
+
+            if value == -1:
+                return -1
+
+            chance += value
+
+            mom1 = self.names.get(mom1_id) if mom1_id else None
+            mom2 = self.names.get(mom2_id) if mom2_id else None
+
+            value = self.name_match(mom1, mom2)
+            if value == -1:
+                return -1
+
+            chance += value
+
+        for f1_id in p1.families:
+            father1_id, mother1_id = self.families[f1_id]
+            for f2_id in p2.families:
+                father2_id, mother2_id = self.families[f2_id]
+                if p1.gender == Person.FEMALE:
+                    if father1_id and father2_id:
+                        if father1_id == father2_id:
+                            chance += 1
+                        else:
+                            fname1 = self.names.get(father1_id)
+                            fname2 = self.names.get(father2_id)
+                            value = self.name_match(fname1, fname2)
+                            if value != -1:
+                                chance += value
+                else:
+                    if mother1_id and mother2_id:
+                        if mother1_id == mother2_id:
+                            chance += 1
+                        else:
+                            mname1 = self.names.get(mother1_id)
+                            mname2 = self.names.get(mother2_id)
+                            value = self.name_match(mname1, mname2)
+                            if value != -1:
+                                chance += value
+        return chance
+
+    def name_compare(self, s1, s2):
+        if self.use_soundex:
+            try:
+                return compare(s1, s2)
+            except UnicodeEncodeError:
+                return s1 == s2
+        else:
+            return s1 == s2
+
+    def date_match(self, date1, date2):
+        if date1.is_empty() or date2.is_empty():
+            return 0
+        if date1.is_equal(date2):
+            return 1
+
+        if date1.is_compound() or date2.is_compound():
+            return self.range_compare(date1, date2)
+
+        if date1.get_year() == date2.get_year():
+            if date1.get_month() == date2.get_month():
+                return 0.75
+            if not date1.get_month_valid() or not date2.get_month_valid():
+                return 0.75
+            else:
+                return -1
+        else:
+            return -1
+
+    def range_compare(self, date1, date2):
+        start_date_1 = date1.get_start_date()[0:3]
+        start_date_2 = date2.get_start_date()[0:3]
+        stop_date_1 = date1.get_stop_date()[0:3]
+        stop_date_2 = date2.get_stop_date()[0:3]
+        if date1.is_compound() and date2.is_compound():
+            if (
+                start_date_2 <= start_date_1 <= stop_date_2
+                or start_date_1 <= start_date_2 <= stop_date_1
+                or start_date_2 <= stop_date_1 <= stop_date_2
+                or start_date_1 <= stop_date_2 <= stop_date_1
+            ):
+                return 0.5
+            else:
+                return -1
+        elif date2.is_compound():
+            if start_date_2 <= start_date_1 <= stop_date_2:
+                return 0.5
+            else:
+                return -1
+        else:
+            if start_date_1 <= start_date_2 <= stop_date_1:
+                return 0.5
+            else:
+                return -1
+
+    def name_match(self, name, name1):
+        if not name1 or not name:
+            return 0
+
+        srn1 = get_surnames(name)
+        sfx1 = name.get_suffix()
+        srn2 = get_surnames(name1)
+        sfx2 = name1.get_suffix()
+
+        if not self.name_compare(srn1, srn2):
+            return -1
+        if sfx1 != sfx2:
+            if sfx1 != "" and sfx2 != "":
+                return -1
+
+        if name.get_first_name() == name1.get_first_name():
+            return 1
+        else:
+            list1 = name.get_first_name().split()
+            list2 = name1.get_first_name().split()
+
+            if len(list1) < len(list2):
+                return self.list_reduce(list1, list2)
+            else:
+                return self.list_reduce(list2, list1)
+
+    def place_match(self, p1_id, p2_id):
+        if p1_id == p2_id:
+            return 1
+
+        name1 = self.place_titles[p1_id] if p1_id else ""
+        name2 = self.place_titles[p2_id] if p2_id else ""
+
+        if not (name1 and name2):
+            return 0
+        if name1 == name2:
+            return 1
+
+        list1 = name1.replace(",", " ").split()
+        list2 = name2.replace(",", " ").split()
+
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+    def list_reduce(self, list1, list2):
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if is_initial(name) and name[0] == name2[0]:
+                    value += 0.25
+                elif is_initial(name2) and name2[0] == name[0]:
+                    value += 0.25
+                elif name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+    def score_block(self, block, thresh, use_dates=True):
+        """
+        Compare the people of a block with each other.
+
+        Return a list of the handles of the people in the order of the block,
+        each with a list of the handles of the candidates and their chances
+        of at least thresh, in the order of the block.  If use_dates is True,
+        people whose dates differ in the year are not compared.
+        """
+        index = defaultdict(lambda: defaultdict(list))
+        for pos, person in enumerate(block):
+            birth_key = person.birth_key if use_dates else None
+            death_key = person.death_key if use_dates else None
+            index[birth_key][death_key].append(pos)
+
+        result = []
+        for pos1, p1 in enumerate(block):
+            matches = []
+            for pos2 in merge(*self.__get_candidates(index, p1, use_dates)):
+                if pos1 == pos2:
+                    continue
+                p2 = block[pos2]
+                chance = self.compare_people(p1, p2)
+                if chance >= thresh:
+                    matches.append((p2.handle, chance))
+            if matches:
+                result.append((p1.handle, matches))
+        return result
+
+    @staticmethod
+    def __get_candidates(index, person, use_dates):
+        """
+        Return the lists of the positions of the candidates in the block.
+        """
+        birth_key = person.birth_key if use_dates else None
+        death_key = person.death_key if use_dates else None
+        if birth_key is None:
+            death_index_list = index.values()
+        else:
+            death_index_list = [index[key] for key in (None, birth_key) if key in index]
+        for death_index in death_index_list:
+            if death_key is None:
+                yield from death_index.values()
+            else:
+                for key in (None, death_key):
+                    if key in death_index:
+                        yield death_index[key]
+
+
+# The scorer of a worker process
+_SCORER = None
+
+
+def _init_worker(scorer):
+    global _SCORER
+    _SCORER = scorer
+
+
+def _score_blocks(blocks, thresh, use_dates):
+    return [_SCORER.score_block(block, thresh, use_dates) for block in blocks]
+
+
+# ------------------------------------------------------------------------
+#
+# DuplicateFinder
+#
+# ------------------------------------------------------------------------
+class DuplicateFinder:
+    """
+    Find the possible duplicate people in a database.
+    """
+
+    def __init__(self, db, use_soundex=True, processes=1):
+        self.db = db
+        self.use_soundex = use_soundex
+        self.processes = processes
+        self.parents = {}
+        self.families = {}
+        self.ancestors = {}
+
+    def find_potentials(self, thresh, progress=None):
+        """
+        Return a dictionary that maps the handles of people to a tuple of the
+        handle of the most likely duplicate and the chance, which is at
+        least thresh.
+
+        progress is an optional ProgressMeter.
+        """
+        length = self.db.get_number_of_people()
+        if progress:
+            progress.set_pass(_("Pass 1: Building preliminary lists"), length)
+
+        names = {}
+        place_titles = {}
+        places = set()
+        blocks = {}
+        scorer = DuplicateScorer(self.use_soundex, names, self.families, place_titles)
+        for person in self.db.iter_people():
+            if progress:
+                progress.step()
+            features = PersonFeatures(self.db, person)
+            names[features.handle] = features.name
+            self.parents[features.handle] = features.parents
+            places.update((features.birth_place, features.death_place))
+            key = scorer.gen_key(get_surnames(features.name))
+            blocks.setdefault((features.gender == Person.MALE, key), []).append(
+                features
+            )
+        for family in self.db.iter_families():
+            self.families[family.get_handle()] = (
+                family.get_father_handle(),
+                family.get_mother_handle(),
+            )
+        places.discard("")
+        for handle in places:
+            place_titles[handle] = self.db.get_place_from_handle(handle).get_title()
+
+        if progress:
+            progress.set_pass(_("Pass 2: Calculating potential matches"), length)
+
+        # A date of birth or death in another year is a mismatch, which
+        # only matches if the threshold is below that.
+        use_dates = thresh > -1
+        dupes = {}
+        if self.processes > 1:
+            results = self.__score_in_processes(scorer, blocks, thresh, use_dates)
+        else:
+            results = (
+                (len(block), scorer.score_block(block, thresh, use_dates))
+                for block in blocks.values()
+            )
+        for count, block_result in results:
+            if progress:
+                for dummy in range(count):
+                    progress.step()
+            self.__add_matches(dupes, block_result, thresh)
+        return dupes
+
+    def __score_in_processes(self, scorer, blocks, thresh, use_dates):
+        """
+        Compare the people of the blocks in worker processes, and yield the
+        number of people of each block and its result.
+        """
+        chunks = [[]]
+        size = 0
+        singles = 0
+        for block in blocks.values():
+            if len(block) < 2:
+                singles += 1
+                continue
+            if size >= CHUNK_SIZE:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(block)
+            size += len(block)
+        yield singles, []
+        with ProcessPoolExecutor(
+            self.processes, initializer=_init_worker, initargs=(scorer,)
+        ) as executor:
+            futures = {
+                executor.submit(_score_blocks, chunk, thresh, use_dates): chunk
+                for chunk in chunks
+                if chunk
+            }
+            for future in as_completed(futures):
+                for block, block_result in zip(futures[future], future.result()):
+                    yield len(block), block_result
+
+    def __add_matches(self, dupes, block_result, thresh):
+        """
+        Add the matches of the people of one block to dupes, in the order
+        of the block.
+        """
+        for p1key, matches in block_result:
+            for p2key, chance in matches:
+                if p2key in dupes:
+                    (v, c) = dupes[p2key]
+                    if v == p1key:
+                        continue
+                if chance != -1 and self.is_related(p1key, p2key):
+                    chance = -1
+                if chance >= thresh:
+                    if p1key in dupes:
+                        val = dupes[p1key]
+                        if val[1] > chance:
+                            dupes[p1key] = (p2key, chance)
+                    else:
+                        dupes[p1key] = (p2key, chance)
+
+    def is_related(self, p1_id, p2_id):
+        """
+        Return True if one person is an ancestor of the other.
+        """
+        return p2_id in self.get_ancestors(p1_id) or p1_id in self.get_ancestors(p2_id)
+
+    def get_ancestors(self, p1_id):
+        """
+        Return the set of the handles of the person and its ancestors through
+        the main parents.  The sets are remembered, and those of the
+        ancestors are used for their descendants.
+        """
+        if p1_id in self.ancestors:
+            return self.ancestors[p1_id]
+        ancestors = set()
+        todo = [p1_id]
+        while todo:
+            handle = todo.pop()
+            if not handle or handle in ancestors:
+                continue
+            if handle in self.ancestors:
+                ancestors.update(self.ancestors[handle])
+                continue
+            ancestors.add(handle)
+            family = self.families.get(self.parents.get(handle))
+            if family:
+                todo.extend(family)
+        self.ancestors[p1_id] = ancestors
+        return ancestors
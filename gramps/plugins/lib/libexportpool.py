@@ -0,0 +1,171 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Render the records of an export in several processes.
+
+The primary objects of a table are split in chunks of raw data, in the order
+in which they are written.  Each chunk is rendered to text by a writer in a
+worker process, and the texts are returned in the order of the chunks, so
+that the output is the same as when the objects are written one at a time.
+
+The XML writer only needs the object being written.  The GEDCOM writer also
+looks up other objects, so its workers open the database themselves, which
+is only possible for a database on disk without proxies.
+"""
+
+# ------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# ------------------------------------------------------------------------
+from collections import deque
+from io import StringIO
+from itertools import islice
+import os
+
+# ------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# ------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.db.dbconst import DBMODE_R
+from gramps.gen.db.utils import get_dbid_from_path, make_database
+from gramps.gen.lib.serialize import from_dict
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.gen.user import User
+
+# Number of objects rendered in one task of a worker process
+CHUNK_SIZE = 500
+
+
+def get_processes():
+    """
+    Return the number of processes used to render an export.
+    """
+    return config.get("database.export-processes")
+
+
+def get_database_path(db):
+    """
+    Return the directory of a database that a worker process can open, or
+    None if the database is in memory or is a proxy.
+    """
+    if isinstance(db, ProxyDbBase):
+        return None
+    path = db.get_save_path()
+    if path and os.path.isdir(path):
+        return path
+    return None
+
+
+def open_database(path):
+    """
+    Open the database in a directory read-only, in a worker process.
+    """
+    db = make_database(get_dbid_from_path(path))
+    db.load(path, mode=DBMODE_R, update=False)
+    return db
+
+
+def iter_chunks(items, size=CHUNK_SIZE):
+    """
+    Return an iterator over lists of up to size items.
+    """
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+
+def render_in_order(pool, processes, render, chunks):
+    """
+    Return an iterator over (number of objects, text) tuples, one for each
+    chunk, in the order of the chunks.  The chunks are rendered by calling
+    render(chunk) in the pool while the next chunks are being read.
+    """
+    pending = deque()
+    for chunk in chunks:
+        pending.append((len(chunk), pool.submit(render, chunk)))
+        # Limit the number of chunks held in memory
+        if len(pending) > 2 * processes:
+            count, future = pending.popleft()
+            yield count, future.result()
+    while pending:
+        count, future = pending.popleft()
+        yield count, future.result()
+
+
+# ------------------------------------------------------------------------
+#
+# Worker processes
+#
+# ------------------------------------------------------------------------
+
+# The writer of a worker process
+_WRITER = None
+
+
+def init_xml_worker(strip_photos, version):
+    """
+    Create the XML writer of a worker process.
+    """
+    global _WRITER
+    from gramps.plugins.export.exportxml import GrampsXmlWriter
+
+    _WRITER = GrampsXmlWriter(None, strip_photos, 0, version, User())
+
+
+def render_xml(method, chunk):
+    """
+    Return the XML of a chunk of raw data, written with a method of the
+    XML writer.
+    """
+    _WRITER.g = StringIO()
+    write = getattr(_WRITER, method)
+    for data in chunk:
+        write(from_dict(data), 2)
+    return _WRITER.g.getvalue()
+
+
+def init_gedcom_worker(path, dirname):
+    """
+    Open the database read-only and create the GEDCOM writer of a worker
+    process.
+    """
+    global _WRITER
+    from gramps.plugins.export.exportgedcom import GedcomWriter
+
+    _WRITER = GedcomWriter(open_database(path), User())
+    _WRITER.dirname = dirname
+
+
+def render_gedcom(method, chunk):
+    """
+    Return the GEDCOM of a chunk of raw data, written with a method of the
+    GEDCOM writer.
+    """
+    _WRITER.gedcom_file = StringIO()
+    write = getattr(_WRITER, method)
+    for data in chunk:
+        write(from_dict(data))
+    return _WRITER.gedcom_file.getvalue()
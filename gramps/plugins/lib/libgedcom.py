@@ -91,6 +91,7 @@ all lines until the next level 2 token is found (in this case, skipping the
 # -------------------------------------------------------------------------
 import os
 import re
+import sys
 import time
 
 # from xml.parsers.expat import ParserCreate
@@ -100,6 +101,11 @@ import mimetypes
 from io import StringIO, TextIOWrapper
 from urllib.parse import urlparse
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 # ------------------------------------------------------------------------
 #
 # Set up logging
@@ -109,6 +115,10 @@ import logging
 
 LOG = logging.getLogger(".libgedcom")
 
+# approximate number of lines of an object in a GEDCOM file, used to estimate
+# the number of objects imported from the number of lines of the file
+LINES_PER_OBJECT = 5
+
 # -------------------------------------------------------------------------
 #
 # Gramps modules
@@ -2056,6 +2066,19 @@ class PlaceParser:
             return location
 
 
+def _peak_memory():
+    """
+    Return the peak resident memory of the process in MiB, or None where it
+    cannot be determined.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak /= 1024  # reported in bytes rather than KiB
+    return peak / 1024
+
+
 # -------------------------------------------------------------------------
 #
 # IdFinder
@@ -2100,19 +2123,27 @@ class IdMapper:
     """This class provide methods to keep track of the correspoindence between
     Gedcom xrefs (@P1023@) and Gramps IDs."""
 
-    def __init__(self, has_gid, find_next, id2user_format):
+    def __init__(self, has_gid, find_next, id2user_format, gramps_ids=None):
+        """
+        If gramps_ids is given it holds the Gramps IDs already in the
+        database, and is used instead of has_gid to look them up.  Objects
+        created during the import must then take their Gramps ID from the
+        mapper, so that it knows every ID in use.
+        """
         self.has_gid = has_gid
         self.find_next = find_next
         self.id2user_format = id2user_format
         self.swap = {}
+        self.preloaded = gramps_ids is not None
+        # all the Gramps IDs handed out by this mapper, and when preloaded
+        # the ones already in the database
+        self.used = set(gramps_ids) if self.preloaded else set()
 
     def __getitem__(self, gid):
         if gid == "":
             # We need to find the next gramps ID provided it is not already
             # the target of a swap
-            new_val = self.find_next()
-            while new_val in list(self.swap.values()):
-                new_val = self.find_next()
+            new_val = self.__next_free()
         else:
             # remove any @ signs
             gid = self.clean(gid)
@@ -2126,19 +2157,26 @@ class IdMapper:
                 # have found it. If we had already encountered I0001 and we are
                 # now looking for I1, it wouldn't be in self.swap, and we now
                 # find that I0001 is in use, so we have to create a new id.
-                if self.has_gid(formatted_gid) or (
-                    formatted_gid in list(self.swap.values())
+                if formatted_gid in self.used or (
+                    not self.preloaded and self.has_gid(formatted_gid)
                 ):
-                    new_val = self.find_next()
-                    while new_val in list(self.swap.values()):
-                        new_val = self.find_next()
+                    new_val = self.__next_free()
                 else:
                     new_val = formatted_gid
+                    self.used.add(new_val)
             # we need to distinguish between I1 and I0001, so we record the map
             # from the original format
             self.swap[gid] = new_val
         return new_val
 
+    def __next_free(self):
+        """return the next Gramps ID that has not been handed out yet"""
+        new_val = self.find_next()
+        while new_val in self.used:
+            new_val = self.find_next()
+        self.used.add(new_val)
+        return new_val
+
     def clean(self, gid):
         """remove '@' from start and end of xref"""
         temp = gid.strip()
@@ -2228,7 +2266,10 @@ class GedcomParser(UpdateCallback):
     ):
         UpdateCallback.__init__(self, user.callback)
         self.user = user
-        self.set_total(stage_one.get_line_count())
+        self.line_count = stage_one.get_line_count()
+        self.set_total(self.line_count)
+        self.phase_times = []
+        self.phase_start = time.perf_counter()
         self.repo2id = {}
         self.trans = None
         self.errors = []
@@ -2276,31 +2317,37 @@ class GedcomParser(UpdateCallback):
             self.dbase.has_person_gramps_id,
             self.dbase.find_next_person_gramps_id,
             self.dbase.id2user_format,
+            self.dbase.get_person_gramps_ids(),
         )
         self.fid_map = IdMapper(
             self.dbase.has_family_gramps_id,
             self.dbase.find_next_family_gramps_id,
             self.dbase.fid2user_format,
+            self.dbase.get_family_gramps_ids(),
         )
         self.sid_map = IdMapper(
             self.dbase.has_source_gramps_id,
             self.dbase.find_next_source_gramps_id,
             self.dbase.sid2user_format,
+            self.dbase.get_source_gramps_ids(),
         )
         self.oid_map = IdMapper(
             self.dbase.has_media_gramps_id,
             self.dbase.find_next_media_gramps_id,
             self.dbase.oid2user_format,
+            self.dbase.get_media_gramps_ids(),
         )
         self.rid_map = IdMapper(
             self.dbase.has_repository_gramps_id,
             self.dbase.find_next_repository_gramps_id,
             self.dbase.rid2user_format,
+            self.dbase.get_repository_gramps_ids(),
         )
         self.nid_map = IdMapper(
             self.dbase.has_note_gramps_id,
             self.dbase.find_next_note_gramps_id,
             self.dbase.nid2user_format,
+            self.dbase.get_note_gramps_ids(),
         )
 
         self.gid2id = {}
@@ -3058,15 +3105,12 @@ class GedcomParser(UpdateCallback):
         }
         self.func_list.append(self.note_parse_tbl)
 
-        # look for existing place titles, build a map
-        self.place_names = defaultdict(list)
-        cursor = dbase.get_place_cursor()
-        data = next(cursor)
-        while data:
-            (handle, val) = data
-            self.place_names[val[2]].append(handle)
-            data = next(cursor)
-        cursor.close()
+        # look for existing places, build an index on the title, the first
+        # location and the enclosing places
+        self.place_index = defaultdict(list)
+        self.place_keys = {}
+        for place in dbase.iter_places():
+            self.__index_place(place)
 
         enc = stage_one.get_encoding()
 
@@ -3104,6 +3148,39 @@ class GedcomParser(UpdateCallback):
           0 <<RECORD>>                                    {1:M}
           0 TRLR                                          {1:1}
 
+        """
+        self.phase_start = time.perf_counter()
+        if use_trans:
+            self.__parse_gedcom_records(use_trans)
+        else:
+            self.dbase.bulk_load_begin(self.line_count // LINES_PER_OBJECT)
+            try:
+                self.__parse_gedcom_records(use_trans)
+            finally:
+                self.dbase.bulk_load_end()
+                self.__end_phase("bulk load end")
+        self.dbase.enable_signals()
+        self.dbase.request_rebuild()
+        self.__end_phase("rebuild")
+        self.__log_phases()
+        if self.number_of_errors == 0:
+            message = _("GEDCOM import report: No errors detected")
+        else:
+            message = (
+                _("GEDCOM import report: %s errors detected") % self.number_of_errors
+            )
+        if hasattr(self.user.uistate, "window"):
+            parent_window = self.user.uistate.window
+        else:
+            parent_window = None
+        self.user.info(
+            message, "".join(self.errors), parent=parent_window, monospaced=True
+        )
+
+    def __parse_gedcom_records(self, use_trans):
+        """
+        Parses the opened GEDCOM file in a single transaction, which is a
+        batch transaction unless use_trans is set.
         """
         with DbTxn(_("GEDCOM import"), self.dbase, not use_trans) as self.trans:
             self.dbase.disable_signals()
@@ -3111,37 +3188,59 @@ class GedcomParser(UpdateCallback):
             self.want_parse_warnings = False
             self.want_parse_warnings = True
             if self.use_def_src:
+                self.def_src.set_gramps_id(self.sid_map[""])
                 self.dbase.add_source(self.def_src, self.trans)
             if self.default_tag and self.default_tag.handle is None:
                 self.dbase.add_tag(self.default_tag, self.trans)
             self.__parse_header()
+            self.__end_phase("header")
             self.__parse_record()
             self.__parse_trailer()
+            self.__end_phase("records")
             for title, handle in self.inline_srcs.items():
                 src = Source()
                 src.set_handle(handle)
                 src.set_title(title)
+                src.set_gramps_id(self.sid_map[""])
                 self.dbase.add_source(src, self.trans)
             self.__clean_up()
+            self.__end_phase("inline sources")
 
             self.place_import.generate_hierarchy(self.trans)
+            self.__end_phase("place hierarchy")
 
             if not self.dbase.get_feature("skip-check-xref"):
                 self.__check_xref()
-        self.dbase.enable_signals()
-        self.dbase.request_rebuild()
-        if self.number_of_errors == 0:
-            message = _("GEDCOM import report: No errors detected")
-        else:
-            message = (
-                _("GEDCOM import report: %s errors detected") % self.number_of_errors
-            )
-        if hasattr(self.user.uistate, "window"):
-            parent_window = self.user.uistate.window
-        else:
-            parent_window = None
-        self.user.info(
-            message, "".join(self.errors), parent=parent_window, monospaced=True
+                self.__end_phase("check references")
+        self.__end_phase("commit")
+
+    def __end_phase(self, name):
+        """
+        Record the time taken by an import phase, and the peak memory use at
+        its end.
+        """
+        now = time.perf_counter()
+        self.phase_times.append((name, now - self.phase_start, _peak_memory()))
+        self.phase_start = now
+
+    def __log_phases(self):
+        """
+        Log the time and memory use of each phase of the import.
+        """
+        if not LOG.isEnabledFor(logging.DEBUG):
+            return
+        total = 0.0
+        for name, elapsed, peak in self.phase_times:
+            total += elapsed
+            if peak is None:
+                LOG.debug("%-20s %8.2fs", name, elapsed)
+            else:
+                LOG.debug("%-20s %8.2fs %8.1f MiB peak", name, elapsed, peak)
+        LOG.debug(
+            "%d lines in %.2fs, %.0f lines/sec",
+            self.line_count,
+            total,
+            self.line_count / total if total else 0,
         )
 
     def __clean_up(self):
@@ -3188,7 +3287,7 @@ class GedcomParser(UpdateCallback):
         we create a new person, assign the handle and Gramps ID.
         """
         intid = self.gid2id.get(gramps_id)
-        if self.dbase.has_person_handle(intid):
+        if intid and self.dbase.has_person_handle(intid):
             person = from_dict(self.dbase.get_raw_person_data(intid))
         else:
             person = Person()
@@ -3204,7 +3303,7 @@ class GedcomParser(UpdateCallback):
         we create a new family, assign the handle and Gramps ID.
         """
         intid = self.fid2id.get(gramps_id)
-        if self.dbase.has_family_handle(intid):
+        if intid and self.dbase.has_family_handle(intid):
             family = from_dict(self.dbase.get_raw_family_data(intid))
         else:
             family = Family()
@@ -3222,7 +3321,7 @@ class GedcomParser(UpdateCallback):
         we create a new media object, assign the handle and Gramps ID.
         """
         intid = self.oid2id.get(gramps_id)
-        if self.dbase.has_media_handle(intid):
+        if intid and self.dbase.has_media_handle(intid):
             obj = from_dict(self.dbase.get_raw_media_data(intid))
         else:
             obj = Media()
@@ -3240,7 +3339,7 @@ class GedcomParser(UpdateCallback):
 
         """
         intid = self.sid2id.get(gramps_id)
-        if self.dbase.has_source_handle(intid):
+        if intid and self.dbase.has_source_handle(intid):
             obj = from_dict(self.dbase.get_raw_source_data(intid))
         else:
             obj = Source()
@@ -3259,7 +3358,7 @@ class GedcomParser(UpdateCallback):
         repository inline instead of in a object.
         """
         intid = self.rid2id.get(gramps_id)
-        if self.dbase.has_repository_handle(intid):
+        if intid and self.dbase.has_repository_handle(intid):
             repository = from_dict(self.dbase.get_raw_repository_data(intid))
         else:
             repository = Repository()
@@ -3278,12 +3377,12 @@ class GedcomParser(UpdateCallback):
         """
         if not gramps_id:
             need_commit = True
-            gramps_id = self.dbase.find_next_note_gramps_id()
+            gramps_id = self.nid_map[""]
         else:
             need_commit = False
 
         intid = self.nid2id.get(gramps_id)
-        if self.dbase.has_note_handle(intid):
+        if intid and self.dbase.has_note_handle(intid):
             note = from_dict(self.dbase.get_raw_note_data(intid))
         else:
             note = Note()
@@ -3310,6 +3409,40 @@ class GedcomParser(UpdateCallback):
             return True
         return False
 
+    def __place_key(self, title, location, placeref_list):
+        """
+        Return the key of a place in the place index.
+
+        Places match when they have the same title, identical first locations
+        (or both are empty) and the same enclosing places.
+        """
+        if self.__loc_is_empty(location):
+            loc_key = None
+        else:
+            loc_key = location.serialize()
+        return (title, loc_key, tuple(ref.ref for ref in placeref_list))
+
+    def __index_place(self, place):
+        """
+        Add a place to the place index, or move it if it has changed since
+        it was indexed.
+
+        @param place: The place that was added or committed
+        @type place: gen.lib.Place
+        """
+        key = self.__place_key(
+            place.get_title(),
+            self.__get_first_loc(place),
+            place.get_placeref_list(),
+        )
+        old_key = self.place_keys.get(place.handle)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self.place_index[old_key].remove(place.handle)
+        self.place_index[key].append(place.handle)
+        self.place_keys[place.handle] = key
+
     def __find_place(self, title, location, placeref_list):
         """
         Finds an existing place based on the title and primary location.
@@ -3318,23 +3451,16 @@ class GedcomParser(UpdateCallback):
         @type title: string
         @param location: The current location
         @type location: gen.lib.Location
+        @param placeref_list: The enclosing places, or None to always create
+                              a new place
+        @type placeref_list: list
         @return gen.lib.Place
         """
-        for place_handle in self.place_names[title]:
-            place = self.dbase.get_place_from_handle(place_handle)
-            if place.get_title() == title:
-                if (
-                    self.__loc_is_empty(location)
-                    and self.__loc_is_empty(self.__get_first_loc(place))
-                    and place.get_placeref_list() == placeref_list
-                ):
-                    return place
-                elif (
-                    not self.__loc_is_empty(location)
-                    and not self.__loc_is_empty(self.__get_first_loc(place))
-                    and self.__get_first_loc(place).is_equivalent(location) == IDENTICAL
-                ) and place.get_placeref_list() == placeref_list:
-                    return place
+        if placeref_list is None:
+            return None
+        handles = self.place_index.get(self.__place_key(title, location, placeref_list))
+        if handles:
+            return self.dbase.get_place_from_handle(handles[0])
         return None
 
     def __add_place(self, event, sub_state):
@@ -3366,7 +3492,7 @@ class GedcomParser(UpdateCallback):
                 # handle.
                 if location:
                     self.place_import.store_location(location, place.handle)
-                self.place_names[place.get_title()].append(place.get_handle())
+                self.__index_place(place)
                 event.set_place_handle(place.get_handle())
             else:
                 place.merge(sub_state.place)
@@ -3377,6 +3503,7 @@ class GedcomParser(UpdateCallback):
                 self.dbase.commit_place(place, self.trans)
                 if location:
                     self.place_import.store_location(location, place.handle)
+                self.__index_place(place)
                 event.set_place_handle(place.get_handle())
 
     def __find_file(self, fullname, altpath):
@@ -3585,10 +3712,11 @@ class GedcomParser(UpdateCallback):
         self.backoff = True
 
     def __check_xref(self):
-        def __check(_map, has_gid_func, class_func, commit_func, gramps_id2handle, msg):
+        def __check(_map, gids_func, class_func, commit_func, gramps_id2handle, msg):
+            gramps_ids = set(gids_func())
             for input_id, gramps_id in _map.map().items():
                 # Check whether an object exists for the mapped gramps_id
-                if not has_gid_func(gramps_id):
+                if gramps_id not in gramps_ids:
                     _handle = self.__find_from_handle(gramps_id, gramps_id2handle)
                     if msg == "FAM":
                         make_unknown(
@@ -3632,7 +3760,7 @@ class GedcomParser(UpdateCallback):
         self.missing_references = 0
         __check(
             self.pid_map,
-            self.dbase.has_person_gramps_id,
+            self.dbase.get_person_gramps_ids,
             self.__find_or_create_person,
             self.dbase.commit_person,
             self.gid2id,
@@ -3640,7 +3768,7 @@ class GedcomParser(UpdateCallback):
         )
         __check(
             self.fid_map,
-            self.dbase.has_family_gramps_id,
+            self.dbase.get_family_gramps_ids,
             self.__find_or_create_family,
             self.dbase.commit_family,
             self.fid2id,
@@ -3648,7 +3776,7 @@ class GedcomParser(UpdateCallback):
         )
         __check(
             self.sid_map,
-            self.dbase.has_source_gramps_id,
+            self.dbase.get_source_gramps_ids,
             self.__find_or_create_source,
             self.dbase.commit_source,
             self.sid2id,
@@ -3656,7 +3784,7 @@ class GedcomParser(UpdateCallback):
         )
         __check(
             self.oid_map,
-            self.dbase.has_media_gramps_id,
+            self.dbase.get_media_gramps_ids,
             self.__find_or_create_media,
             self.dbase.commit_media,
             self.oid2id,
@@ -3664,7 +3792,7 @@ class GedcomParser(UpdateCallback):
         )
         __check(
             self.rid_map,
-            self.dbase.has_repository_gramps_id,
+            self.dbase.get_repository_gramps_ids,
             self.__find_or_create_repository,
             self.dbase.commit_repository,
             self.rid2id,
@@ -3672,7 +3800,7 @@ class GedcomParser(UpdateCallback):
         )
         __check(
             self.nid_map,
-            self.dbase.has_note_gramps_id,
+            self.dbase.get_note_gramps_ids,
             self.__find_or_create_note,
             self.dbase.commit_note,
             self.nid2id,
@@ -5127,7 +5255,7 @@ class GedcomParser(UpdateCallback):
                 place.set_title(title)
                 place.name.set_value(title)
                 self.dbase.add_place(place, self.trans)
-                self.place_names[place.get_title()].append(place.get_handle())
+                self.__index_place(place)
             else:
                 pass
             state.lds_ord.set_place_handle(place.handle)
@@ -5909,6 +6037,7 @@ class GedcomParser(UpdateCallback):
                         photo.set_mime_type(value)
                 if sub_state.attr:
                     photo.attribute_list.append(sub_state.attr)
+                photo.set_gramps_id(self.oid_map[""])
                 self.dbase.add_media(photo, self.trans)
                 self.media_map[path] = photo.handle
             else:
@@ -6236,10 +6365,10 @@ class GedcomParser(UpdateCallback):
             if place is None:
                 place = state.place
                 self.dbase.add_place(place, self.trans)
-                self.place_names[place.get_title()].append(place.get_handle())
             else:
                 place.merge(state.place)
                 self.dbase.commit_place(place, self.trans)
+            self.__index_place(place)
             place_title = _pd.display(self.dbase, place)
             state.pf.load_place(self.place_import, place, place_title)
 
@@ -7782,6 +7911,7 @@ class GedcomParser(UpdateCallback):
             rtype = RepositoryType()
             rtype.set((RepositoryType.CUSTOM, _("GEDCOM data")))
             repo.set_type(rtype)
+            repo.set_gramps_id(self.rid_map[""])
             self.dbase.add_repository(repo, self.trans)
             repo_ref = RepoRef()
             repo_ref.set_reference_handle(repo.handle)
@@ -0,0 +1,228 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Look for broken references in a database.
+
+Each table of primary objects is read once, to collect the handles of its
+objects and the references they hold, and the reference map is read once.
+The references to missing objects, and the differences between the
+references and the reference map, are then found with set operations.
+
+The tables can be read in several processes.  The worker processes open the
+database themselves, so they only see what is committed to a database on
+disk.
+"""
+
+# ------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# ------------------------------------------------------------------------
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# ------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# ------------------------------------------------------------------------
+from gramps.gen.db import CLASS_TO_KEY_MAP
+from gramps.gen.lib.serialize import from_dict
+from gramps.plugins.lib.libexportpool import get_database_path, open_database
+
+
+def get_empty_references(obj):
+    """
+    Return the references without a handle which
+    :meth:`get_referenced_handles_recursively` leaves out, as a list of
+    (ref_class_name, ref_handle) tuples.
+    """
+    if obj.__class__.__name__ == "Person":
+        return [("Person", ref.ref) for ref in obj.get_person_ref_list() if not ref.ref]
+    if obj.__class__.__name__ == "Source":
+        return [
+            ("Repository", ref.ref) for ref in obj.get_reporef_list() if not ref.ref
+        ]
+    if obj.__class__.__name__ == "Citation":
+        if not obj.get_reference_handle():
+            return [("Source", obj.get_reference_handle())]
+    return []
+
+
+def scan_table(db, class_name):
+    """
+    Return the handles of the objects of a class, and the references they
+    hold as a list of (handle, ref_class_name, ref_handle) tuples.
+    """
+    handles = []
+    references = []
+    with db.method("get_%s_cursor", class_name)() as cursor:
+        for handle, data in cursor:
+            handles.append(handle)
+            obj = from_dict(data)
+            for ref_class_name, ref_handle in obj.get_referenced_handles_recursively():
+                references.append((handle, ref_class_name, ref_handle))
+            for ref_class_name, ref_handle in get_empty_references(obj):
+                references.append((handle, ref_class_name, ref_handle))
+    return handles, references
+
+
+# ------------------------------------------------------------------------
+#
+# Worker processes
+#
+# ------------------------------------------------------------------------
+
+# The database of a worker process
+_DB = None
+
+
+def _init_worker(path):
+    """
+    Open the database read-only in a worker process.
+    """
+    global _DB
+    _DB = open_database(path)
+
+
+def _scan_table(class_name):
+    """
+    Read a table in a worker process.
+    """
+    return scan_table(_DB, class_name)
+
+
+# ------------------------------------------------------------------------
+#
+# IntegrityScan
+#
+# ------------------------------------------------------------------------
+class IntegrityScan:
+    """
+    The handles and references of all primary objects of a database.
+
+    After :meth:`scan`:
+
+    handles
+        the set of the handles of each class, by class name
+    references
+        the set of the references held by the objects, as
+        (class_name, handle, ref_class_name, ref_handle) tuples
+    reference_map
+        the set of the references kept in the reference map of the
+        database, as the same tuples
+    broken
+        the set of the handles of the objects holding references to missing
+        objects, or references without a handle, by
+        (class_name, ref_class_name)
+    """
+
+    def __init__(self, db, processes=1):
+        """
+        :param db: the database to scan
+        :param processes: the number of processes reading the tables, which
+                          is only used for a database on disk
+        """
+        self.db = db
+        self.processes = processes
+        self.handles = {}
+        self.references = set()
+        self.reference_map = set()
+        self.broken = defaultdict(set)
+
+    def scan(self, step=None):
+        """
+        Read the tables and the reference map.
+
+        :param step: called after each table is read
+        """
+        path = None
+        if self.processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+            path = get_database_path(self.db)
+        if path is None:
+            self.__add_tables(
+                ((name, scan_table(self.db, name)) for name in CLASS_TO_KEY_MAP), step
+            )
+        else:
+            with ProcessPoolExecutor(
+                min(self.processes, len(CLASS_TO_KEY_MAP)),
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(path,),
+            ) as pool:
+                results = pool.map(_scan_table, CLASS_TO_KEY_MAP)
+                self.__add_tables(zip(CLASS_TO_KEY_MAP, results), step)
+        self.reference_map = set(self.db.iter_reference_map())
+        for class_name, handle, ref_class_name, dummy in self.get_missing_references():
+            self.broken[class_name, ref_class_name].add(handle)
+
+    def __add_tables(self, tables, step):
+        """
+        Add the handles and references read from the tables.
+        """
+        for class_name, (handles, references) in tables:
+            self.handles[class_name] = set(handles)
+            self.references.update(
+                (class_name, handle, ref_class_name, ref_handle)
+                for handle, ref_class_name, ref_handle in references
+            )
+            if step:
+                step()
+
+    def has_handle(self, class_name, handle):
+        """
+        Return True if the database has the object.
+        """
+        return handle in self.handles.get(class_name, ())
+
+    def get_missing_references(self):
+        """
+        Return the set of the references to objects which are not in the
+        database, including the references without a handle.
+        """
+        return {ref for ref in self.references if not self.has_handle(ref[2], ref[3])}
+
+    def get_broken_handles(self, class_name, ref_class_name):
+        """
+        Return the set of the handles of the objects of a class which hold
+        references to missing objects of another class, or references to it
+        without a handle.
+        """
+        return self.broken.get((class_name, ref_class_name), set())
+
+    def get_missing_backlinks(self):
+        """
+        Return the set of the references to objects in the database which
+        are not in the reference map.
+        """
+        return {
+            ref
+            for ref in self.references - self.reference_map
+            if self.has_handle(ref[2], ref[3])
+        }
+
+    def get_extra_backlinks(self):
+        """
+        Return the set of the references in the reference map which no
+        object holds.
+        """
+        return self.reference_map - self.references
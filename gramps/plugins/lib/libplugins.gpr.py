@@ -44,6 +44,42 @@ register(
     # load_on_reg = True
 )
 
+# ------------------------------------------------------------------------
+#
+# libduplicates
+#
+# ------------------------------------------------------------------------
+register(
+    GENERAL,
+    id="libduplicates",
+    name="Duplicates lib",
+    description=_("Provides the search for possible duplicate people"),
+    version="1.0",
+    gramps_target_version=MODULE_VERSION,
+    status=STABLE,
+    fname="libduplicates.py",
+    authors=["The Gramps project"],
+    authors_email=["http://gramps-project.org"],
+)
+
+# ------------------------------------------------------------------------
+#
+# libexportpool
+#
+# ------------------------------------------------------------------------
+register(
+    GENERAL,
+    id="libexportpool",
+    name="Export pool lib",
+    description=_("Provides the rendering of exports in several processes"),
+    version="1.0",
+    gramps_target_version=MODULE_VERSION,
+    status=STABLE,
+    fname="libexportpool.py",
+    authors=["The Gramps project"],
+    authors_email=["http://gramps-project.org"],
+)
+
 # ------------------------------------------------------------------------
 #
 # libgedcom
@@ -175,6 +211,24 @@ register(
     # load_on_reg = True
 )
 
+# ------------------------------------------------------------------------
+#
+# libintegrity
+#
+# ------------------------------------------------------------------------
+register(
+    GENERAL,
+    id="libintegrity",
+    name="Integrity lib",
+    description=_("Provides the search for broken references"),
+    version="1.0",
+    gramps_target_version=MODULE_VERSION,
+    status=STABLE,
+    fname="libintegrity.py",
+    authors=["The Gramps project"],
+    authors_email=["http://gramps-project.org"],
+)
+
 # ------------------------------------------------------------------------
 #
 # libmapservice
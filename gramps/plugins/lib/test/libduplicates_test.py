@@ -0,0 +1,92 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the search for possible duplicate people
+"""
+import os
+import unittest
+from unittest.mock import patch
+
+from ....gen.const import DATA_DIR
+from ....gen.db.utils import import_as_dict
+from ....gen.user import User
+from ..libduplicates import DuplicateFinder
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class DuplicateFinderTest(unittest.TestCase):
+    """
+    Duplicate finder tests.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_blocking(self):
+        """
+        Test that looking up the candidates by date gives the same matches
+        as comparing all people of a block.
+        """
+        for thresh in (0.25, 1.0, 2.0):
+            with patch(
+                "gramps.plugins.lib.libduplicates.get_date_key", return_value=None
+            ):
+                expected = DuplicateFinder(self.db).find_potentials(thresh)
+            result = DuplicateFinder(self.db).find_potentials(thresh)
+            self.assertEqual(result, expected)
+        self.assertTrue(result)
+
+    def test_processes(self):
+        """
+        Test that comparing the people in several processes gives the same
+        matches.
+        """
+        expected = DuplicateFinder(self.db).find_potentials(0.25)
+        result = DuplicateFinder(self.db, processes=2).find_potentials(0.25)
+        self.assertEqual(result, expected)
+
+    def test_ancestors(self):
+        """
+        Test that a person is related to the father.
+        """
+        finder = DuplicateFinder(self.db)
+        finder.find_potentials(2.0)
+        for person in self.db.iter_people():
+            family_handle = person.get_main_parents_family_handle()
+            if family_handle:
+                family = self.db.get_family_from_handle(family_handle)
+                if family.get_father_handle():
+                    break
+        father_handle = family.get_father_handle()
+        self.assertTrue(finder.is_related(person.handle, father_handle))
+        self.assertTrue(finder.is_related(father_handle, person.handle))
+        self.assertIn(father_handle, finder.get_ancestors(person.handle))
+        self.assertNotIn(person.handle, finder.get_ancestors(father_handle))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the GEDCOM import lookups
+"""
+import os
+import tempfile
+import unittest
+
+from ....gen.db.utils import import_as_dict
+from ....gen.user import User
+from ..libgedcom import IdMapper
+
+GEDCOM = """0 HEAD
+1 SOUR Test
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME John /Smith/
+1 BIRT
+2 PLAC Springfield
+1 DEAT
+2 PLAC Springfield
+0 @I0001@ INDI
+1 NAME Jane /Smith/
+1 BIRT
+2 PLAC Springfield
+1 RESI
+2 PLAC Shelbyville
+0 TRLR
+"""
+
+GEDCOM_MEDIA = """0 HEAD
+1 SOUR Test
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME John /Smith/
+1 OBJE
+2 FILE inline.jpg
+3 FORM jpg
+2 TITL Inline
+1 OBJE @O0000@
+0 @O0000@ OBJE
+1 FILE record.jpg
+2 FORM jpg
+2 TITL Record
+0 TRLR
+"""
+
+
+def import_gedcom(text):
+    """
+    Import GEDCOM text into a new database.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".ged", encoding="utf-8", delete=False
+    ) as ged:
+        ged.write(text)
+    try:
+        return import_as_dict(ged.name, User())
+    finally:
+        os.remove(ged.name)
+
+
+class IdMapperTest(unittest.TestCase):
+    """
+    Test the mapping of GEDCOM xrefs to Gramps IDs.
+    """
+
+    def setUp(self):
+        self.next_index = 0
+
+    def find_next(self):
+        """
+        Return the next Gramps ID, as the database would.
+        """
+        gramps_id = "I%04d" % self.next_index
+        self.next_index += 1
+        return gramps_id
+
+    def id2user_format(self, gid):
+        """
+        Format an xref like a Gramps person ID.
+        """
+        if gid[1:].isdigit():
+            return "I%04d" % int(gid[1:])
+        return gid
+
+    def test_preloaded(self):
+        """
+        Test that Gramps IDs in the database and IDs already handed out are
+        not reused.
+        """
+        mapper = IdMapper(None, self.find_next, self.id2user_format, ["I0002"])
+        self.assertEqual(mapper["@I1@"], "I0001")
+        self.assertEqual(mapper["@I1@"], "I0001")
+        # I0001 and I1 format the same, but are different records
+        self.assertEqual(mapper["@I0001@"], "I0000")
+        # I0002 is already in the database
+        self.assertEqual(mapper["@I2@"], "I0003")
+        self.assertEqual(mapper[""], "I0004")
+        self.assertEqual(mapper["I4"], "I0005")
+        self.assertEqual(
+            mapper.map(),
+            {"I1": "I0001", "I0001": "I0000", "I2": "I0003", "I4": "I0005"},
+        )
+
+    def test_has_gid(self):
+        """
+        Test that the database lookup is used when the Gramps IDs are not
+        preloaded.
+        """
+        mapper = IdMapper(
+            lambda gid: gid == "I0002", self.find_next, self.id2user_format
+        )
+        self.assertEqual(mapper["@I2@"], "I0000")
+        self.assertEqual(mapper["@I3@"], "I0003")
+        self.assertEqual(mapper[""], "I0001")
+
+
+class PlaceIndexTest(unittest.TestCase):
+    """
+    Test that places with the same title are shared between events.
+    """
+
+    def test_shared_places(self):
+        db = import_gedcom(GEDCOM)
+        self.assertEqual(db.get_number_of_people(), 2)
+        springfield = [
+            place.handle
+            for place in db.iter_places()
+            if place.get_title() == "Springfield"
+        ]
+        self.assertEqual(len(springfield), 1)
+        places = [event.get_place_handle() for event in db.iter_events()]
+        self.assertEqual(places.count(springfield[0]), 3)
+
+
+class GrampsIdTest(unittest.TestCase):
+    """
+    Test that objects created during the import do not share Gramps IDs
+    with records.
+    """
+
+    def test_inline_media(self):
+        db = import_gedcom(GEDCOM_MEDIA)
+        media = {media.get_description(): media for media in db.iter_media()}
+        self.assertEqual(sorted(media), ["Inline", "Record"])
+        # The inline object is created first
+        self.assertEqual(media["Inline"].get_gramps_id(), "O0000")
+        self.assertEqual(media["Record"].get_gramps_id(), "O0001")
+
+
+if __name__ == "__main__":
+    unittest.main()
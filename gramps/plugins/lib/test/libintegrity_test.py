@@ -0,0 +1,155 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the search for broken references
+"""
+import os
+import unittest
+
+from ....gen.const import DATA_DIR
+from ....gen.db import DbTxn
+from ....gen.db.base import DbReadBase
+from ....gen.db.utils import import_as_dict
+from ....gen.lib import EventRef, PersonRef, RepoRef
+from ....gen.user import User
+from ..libintegrity import IntegrityScan
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class IntegrityScanTest(unittest.TestCase):
+    """
+    Integrity scan tests.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_reference_map(self):
+        """
+        Test that the reference map read at once is the one read for each
+        object.
+        """
+        self.assertEqual(
+            set(self.db.iter_reference_map()),
+            set(DbReadBase.iter_reference_map(self.db)),
+        )
+
+    def test_clean(self):
+        scan = IntegrityScan(self.db)
+        scan.scan()
+        self.assertEqual(len(scan.handles["Person"]), self.db.get_number_of_people())
+        self.assertEqual(scan.references, scan.reference_map)
+        self.assertEqual(scan.get_missing_references(), set())
+        self.assertEqual(scan.get_missing_backlinks(), set())
+        self.assertEqual(scan.get_extra_backlinks(), set())
+
+    def test_broken(self):
+        person = next(
+            person
+            for person in self.db.iter_people()
+            if person.get_family_handle_list()
+        )
+        event_ref = EventRef()
+        event_ref.set_reference_handle("missing")
+        person.add_event_ref(event_ref)
+        with DbTxn("Add missing event", self.db) as trans:
+            self.db.commit_person(person, trans)
+        try:
+            # Remove a reference from the reference map
+            ref_handle = person.get_family_handle_list()[0]
+            self.db.dbapi.execute(
+                "DELETE FROM reference WHERE obj_handle = ? AND ref_handle = ?",
+                [person.handle, ref_handle],
+            )
+            scan = IntegrityScan(self.db)
+            scan.scan()
+            missing = ("Person", person.handle, "Event", "missing")
+            self.assertEqual(scan.get_missing_references(), {missing})
+            self.assertEqual(
+                scan.get_broken_handles("Person", "Event"), {person.handle}
+            )
+            self.assertEqual(scan.get_broken_handles("Person", "Family"), set())
+            self.assertEqual(
+                scan.get_missing_backlinks(),
+                {("Person", person.handle, "Family", ref_handle)},
+            )
+            self.assertEqual(scan.get_extra_backlinks(), set())
+        finally:
+            self.db.dbapi.rollback()
+            person.remove_handle_references("Event", ["missing"])
+            with DbTxn("Remove missing event", self.db) as trans:
+                self.db.commit_person(person, trans)
+
+    def test_empty_references(self):
+        """
+        Test that the references without a handle are found.
+        """
+        person = next(self.db.iter_people())
+        person.add_person_ref(PersonRef())
+        source = next(self.db.iter_sources())
+        source.add_repo_reference(RepoRef())
+        citation = next(self.db.iter_citations())
+        source_handle = citation.get_reference_handle()
+        citation.set_reference_handle(None)
+        with DbTxn("Add empty references", self.db) as trans:
+            self.db.commit_person(person, trans)
+            self.db.commit_source(source, trans)
+            self.db.commit_citation(citation, trans)
+        try:
+            scan = IntegrityScan(self.db)
+            scan.scan()
+            self.assertEqual(
+                scan.get_missing_references(),
+                {
+                    ("Person", person.handle, "Person", None),
+                    ("Source", source.handle, "Repository", None),
+                    ("Citation", citation.handle, "Source", None),
+                },
+            )
+            self.assertEqual(
+                scan.get_broken_handles("Person", "Person"), {person.handle}
+            )
+            self.assertEqual(
+                scan.get_broken_handles("Source", "Repository"), {source.handle}
+            )
+            self.assertEqual(
+                scan.get_broken_handles("Citation", "Source"), {citation.handle}
+            )
+            self.assertEqual(scan.get_missing_backlinks(), set())
+            self.assertEqual(scan.get_extra_backlinks(), set())
+        finally:
+            person.set_person_ref_list(person.get_person_ref_list()[:-1])
+            source.set_reporef_list(source.get_reporef_list()[:-1])
+            citation.set_reference_handle(source_handle)
+            with DbTxn("Remove empty references", self.db) as trans:
+                self.db.commit_person(person, trans)
+                self.db.commit_source(source, trans)
+                self.db.commit_citation(citation, trans)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -90,6 +90,7 @@ from gramps.gui.dialog import OkDialog, MissingMediaDialog
 from gramps.gen.display.name import displayer as _nd
 from gramps.gui.glade import Glade
 from gramps.gen.errors import HandleError
+from gramps.plugins.lib.libintegrity import IntegrityScan
 
 # table for handling control chars in notes.
 # All except 09, 0A, 0D are replaced with space.
@@ -182,9 +183,9 @@ class Check(tool.BatchTool):
             global ProgressMeter
             ProgressMeter = PM
 
-        if self.db.readonly:
-            # TODO: split plugin in a check and repair part to support
-            # checking of a read only database
+        if self.db.readonly or self.options.handler.options_dict["dry_run"]:
+            # Only report the broken references, without repairing them
+            self.check_only(uistate, cli)
             return
 
         # The low-level repair is bypassing the transaction mechanism.
@@ -236,6 +237,7 @@ class Check(tool.BatchTool):
 
             checker.fix_duplicated_grampsid()
             checker.check_events()
+            checker.scan_references()
             checker.check_person_references()
             checker.check_family_references()
             checker.check_place_references()
@@ -266,6 +268,91 @@ class Check(tool.BatchTool):
         if errs:
             CheckReport(uistate, checker.text.getvalue(), cli)
 
+    def check_only(self, uistate, cli):
+        """
+        Look for broken references and backlinks, and report them without
+        changing the database.
+        """
+        progress = ProgressMeter(
+            _("Checking Database"), "", parent=uistate.window if uistate else None
+        )
+        progress.set_pass(_("Looking for reference problems"), len(CLASS_TO_KEY_MAP))
+        logging.info("Looking for reference problems")
+        scan = IntegrityScan(self.db, self.options.handler.options_dict["processes"])
+        scan.scan(progress.step)
+        progress.close()
+        CheckReport(uistate, build_scan_report(scan), cli)
+
+
+def build_scan_report(scan):
+    """
+    Return the text reporting the broken references found by a scan, and
+    the checks which the scan does not run.
+    """
+    missing = defaultdict(set)
+    empty = defaultdict(int)
+    for dummy, dummy, ref_class_name, ref_handle in scan.get_missing_references():
+        if ref_handle:
+            missing[ref_class_name].add(ref_handle)
+        else:
+            empty[ref_class_name] += 1
+    missing_backlinks = len(scan.get_missing_backlinks())
+    extra_backlinks = len(scan.get_extra_backlinks())
+
+    text = StringIO()
+    text.write(_("The database was checked, but not repaired.\n\n"))
+    text.write(
+        _(
+            "Only the references between objects and their backlinks were "
+            "checked.  The other checks, such as those of the family links, "
+            "events, media paths, Gramps IDs, empty objects and text "
+            "encoding, are only run when the database is repaired.\n\n"
+        )
+    )
+    if not (missing or empty or missing_backlinks or extra_backlinks):
+        text.write(_("No reference problems were found.\n"))
+    for ref_class_name in sorted(missing):
+        count = len(missing[ref_class_name])
+        text.write(
+            # Translators: leave all/any {...} untranslated
+            ngettext(
+                "{quantity} missing object of type {class_name} is referenced\n",
+                "{quantity} missing objects of type {class_name} are referenced\n",
+                count,
+            ).format(quantity=count, class_name=_(ref_class_name))
+        )
+    for ref_class_name in sorted(empty):
+        count = empty[ref_class_name]
+        text.write(
+            # Translators: leave all/any {...} untranslated
+            ngettext(
+                "{quantity} reference to an object of type {class_name} "
+                "has no handle\n",
+                "{quantity} references to objects of type {class_name} "
+                "have no handle\n",
+                count,
+            ).format(quantity=count, class_name=_(ref_class_name))
+        )
+    if missing_backlinks:
+        text.write(
+            # Translators: leave all/any {...} untranslated
+            ngettext(
+                "{quantity} reference has no backlink\n",
+                "{quantity} references have no backlink\n",
+                missing_backlinks,
+            ).format(quantity=missing_backlinks)
+        )
+    if extra_backlinks:
+        text.write(
+            # Translators: leave all/any {...} untranslated
+            ngettext(
+                "{quantity} backlink has no reference\n",
+                "{quantity} backlinks have no reference\n",
+                extra_backlinks,
+            ).format(quantity=extra_backlinks)
+        )
+    return text.getvalue()
+
 
 # -------------------------------------------------------------------------
 #
@@ -309,6 +396,7 @@ class CheckIntegrity:
         self.duplicated_gramps_ids = 0
         self.bad_backlinks = 0
         self.bad_note_links = 0
+        self.scan = None
         self.text = StringIO()
         self.last_img_dir = config.get("behavior.addmedia-image-dir")
         self.progress = ProgressMeter(
@@ -1257,9 +1345,7 @@ class CheckIntegrity:
                         none_handle = True
                         event_ref.ref = create_id()
                     event_handle = event_ref.ref
-                    try:
-                        self.db.get_event_from_handle(event_handle)
-                    except HandleError:
+                    if not self.db.has_event_handle(event_handle):
                         # The event referenced by the person
                         # does not exist in the database
                         # TODO: There is no better way?
@@ -1305,9 +1391,7 @@ class CheckIntegrity:
                         none_handle = True
                         event_ref.ref = create_id()
                     event_handle = event_ref.ref
-                    try:
-                        self.db.get_event_from_handle(event_handle)
-                    except HandleError:
+                    if not self.db.has_event_handle(event_handle):
                         # The event referenced by the family
                         # does not exist in the database
                         logging.warning(
@@ -1349,100 +1433,78 @@ class CheckIntegrity:
     def check_backlinks(self):
         """Looking for backlink reference problems"""
 
-        total = self.db.get_total()
-
         self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (1)", total
+            _("Looking for backlink reference problems"), len(CLASS_TO_KEY_MAP)
         )
         logging.info("Looking for backlink reference problems")
 
-        # dict of object handles indexed by forward link created here
-        my_blinks = defaultdict(list)
-        my_items = 0  # count of my backlinks for progress meter
-        # dict of object handles indexed by forward link from db
-        db_blinks = {}
-        db_items = 0  # count of db backlinks for progress meter
-
-        # first we assemble our own backlinks table, and while we have the
-        # handle, gather up a second table with the db's backlinks
-        for obj_class in CLASS_TO_KEY_MAP.keys():
-            for handle in self.db.method("iter_%s_handles", obj_class)():
-                self.progress.step()
-                blinks = list(self.db.find_backlink_handles(handle))
-                db_blinks[(obj_class, handle)] = blinks
-                db_items += len(blinks)
-                pri_obj = self.db.method("get_%s_from_handle", obj_class)(handle)
-                handle_list = pri_obj.get_referenced_handles_recursively()
-                my_items += len(handle_list)
-
-                for item in handle_list:
-                    my_blinks[item].append((obj_class, handle))
-
-        # Now we go through our backlinks and the dbs table comparing them
-        # check that each real reference has a backlink in the db table
-        self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (2)", my_items
-        )
-        for key, blinks in my_blinks.items():
-            for item in blinks:
-                self.progress.step()
-                if key not in db_blinks:
-                    # object has reference to something not in db;
-                    # should have been found in previous checks
-                    logging.warning(
-                        "    Fail: reference to an object %(obj)s"
-                        " not in the db by %(ref)s!",
-                        {"obj": key, "ref": item},
-                    )
-                    continue
-                if item not in db_blinks[key]:
-                    # Object has reference with no cooresponding backlink
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        'has a "%(cls2)s" reference'
-                        " with no corresponding backlink.",
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
+        # The tables are read here, as the repairs are not committed yet
+        scan = IntegrityScan(self.db)
+        scan.scan(self.progress.step)
 
-        # Now we go through the db table and make checks against ours
+        for cls, handle, cls2, handle2 in scan.get_missing_references():
+            # object has reference to something not in db;
+            # should have been found in previous checks
+            logging.warning(
+                "    Fail: reference to an object %(obj)s" " not in the db by %(ref)s!",
+                {"obj": (cls2, handle2), "ref": (cls, handle)},
+            )
+        for cls, handle, cls2, handle2 in scan.get_missing_backlinks():
+            # Object has reference with no cooresponding backlink
+            self.bad_backlinks += 1
+            pri_obj = self.db.method("get_%s_from_handle", cls2)(handle2)
+            logging.warning(
+                '    FAIL: the "%(cls)s" [%(gid)s] '
+                'has a "%(cls2)s" reference'
+                " with no corresponding backlink.",
+                {"gid": pri_obj.gramps_id, "cls": cls2, "cls2": cls},
+            )
         # Check for db backlinks that don't have a reference object at all
-        self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (3)", db_items
-        )
-        for key, blinks in db_blinks.items():
-            for item in blinks:
-                self.progress.step()
-                if item not in db_blinks:
-                    # backlink to object entirely missing
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        "has a backlink to a missing"
-                        ' "%(cls2)s" object.',
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
-                    continue
-                # Check if the object has a reference to the backlinked one
-                if key not in my_blinks or item not in my_blinks[key]:
-                    # backlink to object which doesn't have reference
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        'has a backlink to a "%(cls2)s"'
-                        " with no corresponding reference.",
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
+        for cls, handle, cls2, handle2 in scan.get_extra_backlinks():
+            self.bad_backlinks += 1
+            if not scan.has_handle(cls2, handle2):
+                # backlink of an object which is not in the db
+                logging.warning(
+                    "    FAIL: backlink of an object %(obj)s"
+                    " not in the db by %(ref)s!",
+                    {"obj": (cls2, handle2), "ref": (cls, handle)},
+                )
+                continue
+            pri_obj = self.db.method("get_%s_from_handle", cls2)(handle2)
+            if not scan.has_handle(cls, handle):
+                # backlink to object entirely missing
+                logging.warning(
+                    '    FAIL: the "%(cls)s" [%(gid)s] '
+                    "has a backlink to a missing"
+                    ' "%(cls2)s" object.',
+                    {"gid": pri_obj.gramps_id, "cls": cls2, "cls2": cls},
+                )
+            else:
+                # backlink to object which doesn't have reference
+                logging.warning(
+                    '    FAIL: the "%(cls)s" [%(gid)s] '
+                    'has a backlink to a "%(cls2)s"'
+                    " with no corresponding reference.",
+                    {"gid": pri_obj.gramps_id, "cls": cls2, "cls2": cls},
+                )
 
     def callback(self, *args):
         self.progress.step()
 
+    def scan_references(self):
+        """Looking for the objects with reference problems"""
+        self.progress.set_pass(
+            _("Looking for reference problems"), len(CLASS_TO_KEY_MAP)
+        )
+        logging.info("Looking for reference problems")
+
+        # The reference checks below only visit the objects found here
+        self.scan = IntegrityScan(self.db)
+        self.scan.scan(self.progress.step)
+
     def check_person_references(self):
         """Looking for person reference problems"""
-        plist = self.db.get_person_handles()
+        plist = self.scan.get_broken_handles("Person", "Person")
 
         self.progress.set_pass(_("Looking for person reference problems"), len(plist))
         logging.info("Looking for person reference problems")
@@ -1457,9 +1519,7 @@ class CheckIntegrity:
                 if not pref.ref:
                     none_handle = True
                     pref.ref = create_id()
-                try:
-                    self.db.get_person_from_handle(pref.ref)
-                except HandleError:
+                if not self.db.has_person_handle(pref.ref):
                     # The referenced person does not exist in the database
                     make_unknown(
                         pref.ref,
@@ -1478,7 +1538,7 @@ class CheckIntegrity:
 
     def check_family_references(self):
         """Looking for family reference problems"""
-        plist = self.db.get_person_handles()
+        plist = self.scan.get_broken_handles("Person", "Family")
 
         self.progress.set_pass(_("Looking for family reference problems"), len(plist))
         logging.info("Looking for family reference problems")
@@ -1489,9 +1549,7 @@ class CheckIntegrity:
             for ordinance in person.get_lds_ord_list():
                 family_handle = ordinance.get_family_handle()
                 if family_handle:
-                    try:
-                        self.db.get_family_from_handle(family_handle)
-                    except HandleError:
+                    if not self.db.has_family_handle(family_handle):
                         # The referenced family does not exist in the database
                         make_unknown(
                             family_handle,
@@ -1508,7 +1566,7 @@ class CheckIntegrity:
 
     def check_repo_references(self):
         """Looking for repository reference problems"""
-        slist = self.db.get_source_handles()
+        slist = self.scan.get_broken_handles("Source", "Repository")
 
         self.progress.set_pass(
             _("Looking for repository reference problems"), len(slist)
@@ -1525,9 +1583,7 @@ class CheckIntegrity:
                 if not reporef.ref:
                     none_handle = True
                     reporef.ref = create_id()
-                try:
-                    self.db.get_repository_from_handle(reporef.ref)
-                except HandleError:
+                if not self.db.has_repository_handle(reporef.ref):
                     # The referenced repository does not exist in the database
                     make_unknown(
                         reporef.ref,
@@ -1546,10 +1602,10 @@ class CheckIntegrity:
 
     def check_place_references(self):
         """Looking for place reference problems"""
-        plist = self.db.get_person_handles()
-        flist = self.db.get_family_handles()
-        elist = self.db.get_event_handles()
-        llist = self.db.get_place_handles()
+        plist = self.scan.get_broken_handles("Person", "Place")
+        flist = self.scan.get_broken_handles("Family", "Place")
+        elist = self.scan.get_broken_handles("Event", "Place")
+        llist = self.scan.get_broken_handles("Place", "Place")
         self.progress.set_pass(
             _("Looking for place reference problems"),
             len(elist) + len(plist) + len(flist) + len(llist),
@@ -1566,9 +1622,7 @@ class CheckIntegrity:
                 if not placeref.ref:
                     none_handle = True
                     placeref.ref = create_id()
-                try:
-                    self.db.get_place_from_handle(placeref.ref)
-                except HandleError:
+                if not self.db.has_place_handle(placeref.ref):
                     # The referenced place does not exist in the database
                     make_unknown(
                         placeref.ref,
@@ -1595,9 +1649,7 @@ class CheckIntegrity:
             for ordinance in person.lds_ord_list:
                 place_handle = ordinance.get_place_handle()
                 if place_handle:
-                    try:
-                        place = self.db.get_place_from_handle(place_handle)
-                    except HandleError:
+                    if not self.db.has_place_handle(place_handle):
                         # The referenced place does not exist in the database
                         # This is tested by TestcaseGenerator person "Broken17"
                         # This is tested by TestcaseGenerator person "Broken18"
@@ -1622,9 +1674,7 @@ class CheckIntegrity:
             for ordinance in family.lds_ord_list:
                 place_handle = ordinance.get_place_handle()
                 if place_handle:
-                    try:
-                        place = self.db.get_place_from_handle(place_handle)
-                    except HandleError:
+                    if not self.db.has_place_handle(place_handle):
                         # The referenced place does not exist in the database
                         make_unknown(
                             place_handle,
@@ -1646,9 +1696,7 @@ class CheckIntegrity:
             event = self.db.get_event_from_handle(key)
             place_handle = event.get_place_handle()
             if place_handle:
-                try:
-                    place = self.db.get_place_from_handle(place_handle)
-                except HandleError:
+                if not self.db.has_place_handle(place_handle):
                     # The referenced place does not exist in the database
                     make_unknown(
                         place_handle,
@@ -1670,23 +1718,23 @@ class CheckIntegrity:
 
     def check_citation_references(self):
         """Looking for citation reference problems"""
-        known_handles = self.db.get_citation_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_repositories()
-        )
+        known_handles = set(self.db.get_citation_handles())
+
+        broken = {
+            "Person": self.scan.get_broken_handles("Person", "Citation"),
+            "Family": self.scan.get_broken_handles("Family", "Citation"),
+            "Place": self.scan.get_broken_handles("Place", "Citation"),
+            "Citation": self.scan.get_broken_handles("Citation", "Citation"),
+            "Repository": self.scan.get_broken_handles("Repository", "Citation"),
+            "Media": self.scan.get_broken_handles("Media", "Citation"),
+            "Event": self.scan.get_broken_handles("Event", "Citation"),
+        }
+        total = sum(len(handles) for handles in broken.values())
 
         self.progress.set_pass(_("Looking for citation reference problems"), total)
         logging.info("Looking for citation reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in broken["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -1700,7 +1748,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in broken["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -1714,7 +1762,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in broken["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -1728,7 +1776,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in broken["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -1742,7 +1790,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_repository_handles():
+        for handle in broken["Repository"]:
             self.progress.step()
             repository = self.db.get_repository_from_handle(handle)
             handle_list = repository.get_referenced_handles_recursively()
@@ -1756,7 +1804,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
+        for handle in broken["Media"]:
             self.progress.step()
             obj = self.db.get_media_from_handle(handle)
             handle_list = obj.get_referenced_handles_recursively()
@@ -1770,7 +1818,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in broken["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -1802,7 +1850,7 @@ class CheckIntegrity:
 
     def check_source_references(self):
         """Looking for source reference problems"""
-        clist = self.db.get_citation_handles()
+        clist = self.scan.get_broken_handles("Citation", "Source")
         self.progress.set_pass(_("Looking for source reference problems"), len(clist))
         logging.info("Looking for source reference problems")
 
@@ -1815,9 +1863,7 @@ class CheckIntegrity:
                 citation.set_reference_handle(source_handle)
                 self.db.commit_citation(citation, self.trans)
             if source_handle:
-                try:
-                    self.db.get_source_from_handle(source_handle)
-                except HandleError:
+                if not self.db.has_source_handle(source_handle):
                     # The referenced source does not exist in the database
                     make_unknown(
                         source_handle,
@@ -1838,23 +1884,24 @@ class CheckIntegrity:
 
     def check_media_references(self):
         """Looking for media object reference problems"""
-        known_handles = self.db.get_media_handles(False)
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-        )
+        known_handles = set(self.db.get_media_handles(False))
+
+        broken = {
+            "Person": self.scan.get_broken_handles("Person", "Media"),
+            "Family": self.scan.get_broken_handles("Family", "Media"),
+            "Place": self.scan.get_broken_handles("Place", "Media"),
+            "Event": self.scan.get_broken_handles("Event", "Media"),
+            "Citation": self.scan.get_broken_handles("Citation", "Media"),
+            "Source": self.scan.get_broken_handles("Source", "Media"),
+        }
+        total = sum(len(handles) for handles in broken.values())
 
         self.progress.set_pass(
             _("Looking for media object reference " "problems"), total
         )
         logging.info("Looking for media object reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in broken["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -1868,7 +1915,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in broken["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -1882,7 +1929,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in broken["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -1896,7 +1943,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in broken["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -1910,7 +1957,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in broken["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -1924,7 +1971,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
+        for handle in broken["Source"]:
             self.progress.step()
             source = self.db.get_source_from_handle(handle)
             handle_list = source.get_referenced_handles_recursively()
@@ -1968,23 +2015,24 @@ class CheckIntegrity:
         if missing_references:
             self.db.add_note(self.explanation, self.trans, set_gid=True)
 
-        known_handles = self.db.get_note_handles()
+        known_handles = set(self.db.get_note_handles())
 
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_repositories()
-        )
+        broken = {
+            "Person": self.scan.get_broken_handles("Person", "Note"),
+            "Family": self.scan.get_broken_handles("Family", "Note"),
+            "Place": self.scan.get_broken_handles("Place", "Note"),
+            "Citation": self.scan.get_broken_handles("Citation", "Note"),
+            "Source": self.scan.get_broken_handles("Source", "Note"),
+            "Media": self.scan.get_broken_handles("Media", "Note"),
+            "Event": self.scan.get_broken_handles("Event", "Note"),
+            "Repository": self.scan.get_broken_handles("Repository", "Note"),
+        }
+        total = sum(len(handles) for handles in broken.values())
 
         self.progress.set_pass(_("Looking for note reference problems"), total)
         logging.info("Looking for note reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in broken["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -1998,7 +2046,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in broken["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -2012,7 +2060,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in broken["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -2026,7 +2074,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in broken["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -2040,7 +2088,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
+        for handle in broken["Source"]:
             self.progress.step()
             source = self.db.get_source_from_handle(handle)
             handle_list = source.get_referenced_handles_recursively()
@@ -2054,7 +2102,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
+        for handle in broken["Media"]:
             self.progress.step()
             obj = self.db.get_media_from_handle(handle)
             handle_list = obj.get_referenced_handles_recursively()
@@ -2068,7 +2116,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in broken["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -2082,7 +2130,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_repository_handles():
+        for handle in broken["Repository"]:
             self.progress.step()
             repo = self.db.get_repository_from_handle(handle)
             handle_list = repo.get_referenced_handles_recursively()
@@ -2128,24 +2176,25 @@ class CheckIntegrity:
 
     def check_tag_references(self):
         """Looking for tag reference problems"""
-        known_handles = self.db.get_tag_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_notes()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_repositories()
-        )
+        known_handles = set(self.db.get_tag_handles())
+
+        broken = {
+            "Person": self.scan.get_broken_handles("Person", "Tag"),
+            "Family": self.scan.get_broken_handles("Family", "Tag"),
+            "Media": self.scan.get_broken_handles("Media", "Tag"),
+            "Note": self.scan.get_broken_handles("Note", "Tag"),
+            "Event": self.scan.get_broken_handles("Event", "Tag"),
+            "Citation": self.scan.get_broken_handles("Citation", "Tag"),
+            "Source": self.scan.get_broken_handles("Source", "Tag"),
+            "Place": self.scan.get_broken_handles("Place", "Tag"),
+            "Repository": self.scan.get_broken_handles("Repository", "Tag"),
+        }
+        total = sum(len(handles) for handles in broken.values())
 
         self.progress.set_pass(_("Looking for tag reference problems"), total)
         logging.info("Looking for tag reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in broken["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -2159,7 +2208,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in broken["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -2173,7 +2222,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
+        for handle in broken["Media"]:
             self.progress.step()
             obj = self.db.get_media_from_handle(handle)
             handle_list = obj.get_referenced_handles_recursively()
@@ -2187,7 +2236,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_note_handles():
+        for handle in broken["Note"]:
             self.progress.step()
             note = self.db.get_note_from_handle(handle)
             handle_list = note.get_referenced_handles_recursively()
@@ -2201,7 +2250,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in broken["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -2215,7 +2264,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in broken["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -2229,7 +2278,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
+        for handle in broken["Source"]:
             self.progress.step()
             source = self.db.get_source_from_handle(handle)
             handle_list = source.get_referenced_handles_recursively()
@@ -2243,7 +2292,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in broken["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -2257,7 +2306,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_repository_handles():
+        for handle in broken["Repository"]:
             self.progress.step()
             repository = self.db.get_repository_from_handle(handle)
             handle_list = repository.get_referenced_handles_recursively()
@@ -3108,3 +3157,23 @@ class CheckOptions(tool.ToolOptions):
 
     def __init__(self, name, person_id=None):
         tool.ToolOptions.__init__(self, name, person_id)
+
+        # Options specific for this report
+        self.options_dict = {
+            "dry_run": 0,
+            "processes": 1,
+        }
+        self.options_help = {
+            "dry_run": (
+                "=0/1",
+                "Whether to only report the reference problems, without "
+                "running the other checks",
+                ["Check and repair", "Only check references"],
+                True,
+            ),
+            "processes": (
+                "=num",
+                "Number of processes reading the database when only checking",
+                "Integer number",
+            ),
+        }
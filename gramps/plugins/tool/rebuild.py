@@ -27,6 +27,8 @@
 # python modules
 #
 # -------------------------------------------------------------------------
+import time
+
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -77,7 +79,7 @@ class Rebuild(tool.Tool):
             uistate.progress.show()
             uistate.push_message(dbstate, _("Rebuilding secondary indexes..."))
 
-            self.db.rebuild_secondary(self.callback)
+            self.__rebuild(self.callback)
 
             uistate.set_busy_cursor(False)
             uistate.progress.hide()
@@ -88,12 +90,19 @@ class Rebuild(tool.Tool):
             )
         else:
             print("Rebuilding Secondary Indexes...")
-            self.db.rebuild_secondary(None)
+            self.__rebuild(None)
             print("All secondary indexes have been rebuilt.")
 
         self.db.enable_signals()
         self.db.request_rebuild()
 
+    def __rebuild(self, callback):
+        start = time.perf_counter()
+        self.db.rebuild_secondary(callback)
+        log.info(
+            "Secondary indexes rebuilt in %.2f seconds", time.perf_counter() - start
+        )
+
 
 # ------------------------------------------------------------------------
 #
@@ -0,0 +1,112 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the repair of broken references by the Check tool
+"""
+import os
+import unittest
+from types import SimpleNamespace
+
+from ....gen.const import DATA_DIR
+from ....gen.db import DbTxn
+from ....gen.db.utils import import_as_dict
+from ....gen.lib import PersonRef
+from ....gen.user import User
+from ...lib.libintegrity import IntegrityScan
+from .. import check
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "example.gramps")
+
+
+class CheckReferencesTest(unittest.TestCase):
+    """
+    Test that the reference checks, which only visit the objects found by
+    the scan, repair all broken references.
+    """
+
+    def setUp(self):
+        self.db = import_as_dict(EXAMPLE, User())
+
+    def break_references(self):
+        """
+        Return the objects holding broken references.
+        """
+        person = next(self.db.iter_people())
+        person.add_person_ref(PersonRef())
+        person.add_citation("missing-citation")
+        event = next(self.db.iter_events())
+        event.set_place_handle("missing-place")
+        family = next(self.db.iter_families())
+        family.add_note("missing-note")
+        citation = next(self.db.iter_citations())
+        citation.set_reference_handle(None)
+        with DbTxn("Break references", self.db) as trans:
+            self.db.commit_person(person, trans)
+            self.db.commit_event(event, trans)
+            self.db.commit_family(family, trans)
+            self.db.commit_citation(citation, trans)
+        return person, event, family, citation
+
+    def test_scan_report(self):
+        self.break_references()
+        scan = IntegrityScan(self.db)
+        scan.scan()
+        text = check.build_scan_report(scan)
+        self.assertIn("1 missing object of type Citation is referenced", text)
+        self.assertIn("1 missing object of type Note is referenced", text)
+        self.assertIn("1 missing object of type Place is referenced", text)
+        self.assertIn("1 reference to an object of type Person has no handle", text)
+        self.assertIn("1 reference to an object of type Source has no handle", text)
+        self.assertNotIn("no backlink", text)
+        self.assertNotIn("no reference", text)
+
+    def test_repair(self):
+        person, event, family, citation = self.break_references()
+        with DbTxn("Check Integrity", self.db, batch=True) as trans:
+            checker = check.CheckIntegrity(SimpleNamespace(db=self.db), None, trans)
+            checker.scan_references()
+            checker.check_person_references()
+            checker.check_family_references()
+            checker.check_place_references()
+            checker.check_source_references()
+            checker.check_citation_references()
+            checker.check_media_references()
+            checker.check_repo_references()
+            checker.check_note_references()
+            checker.check_tag_references()
+
+        self.assertEqual(checker.invalid_person_references, {person.handle})
+        self.assertEqual(checker.invalid_place_references, {event.handle})
+        self.assertIn(citation.handle, checker.invalid_source_references)
+        self.assertEqual(checker.invalid_citation_references, {"missing-citation"})
+        self.assertEqual(checker.invalid_note_references, {"missing-note"})
+        self.assertEqual(checker.invalid_family_references, set())
+        self.assertEqual(checker.invalid_media_references, set())
+        self.assertEqual(checker.invalid_repo_references, set())
+        self.assertEqual(checker.invalid_tag_references, set())
+
+        scan = IntegrityScan(self.db)
+        scan.scan()
+        self.assertEqual(scan.get_missing_references(), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,340 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the data read by the Verify tool
+"""
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from ....gen.const import DATA_DIR
+from ....gen.db.utils import import_as_dict
+from ....gen.lib import EventRoleType, EventType, NameType, Person
+from ....gen.user import User
+from ....gen.utils.db import family_name
+from .. import verify
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "example.gramps")
+
+
+class ObjectFamily:
+    """
+    A family, as seen by the rules, read from the Family object.
+    """
+
+    def __init__(self, db, family):
+        self.handle = ""
+        self.gramps_id = ""
+        self.name = ""
+        self.marr_date = 0
+        self.divo_date = 0
+        self.events_in_wrong_order = False
+        self.events_of_type_unknown = False
+        self.mother_handle = ""
+        self.father_handle = ""
+        self.child_ref_list = []
+        self.relationship = None
+        if family is None:
+            return
+
+        self.handle = family.get_handle()
+        self.gramps_id = family.get_gramps_id()
+        self.name = family_name(family, db)
+        self.mother_handle = family.get_mother_handle()
+        self.father_handle = family.get_father_handle()
+        self.child_ref_list = family.get_child_ref_list()
+        self.relationship = family.get_relationship()
+
+        prev_date = 0
+        for event_ref in family.get_event_ref_list():
+            event = db.get_event_from_handle(event_ref.ref)
+            date_obj = event.get_date_object()
+            if date_obj.get_day() != 0 and date_obj.get_month() != 0:
+                if prev_date > date_obj.get_sort_value() > 0:
+                    self.events_in_wrong_order = True
+                prev_date = date_obj.get_sort_value()
+
+            if event_ref.get_role() == EventRoleType.UNKNOWN:
+                self.events_of_type_unknown = True
+                continue
+            if event_ref.get_role() in (EventRoleType.FAMILY, EventRoleType.PRIMARY):
+                if event.get_type() == EventType.MARRIAGE:
+                    self.marr_date = date_obj.get_sort_value()
+                elif event.get_type() == EventType.DIVORCE:
+                    self.divo_date = date_obj.get_sort_value()
+
+    def get_marriage_date(self):
+        return self.marr_date
+
+    def get_divorce_date(self):
+        return self.divo_date
+
+    def get_mother_handle(self):
+        return self.mother_handle
+
+    def get_father_handle(self):
+        return self.father_handle
+
+    def is_events_of_type_unknown(self):
+        return self.events_of_type_unknown
+
+    def is_events_in_wrong_order(self):
+        return self.events_in_wrong_order
+
+    def get_name(self):
+        return self.name
+
+    def get_child_ref_list(self):
+        return self.child_ref_list
+
+    def get_relationship(self):
+        return self.relationship
+
+    def get_handle(self):
+        return self.handle
+
+
+class ObjectPerson:
+    """
+    A person, as seen by the rules, read from the Person object.
+    """
+
+    def __init__(self, data, person):
+        self.data = data
+        self.handle = ""
+        self.gramps_id = ""
+        self.name = ""
+        self.surname = ""
+        self.name_type = NameType.UNKNOWN
+        self.gender = Person.UNKNOWN
+        self.death = False
+        self.family_handle_list = []
+        self.parent_family_handle_list = []
+        self.dates = {}
+        self.birth_date_invalid = False
+        self.death_date_invalid = False
+        self.events_of_type_unknown = False
+        self.events_in_wrong_order = False
+        if person is None:
+            return
+
+        db = data.db
+        self.handle = person.get_handle()
+        self.gramps_id = person.get_gramps_id()
+        self.name = person.get_primary_name().get_name()
+        self.surname = person.get_primary_name().get_surname()
+        self.name_type = person.get_primary_name().get_type()
+        self.gender = person.get_gender()
+        self.death = bool(person.get_death_ref())
+        self.family_handle_list = person.get_family_handle_list()
+        self.parent_family_handle_list = person.get_parent_family_handle_list()
+
+        prev_date = 0
+        for event_ref in person.get_event_ref_list():
+            event = db.get_event_from_handle(event_ref.ref)
+            date_obj = event.get_date_object()
+            full = date_obj.get_day() != 0 and date_obj.get_month() != 0
+            if full:
+                if prev_date > date_obj.get_sort_value() > 0:
+                    self.events_in_wrong_order = True
+                prev_date = date_obj.get_sort_value()
+
+            if event_ref.get_role() == EventRoleType.UNKNOWN:
+                self.events_of_type_unknown = True
+                continue
+            if event_ref.get_role() != EventRoleType.PRIMARY:
+                continue
+            etype = event.get_type()
+            dates = (
+                date_obj.get_sort_value() if full else 0,
+                date_obj.get_sort_value(),
+            )
+            if etype == EventType.BAPTISM or (
+                etype == EventType.CHRISTEN and self.dates.get("bapt", (0, 0))[1] == 0
+            ):
+                self.dates["bapt"] = dates
+            elif etype == EventType.BURIAL:
+                self.dates["bury"] = dates
+            elif etype == EventType.BIRTH:
+                if not date_obj.get_valid():
+                    self.birth_date_invalid = True
+                self.dates["birth"] = dates
+            elif etype == EventType.DEATH:
+                if not date_obj.get_valid():
+                    self.death_date_invalid = True
+                self.dates["death"] = dates
+
+    def get_birth_date(self, estimate=False):
+        return self.dates.get("birth", (0, 0))[int(estimate)]
+
+    def get_death_date(self, estimate=False):
+        return self.dates.get("death", (0, 0))[int(estimate)]
+
+    def get_bapt_date(self, estimate=False):
+        return self.dates.get("bapt", (0, 0))[int(estimate)]
+
+    def get_bury_date(self, estimate=False):
+        return self.dates.get("bury", (0, 0))[int(estimate)]
+
+    def get_age_at_death(self, estimate=False):
+        birth_date = self.get_birth_date(estimate)
+        death_date = self.get_death_date(estimate)
+        if birth_date > 0 and death_date > 0:
+            return death_date - birth_date
+        return 0
+
+    def get_n_children(self):
+        return sum(
+            len(self.data.get_family(handle).get_child_ref_list())
+            for handle in self.family_handle_list
+        )
+
+    def get_name(self):
+        return self.name
+
+    def get_surname(self):
+        return self.surname
+
+    def get_name_type(self):
+        return self.name_type
+
+    def get_family_handle_list(self):
+        return self.family_handle_list
+
+    def get_gender(self):
+        return self.gender
+
+    def get_parent_family_handle_list(self):
+        return self.parent_family_handle_list
+
+    def get_death(self):
+        return self.death
+
+    def is_birth_date_invalid(self):
+        return self.birth_date_invalid
+
+    def is_death_date_invalid(self):
+        return self.death_date_invalid
+
+    def is_events_of_type_unknown(self):
+        return self.events_of_type_unknown
+
+    def is_events_in_wrong_order(self):
+        return self.events_in_wrong_order
+
+    def get_gramps_id(self):
+        return self.gramps_id
+
+    def get_handle(self):
+        return self.handle
+
+
+class ObjectData:
+    """
+    The people and families seen by the rules, read one by one from the
+    objects of the database, as the tool did before it read the data into
+    columns.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.person_rows = {handle: None for handle in db.get_person_handles()}
+        self.family_rows = {handle: None for handle in db.get_family_handles()}
+
+    def get_person(self, handle):
+        if handle not in self.person_rows:
+            return ObjectPerson(self, None)
+        return ObjectPerson(self, self.db.get_person_from_handle(handle))
+
+    def get_family(self, handle):
+        if handle not in self.family_rows:
+            return ObjectFamily(self.db, None)
+        return ObjectFamily(self.db, self.db.get_family_from_handle(handle))
+
+    def iter_people(self):
+        for handle in self.person_rows:
+            yield self.get_person(handle)
+
+
+def get_child_birth_dates(db, family, estimate):
+    """
+    Return the birth dates of the children of a family, read from the
+    objects.
+    """
+    dates = []
+    for child_ref in family.get_child_ref_list():
+        child_birth_date = verify.find_person(db, child_ref.ref).get_birth_date(
+            estimate
+        )
+        if child_birth_date > 0:
+            dates.append(child_birth_date)
+    return dates
+
+
+class VerifyDataTest(unittest.TestCase):
+    """
+    Compare the results of the rules, run on the columns of
+    :class:`~.verify.VerifyData`, with those of the rules run on the
+    objects.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def run_rules(self, estimate_age):
+        """
+        Run all the rules, and return their sorted results.
+        """
+        tool = verify.Verify.__new__(verify.Verify)
+        tool.db = self.db
+        tool.v_r = None
+        # The default options, rather than those saved by the user
+        options_dict = verify.VerifyOptions("verify").options_dict
+        options_dict["estimate_age"] = estimate_age
+        tool.options = SimpleNamespace(
+            handler=SimpleNamespace(options_dict=options_dict)
+        )
+        results = []
+        tool.add_results = results.append
+        tool.set_total = lambda total: None
+        tool.run_the_tool(cli=True)
+        return sorted(results, key=repr)
+
+    def check_results(self, estimate_age):
+        results = self.run_rules(estimate_age)
+        with mock.patch.object(verify, "VerifyData", ObjectData), mock.patch.object(
+            verify, "get_child_birth_dates", get_child_birth_dates
+        ):
+            expected = self.run_rules(estimate_age)
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(results, expected)
+
+    def test_results(self):
+        self.check_results(0)
+
+    def test_results_estimate_age(self):
+        self.check_results(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
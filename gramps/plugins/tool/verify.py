@@ -42,6 +42,7 @@ options are defined (and read in) is not done the way it would be now.
 #
 # ------------------------------------------------------------------------
 
+from array import array
 import os
 import pickle
 import statistics
@@ -74,11 +75,9 @@ from gramps.gen.lib import (
     NameType,
     Person,
 )
-from gramps.gen.lib.family import Family
-from gramps.gen.lib.date import Today
+from gramps.gen.lib.date import Date, Today
 from gramps.gui.editors import EditPerson, EditFamily
 from gramps.gen.utils.db import family_name
-from gramps.gen.utils.lru import LRU
 from gramps.gui.display import display_help
 from gramps.gui.managedwindow import ManagedWindow
 from gramps.gen.updatecallback import UpdateCallback
@@ -99,253 +98,359 @@ WIKI_HELP_SEC = _("Verify_the_Data", "manual")
 # temp storage and related functions
 #
 # -------------------------------------------------------------------------
-class VerifyFamily:
-    def __init__(self, db, family: Family):
-        self.handle = ""
-        self.marr_date = 0
-        self.divo_date = 0
-        self.events_in_wrong_order = False
-        self.events_of_type_unknown = False
-        self.name = ""
-        self.mother_handle = ""
-        self.father_handle = ""
-        self.gramps_id = ""
-        self.child_ref_list = {}
-        self.relationship = None
-
-        if family is None:
-            return
-
-        self.handle = family.get_handle()
-        self.name = family_name(family, db)
-        self.mother_handle = family.get_mother_handle()
-        self.father_handle = family.get_father_handle()
-        self.gramps_id = family.get_gramps_id()
-        self.child_ref_list = family.get_child_ref_list()
-        self.relationship = family.get_relationship()
+# Flags of the people and families
+_BIRTH_DATE_INVALID = 1
+_DEATH_DATE_INVALID = 2
+_EVENTS_OF_TYPE_UNKNOWN = 4
+_EVENTS_IN_WRONG_ORDER = 8
+
+
+class VerifyData:
+    """
+    The data used by the rules, about all people and families.
+
+    The data is read in one pass over the events, the people and the
+    families, and kept in columns: one list or array per value, indexed by
+    the row of the person or family.  Row 0 holds the values of a missing
+    person or family.  The values which depend on several objects, like the
+    ages at death and the numbers of children, are computed for all rows
+    at once.
+    """
 
+    def __init__(self, db):
+        self.db = db
+        self.person_rows = {}
+        self.family_rows = {}
+
+        # Person columns
+        self.person_handle = [""]
+        self.person_gramps_id = [""]
+        self.surname = [""]
+        self.name_type = [NameType.UNKNOWN]
+        self.gender = array("b", [Person.UNKNOWN])
+        self.death = array("b", [False])
+        self.person_flags = array("B", [0])
+        self.family_handle_list = [[]]
+        self.parent_family_handle_list = [[]]
+        # Sort values of the dates, (exact, estimated)
+        self.birth_date = (array("l", [0]), array("l", [0]))
+        self.death_date = (array("l", [0]), array("l", [0]))
+        self.bapt_date = (array("l", [0]), array("l", [0]))
+        self.bury_date = (array("l", [0]), array("l", [0]))
+
+        # Family columns
+        self.family_handle = [""]
+        self.family_gramps_id = [""]
+        self.mother_handle = [""]
+        self.father_handle = [""]
+        self.relationship = [None]
+        self.child_ref_list = [[]]
+        self.family_flags = array("B", [0])
+        self.marr_date = array("l", [0])
+        self.divo_date = array("l", [0])
+
+        events = self.__read_events()
+        for person in db.iter_people():
+            self.__add_person(person, events)
+        for family in db.iter_families():
+            self.__add_family(family, events)
+        del events
+
+        # Age at death, (exact, estimated)
+        self.age_at_death = tuple(
+            array(
+                "l",
+                [
+                    death - birth if birth > 0 and death > 0 else 0
+                    for birth, death in zip(self.birth_date[est], self.death_date[est])
+                ],
+            )
+            for est in (0, 1)
+        )
+        # Number of children of the families of each person
+        n_children = [len(child_ref_list) for child_ref_list in self.child_ref_list]
+        family_rows = self.family_rows
+        self.n_children = array(
+            "l",
+            [
+                sum(
+                    n_children[family_rows[handle]]
+                    for handle in handle_list
+                    if handle in family_rows
+                )
+                for handle_list in self.family_handle_list
+            ],
+        )
+
+    def __read_events(self):
+        """
+        Return the (type, full date, sort value, valid date) of all events,
+        by handle.  A date is full if it has a day and a month.
+        """
+        events = {}
+        with self.db.get_event_cursor() as cursor:
+            for handle, data in cursor:
+                date = data["date"]
+                full = date["dateval"][0] != 0 and date["dateval"][1] != 0
+                valid = date["modifier"] != Date.MOD_TEXTONLY
+                events[handle] = (data["type"]["value"], full, date["sortval"], valid)
+        return events
+
+    def __add_person(self, person, events):
+        """
+        Add a row for a person.
+        """
+        self.person_rows[person.handle] = len(self.person_handle)
+        name = person.get_primary_name()
+        self.person_handle.append(person.handle)
+        self.person_gramps_id.append(person.gramps_id)
+        self.surname.append(name.get_surname())
+        self.name_type.append(name.get_type().value)
+        self.gender.append(person.get_gender())
+        self.death.append(bool(person.get_death_ref()))
+        self.family_handle_list.append(person.get_family_handle_list())
+        self.parent_family_handle_list.append(person.get_parent_family_handle_list())
+
+        flags = 0
+        dates = {}
+        prev_date = 0
+        for event_ref in person.get_event_ref_list():
+            event = events.get(event_ref.ref)
+            if event is None:
+                continue
+            etype, full, sort_value, valid = event
+            if full:
+                if prev_date > sort_value > 0:
+                    flags |= _EVENTS_IN_WRONG_ORDER
+                prev_date = sort_value
+
+            role = event_ref.get_role()
+            if role == EventRoleType.UNKNOWN:
+                flags |= _EVENTS_OF_TYPE_UNKNOWN
+                continue
+            if role == EventRoleType.PRIMARY:
+                exact_date = sort_value if full else 0
+                if etype == EventType.BAPTISM or (
+                    etype == EventType.CHRISTEN and dates.get("bapt", (0, 0))[1] == 0
+                ):
+                    dates["bapt"] = (exact_date, sort_value)
+                elif etype == EventType.BURIAL:
+                    dates["bury"] = (exact_date, sort_value)
+                elif etype == EventType.BIRTH:
+                    if not valid:
+                        flags |= _BIRTH_DATE_INVALID
+                    dates["birth"] = (exact_date, sort_value)
+                elif etype == EventType.DEATH:
+                    if not valid:
+                        flags |= _DEATH_DATE_INVALID
+                    dates["death"] = (exact_date, sort_value)
+        self.person_flags.append(flags)
+        for key, column in (
+            ("birth", self.birth_date),
+            ("death", self.death_date),
+            ("bapt", self.bapt_date),
+            ("bury", self.bury_date),
+        ):
+            exact_date, sort_value = dates.get(key, (0, 0))
+            column[0].append(exact_date)
+            column[1].append(sort_value)
+
+    def __add_family(self, family, events):
+        """
+        Add a row for a family.
+        """
+        self.family_rows[family.handle] = len(self.family_handle)
+        self.family_handle.append(family.handle)
+        self.family_gramps_id.append(family.gramps_id)
+        self.mother_handle.append(family.get_mother_handle())
+        self.father_handle.append(family.get_father_handle())
+        self.relationship.append(family.get_relationship().value)
+        self.child_ref_list.append(family.get_child_ref_list())
+
+        flags = 0
+        marr_date = divo_date = 0
         prev_date = 0
         for event_ref in family.get_event_ref_list():
-            event = db.get_event_from_handle(event_ref.ref)
-            date_obj = event.get_date_object()
-            if date_obj and date_obj.get_day() != 0 and date_obj.get_month() != 0:
-                if prev_date > date_obj.get_sort_value() > 0:
-                    self.events_in_wrong_order = True
-                prev_date = date_obj.get_sort_value()
-
-            if event_ref.get_role() == EventRoleType.UNKNOWN:
-                self.events_of_type_unknown = True
+            event = events.get(event_ref.ref)
+            if event is None:
                 continue
-            if (
-                event_ref.get_role() == EventRoleType.FAMILY
-                or event_ref.get_role() == EventRoleType.PRIMARY
-            ):
-                etype = event.get_type()
-                date_obj = event.get_date_object()
+            etype, full, sort_value, valid = event
+            if full:
+                if prev_date > sort_value > 0:
+                    flags |= _EVENTS_IN_WRONG_ORDER
+                prev_date = sort_value
+
+            role = event_ref.get_role()
+            if role == EventRoleType.UNKNOWN:
+                flags |= _EVENTS_OF_TYPE_UNKNOWN
+                continue
+            if role == EventRoleType.FAMILY or role == EventRoleType.PRIMARY:
                 if etype == EventType.MARRIAGE:
-                    self.marr_date = date_obj.get_sort_value()
+                    marr_date = sort_value
                 elif etype == EventType.DIVORCE:
-                    self.divo_date = date_obj.get_sort_value()
+                    divo_date = sort_value
+        self.family_flags.append(flags)
+        self.marr_date.append(marr_date)
+        self.divo_date.append(divo_date)
+
+    def get_person(self, handle):
+        """
+        Return the :class:`VerifyPerson` of a handle.
+        """
+        return VerifyPerson(self, self.person_rows.get(handle, 0))
+
+    def get_family(self, handle):
+        """
+        Return the :class:`VerifyFamily` of a handle.
+        """
+        return VerifyFamily(self, self.family_rows.get(handle, 0))
+
+    def iter_people(self):
+        """
+        Return an iterator over the :class:`VerifyPerson` of all people.
+        """
+        for row in range(1, len(self.person_handle)):
+            yield VerifyPerson(self, row)
+
+
+class VerifyFamily:
+    """
+    A family, as seen by the rules: a row of the :class:`VerifyData`.
+    """
+
+    __slots__ = ("data", "row")
+
+    def __init__(self, data, row):
+        self.data = data
+        self.row = row
+
+    @property
+    def gramps_id(self):
+        return self.data.family_gramps_id[self.row]
 
     def get_marriage_date(self):
-        return self.marr_date
+        return self.data.marr_date[self.row]
 
     def get_divorce_date(self):
-        return self.divo_date
+        return self.data.divo_date[self.row]
 
     def get_mother_handle(self):
-        return self.mother_handle
+        return self.data.mother_handle[self.row]
 
     def get_father_handle(self):
-        return self.father_handle
+        return self.data.father_handle[self.row]
 
     def is_events_of_type_unknown(self):
-        return self.events_of_type_unknown
+        return bool(self.data.family_flags[self.row] & _EVENTS_OF_TYPE_UNKNOWN)
 
     def is_events_in_wrong_order(self):
-        return self.events_in_wrong_order
+        return bool(self.data.family_flags[self.row] & _EVENTS_IN_WRONG_ORDER)
 
     def get_name(self):
-        return self.name
+        if not self.row:
+            return ""
+        family = self.data.db.get_family_from_handle(self.get_handle())
+        return family_name(family, self.data.db)
 
     def get_child_ref_list(self):
-        return self.child_ref_list
+        return self.data.child_ref_list[self.row]
 
     def get_relationship(self):
-        return self.relationship
+        return self.data.relationship[self.row]
 
     def get_handle(self):
-        return self.handle
+        return self.data.family_handle[self.row]
 
 
 class VerifyPerson:
-    def __init__(self, db, person: Person):
-        self.handle = ""
-        self.birth_date = [0, 0]
-        self.death_date = [0, 0]
-        self.bapt_date = [0, 0]
-        self.bury_date = [0, 0]
-        self.death = False
-        self.birth_date_invalid = False
-        self.death_date_invalid = False
-        self.events_of_type_unknown = False
-        self.name = ""
-        self.surname = ""
-        self.name_type = NameType.UNKNOWN
-        self.gramps_id = ""
-        self.gender = Person.UNKNOWN
-        self.family_handle_list = {}
-        self.parent_family_handle_list = {}
-        self.events_in_wrong_order = False
-
-        if person is None:
-            return
-
-        self.handle = person.get_handle()
-        self.name = person.get_primary_name().get_name()
-        self.surname = person.get_primary_name().get_surname()
-        self.gramps_id = person.get_gramps_id()
-        self.gender = person.get_gender()
-        self.family_handle_list = person.get_family_handle_list()
-        self.parent_family_handle_list = person.get_parent_family_handle_list()
-        self.death = bool(person.get_death_ref())
-        self.name_type = person.get_primary_name().get_type()
+    """
+    A person, as seen by the rules: a row of the :class:`VerifyData`.
+    """
 
-        prev_date = 0
-        for event_ref in person.get_event_ref_list():
-            event = db.get_event_from_handle(event_ref.ref)
-            date_obj = event.get_date_object()
-            if date_obj and date_obj.get_day() != 0 and date_obj.get_month() != 0:
-                if prev_date > date_obj.get_sort_value() > 0:
-                    self.events_in_wrong_order = True
-                prev_date = date_obj.get_sort_value()
-
-            if event and event_ref.get_role() == EventRoleType.UNKNOWN:
-                self.events_of_type_unknown = True
-                continue
-            if event and event_ref.get_role() == EventRoleType.PRIMARY:
-                etype = event.get_type()
-                date_obj = event.get_date_object()
-                if date_obj:
-                    if date_obj.get_day() == 0 or date_obj.get_month() == 0:
-                        exact_date = 0
-                    else:
-                        exact_date = date_obj.get_sort_value()
-
-                    if etype == EventType.BAPTISM or (
-                        etype == EventType.CHRISTEN and self.bapt_date[1] == 0
-                    ):
-                        self.bapt_date[0] = exact_date
-                        self.bapt_date[1] = date_obj.get_sort_value()
-                    elif etype == EventType.BURIAL:
-                        self.bury_date[0] = exact_date
-                        self.bury_date[1] = date_obj.get_sort_value()
-                    elif etype == EventType.BIRTH:
-                        if not date_obj.get_valid():
-                            self.birth_date_invalid = True
-                        self.birth_date[0] = exact_date
-                        self.birth_date[1] = date_obj.get_sort_value()
-                    elif etype == EventType.DEATH:
-                        if not date_obj.get_valid():
-                            self.death_date_invalid = True
-                        self.death_date[0] = exact_date
-                        self.death_date[1] = date_obj.get_sort_value()
+    __slots__ = ("data", "row")
+
+    def __init__(self, data, row):
+        self.data = data
+        self.row = row
+
+    @property
+    def gramps_id(self):
+        return self.data.person_gramps_id[self.row]
 
     def get_birth_date(self, estimate=False):
-        return self.birth_date[int(estimate)]
+        return self.data.birth_date[int(estimate)][self.row]
 
     def get_death_date(self, estimate=False):
-        return self.death_date[int(estimate)]
+        return self.data.death_date[int(estimate)][self.row]
 
     def get_bapt_date(self, estimate=False):
-        return self.bapt_date[int(estimate)]
+        return self.data.bapt_date[int(estimate)][self.row]
 
     def get_bury_date(self, estimate=False):
-        return self.bury_date[int(estimate)]
+        return self.data.bury_date[int(estimate)][self.row]
+
+    def get_age_at_death(self, estimate=False):
+        return self.data.age_at_death[int(estimate)][self.row]
+
+    def get_n_children(self):
+        return self.data.n_children[self.row]
 
     def get_name(self):
-        return self.name
+        if not self.row:
+            return ""
+        person = self.data.db.get_person_from_handle(self.get_handle())
+        return person.get_primary_name().get_name()
 
     def get_surname(self):
-        return self.surname
+        return self.data.surname[self.row]
 
     def get_name_type(self):
-        return self.name_type
+        return self.data.name_type[self.row]
 
     def get_family_handle_list(self):
-        return self.family_handle_list
+        return self.data.family_handle_list[self.row]
 
     def get_gender(self):
-        return self.gender
+        return self.data.gender[self.row]
 
     def get_parent_family_handle_list(self):
-        return self.parent_family_handle_list
+        return self.data.parent_family_handle_list[self.row]
 
     def get_death(self):
-        return self.death
+        return bool(self.data.death[self.row])
 
     def is_birth_date_invalid(self):
-        return self.birth_date_invalid
+        return bool(self.data.person_flags[self.row] & _BIRTH_DATE_INVALID)
 
     def is_death_date_invalid(self):
-        return self.death_date_invalid
+        return bool(self.data.person_flags[self.row] & _DEATH_DATE_INVALID)
 
     def is_events_of_type_unknown(self):
-        return self.events_of_type_unknown
+        return bool(self.data.person_flags[self.row] & _EVENTS_OF_TYPE_UNKNOWN)
 
     def is_events_in_wrong_order(self):
-        return self.events_in_wrong_order
+        return bool(self.data.person_flags[self.row] & _EVENTS_IN_WRONG_ORDER)
 
     def get_gramps_id(self):
         return self.gramps_id
 
     def get_handle(self):
-        return self.handle
+        return self.data.person_handle[self.row]
 
 
-_person_cache_size = 20000
-_family_cache_size = 10000
-_person_cache = LRU(_person_cache_size + 1)
-_family_cache = LRU(_family_cache_size + 1)
+# The data of the tool being run
+_verify_data = None
 _today = Today().get_sort_value()
 
 
 def find_person(db, handle):
     """find a person, given a handle"""
-    if handle not in _person_cache:
-        person = db.get_person_from_handle(handle)
-        verify_person = VerifyPerson(db, person)
-        _person_cache[handle] = verify_person
-    return _person_cache[handle]
+    return _verify_data.get_person(handle)
 
 
 def find_family(db, handle):
     """find a family, given a handle"""
-    if handle not in _family_cache:
-        family = db.get_family_from_handle(handle)
-        verify_family = VerifyFamily(db, family)
-        _family_cache[handle] = verify_family
-    return _family_cache[handle]
-
-
-def preload_person_cache(db):
-    """puts all existing people in the cache"""
-    for person in db.iter_people():
-        verify_person = VerifyPerson(db, person)
-        _person_cache[person.get_handle()] = verify_person
-
-
-def preload_family_cache(db):
-    """puts all existing families in the cache"""
-    for family in db.iter_families():
-        verify_family = VerifyFamily(db, family)
-        _family_cache[family.get_handle()] = verify_family
-
-
-def clear_cache():
-    """clear the cache"""
-    _person_cache.clear()
-    _family_cache.clear()
+    return _verify_data.get_family(handle)
 
 
 # -------------------------------------------------------------------------
@@ -355,39 +460,30 @@ def clear_cache():
 # -------------------------------------------------------------------------
 def get_age_at_death(person, estimate):
     """get a person's age at death"""
-    birth_date = person.get_birth_date(estimate)
-    death_date = person.get_death_date(estimate)
-    if (birth_date > 0) and (death_date > 0):
-        return death_date - birth_date
-    return 0
+    return person.get_age_at_death(estimate)
 
 
 def get_father(db, family):
     """get a family's father"""
     if not family:
-        return VerifyPerson(None, None)
-    father_handle = family.get_father_handle()
-    if father_handle:
-        return find_person(db, father_handle)
-    return VerifyPerson(None, None)
+        return find_person(db, None)
+    return find_person(db, family.get_father_handle())
 
 
 def get_mother(db, family):
     """get a family's mother"""
     if not family:
-        return VerifyPerson(None, None)
-    mother_handle = family.get_mother_handle()
-    if mother_handle:
-        return find_person(db, mother_handle)
-    return VerifyPerson(None, None)
+        return find_person(db, None)
+    return find_person(db, family.get_mother_handle())
 
 
 def get_child_birth_dates(db, family, estimate):
     """get a family's children's birth dates"""
     dates = []
+    person_rows = _verify_data.person_rows
+    birth_dates = _verify_data.birth_date[int(estimate)]
     for child_ref in family.get_child_ref_list():
-        child = find_person(db, child_ref.ref)
-        child_birth_date = child.get_birth_date(estimate)
+        child_birth_date = birth_dates[person_rows.get(child_ref.ref, 0)]
         if child_birth_date > 0:
             dates.append(child_birth_date)
     return dates
@@ -395,12 +491,7 @@ def get_child_birth_dates(db, family, estimate):
 
 def get_n_children(db, person):
     """get the number of a family's children"""
-    number = 0
-    for family_handle in person.get_family_handle_list():
-        family = find_family(db, family_handle)
-        if family:
-            number += len(family.get_child_ref_list())
-    return number
+    return person.get_n_children()
 
 
 # -------------------------------------------------------------------------
@@ -631,12 +722,10 @@ class Verify(tool.Tool, ManagedWindow, UpdateCallback):
     def run_the_tool(self, cli=False):
         """run the tool"""
 
-        n_people = self.db.get_number_of_people()
-        n_families = self.db.get_number_of_families()
-        if n_people <= _person_cache_size:
-            preload_person_cache(self.db)
-        if n_families <= _family_cache_size:
-            preload_family_cache(self.db)
+        global _verify_data
+        _verify_data = VerifyData(self.db)
+        n_people = len(_verify_data.person_rows)
+        n_families = len(_verify_data.family_rows)
 
         for option, value in self.options.handler.options_dict.items():
             exec("%s = %s" % (option, value), globals())
@@ -648,11 +737,9 @@ class Verify(tool.Tool, ManagedWindow, UpdateCallback):
 
         self.set_total(n_people + n_families)
 
-        family_handles = set(self.db.get_family_handles())
+        family_handles = set(_verify_data.family_rows)
 
-        for person in self.db.iter_people():
-            verify_person = VerifyPerson(self.db, person)
-            _person_cache[verify_person.get_handle()] = verify_person
+        for verify_person in _verify_data.iter_people():
             for family_handle in verify_person.get_family_handle_list():
                 if family_handle in family_handles:
                     verify_family = find_family(self.db, family_handle)
@@ -699,7 +786,7 @@ class Verify(tool.Tool, ManagedWindow, UpdateCallback):
                 estimate_age,
             )
 
-        clear_cache()
+        _verify_data = None
         self.update = None  # Needed for garbage collection
 
 
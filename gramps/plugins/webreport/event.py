@@ -127,7 +127,9 @@ class EventPages(BasePage):
             for event_handle in event_handle_list:
                 step()
                 index += 1
-                self.eventpage(self.report, the_lang, the_title, event_handle)
+                self.report.write_object_page(
+                    Event, event_handle, "eventpage", event_handle
+                )
             step()
         self.eventlistpage(
             self.report, the_lang, the_title, event_types, event_handle_list
@@ -121,7 +121,9 @@ class FamilyPages(BasePage):
             for family_handle in self.report.obj_dict[Family]:
                 step()
                 index += 1
-                self.familypage(self.report, the_lang, the_title, family_handle)
+                self.report.write_object_page(
+                    Family, family_handle, "familypage", family_handle
+                )
             step()
             self.familylistpage(
                 self.report, the_lang, the_title, self.report.obj_dict[Family].keys()
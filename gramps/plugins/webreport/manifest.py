@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Incremental generation of the pages of the primary objects.
+
+Each page written by an incremental run is stored in a manifest, in the
+target directory, with the handles of the objects read while writing it and
+the other lookups it made, a digest of their change times, of their place in
+the report and of the results of the lookups, and the files it created.  On
+the next run with the same options, a page whose files still exist and
+whose digest did not change is not written again.  The files of the pages
+of objects no longer in the report are removed.
+
+Classes:
+    RecordingCacheProxyDb
+    PageManifest
+"""
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+from contextlib import contextmanager
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.const import VERSION
+from gramps.gen.lib import (
+    Person,
+    Family,
+    Event,
+    Place,
+    Source,
+    Citation,
+    Media,
+    Repository,
+    Note,
+    Tag,
+)
+from gramps.gen.proxy import CacheProxyDb
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+# The manifest file, in the target directory
+MANIFEST_NAME = ".narrativeweb-manifest.json.gz"
+
+# The options which only change the download page.  The default file names
+# follow the last web site directory, so they would change between runs.
+_DOWNLOAD_OPTIONS = ("down_fname", "dl_descr")
+
+# The tables whose change times are used
+_TABLES = (
+    "person",
+    "family",
+    "event",
+    "place",
+    "source",
+    "citation",
+    "media",
+    "repository",
+    "note",
+    "tag",
+)
+
+# The classes of the objects in the report
+_CLASSES = (
+    Person,
+    Family,
+    Event,
+    Place,
+    Source,
+    Citation,
+    Media,
+    Repository,
+    Note,
+    Tag,
+)
+
+
+class RecordingCacheProxyDb(CacheProxyDb):
+    """
+    A cache proxy which records the handles of the objects read, and the
+    other lookups made, while a page is being written.
+    """
+
+    def __init__(self, database):
+        CacheProxyDb.__init__(self, database)
+        self.recorder = None
+        self.lookups = None
+
+    def __record(self, handle):
+        """
+        Add a handle to the inputs of the page being written.
+        """
+        if self.recorder is not None:
+            self.recorder.add(handle)
+
+    def __record_lookup(self, method, *args):
+        """
+        Add a lookup, which does not read an object from its handle, to the
+        inputs of the page being written.
+        """
+        if self.lookups is not None:
+            self.lookups.add(json.dumps([method] + list(args)))
+
+    def __from_gramps_id(self, method, val):
+        """
+        Return the object with a Gramps ID, and record the lookup and the
+        object.
+        """
+        self.__record_lookup(method, val)
+        obj = getattr(self.db, method)(val)
+        if obj is not None:
+            self.__record(obj.handle)
+        return obj
+
+    def get_lookup_result(self, lookup):
+        """
+        Return the result of a recorded lookup, read again from the
+        database: the handle of the object with a Gramps ID, the back
+        references of an object, or the number of objects of a type.
+        """
+        method, *args = json.loads(lookup)
+        result = getattr(self.db, method)(*args)
+        if method == "find_backlink_handles":
+            return sorted(result)
+        if method.endswith("_handles"):
+            return len(result)
+        return result.handle if result is not None else None
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        self.__record_lookup("find_backlink_handles", handle, include_classes)
+        return self.db.find_backlink_handles(handle, include_classes)
+
+    def get_media_handles(self, *args, **kwargs):
+        self.__record_lookup("get_media_handles")
+        return self.db.get_media_handles(*args, **kwargs)
+
+    def get_place_handles(self, *args, **kwargs):
+        self.__record_lookup("get_place_handles")
+        return self.db.get_place_handles(*args, **kwargs)
+
+    def get_repository_handles(self):
+        self.__record_lookup("get_repository_handles")
+        return self.db.get_repository_handles()
+
+    def get_person_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_person_from_gramps_id", val)
+
+    def get_family_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_family_from_gramps_id", val)
+
+    def get_event_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_event_from_gramps_id", val)
+
+    def get_place_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_place_from_gramps_id", val)
+
+    def get_source_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_source_from_gramps_id", val)
+
+    def get_citation_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_citation_from_gramps_id", val)
+
+    def get_media_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_media_from_gramps_id", val)
+
+    def get_repository_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_repository_from_gramps_id", val)
+
+    def get_note_from_gramps_id(self, val):
+        return self.__from_gramps_id("get_note_from_gramps_id", val)
+
+    def get_person_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_person_from_handle(self, handle)
+
+    def get_event_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_event_from_handle(self, handle)
+
+    def get_family_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_family_from_handle(self, handle)
+
+    def get_repository_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_repository_from_handle(self, handle)
+
+    def get_place_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_place_from_handle(self, handle)
+
+    def get_citation_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_citation_from_handle(self, handle)
+
+    def get_source_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_source_from_handle(self, handle)
+
+    def get_note_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_note_from_handle(self, handle)
+
+    def get_media_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_media_from_handle(self, handle)
+
+    def get_tag_from_handle(self, handle):
+        self.__record(handle)
+        return CacheProxyDb.get_tag_from_handle(self, handle)
+
+
+class PageManifest:
+    """
+    The pages written by the previous and the current incremental run.
+    """
+
+    def __init__(self, report):
+        """
+        @param: report -- The instance of the main report class.
+                          Its database must be a RecordingCacheProxyDb.
+        """
+        self.report = report
+        self.path = os.path.join(report.html_dir, MANIFEST_NAME)
+        options = [
+            (name, value)
+            for name, value in sorted(report.options.items())
+            if not name.startswith(_DOWNLOAD_OPTIONS)
+        ]
+        options = repr(options) + VERSION
+        self.key = hashlib.sha1(options.encode("utf-8")).hexdigest()
+        self.old_pages = self.__load()
+        self.pages = {}
+        self.files = None
+        self.written_files = set()
+        self.changes = None
+        self.lookup_results = {}
+        self.written = 0
+        self.skipped = 0
+
+    def __load(self):
+        """
+        Return the pages of the previous run, or an empty dictionary if there
+        is none or if it was made with other options.
+        """
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as manifest:
+                data = json.load(manifest)
+        except FileNotFoundError:
+            return {}
+        except (OSError, EOFError, ValueError) as err:
+            LOG.warning("Ignoring the page manifest %s: %s", self.path, err)
+            return {}
+        if data.get("key") != self.key:
+            LOG.info("The report options changed, writing all pages")
+            return {}
+        handles = data["handles"]
+        pages = data["pages"]
+        for page in pages.values():
+            page["handles"] = [handles[index] for index in page["handles"]]
+        return pages
+
+    def save(self):
+        """
+        Write the manifest of the pages of this run, and remove the files of
+        the pages of the previous run whose objects are no longer in the
+        report.
+        """
+        self.__remove_old_pages()
+        handles = {}
+        pages = {}
+        for page_key, page in self.pages.items():
+            page = dict(page)
+            page["handles"] = [
+                handles.setdefault(handle, len(handles)) for handle in page["handles"]
+            ]
+            pages[page_key] = page
+        data = {"key": self.key, "handles": list(handles), "pages": pages}
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as manifest:
+            json.dump(data, manifest)
+        os.replace(tmp_path, self.path)
+        LOG.info(
+            "Incremental web report: %d pages written, %d unchanged",
+            self.written,
+            self.skipped,
+        )
+
+    def __remove_old_pages(self):
+        """
+        Remove the files of the pages of the previous run which were neither
+        kept nor written again, unless this run wrote them.
+        """
+        files = set(self.written_files)
+        for page in self.pages.values():
+            files.update(page["files"])
+        removed = 0
+        for page_key, page in self.old_pages.items():
+            if page_key in self.pages:
+                continue
+            for fname in page["files"]:
+                if fname not in files and os.path.exists(fname):
+                    os.remove(fname)
+                    files.add(fname)
+            removed += 1
+        if removed:
+            LOG.info("Incremental web report: %d pages removed", removed)
+
+    def __page_key(self, obj_class, handle):
+        """
+        Return the key of the page of an object, in the current language.
+        """
+        return "%s/%s/%s" % (self.report.the_lang or "", obj_class.__name__, handle)
+
+    def load_changes(self):
+        """
+        Read the change times of all objects in the database, if they were
+        not read yet.
+        """
+        if self.changes is None:
+            # One pass over the tables is cheaper than a query for each page
+            database = self.report.database.db
+            database = getattr(database, "basedb", database)
+            self.changes = {}
+            for table in _TABLES:
+                with getattr(database, "get_%s_cursor" % table)() as cursor:
+                    for obj_handle, data in cursor:
+                        self.changes[obj_handle] = data["change"]
+
+    def __get_change(self, handle):
+        """
+        Return the change time of an object in the database.
+        """
+        self.load_changes()
+        return self.changes.get(handle)
+
+    def __get_lookup_result(self, lookup):
+        """
+        Return the result of a lookup made by a page, read once per run.
+        """
+        if lookup not in self.lookup_results:
+            database = self.report.database
+            self.lookup_results[lookup] = database.get_lookup_result(lookup)
+        return self.lookup_results[lookup]
+
+    def __entry_state(self, entry):
+        """
+        Return the entry of an object in the list of objects of the report,
+        with the objects it holds, such as the event of a place, replaced by
+        their handles and change times.
+        """
+        return tuple(
+            (
+                (item.handle, self.__get_change(item.handle))
+                if hasattr(item, "handle")
+                else item
+            )
+            for item in entry
+        )
+
+    def __digest(self, handles, lookups, context):
+        """
+        Return a digest of the state of the objects used by a page.
+
+        The state of an object is its change time, its entry in the list of
+        objects of the report and its back references.  An object which was
+        not changed can still be linked or unlinked from a page, or be
+        referenced by other objects, when others are changed.  The results
+        of the other lookups, such as a Gramps ID set in the options, are
+        part of the digest too.
+        """
+        obj_dict = self.report.obj_dict
+        bkref_dict = self.report.bkref_dict
+        digest = hashlib.sha1(repr(context).encode("utf-8"))
+        for lookup in lookups:
+            result = self.__get_lookup_result(lookup)
+            digest.update(("%s=%r" % (lookup, result)).encode("utf-8"))
+            digest.update(b"\0")
+        for handle in handles:
+            state = [handle, str(self.__get_change(handle))]
+            for obj_class in _CLASSES:
+                entry = obj_dict[obj_class].get(handle)
+                if entry:
+                    entry = self.__entry_state(entry)
+                    state.append("%s=%r" % (obj_class.__name__, entry))
+                    for bkref_class, ref, role in sorted(
+                        bkref_dict[obj_class].get(handle, ()), key=str
+                    ):
+                        name = getattr(bkref_class, "__name__", bkref_class)
+                        state.append("%s:%s:%s" % (name, ref, role))
+            digest.update("\n".join(state).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def is_current(self, obj_class, handle, *context):
+        """
+        Return True if the page of an object written by the previous run
+        can be kept.  The page is then kept in the manifest of this run.
+
+        @param: obj_class -- The class of the object of the page
+        @param: handle    -- The handle of the object of the page
+        @param: context   -- Other values the page depends on
+        """
+        page_key = self.__page_key(obj_class, handle)
+        page = self.old_pages.get(page_key)
+        if page is None:
+            return False
+        if not all(os.path.exists(fname) for fname in page["files"]):
+            return False
+        digest = self.__digest(page["handles"], page["lookups"], context)
+        if page["digest"] != digest:
+            return False
+        self.pages[page_key] = page
+        fam_link = page.get("fam_link")
+        if fam_link:
+            self.report.fam_link[handle] = fam_link
+        self.skipped += 1
+        return True
+
+    @contextmanager
+    def record(self, obj_class, handle, *context):
+        """
+        Record the objects used and the files written while the page of an
+        object is being written.
+
+        @param: obj_class -- The class of the object of the page
+        @param: handle    -- The handle of the object of the page
+        @param: context   -- Other values the page depends on
+        """
+        database = self.report.database
+        inputs = {handle}
+        lookups = set()
+        self.files = []
+        database.recorder = inputs
+        database.lookups = lookups
+        try:
+            yield
+        finally:
+            database.recorder = None
+            database.lookups = None
+        handles = sorted(inputs)
+        lookups = sorted(lookups)
+        page = {
+            "handles": handles,
+            "lookups": lookups,
+            "digest": self.__digest(handles, lookups, context),
+            "files": self.files,
+        }
+        fam_link = self.report.fam_link.get(handle)
+        if fam_link:
+            page["fam_link"] = fam_link
+        self.pages[self.__page_key(obj_class, handle)] = page
+        self.files = None
+        self.written += 1
+
+    def take_pages(self):
+        """
+        Return the pages recorded since the last call, and the number of
+        pages written, and forget them.  Used in the worker processes.
+        """
+        pages, written = self.pages, self.written
+        self.pages = {}
+        self.written = 0
+        return pages, written
+
+    def add_pages(self, pages, written):
+        """
+        Add the pages recorded by a worker process.
+        """
+        self.pages.update(pages)
+        self.written += written
+
+    def add_file(self, fname):
+        """
+        Add a file to the page being written.
+        """
+        self.written_files.add(fname)
+        if self.files is not None:
+            self.files.append(fname)
@@ -157,12 +157,9 @@ class MediaPages(BasePage):
                     next_ = self.unused_media_handles[0]
                 else:
                     next_ = None
-                self.mediapage(
-                    self.report,
-                    the_lang,
-                    the_title,
-                    handle,
-                    (prev, next_, index, media_count),
+                info = (prev, next_, index, media_count)
+                self.report.write_object_page(
+                    Media, handle, "mediapage", handle, info, context=info
                 )
                 prev = handle
                 step()
@@ -178,12 +175,14 @@ class MediaPages(BasePage):
                         next_ = None
                     else:
                         next_ = self.unused_media_handles[idx]
-                    self.mediapage(
-                        self.report,
-                        the_lang,
-                        the_title,
+                    info = (prev, next_, index, media_count)
+                    self.report.write_object_page(
+                        Media,
                         media_handle,
-                        (prev, next_, index, media_count),
+                        "mediapage",
+                        media_handle,
+                        info,
+                        context=info,
                     )
                     prev = media_handle
                     step()
@@ -55,6 +55,7 @@ import shutil
 import tarfile
 from io import BytesIO, TextIOWrapper
 from collections import defaultdict
+from contextlib import nullcontext
 from decimal import getcontext
 
 # ------------------------------------------------
@@ -127,6 +128,8 @@ from gramps.plugins.webreport.introduction import IntroductionPage
 from gramps.plugins.webreport.addressbook import AddressBookPage
 from gramps.plugins.webreport.addressbooklist import AddressBookListPage
 from gramps.plugins.webreport.calendar import CalendarPage
+from gramps.plugins.webreport.manifest import RecordingCacheProxyDb, PageManifest
+from gramps.plugins.webreport.pagepool import PageWriterPool, get_page_writers
 
 from gramps.plugins.webreport.common import (
     get_gendex_data,
@@ -180,7 +183,12 @@ class NavWebReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu)
-        self.database = CacheProxyDb(self.database)
+        # Only pages in a directory can be kept from a previous run
+        self.incremental = self.options["incremental"] and not self.options["archive"]
+        if self.incremental:
+            self.database = RecordingCacheProxyDb(self.database)
+        else:
+            self.database = CacheProxyDb(self.database)
         self._db = self.database
 
         filters_option = menu.get_option_by_name("filter")
@@ -311,6 +319,8 @@ class NavWebReport(Report):
         self.rel_class = None
         self.tab = None
         self.fam_link = {}
+        self.manifest = None
+        self.page_pool = None
         if self.options["securesite"]:
             self.secure_mode = HTTPS
         else:
@@ -472,6 +482,9 @@ class NavWebReport(Report):
 
         self._build_obj_dict()
 
+        if self.incremental:
+            self.manifest = PageManifest(self)
+
         #################################################
         #
         # Add images for home, contact and introduction pages
@@ -532,7 +545,7 @@ class NavWebReport(Report):
             self.base_pages()
 
             # build classes IndividualListPage and IndividualPage
-            self.tab["Person"].display_pages(the_lang, the_title)
+            self.display_tab("Person", the_lang, the_title)
 
             self.build_gendex(self.obj_dict[Person], the_lang)
 
@@ -541,23 +554,23 @@ class NavWebReport(Report):
 
             # build classes FamilyListPage and FamilyPage
             if self.inc_families:
-                self.tab["Family"].display_pages(the_lang, the_title)
+                self.display_tab("Family", the_lang, the_title)
 
             # build classes EventListPage and EventPage
             if self.inc_events:
-                self.tab["Event"].display_pages(the_lang, the_title)
+                self.display_tab("Event", the_lang, the_title)
 
             # build classes PlaceListPage and PlacePage
-            self.tab["Place"].display_pages(the_lang, the_title)
+            self.display_tab("Place", the_lang, the_title)
 
             # build classes RepositoryListPage and RepositoryPage
             if self.inc_repository:
-                self.tab["Repository"].display_pages(the_lang, the_title)
+                self.display_tab("Repository", the_lang, the_title)
 
             # build classes MediaListPage and MediaPage
             if self.inc_gallery:
                 if not self.create_thumbs_only:
-                    self.tab["Media"].display_pages(the_lang, the_title)
+                    self.display_tab("Media", the_lang, the_title)
 
                 # build Thumbnail Preview Page...
                 self.thumbnail_preview_page()
@@ -567,7 +580,7 @@ class NavWebReport(Report):
                 self.addressbook_pages(self.obj_dict[Person])
 
             # build classes SourceListPage and SourcePage
-            self.tab["Source"].display_pages(the_lang, the_title)
+            self.display_tab("Source", the_lang, the_title)
 
             # build calendar for the current year
             if self.usecal:
@@ -585,6 +598,9 @@ class NavWebReport(Report):
         # copy all of the necessary files
         self.copy_narrated_files()
 
+        if self.manifest:
+            self.manifest.save()
+
         # if an archive is being used, close it?
         if self.archive:
             self.archive.close()
@@ -605,6 +621,82 @@ class NavWebReport(Report):
         # pr.print_stats()
         # end print performance check
 
+    def display_tab(self, obj_class, the_lang, the_title):
+        """
+        Generate and output the pages of a tab.  The pages of the objects
+        are written in worker processes when more than one process is set
+        for exports and the database is on disk.
+
+        @param: obj_class -- The name of the class of the objects of the tab
+        @param: the_lang  -- The lang to process
+        @param: the_title -- The title page related to the language
+        """
+        processes, path = get_page_writers(self)
+        if processes < 2:
+            self.tab[obj_class].display_pages(the_lang, the_title)
+            return
+        try:
+            with PageWriterPool(self, processes, path) as self.page_pool:
+                self.tab[obj_class].display_pages(the_lang, the_title)
+        finally:
+            self.page_pool = None
+
+    def write_object_page(self, obj_class, handle, method, *args, context=()):
+        """
+        Write the page of an object, unless the page written by the previous
+        incremental run can be kept.
+
+        @param: obj_class -- The class of the object of the page
+        @param: handle    -- The handle of the object of the page
+        @param: method    -- The name of the method of the web page plugin of
+                             the class which writes the page.  It is called
+                             with the report, the lang, the title and args.
+        @param: context   -- Other values the page depends on
+        """
+        if self.page_is_current(obj_class, handle, *context):
+            return
+        page = (obj_class, handle, method, args, context)
+        if self.page_pool:
+            self.page_pool.submit(page)
+        else:
+            self.write_page_now(*page)
+
+    def write_page_now(self, obj_class, handle, method, args, context):
+        """
+        Write the page of an object in this process.
+        See write_object_page.
+        """
+        with self.record_page(obj_class, handle, *context):
+            write_page = getattr(self.tab[obj_class.__name__], method)
+            write_page(self, self.the_lang, self.the_title, *args)
+
+    def page_is_current(self, obj_class, handle, *context):
+        """
+        Return True if the page of an object written by the previous
+        incremental run can be kept, because none of the objects used by the
+        page have changed since.
+
+        @param: obj_class -- The class of the object of the page
+        @param: handle    -- The handle of the object of the page
+        @param: context   -- Other values the page depends on
+        """
+        if self.manifest is None:
+            return False
+        return self.manifest.is_current(obj_class, handle, *context)
+
+    def record_page(self, obj_class, handle, *context):
+        """
+        Return a context manager which records the objects used and the files
+        written by the page of an object, for the next incremental run.
+
+        @param: obj_class -- The class of the object of the page
+        @param: handle    -- The handle of the object of the page
+        @param: context   -- Other values the page depends on
+        """
+        if self.manifest is None:
+            return nullcontext()
+        return self.manifest.record(obj_class, handle, *context)
+
     def _build_obj_dict(self):
         """
         Construct the dictionaries of objects to be included in the reports.
@@ -1815,6 +1907,8 @@ class NavWebReport(Report):
             dir_name = os.path.dirname(fname)
             if not os.path.isdir(dir_name):
                 os.makedirs(dir_name)
+            if self.manifest:
+                self.manifest.add_file(fname)
             output_file = open(
                 fname, "w", encoding=self.encoding, errors="xmlcharrefreplace"
             )
@@ -1901,6 +1995,8 @@ class NavWebReport(Report):
                 self.archive.add(from_fname, dest, filter=set_mtime)
         else:
             dest = os.path.join(self.html_dir, to_dir, to_fname)
+            if self.manifest:
+                self.manifest.add_file(dest)
 
             destdir = os.path.dirname(dest)
             if not os.path.isdir(destdir):
@@ -2538,6 +2634,18 @@ class NavWebOptions(MenuReportOptions):
         )
         addopt("showhalfsiblings", showallsiblings)
 
+        incremental = BooleanOption(_("Only write the pages of changed objects"), False)
+        incremental.set_help(
+            _(
+                "Keep a list of the objects used by each page in the web "
+                "site directory, and only write again the pages of the "
+                "individuals, families, events, places, sources, "
+                "repositories and media which use changed objects. "
+                "Not used with an archive."
+            )
+        )
+        addopt("incremental", incremental)
+
     def __add_advanced_options_2(self, menu):
         """
         Continue options on the "Advanced" tab.
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Write the pages of the primary objects in worker processes.
+
+The worker processes are forked while the pages of a tab are written, so
+that they share the lists of objects of the report and the state of the
+web page plugins.  Each worker opens the database again, read-only, and
+writes the pages it is given.  Pages in a directory are written by the
+workers.  The files of an archive are sent back to the report, which adds
+them to the archive.
+
+Classes:
+    PageWriterPool
+"""
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import multiprocessing
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.plugins.lib.libexportpool import (
+    get_database_path,
+    get_processes,
+    open_database,
+)
+from gramps.plugins.webreport.common import _WRONGMEDIAPATH
+
+# Number of pages written in one task of a worker process
+CHUNK_SIZE = 50
+
+# The report, in the worker processes
+_REPORT = None
+
+# The archive of the report forked from the parent, in the worker processes.
+# It writes to the file of the parent, so it is kept here to be neither
+# flushed nor closed when it would be collected.
+_FORKED_ARCHIVE = None
+
+
+def get_page_writers(report):
+    """
+    Return the number of processes and the database path to use for the
+    pages of a report, or (1, None) if the pages are written by the report.
+    """
+    processes = get_processes()
+    if processes < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return 1, None
+    database = report.database.db
+    path = get_database_path(getattr(database, "basedb", database))
+    if path is None:
+        return 1, None
+    return processes, path
+
+
+class ArchiveEntries:
+    """
+    Replaces the archive of the report in a worker process, and keeps the
+    files added to it.
+    """
+
+    def __init__(self):
+        self.names = set()
+        self.files = []
+        self.copies = []
+
+    def getnames(self):
+        """
+        Return the names of the files added by this worker.
+        """
+        return self.names
+
+    def addfile(self, tarinfo, fileobj):
+        """
+        Keep a file written by a page.
+        """
+        self.names.add(tarinfo.name)
+        self.files.append((tarinfo, fileobj.read(tarinfo.size)))
+
+    def add(self, name, arcname, filter=None):
+        """
+        Keep a file copied by a page.  The modification time of the file,
+        which the filter of the report sets, is the default of the archive.
+        """
+        self.names.add(arcname)
+        self.copies.append((name, arcname))
+
+    def take(self):
+        """
+        Return the files kept since the last call, and forget them.
+        """
+        files, copies = self.files, self.copies
+        self.files = []
+        self.copies = []
+        return files, copies
+
+
+def _init_worker(path):
+    """
+    Open the database in a worker process, and use it in place of the
+    database of the report forked from the parent.
+    """
+    global _FORKED_ARCHIVE
+    report = _REPORT
+    database = open_database(path)
+    proxy = report.database
+    while isinstance(proxy.db, ProxyDbBase):
+        proxy.db.basedb = database
+        proxy = proxy.db
+    proxy.db = database
+    if report.archive:
+        _FORKED_ARCHIVE = report.archive
+        report.archive = ArchiveEntries()
+    if report.manifest:
+        # Forget the pages recorded by the report before the fork
+        report.manifest.take_pages()
+
+
+def _write_pages(pages):
+    """
+    Write pages in a worker process, and return what the report needs to
+    merge from them.
+    """
+    report = _REPORT
+    del _WRONGMEDIAPATH[:]
+    fam_link = {}
+    for obj_class, handle, method, args, context in pages:
+        report.write_page_now(obj_class, handle, method, args, context)
+        link = report.fam_link.get(handle)
+        if link:
+            fam_link[handle] = link
+    archive = report.archive.take() if report.archive else None
+    recorded = report.manifest.take_pages() if report.manifest else None
+    return archive, fam_link, recorded, list(_WRONGMEDIAPATH)
+
+
+class PageWriterPool:
+    """
+    Write the pages of a tab in worker processes.
+    """
+
+    def __init__(self, report, processes, path):
+        """
+        @param: report    -- The instance of the main report class
+        @param: processes -- The number of worker processes
+        @param: path      -- The path of the database, for the workers
+        """
+        global _REPORT
+        _REPORT = report
+        if report.manifest:
+            # Read once here, rather than in every worker
+            report.manifest.load_changes()
+        self.report = report
+        self.processes = processes
+        self.pool = ProcessPoolExecutor(
+            processes,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(path,),
+        )
+        self.pages = []
+        self.pending = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _REPORT
+        try:
+            if exc_type is None:
+                self.__submit()
+                while self.pending:
+                    self.__merge(self.pending.popleft().result())
+        finally:
+            self.pool.shutdown(wait=exc_type is None, cancel_futures=True)
+            _REPORT = None
+
+    def submit(self, page):
+        """
+        Write a page in a worker process.
+
+        @param: page -- The arguments of the write_page_now method of the
+                        report
+        """
+        self.pages.append(page)
+        if len(self.pages) >= CHUNK_SIZE:
+            self.__submit()
+
+    def __submit(self):
+        """
+        Send the pages to a worker process.
+        """
+        if not self.pages:
+            return
+        self.pending.append(self.pool.submit(_write_pages, self.pages))
+        self.pages = []
+        # Merge the results while the workers run
+        while self.pending and (
+            self.pending[0].done() or len(self.pending) > 2 * self.processes
+        ):
+            self.__merge(self.pending.popleft().result())
+
+    def __merge(self, result):
+        """
+        Merge the result of a worker process into the report.
+        """
+        archive, fam_link, recorded, wrong_media = result
+        report = self.report
+        if archive:
+            files, copies = archive
+            names = set(report.archive.getnames())
+            for tarinfo, data in files:
+                if tarinfo.name not in names:
+                    names.add(tarinfo.name)
+                    report.archive.addfile(tarinfo, BytesIO(data))
+            for name, arcname in copies:
+                if arcname not in names:
+                    names.add(arcname)
+                    report.archive.add(name, arcname)
+        report.fam_link.update(fam_link)
+        if recorded:
+            report.manifest.add_pages(*recorded)
+        _WRONGMEDIAPATH.extend(wrong_media)
@@ -175,7 +175,9 @@ class PersonPages(BasePage):
                 step()
                 index += 1
                 person = self.r_db.get_person_from_handle(person_handle)
-                self.individualpage(self.report, the_lang, the_title, person)
+                self.report.write_object_page(
+                    Person, person_handle, "individualpage", person
+                )
             step()
             self.individuallistpage(
                 self.report, the_lang, the_title, self.report.obj_dict[Person].keys()
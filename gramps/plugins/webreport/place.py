@@ -174,8 +174,13 @@ class PlacePages(BasePage):
                 p_handle = self.report.obj_dict[PlaceName][place_name]
                 index += 1
                 if isinstance(p_handle, tuple):
-                    self.placepage(
-                        self.report, the_lang, the_title, p_handle[0], place_name
+                    self.report.write_object_page(
+                        Place,
+                        p_handle[0],
+                        "placepage",
+                        p_handle[0],
+                        place_name,
+                        context=(place_name,),
                     )
             step()
         self.placelistpage(self.report, the_lang, the_title)
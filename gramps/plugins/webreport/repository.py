@@ -126,7 +126,9 @@ class RepositoryPages(BasePage):
                 (repo, handle) = repos_dict[key]
                 step()
                 idx += 1
-                self.repositorypage(self.report, the_lang, the_title, repo, handle)
+                self.report.write_object_page(
+                    Repository, handle, "repositorypage", repo, handle
+                )
 
     def repositorylistpage(self, report, the_lang, the_title, repos_dict, keys):
         """
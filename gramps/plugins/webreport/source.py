@@ -117,7 +117,9 @@ class SourcePages(BasePage):
             for source_handle in self.report.obj_dict[Source]:
                 step()
                 index += 1
-                self.sourcepage(self.report, the_lang, the_title, source_handle)
+                self.report.write_object_page(
+                    Source, source_handle, "sourcepage", source_handle
+                )
 
     def sourcelistpage(self, report, the_lang, the_title, source_handles):
         """
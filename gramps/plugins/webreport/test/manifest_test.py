@@ -0,0 +1,256 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the incremental generation of the narrated web site
+"""
+from collections import defaultdict
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from ....gen.const import DATA_DIR
+from ....gen.db import DbTxn
+from ....gen.db.utils import import_as_dict, open_database
+from ....gen.lib import Family, Note, Person
+from ....gen.user import User
+from ..manifest import MANIFEST_NAME, PageManifest, RecordingCacheProxyDb
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "data.gramps")
+
+TREE_NAME = "Test_incremental_navweb"
+
+# Added to the pages by the test
+MARK = "<!-- marked -->\n"
+
+
+class PageReport:
+    """
+    The parts of the report used by the manifest, with a page which reads a
+    person, the footer note set in the options and the back references of
+    the person.
+    """
+
+    def __init__(self, database, html_dir, footernote):
+        self.database = RecordingCacheProxyDb(database)
+        self.html_dir = html_dir
+        self.options = {"footernote": footernote}
+        self.the_lang = None
+        self.obj_dict = defaultdict(dict)
+        self.bkref_dict = defaultdict(dict)
+        self.fam_link = {}
+        self.manifest = PageManifest(self)
+
+    def write_page(self, handle):
+        """
+        Write the page of a person, unless it is current.
+        """
+        if self.manifest.is_current(Person, handle):
+            return False
+        with self.manifest.record(Person, handle):
+            person = self.database.get_person_from_handle(handle)
+            note = self.database.get_note_from_gramps_id(self.options["footernote"])
+            backlinks = list(self.database.find_backlink_handles(handle))
+            fname = os.path.join(self.html_dir, "%s.html" % handle)
+            with open(fname, "w", encoding="utf-8") as page:
+                page.write(person.get_primary_name().get_first_name())
+                page.write(note.get() if note else "")
+                page.write(repr(backlinks))
+            self.manifest.add_file(fname)
+        return True
+
+
+class PageManifestTest(unittest.TestCase):
+    """
+    Test the pages kept from a previous run.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.handles = sorted(cls.db.get_person_handles())[:2]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.undo = 0
+        self.run_report("N0000")
+
+    def tearDown(self):
+        for dummy in range(self.undo):
+            self.db.undo()
+        self.tmpdir.cleanup()
+
+    def run_report(self, footernote, handles=None):
+        """
+        Write the pages of some people, and return those written again.
+        """
+        report = PageReport(self.db, self.tmpdir.name, footernote)
+        written = [
+            handle
+            for handle in (self.handles if handles is None else handles)
+            if report.write_page(handle)
+        ]
+        report.manifest.save()
+        return written
+
+    def commit(self, message, change):
+        """
+        Change the database in a transaction undone after the test.
+        """
+        with DbTxn(message, self.db) as trans:
+            change(trans)
+        self.undo += 1
+
+    def test_unchanged(self):
+        self.assertEqual(self.run_report("N0000"), [])
+
+    def test_changed_person(self):
+        person = self.db.get_person_from_handle(self.handles[0])
+        self.commit("Change", lambda trans: self.db.commit_person(person, trans))
+        self.assertEqual(self.run_report("N0000"), [self.handles[0]])
+
+    def test_options(self):
+        self.assertEqual(self.run_report("N0001"), self.handles)
+
+    def test_footer_note(self):
+        note = self.db.get_note_from_gramps_id("N0000")
+        self.commit("Change", lambda trans: self.db.commit_note(note, trans))
+        self.assertEqual(self.run_report("N0000"), self.handles)
+
+    def test_new_footer_note(self):
+        self.assertIsNone(self.db.get_note_from_gramps_id("N9999"))
+        self.run_report("N9999")
+        note = Note("Footer")
+        note.set_gramps_id("N9999")
+        self.commit("Add", lambda trans: self.db.add_note(note, trans))
+        self.assertEqual(self.run_report("N9999"), self.handles)
+
+    def test_backlinks(self):
+        family = Family()
+        family.set_father_handle(self.handles[1])
+        self.commit("Add", lambda trans: self.db.add_family(family, trans))
+        self.assertEqual(self.run_report("N0000"), [self.handles[1]])
+
+    def test_missing_file(self):
+        os.remove(os.path.join(self.tmpdir.name, "%s.html" % self.handles[0]))
+        self.assertEqual(self.run_report("N0000"), [self.handles[0]])
+
+    def test_removed_page(self):
+        self.assertEqual(self.run_report("N0000", self.handles[1:]), [])
+        self.assertFalse(
+            os.path.exists(os.path.join(self.tmpdir.name, "%s.html" % self.handles[0]))
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.tmpdir.name, "%s.html" % self.handles[1]))
+        )
+
+
+class IncrementalReportTest(unittest.TestCase):
+    """
+    Test the pages written by the report with the incremental option.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.call("-y", "--remove", TREE_NAME)
+        cls.call("-C", TREE_NAME, "--import", EXAMPLE)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.call("-y", "--remove", TREE_NAME)
+
+    @staticmethod
+    def call(*args):
+        """
+        Run Gramps in another process, where the web report plugins are
+        registered before its modules are imported.
+        """
+        process = subprocess.run(
+            [sys.executable, "-m", "gramps"] + list(args),
+            capture_output=True,
+            encoding="utf-8",
+            check=False,
+        )
+        return process.stdout, process.stderr
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_report(self):
+        """
+        Write the web site, and return the files of the object pages, and
+        the pages written by this run.  The pages are then marked, so that
+        those written again by the next run can be told from those kept.
+        """
+        out, err = self.call(
+            "-y",
+            "-O",
+            TREE_NAME,
+            "-a",
+            "report",
+            "-p",
+            "name=navwebpage,target=%s,incremental=True" % self.tmpdir.name,
+        )
+        self.assertNotIn("Failed to write report.", err)
+        path = os.path.join(self.tmpdir.name, MANIFEST_NAME)
+        with gzip.open(path, "rt", encoding="utf-8") as manifest:
+            pages = json.load(manifest)["pages"]
+        written = set()
+        for page_key, page in pages.items():
+            with open(page["files"][0], "r+", encoding="utf-8") as page_file:
+                if not page_file.read().endswith(MARK):
+                    written.add(page_key)
+                    page_file.write(MARK)
+        return {page_key: page["files"] for page_key, page in pages.items()}, written
+
+    def test_incremental(self):
+        first, written = self.run_report()
+        self.assertEqual(written, set(first))
+        second, written = self.run_report()
+        self.assertEqual(second, first)
+        self.assertEqual(written, set())
+        database = open_database(TREE_NAME)
+        try:
+            person = database.get_person_from_gramps_id("I0001")
+            removed = database.get_person_from_gramps_id("I0040")
+            with DbTxn("Change", database) as trans:
+                person.get_primary_name().set_first_name("Changed")
+                database.commit_person(person, trans)
+                database.delete_person_from_database(removed, trans)
+        finally:
+            database.close()
+        third, written = self.run_report()
+        self.assertIn("/Person/%s" % person.handle, written)
+        self.assertLess(len(written), len(third) // 2)
+        removed_key = "/Person/%s" % removed.handle
+        self.assertNotIn(removed_key, third)
+        for fname in first[removed_key]:
+            self.assertFalse(os.path.exists(fname))
+
+
+if __name__ == "__main__":
+    unittest.main()
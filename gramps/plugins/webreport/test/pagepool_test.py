@@ -0,0 +1,102 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the pages written in worker processes
+"""
+import multiprocessing
+import os
+import tarfile
+import tempfile
+import unittest
+from io import BytesIO
+
+from ....gen.db.dbconst import DBBACKEND
+from ....gen.db.utils import make_database
+from ....gen.proxy import PrivateProxyDb
+from ..pagepool import PageWriterPool
+
+PAGES = 100
+
+
+class ArchiveReport:
+    """
+    The parts of a report used by the worker processes, writing each page
+    to the archive.
+    """
+
+    def __init__(self, database, archive):
+        self.database = database
+        self.archive = archive
+        self.manifest = None
+        self.fam_link = {}
+
+    def write_page_now(self, obj_class, handle, method, args, context):
+        data = ("<html>%s</html>" % handle).encode("utf-8")
+        tarinfo = tarfile.TarInfo("%s.html" % handle)
+        tarinfo.size = len(data)
+        self.archive.addfile(tarinfo, BytesIO(data))
+
+
+@unittest.skipUnless(
+    "fork" in multiprocessing.get_all_start_methods(),
+    "The pages are only written in worker processes where they can fork.",
+)
+class PageWriterPoolTest(unittest.TestCase):
+    """
+    Test the pages written to an archive by worker processes.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "db")
+        os.mkdir(path)
+        with open(os.path.join(path, DBBACKEND), "w", encoding="utf8") as file:
+            file.write("sqlite")
+        self.db = make_database("sqlite")
+        self.db.load(path)
+        self.path = path
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def test_archive(self):
+        filename = os.path.join(self.tmpdir.name, "site.tar.gz")
+        # Only the report refers to the archive, as in the web report
+        report = ArchiveReport(PrivateProxyDb(self.db), tarfile.open(filename, "w:gz"))
+        # Written by the report before the workers are forked
+        report.write_page_now(None, "index", None, (), ())
+        with PageWriterPool(report, 2, self.path) as pool:
+            for index in range(PAGES):
+                pool.submit((None, "page%03d" % index, None, (), ()))
+        report.archive.close()
+        with tarfile.open(filename, "r:gz") as archive:
+            names = archive.getnames()
+            self.assertEqual(
+                names[1:], sorted("page%03d.html" % index for index in range(PAGES))
+            )
+            self.assertEqual(names[0], "index.html")
+            data = archive.extractfile("page042.html").read()
+        self.assertEqual(data, b"<html>page042</html>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark rebuilding the reference map and the secondary columns.
+
+Builds a synthetic database and compares reindex_reference_map with a
+rebuild that creates an object and inserts one reference row at a time.
+Run from the root directory with:
+
+python3 -m test.rebuild_benchmark [number_of_families] [processes]
+"""
+import sys
+import time
+
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import ChildRef, Event, EventRef, Family, Person, Surname
+
+
+def make_database_with_families(count):
+    """
+    Create an in-memory database with families of four people.
+    """
+    db = make_database("sqlite")
+    db.load(":memory:")
+    with DbTxn("Add families", db, batch=True) as trans:
+        for index in range(count):
+            family = Family()
+            for member in range(4):
+                person = Person()
+                person.set_gender(member % 2)
+                surname = Surname()
+                surname.set_surname("Surname%d" % (index % 2000))
+                person.primary_name.add_surname(surname)
+                event = Event()
+                db.add_event(event, trans)
+                ref = EventRef()
+                ref.set_reference_handle(event.handle)
+                person.add_event_ref(ref)
+                db.add_person(person, trans)
+                if member == 0:
+                    family.set_father_handle(person.handle)
+                elif member == 1:
+                    family.set_mother_handle(person.handle)
+                else:
+                    childref = ChildRef()
+                    childref.set_reference_handle(person.handle)
+                    family.add_child_ref(childref)
+            db.add_family(family, trans)
+    return db
+
+
+def reindex_by_object(db):
+    """
+    Rebuild the reference map one object and one row at a time.
+    """
+    db.dbapi.begin()
+    db.dbapi.execute("DELETE FROM reference")
+    for obj in db.iter_people():
+        for ref_class, ref_handle in set(obj.get_referenced_handles_recursively()):
+            db.dbapi.execute(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)",
+                [obj.handle, "Person", ref_handle, ref_class],
+            )
+    for obj in db.iter_families():
+        for ref_class, ref_handle in set(obj.get_referenced_handles_recursively()):
+            db.dbapi.execute(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)",
+                [obj.handle, "Family", ref_handle, ref_class],
+            )
+    db.dbapi.commit()
+
+
+def timeit(label, func):
+    """
+    Call func and report the elapsed time.
+    """
+    start = time.perf_counter()
+    func()
+    print("%-36s %8.2f seconds" % (label, time.perf_counter() - start))
+
+
+def main(count, processes):
+    db = make_database_with_families(count)
+    print("%d families, %d people" % (count, db.get_number_of_people()))
+    timeit("reference map (by object)", lambda: reindex_by_object(db))
+    config.set("database.rebuild-processes", 1)
+    timeit("reindex_reference_map", lambda: db.reindex_reference_map(None))
+    if processes > 1:
+        config.set("database.rebuild-processes", processes)
+        timeit(
+            "reindex_reference_map (%d processes)" % processes,
+            lambda: db.reindex_reference_map(None),
+        )
+        config.set("database.rebuild-processes", 1)
+    timeit("rebuild_secondary", lambda: db.rebuild_secondary(None))
+    db.close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 25000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+    )
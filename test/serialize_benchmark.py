@@ -0,0 +1,100 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark the conversion between Gramps objects and JSON structs.
+
+Compares the direct struct walk used by to_dict/from_dict with the previous
+JSON round trip.  Run from the root directory with:
+
+python3 -m test.serialize_benchmark [number_of_people]
+"""
+import json
+import sys
+import time
+
+from gramps.gen.lib import (
+    Attribute,
+    AttributeType,
+    Date,
+    EventRef,
+    Name,
+    Person,
+    Surname,
+)
+from gramps.gen.lib.serialize import from_dict, from_json, to_dict, to_json
+
+
+def make_people(count):
+    """
+    Create a list of people with a typical amount of secondary data.
+    """
+    people = []
+    for index in range(count):
+        person = Person()
+        person.set_handle("H%08d" % index)
+        person.set_gramps_id("I%05d" % index)
+        person.set_gender(index % 2)
+        name = Name()
+        name.set_first_name("Given%d" % (index % 500))
+        surname = Surname()
+        surname.set_surname("Surname%d" % (index % 2000))
+        name.add_surname(surname)
+        name.get_date_object().set_yr_mon_day(1800 + index % 200, 1, 1)
+        person.set_primary_name(name)
+        for offset in range(2):
+            ref = EventRef()
+            ref.set_reference_handle("E%08d" % (index * 2 + offset))
+            person.add_event_ref(ref)
+        attr = Attribute()
+        attr.set_type(AttributeType.NICKNAME)
+        attr.set_value("Nick%d" % index)
+        person.add_attribute(attr)
+        people.append(person)
+    return people
+
+
+def timeit(label, func, items):
+    """
+    Apply func to every item and report the throughput.
+    """
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+    print("%-28s %10.0f objects/sec" % (label, len(items) / elapsed))
+
+
+def main(count):
+    people = make_people(count)
+    structs = [to_dict(person) for person in people]
+    print("%d people" % count)
+    timeit("to_dict (json round trip)", lambda obj: json.loads(to_json(obj)), people)
+    timeit("to_dict (direct)", to_dict, people)
+    timeit(
+        "from_dict (json round trip)",
+        lambda data: from_json(json.dumps(data)),
+        structs,
+    )
+    timeit("from_dict (direct)", from_dict, structs)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)